@@ -30,11 +30,7 @@ def main(
     pass
 
 
-@app.command()
-def serve(
-    host: str = "0.0.0.0",
-    port: int = 8080,
-):
+def load_secret_key():
     os.environ["FROM_INIT_PY"] = "true"
     if os.getenv("WEBUI_SECRET_KEY") is None:
         typer.echo(
@@ -46,6 +42,14 @@ def serve(
         typer.echo(f"Loading WEBUI_SECRET_KEY from {KEY_FILE}")
         os.environ["WEBUI_SECRET_KEY"] = KEY_FILE.read_text()
 
+
+@app.command()
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+):
+    load_secret_key()
+
     if os.getenv("USE_CUDA_DOCKER", "false") == "true":
         typer.echo(
             "CUDA is enabled, appending LD_LIBRARY_PATH to include torch/cudnn & cublas libraries."
@@ -84,6 +88,22 @@ def serve(
     )
 
 
+@app.command()
+def worker(
+    concurrency: Annotated[
+        Optional[int],
+        typer.Option(help="Worker processes, defaults to INGESTION_WORKER_CONCURRENCY"),
+    ] = None,
+):
+    """Process queued file ingestion jobs (ENABLE_INGESTION_QUEUE)."""
+    load_secret_key()
+
+    from open_webui.env import INGESTION_WORKER_CONCURRENCY
+    from open_webui.worker import run_workers
+
+    run_workers(concurrency or INGESTION_WORKER_CONCURRENCY)
+
+
 @app.command()
 def dev(
     host: str = "0.0.0.0",
@@ -3,6 +3,7 @@ import logging
 import os
 import shutil
 import base64
+import time
 import redis
 
 from datetime import datetime
@@ -24,6 +25,7 @@ from open_webui.env import (
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
+    CONFIG_REDIS_SYNC_INTERVAL,
     FRONTEND_BUILD_DIR,
     OFFLINE_MODE,
     OPEN_WEBUI_DIR,
@@ -224,8 +226,15 @@ class PersistentConfig(Generic[T]):
 class AppConfig:
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
+    _redis_sync_interval: float = 0.0
+
+    # Last seen value of the shared config version key, a change means that
+    # another node has written to the config and the local snapshot is stale.
+    _version: Optional[str] = None
+    _version_checked_at: float = 0.0
 
     _state: dict[str, PersistentConfig]
+    _stats: dict[str, int]
 
     def __init__(
         self,
@@ -233,6 +242,7 @@ class AppConfig:
         redis_sentinels: Optional[list] = [],
         redis_cluster: Optional[bool] = False,
         redis_key_prefix: str = "open-webui",
+        redis_sync_interval: float = CONFIG_REDIS_SYNC_INTERVAL,
     ):
         if redis_url:
             super().__setattr__("_redis_key_prefix", redis_key_prefix)
@@ -245,8 +255,74 @@ class AppConfig:
                     decode_responses=True,
                 ),
             )
+            # Interval is configured in milliseconds
+            super().__setattr__("_redis_sync_interval", redis_sync_interval / 1000)
 
         super().__setattr__("_state", {})
+        super().__setattr__("_stats", {"reads": 0, "redis_calls": 0})
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:config:{key}"
+
+    def _version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config:__version__"
+
+    def _sync_from_redis(self):
+        """
+        Refresh the local config snapshot if another node has bumped the
+        shared version key. The version key is checked at most once per sync
+        interval, in between config reads are plain dict lookups.
+        """
+        now = time.monotonic()
+        if now - self._version_checked_at < self._redis_sync_interval:
+            return
+        super().__setattr__("_version_checked_at", now)
+
+        version = self._redis.get(self._version_key())
+        self._stats["redis_calls"] += 1
+
+        if version is None:
+            # Seed the key, missing until the first write or after a Redis
+            # flush, so the next checks compare versions instead of fetching
+            # every value again
+            if self._redis.set(self._version_key(), 0, nx=True):
+                version = "0"
+            self._stats["redis_calls"] += 1
+        elif version == self._version:
+            return
+
+        keys = list(self._state.keys())
+        mget = getattr(self._redis, "mget_nonatomic", None) or self._redis.mget
+        redis_values = mget([self._redis_key(key) for key in keys])
+        self._stats["redis_calls"] += 1
+
+        for key, redis_value in zip(keys, redis_values):
+            if redis_value is None:
+                continue
+
+            try:
+                decoded_value = json.loads(redis_value)
+
+                # Update the in-memory value if different
+                if self._state[key].value != decoded_value:
+                    self._state[key].value = decoded_value
+                    log.info(f"Updated {key} from Redis: {decoded_value}")
+
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+        super().__setattr__("_version", version)
+
+    def get_stats(self) -> dict:
+        reads = self._stats["reads"]
+        redis_calls = self._stats["redis_calls"] if self._redis else 0
+
+        return {
+            "reads": reads,
+            "redis_calls": redis_calls,
+            # Every read used to be a Redis round trip
+            "redis_calls_saved": max(reads - redis_calls, 0) if self._redis else 0,
+        }
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -256,29 +332,24 @@ class AppConfig:
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                pipe = self._redis.pipeline()
+                pipe.set(self._redis_key(key), json.dumps(self._state[key].value))
+                pipe.incr(self._version_key())
+                _, version = pipe.execute()
+
+                # Only skip the next refresh if no other node wrote in between
+                if self._version is not None and int(version) == int(self._version) + 1:
+                    super().__setattr__("_version", str(version))
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
-
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+        self._stats["reads"] += 1
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+        # If Redis is available, check for updated values
+        if self._redis:
+            self._sync_from_redis()
 
         return self._state[key].value
 
@@ -950,6 +1021,14 @@ AZURE_STORAGE_KEY = os.environ.get("AZURE_STORAGE_KEY", None)
 UPLOAD_DIR = DATA_DIR / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Uploads are written and sent to the storage provider in chunks of this size,
+# also the chunk size of resumable uploads
+UPLOAD_CHUNK_SIZE = os.environ.get("UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024))
+try:
+    UPLOAD_CHUNK_SIZE = max(int(UPLOAD_CHUNK_SIZE), 64 * 1024)
+except ValueError:
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 ####################################
 # Cache DIR
@@ -2178,6 +2257,26 @@ if VECTOR_DB == "chroma":
     else:
         CHROMA_HTTP_HEADERS = None
     CHROMA_HTTP_SSL = os.environ.get("CHROMA_HTTP_SSL", "false").lower() == "true"
+
+# Embedded memory-mapped vector store
+MMAP_VECTOR_DATA_PATH = os.environ.get(
+    "MMAP_VECTOR_DATA_PATH", f"{DATA_DIR}/vector_db_mmap"
+)
+# float32 or float16, the latter halves disk and page cache use
+MMAP_VECTOR_DTYPE = os.environ.get("MMAP_VECTOR_DTYPE", "float32").lower()
+# Collections with more live vectors are searched through an HNSW graph if
+# hnswlib is installed
+MMAP_VECTOR_HNSW_THRESHOLD = os.environ.get("MMAP_VECTOR_HNSW_THRESHOLD", "50000")
+try:
+    MMAP_VECTOR_HNSW_THRESHOLD = int(MMAP_VECTOR_HNSW_THRESHOLD)
+except ValueError:
+    MMAP_VECTOR_HNSW_THRESHOLD = 50000
+# Share of deleted rows above which a collection is compacted
+MMAP_VECTOR_COMPACTION_RATIO = os.environ.get("MMAP_VECTOR_COMPACTION_RATIO", "0.3")
+try:
+    MMAP_VECTOR_COMPACTION_RATIO = float(MMAP_VECTOR_COMPACTION_RATIO)
+except ValueError:
+    MMAP_VECTOR_COMPACTION_RATIO = 0.3
 # this uses the model defined in the Dockerfile ENV variable. If you dont use docker or docker based deployments such as k8s, the default embedding model will be used (sentence-transformers/all-MiniLM-L6-v2)
 
 # Milvus
@@ -2766,6 +2865,86 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+# Max number of in-flight requests to the embedding engine, shared by all users
+RAG_EMBEDDING_CONCURRENT_REQUESTS = os.environ.get(
+    "RAG_EMBEDDING_CONCURRENT_REQUESTS", "8"
+)
+try:
+    RAG_EMBEDDING_CONCURRENT_REQUESTS = int(RAG_EMBEDDING_CONCURRENT_REQUESTS)
+except ValueError:
+    RAG_EMBEDDING_CONCURRENT_REQUESTS = 8
+
+# Batches are also split so that their estimated token count stays under this
+# limit (0 to only split by RAG_EMBEDDING_BATCH_SIZE)
+RAG_EMBEDDING_BATCH_MAX_TOKENS = os.environ.get(
+    "RAG_EMBEDDING_BATCH_MAX_TOKENS", "100000"
+)
+try:
+    RAG_EMBEDDING_BATCH_MAX_TOKENS = int(RAG_EMBEDDING_BATCH_MAX_TOKENS)
+except ValueError:
+    RAG_EMBEDDING_BATCH_MAX_TOKENS = 100000
+
+# Retries of embedding requests failing with 429, 5xx or connection errors
+RAG_EMBEDDING_MAX_RETRIES = os.environ.get("RAG_EMBEDDING_MAX_RETRIES", "5")
+try:
+    RAG_EMBEDDING_MAX_RETRIES = int(RAG_EMBEDDING_MAX_RETRIES)
+except ValueError:
+    RAG_EMBEDDING_MAX_RETRIES = 5
+
+# Chunks embedded and stored per step when saving documents, and steps buffered
+# between splitting, embedding and storing
+RAG_EMBEDDING_PIPELINE_BATCH_SIZE = os.environ.get(
+    "RAG_EMBEDDING_PIPELINE_BATCH_SIZE", "256"
+)
+try:
+    RAG_EMBEDDING_PIPELINE_BATCH_SIZE = max(int(RAG_EMBEDDING_PIPELINE_BATCH_SIZE), 1)
+except ValueError:
+    RAG_EMBEDDING_PIPELINE_BATCH_SIZE = 256
+
+RAG_EMBEDDING_PIPELINE_QUEUE_SIZE = os.environ.get(
+    "RAG_EMBEDDING_PIPELINE_QUEUE_SIZE", "2"
+)
+try:
+    RAG_EMBEDDING_PIPELINE_QUEUE_SIZE = max(int(RAG_EMBEDDING_PIPELINE_QUEUE_SIZE), 1)
+except ValueError:
+    RAG_EMBEDDING_PIPELINE_QUEUE_SIZE = 2
+
+# Embeddings are cached by (engine, model, url, prefix, sha256(text)) and shared
+# across files, knowledge bases and queries
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+RAG_EMBEDDING_CACHE_DIR = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DIR", f"{CACHE_DIR}/embeddings"
+)
+
+RAG_EMBEDDING_CACHE_MAX_ENTRIES = os.environ.get(
+    "RAG_EMBEDDING_CACHE_MAX_ENTRIES", "100000"
+)
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(RAG_EMBEDDING_CACHE_MAX_ENTRIES)
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 100000
+
+# Storage precision of cached vectors, "float32" or "float16" (half the size)
+RAG_EMBEDDING_CACHE_DTYPE = os.environ.get("RAG_EMBEDDING_CACHE_DTYPE", "float32")
+if RAG_EMBEDDING_CACHE_DTYPE not in ["float32", "float16"]:
+    RAG_EMBEDDING_CACHE_DTYPE = "float32"
+
+# Optional Redis tier in front of the on-disk cache, shared by all nodes
+ENABLE_RAG_EMBEDDING_CACHE_REDIS = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE_REDIS", "False").lower() == "true"
+)
+
+RAG_EMBEDDING_CACHE_REDIS_TTL = os.environ.get(
+    "RAG_EMBEDDING_CACHE_REDIS_TTL", str(60 * 60 * 24 * 7)
+)
+try:
+    RAG_EMBEDDING_CACHE_REDIS_TTL = int(RAG_EMBEDDING_CACHE_REDIS_TTL)
+except ValueError:
+    RAG_EMBEDDING_CACHE_REDIS_TTL = 60 * 60 * 24 * 7
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
@@ -3030,6 +3209,57 @@ WEB_SEARCH_TRUST_ENV = PersistentConfig(
     os.getenv("WEB_SEARCH_TRUST_ENV", "False").lower() == "true",
 )
 
+# Search results, fetched pages and their extracted text are cached and shared
+# across users, pages per their HTTP caching headers
+ENABLE_WEB_CACHE = os.environ.get("ENABLE_WEB_CACHE", "True").lower() == "true"
+
+WEB_CACHE_DIR = os.environ.get("WEB_CACHE_DIR", f"{CACHE_DIR}/web")
+
+# Size in bytes of the on-disk cache before evicting
+WEB_CACHE_MAX_SIZE = os.environ.get("WEB_CACHE_MAX_SIZE", str(512 * 1024 * 1024))
+try:
+    WEB_CACHE_MAX_SIZE = int(WEB_CACHE_MAX_SIZE)
+except ValueError:
+    WEB_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+# Optional Redis tier in front of the on-disk cache, shared by all nodes
+ENABLE_WEB_CACHE_REDIS = (
+    os.environ.get("ENABLE_WEB_CACHE_REDIS", "False").lower() == "true"
+)
+
+WEB_CACHE_REDIS_TTL = os.environ.get("WEB_CACHE_REDIS_TTL", str(60 * 60 * 24))
+try:
+    WEB_CACHE_REDIS_TTL = int(WEB_CACHE_REDIS_TTL)
+except ValueError:
+    WEB_CACHE_REDIS_TTL = 60 * 60 * 24
+
+# Seconds search results are reused (0 to disable), overridable per engine with
+# a JSON object, e.g. {"tavily": 600, "searxng": 0}
+WEB_SEARCH_CACHE_TTL = os.environ.get("WEB_SEARCH_CACHE_TTL", "3600")
+try:
+    WEB_SEARCH_CACHE_TTL = int(WEB_SEARCH_CACHE_TTL)
+except ValueError:
+    WEB_SEARCH_CACHE_TTL = 3600
+
+try:
+    WEB_SEARCH_CACHE_TTL_BY_ENGINE = json.loads(
+        os.environ.get("WEB_SEARCH_CACHE_TTL_BY_ENGINE", "{}")
+    )
+except json.JSONDecodeError:
+    WEB_SEARCH_CACHE_TTL_BY_ENGINE = {}
+
+if not isinstance(WEB_SEARCH_CACHE_TTL_BY_ENGINE, dict):
+    log.warning("WEB_SEARCH_CACHE_TTL_BY_ENGINE must be a JSON object, ignoring it")
+    WEB_SEARCH_CACHE_TTL_BY_ENGINE = {}
+
+# Seconds fetched pages without explicit expiry (Cache-Control/Expires) or
+# Last-Modified are reused before being fetched again
+WEB_LOADER_CACHE_HEURISTIC_TTL = os.environ.get("WEB_LOADER_CACHE_HEURISTIC_TTL", "300")
+try:
+    WEB_LOADER_CACHE_HEURISTIC_TTL = int(WEB_LOADER_CACHE_HEURISTIC_TTL)
+except ValueError:
+    WEB_LOADER_CACHE_HEURISTIC_TTL = 300
+
 
 OLLAMA_CLOUD_WEB_SEARCH_API_KEY = PersistentConfig(
     "OLLAMA_CLOUD_WEB_SEARCH_API_KEY",
@@ -339,6 +339,44 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Last active timestamps are buffered in memory and written in bulk once per
+# interval, an interval of 0 writes every update through immediately
+USER_LAST_ACTIVE_FLUSH_INTERVAL = (
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+    if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None
+    else 5.0
+)
+
+# How long (in seconds) authenticated users and their group memberships are
+# cached between requests, set to 0 to disable the cache
+PRINCIPAL_CACHE_TTL = os.environ.get("PRINCIPAL_CACHE_TTL", "30")
+try:
+    PRINCIPAL_CACHE_TTL = int(PRINCIPAL_CACHE_TTL)
+except ValueError:
+    PRINCIPAL_CACHE_TTL = 30
+
+# How often (in milliseconds) each node checks Redis for principal cache
+# invalidations made by other nodes
+PRINCIPAL_CACHE_SYNC_INTERVAL = os.environ.get("PRINCIPAL_CACHE_SYNC_INTERVAL", "1000")
+try:
+    PRINCIPAL_CACHE_SYNC_INTERVAL = float(PRINCIPAL_CACHE_SYNC_INTERVAL)
+    if PRINCIPAL_CACHE_SYNC_INTERVAL < 0:
+        PRINCIPAL_CACHE_SYNC_INTERVAL = 1000.0
+except ValueError:
+    PRINCIPAL_CACHE_SYNC_INTERVAL = 1000.0
+
+# How often (in milliseconds) each node checks Redis for function and valve
+# updates made by other nodes before reusing its compiled filter pipelines
+FUNCTION_VERSION_SYNC_INTERVAL = os.environ.get(
+    "FUNCTION_VERSION_SYNC_INTERVAL", "1000"
+)
+try:
+    FUNCTION_VERSION_SYNC_INTERVAL = float(FUNCTION_VERSION_SYNC_INTERVAL)
+    if FUNCTION_VERSION_SYNC_INTERVAL < 0:
+        FUNCTION_VERSION_SYNC_INTERVAL = 1000.0
+except ValueError:
+    FUNCTION_VERSION_SYNC_INTERVAL = 1000.0
+
 # Enable public visibility of active user count (when disabled, only admins can see it)
 ENABLE_PUBLIC_ACTIVE_USERS_COUNT = (
     os.environ.get("ENABLE_PUBLIC_ACTIVE_USERS_COUNT", "True").lower() == "true"
@@ -352,6 +390,20 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Streaming deltas are coalesced and written at most once per interval (seconds)
+# or every N updates, whichever comes first. An interval of 0 writes every delta.
+REALTIME_CHAT_SAVE_INTERVAL = os.environ.get("REALTIME_CHAT_SAVE_INTERVAL", "1")
+try:
+    REALTIME_CHAT_SAVE_INTERVAL = float(REALTIME_CHAT_SAVE_INTERVAL)
+except ValueError:
+    REALTIME_CHAT_SAVE_INTERVAL = 1.0
+
+REALTIME_CHAT_SAVE_MAX_UPDATES = os.environ.get("REALTIME_CHAT_SAVE_MAX_UPDATES", "100")
+try:
+    REALTIME_CHAT_SAVE_MAX_UPDATES = int(REALTIME_CHAT_SAVE_MAX_UPDATES)
+except ValueError:
+    REALTIME_CHAT_SAVE_MAX_UPDATES = 100
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
 ####################################
@@ -382,6 +434,16 @@ try:
 except ValueError:
     REDIS_SOCKET_CONNECT_TIMEOUT = None
 
+# How often (in milliseconds) each node checks Redis for config changes made by
+# other nodes. Config reads in between are served from the local snapshot.
+CONFIG_REDIS_SYNC_INTERVAL = os.environ.get("CONFIG_REDIS_SYNC_INTERVAL", "1000")
+try:
+    CONFIG_REDIS_SYNC_INTERVAL = float(CONFIG_REDIS_SYNC_INTERVAL)
+    if CONFIG_REDIS_SYNC_INTERVAL < 0:
+        CONFIG_REDIS_SYNC_INTERVAL = 1000.0
+except ValueError:
+    CONFIG_REDIS_SYNC_INTERVAL = 1000.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -396,6 +458,69 @@ except ValueError:
     UVICORN_WORKERS = 1
     log.info(f"Invalid UVICORN_WORKERS value, defaulting to {UVICORN_WORKERS}")
 
+####################################
+# INGESTION WORKERS
+####################################
+
+# Queue uploaded files for `open-webui worker` processes instead of processing
+# them in the API process
+ENABLE_INGESTION_QUEUE = (
+    os.environ.get("ENABLE_INGESTION_QUEUE", "False").lower() == "true"
+)
+
+# Number of worker processes started by `open-webui worker`
+INGESTION_WORKER_CONCURRENCY = os.environ.get("INGESTION_WORKER_CONCURRENCY", "2")
+try:
+    INGESTION_WORKER_CONCURRENCY = int(INGESTION_WORKER_CONCURRENCY)
+    if INGESTION_WORKER_CONCURRENCY < 1:
+        INGESTION_WORKER_CONCURRENCY = 1
+except ValueError:
+    INGESTION_WORKER_CONCURRENCY = 2
+
+# Seconds an idle worker waits before polling the queue again
+INGESTION_WORKER_POLL_INTERVAL = os.environ.get("INGESTION_WORKER_POLL_INTERVAL", "1")
+try:
+    INGESTION_WORKER_POLL_INTERVAL = float(INGESTION_WORKER_POLL_INTERVAL)
+except ValueError:
+    INGESTION_WORKER_POLL_INTERVAL = 1.0
+
+# Attempts per job before it is marked as failed
+INGESTION_JOB_MAX_ATTEMPTS = os.environ.get("INGESTION_JOB_MAX_ATTEMPTS", "3")
+try:
+    INGESTION_JOB_MAX_ATTEMPTS = max(int(INGESTION_JOB_MAX_ATTEMPTS), 1)
+except ValueError:
+    INGESTION_JOB_MAX_ATTEMPTS = 3
+
+# Seconds a worker may hold a job, after which the job is considered lost
+# (e.g. the worker was killed) and handed to another worker
+INGESTION_JOB_TIMEOUT = os.environ.get("INGESTION_JOB_TIMEOUT", "3600")
+try:
+    INGESTION_JOB_TIMEOUT = int(INGESTION_JOB_TIMEOUT)
+except ValueError:
+    INGESTION_JOB_TIMEOUT = 3600
+
+# Files embedded at once across all knowledge bases being reindexed
+KNOWLEDGE_REINDEX_CONCURRENCY = os.environ.get("KNOWLEDGE_REINDEX_CONCURRENCY", "4")
+try:
+    KNOWLEDGE_REINDEX_CONCURRENCY = max(int(KNOWLEDGE_REINDEX_CONCURRENCY), 1)
+except ValueError:
+    KNOWLEDGE_REINDEX_CONCURRENCY = 4
+
+# Threads running calls of vector DB clients that have no async API
+VECTOR_DB_THREAD_POOL_SIZE = os.environ.get("VECTOR_DB_THREAD_POOL_SIZE", "16")
+try:
+    VECTOR_DB_THREAD_POOL_SIZE = max(int(VECTOR_DB_THREAD_POOL_SIZE), 1)
+except ValueError:
+    VECTOR_DB_THREAD_POOL_SIZE = 16
+
+# Processes parsing web pages, splitting and extracting documents (0 to run
+# that work in threads instead)
+CPU_PROCESS_POOL_SIZE = os.environ.get("CPU_PROCESS_POOL_SIZE", "2")
+try:
+    CPU_PROCESS_POOL_SIZE = max(int(CPU_PROCESS_POOL_SIZE), 0)
+except ValueError:
+    CPU_PROCESS_POOL_SIZE = 2
+
 ####################################
 # WEBUI_AUTH (Required for security)
 ####################################
@@ -715,6 +840,89 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Seconds between background refreshes of OpenAPI tool server specs, 0 disables
+TOOL_SERVER_SPEC_REFRESH_INTERVAL = os.environ.get(
+    "TOOL_SERVER_SPEC_REFRESH_INTERVAL", "300"
+)
+try:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = float(TOOL_SERVER_SPEC_REFRESH_INTERVAL)
+except ValueError:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = 300.0
+
+# Upstream LLM/embedding traffic reuses one pooled session per upstream
+ENABLE_AIOHTTP_CLIENT_POOL = (
+    os.environ.get("ENABLE_AIOHTTP_CLIENT_POOL", "True").lower() == "true"
+)
+
+# Connections per pooled session, 0 for no limit. A cap queues requests once
+# reached, so streaming chats can block each other behind it.
+AIOHTTP_CLIENT_POOL_LIMIT = os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "0")
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(AIOHTTP_CLIENT_POOL_LIMIT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT = 0
+
+AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT", "30"
+)
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 30.0
+
+AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL", "300"
+)
+try:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = int(AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = 300
+
+# MCP tool servers keep one long-lived session per server and credentials
+ENABLE_MCP_SESSION_POOL = (
+    os.environ.get("ENABLE_MCP_SESSION_POOL", "True").lower() == "true"
+)
+
+MCP_SESSION_IDLE_TIMEOUT = os.environ.get("MCP_SESSION_IDLE_TIMEOUT", "300")
+try:
+    MCP_SESSION_IDLE_TIMEOUT = float(MCP_SESSION_IDLE_TIMEOUT)
+except ValueError:
+    MCP_SESSION_IDLE_TIMEOUT = 300.0
+
+MCP_SESSION_HEALTH_CHECK_INTERVAL = os.environ.get(
+    "MCP_SESSION_HEALTH_CHECK_INTERVAL", "60"
+)
+try:
+    MCP_SESSION_HEALTH_CHECK_INTERVAL = float(MCP_SESSION_HEALTH_CHECK_INTERVAL)
+except ValueError:
+    MCP_SESSION_HEALTH_CHECK_INTERVAL = 60.0
+
+# Backend selection when a model is served by several OLLAMA_BASE_URLS:
+# "least_outstanding", "latency" or "random"
+OLLAMA_ROUTING_STRATEGY = os.environ.get(
+    "OLLAMA_ROUTING_STRATEGY", "least_outstanding"
+).lower()
+if OLLAMA_ROUTING_STRATEGY not in ["least_outstanding", "latency", "random"]:
+    OLLAMA_ROUTING_STRATEGY = "least_outstanding"
+
+OLLAMA_ROUTING_STICKY_TTL = os.environ.get("OLLAMA_ROUTING_STICKY_TTL", "900")
+try:
+    OLLAMA_ROUTING_STICKY_TTL = int(OLLAMA_ROUTING_STICKY_TTL)
+except ValueError:
+    OLLAMA_ROUTING_STICKY_TTL = 900
+
+OLLAMA_ROUTING_EJECT_ERRORS = os.environ.get("OLLAMA_ROUTING_EJECT_ERRORS", "3")
+try:
+    OLLAMA_ROUTING_EJECT_ERRORS = int(OLLAMA_ROUTING_EJECT_ERRORS)
+except ValueError:
+    OLLAMA_ROUTING_EJECT_ERRORS = 3
+
+OLLAMA_ROUTING_EJECT_DURATION = os.environ.get("OLLAMA_ROUTING_EJECT_DURATION", "30")
+try:
+    OLLAMA_ROUTING_EJECT_DURATION = int(OLLAMA_ROUTING_EJECT_DURATION)
+except ValueError:
+    OLLAMA_ROUTING_EJECT_DURATION = 30
+
 
 ####################################
 # SENTENCE TRANSFORMERS
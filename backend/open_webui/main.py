@@ -452,6 +452,8 @@ from open_webui.env import (
     GLOBAL_LOG_LEVEL,
     MAX_BODY_LOG_SIZE,
     SAFE_MODE,
+    USER_LAST_ACTIVE_FLUSH_INTERVAL,
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL,
     VERSION,
     DEPLOYMENT_ID,
     INSTANCE_ID,
@@ -512,6 +514,15 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.session_pool import SESSION_POOL
+from open_webui.utils.tools import refresh_tool_servers
+from open_webui.utils.mcp.pool import MCP_SESSION_POOL, PooledMCPClient
+from open_webui.utils.process_pool import CPU_PROCESS_POOL
+from open_webui.utils.file_status import FILE_STATUS
+from open_webui.retrieval.reindex import (
+    REINDEX_HEARTBEAT_INTERVAL,
+    resume_interrupted_reindexes,
+)
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -567,6 +578,48 @@ https://github.com/open-webui/open-webui
 )
 
 
+async def backfill_chat_stats():
+    try:
+        count = await asyncio.to_thread(Chats.backfill_chat_stats)
+        if count:
+            log.info(f"Computed usage stats for {count} chats")
+    except Exception as e:
+        log.exception(f"Error backfilling chat stats: {e}")
+
+
+async def resume_knowledge_reindexes():
+    from open_webui.worker import get_worker_request
+
+    request = get_worker_request(app)
+    while True:
+        try:
+            user = await asyncio.to_thread(Users.get_super_admin_user)
+            if user:
+                # Runs in the background, a resumed reindex may take long
+                asyncio.create_task(resume_interrupted_reindexes(request, user))
+        except Exception as e:
+            log.exception(f"Error resuming knowledge base reindexes: {e}")
+        await asyncio.sleep(REINDEX_HEARTBEAT_INTERVAL)
+
+
+async def periodic_tool_server_refresh():
+    while True:
+        try:
+            await refresh_tool_servers(app, lock_ttl=TOOL_SERVER_SPEC_REFRESH_INTERVAL)
+        except Exception as e:
+            log.exception(f"Error refreshing tool server specs: {e}")
+        await asyncio.sleep(TOOL_SERVER_SPEC_REFRESH_INTERVAL)
+
+
+async def periodic_last_active_flush():
+    while True:
+        await asyncio.sleep(USER_LAST_ACTIVE_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(Users.flush_last_active)
+        except Exception as e:
+            log.exception(f"Error flushing last active timestamps: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.instance_id = INSTANCE_ID
@@ -597,11 +650,32 @@ async def lifespan(app: FastAPI):
             redis_task_command_listener(app)
         )
 
+        if FILE_STATUS.r is not None:
+            app.state.file_status_listener = asyncio.create_task(
+                FILE_STATUS.listen(app.state.redis)
+            )
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(backfill_chat_stats())
+    app.state.reindex_resume_task = asyncio.create_task(resume_knowledge_reindexes())
+
+    if TOOL_SERVER_SPEC_REFRESH_INTERVAL > 0:
+        app.state.tool_server_refresh_task = asyncio.create_task(
+            periodic_tool_server_refresh()
+        )
+
+    if USER_LAST_ACTIVE_FLUSH_INTERVAL:
+        app.state.last_active_flush_task = asyncio.create_task(
+            periodic_last_active_flush()
+        )
+
+    SESSION_POOL.start()
+    MCP_SESSION_POOL.start()
+    CPU_PROCESS_POOL.start()
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -629,6 +703,20 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "file_status_listener"):
+        app.state.file_status_listener.cancel()
+
+    if hasattr(app.state, "last_active_flush_task"):
+        app.state.last_active_flush_task.cancel()
+    Users.flush_last_active()
+
+    if hasattr(app.state, "reindex_resume_task"):
+        app.state.reindex_resume_task.cancel()
+
+    await SESSION_POOL.close()
+    await MCP_SESSION_POOL.close()
+    CPU_PROCESS_POOL.close()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -705,6 +793,8 @@ app.state.OPENAI_MODELS = {}
 
 app.state.config.TOOL_SERVER_CONNECTIONS = TOOL_SERVER_CONNECTIONS
 app.state.TOOL_SERVERS = []
+app.state.TOOL_SERVERS_VERSION = None
+app.state.TOOL_SERVERS_CHECKED_AT = 0.0
 
 ########################################
 #
@@ -1742,7 +1832,10 @@ async def chat_completion(
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
+                        if isinstance(client, PooledMCPClient):
+                            MCP_SESSION_POOL.release(client)
+                        else:
+                            await client.disconnect()
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
                 pass
@@ -0,0 +1,177 @@
+"""Add chat_message table
+
+Revision ID: 0525305049cd
+Revises: c440947495f3
+Create Date: 2026-01-08 10:12:43.517214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+import time
+import json
+
+# revision identifiers, used by Alembic.
+revision: str = "0525305049cd"
+down_revision: Union[str, None] = "c440947495f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("parent_id", sa.Text(), nullable=True),
+        sa.Column("role", sa.Text(), nullable=True),
+        sa.Column("message", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        # indexes
+        sa.Index("chat_message_chat_id_parent_id_idx", "chat_id", "parent_id"),
+    )
+
+    connection = op.get_bind()
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("user_id", sa.Text()),
+        sa.Column("chat", sa.JSON()),  # JSON stored as text in SQLite + PG
+    )
+
+    chat_message_table = sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("id", sa.Text()),
+        sa.Column("parent_id", sa.Text()),
+        sa.Column("role", sa.Text()),
+        sa.Column("message", sa.JSON()),
+        sa.Column("created_at", sa.BigInteger()),
+        sa.Column("updated_at", sa.BigInteger()),
+    )
+
+    # Backfill messages from the chat JSON, in batches to bound memory usage.
+    # Shared chat snapshots are left as JSON only.
+    now = int(time.time())
+    last_id = None
+    while True:
+        query = (
+            sa.select(chat_table.c.id, chat_table.c.chat)
+            .where(sa.not_(chat_table.c.user_id.like("shared-%")))
+            .order_by(chat_table.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(chat_table.c.id > last_id)
+
+        results = connection.execute(query).fetchall()
+        if not results:
+            break
+
+        rows = []
+        for chat_id, chat in results:
+            last_id = chat_id
+
+            if isinstance(chat, str):
+                try:
+                    chat = json.loads(chat)
+                except Exception:
+                    continue  # skip invalid JSON
+
+            if not isinstance(chat, dict):
+                continue
+
+            messages = (chat.get("history", {}) or {}).get("messages", {}) or {}
+            if not isinstance(messages, dict):
+                continue
+
+            for message_id, message in messages.items():
+                if not isinstance(message, dict):
+                    continue
+
+                rows.append(
+                    {
+                        "chat_id": chat_id,
+                        "id": message_id,
+                        "parent_id": message.get("parentId"),
+                        "role": message.get("role"),
+                        "message": message,
+                        "created_at": message.get("timestamp") or now,
+                        "updated_at": now,
+                    }
+                )
+
+        if rows:
+            connection.execute(chat_message_table.insert(), rows)
+
+
+def downgrade() -> None:
+    # Messages are mirrored into the chat JSON on every full chat write, fold
+    # back any message-level updates before dropping the table.
+    connection = op.get_bind()
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("chat", sa.JSON()),
+    )
+
+    chat_message_table = sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("id", sa.Text()),
+        sa.Column("message", sa.JSON()),
+    )
+
+    chat_ids = connection.execute(
+        sa.select(chat_message_table.c.chat_id).distinct()
+    ).fetchall()
+
+    for (chat_id,) in chat_ids:
+        chat = connection.execute(
+            sa.select(chat_table.c.chat).where(chat_table.c.id == chat_id)
+        ).scalar()
+
+        if isinstance(chat, str):
+            try:
+                chat = json.loads(chat)
+            except Exception:
+                continue
+
+        if not isinstance(chat, dict):
+            continue
+
+        messages = connection.execute(
+            sa.select(chat_message_table.c.id, chat_message_table.c.message).where(
+                chat_message_table.c.chat_id == chat_id
+            )
+        ).fetchall()
+
+        history = chat.get("history", {}) or {}
+        history["messages"] = {
+            **(history.get("messages", {}) or {}),
+            **{message_id: message for message_id, message in messages},
+        }
+        chat["history"] = history
+
+        connection.execute(
+            chat_table.update().where(chat_table.c.id == chat_id).values(chat=chat)
+        )
+
+    op.drop_table("chat_message")
@@ -0,0 +1,37 @@
+"""Add chat stats table
+
+Revision ID: 5f3a9d1c7b28
+Revises: e4b8c2d7a915
+Create Date: 2026-01-26 11:17:40.903126
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5f3a9d1c7b28"
+down_revision: Union[str, None] = "e4b8c2d7a915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are backfilled by the application on startup
+    op.create_table(
+        "chat_stats",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("stats", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_stats")
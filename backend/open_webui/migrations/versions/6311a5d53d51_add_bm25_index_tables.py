@@ -0,0 +1,69 @@
+"""Add BM25 index tables
+
+Revision ID: 6311a5d53d51
+Revises: 0525305049cd
+Create Date: 2026-01-12 09:41:27.104512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6311a5d53d51"
+down_revision: Union[str, None] = "0525305049cd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Indexes of existing collections are built lazily on their first search
+    op.create_table(
+        "bm25_collection",
+        sa.Column("name", sa.Text(), primary_key=True),
+        sa.Column("doc_count", sa.BigInteger(), nullable=False),
+        sa.Column("total_length", sa.BigInteger(), nullable=False),
+        sa.Column("total_meta_length", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "bm25_document",
+        sa.Column("collection_name", sa.Text(), primary_key=True),
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("meta", sa.JSON(), nullable=True),
+        sa.Column("file_id", sa.Text(), nullable=True),
+        sa.Column("hash", sa.Text(), nullable=True),
+        sa.Column("length", sa.Integer(), nullable=False),
+        sa.Column("meta_length", sa.Integer(), nullable=False),
+        # indexes
+        sa.Index(
+            "bm25_document_collection_name_file_id_idx", "collection_name", "file_id"
+        ),
+        sa.Index("bm25_document_collection_name_hash_idx", "collection_name", "hash"),
+    )
+
+    op.create_table(
+        "bm25_posting",
+        sa.Column("collection_name", sa.Text(), primary_key=True),
+        sa.Column("term", sa.Text(), primary_key=True),
+        sa.Column("document_id", sa.Text(), primary_key=True),
+        sa.Column("tf", sa.Integer(), nullable=False),
+        sa.Column("meta_tf", sa.Integer(), nullable=False),
+        # indexes
+        sa.Index(
+            "bm25_posting_collection_name_document_id_idx",
+            "collection_name",
+            "document_id",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("bm25_posting")
+    op.drop_table("bm25_document")
+    op.drop_table("bm25_collection")
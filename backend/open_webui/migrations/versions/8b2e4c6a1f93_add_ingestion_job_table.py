@@ -0,0 +1,51 @@
+"""Add ingestion job table
+
+Revision ID: 8b2e4c6a1f93
+Revises: 5f3a9d1c7b28
+Create Date: 2026-02-02 09:41:12.518304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e4c6a1f93"
+down_revision: Union[str, None] = "5f3a9d1c7b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_job",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("type", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("file_id", sa.Text(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.Text(), nullable=True),
+        sa.Column("locked_until", sa.BigInteger(), nullable=True),
+        sa.Column("run_after", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+    op.create_index(
+        "ingestion_job_status_run_after_idx",
+        "ingestion_job",
+        ["status", "run_after"],
+    )
+    op.create_index("ingestion_job_file_id_idx", "ingestion_job", ["file_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ingestion_job_file_id_idx", table_name="ingestion_job")
+    op.drop_index("ingestion_job_status_run_after_idx", table_name="ingestion_job")
+    op.drop_table("ingestion_job")
@@ -0,0 +1,38 @@
+"""Add file blob table
+
+Revision ID: 9c1e2b7f4d3a
+Revises: 6311a5d53d51
+Create Date: 2026-01-19 14:08:52.317640
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1e2b7f4d3a"
+down_revision: Union[str, None] = "6311a5d53d51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing files keep their own copy, only new uploads are deduplicated
+    op.create_table(
+        "file_blob",
+        sa.Column("hash", sa.String(), primary_key=True),
+        sa.Column("path", sa.Text(), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("ref_count", sa.BigInteger(), nullable=False),
+        # Extraction results reused by every file of the blob, stored in Storage
+        sa.Column("extraction_key", sa.Text(), nullable=True),
+        sa.Column("extraction_path", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("file_blob")
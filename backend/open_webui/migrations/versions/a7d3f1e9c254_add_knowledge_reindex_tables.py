@@ -0,0 +1,44 @@
+"""Add knowledge reindex and vector collection alias tables
+
+Revision ID: a7d3f1e9c254
+Revises: 8b2e4c6a1f93
+Create Date: 2026-02-09 14:12:37.204815
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3f1e9c254"
+down_revision: Union[str, None] = "8b2e4c6a1f93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vector_collection_alias",
+        sa.Column("name", sa.Text(), primary_key=True),
+        sa.Column("collection_name", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+
+    op.create_table(
+        "knowledge_reindex",
+        sa.Column("knowledge_id", sa.Text(), primary_key=True),
+        sa.Column("collection_name", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_files", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_reindex")
+    op.drop_table("vector_collection_alias")
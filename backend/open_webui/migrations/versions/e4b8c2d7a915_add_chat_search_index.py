@@ -0,0 +1,196 @@
+"""Add chat search index
+
+Revision ID: e4b8c2d7a915
+Revises: 9c1e2b7f4d3a
+Create Date: 2026-01-22 09:41:06.582913
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b8c2d7a915"
+down_revision: Union[str, None] = "9c1e2b7f4d3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite: an FTS5 index over chat titles and message contents. chat_fts_doc
+# holds one row per title ('' message id) or text message and is kept in sync
+# with the chat and chat_message tables by triggers, chat_fts indexes it as
+# external content. The explicit INTEGER PRIMARY KEY keeps the FTS rowids
+# stable across VACUUM.
+SQLITE_UPGRADE = [
+    """
+    CREATE TABLE chat_fts_doc (
+        id INTEGER PRIMARY KEY,
+        chat_id TEXT NOT NULL,
+        message_id TEXT NOT NULL,
+        title TEXT,
+        content TEXT,
+        UNIQUE (chat_id, message_id)
+    )
+    """,
+    """
+    CREATE TRIGGER chat_fts_doc_ai AFTER INSERT ON chat_fts_doc BEGIN
+        INSERT INTO chat_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_fts_doc_ad AFTER DELETE ON chat_fts_doc BEGIN
+        INSERT INTO chat_fts(chat_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_fts_doc_au AFTER UPDATE ON chat_fts_doc BEGIN
+        INSERT INTO chat_fts(chat_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO chat_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_ai AFTER INSERT ON chat BEGIN
+        INSERT INTO chat_fts_doc(chat_id, message_id, title)
+        VALUES (new.id, '', new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_au AFTER UPDATE OF title ON chat
+    WHEN old.title IS NOT new.title BEGIN
+        INSERT INTO chat_fts_doc(chat_id, message_id, title)
+        VALUES (new.id, '', new.title)
+        ON CONFLICT(chat_id, message_id) DO UPDATE SET title = excluded.title;
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_ad AFTER DELETE ON chat BEGIN
+        DELETE FROM chat_fts_doc WHERE chat_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER chat_message_search_ai AFTER INSERT ON chat_message BEGIN
+        INSERT INTO chat_fts_doc(chat_id, message_id, content)
+        SELECT new.chat_id, new.id, json_extract(new.message, '$.content')
+        WHERE json_type(new.message, '$.content') = 'text';
+    END
+    """,
+    """
+    CREATE TRIGGER chat_message_search_au AFTER UPDATE OF message ON chat_message
+    WHEN json_extract(old.message, '$.content')
+        IS NOT json_extract(new.message, '$.content') BEGIN
+        DELETE FROM chat_fts_doc
+        WHERE chat_id = old.chat_id AND message_id = old.id;
+        INSERT INTO chat_fts_doc(chat_id, message_id, content)
+        SELECT new.chat_id, new.id, json_extract(new.message, '$.content')
+        WHERE json_type(new.message, '$.content') = 'text';
+    END
+    """,
+    """
+    CREATE TRIGGER chat_message_search_ad AFTER DELETE ON chat_message BEGIN
+        DELETE FROM chat_fts_doc
+        WHERE chat_id = old.chat_id AND message_id = old.id;
+    END
+    """,
+    # Backfill, the chat_fts_doc triggers populate chat_fts
+    """
+    INSERT INTO chat_fts_doc(chat_id, message_id, title)
+    SELECT id, '', title FROM chat
+    """,
+    """
+    INSERT INTO chat_fts_doc(chat_id, message_id, content)
+    SELECT chat_id, id, json_extract(message, '$.content') FROM chat_message
+    WHERE json_type(message, '$.content') = 'text'
+    """,
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS chat_message_search_ad",
+    "DROP TRIGGER IF EXISTS chat_message_search_au",
+    "DROP TRIGGER IF EXISTS chat_message_search_ai",
+    "DROP TRIGGER IF EXISTS chat_search_ad",
+    "DROP TRIGGER IF EXISTS chat_search_au",
+    "DROP TRIGGER IF EXISTS chat_search_ai",
+    "DROP TABLE IF EXISTS chat_fts",
+    "DROP TABLE IF EXISTS chat_fts_doc",
+]
+
+# PostgreSQL: generated tsvector columns with GIN indexes, maintained by the
+# database on every write. Message contents with an escaped null byte cannot
+# be converted to text and are left out of the index.
+POSTGRES_UPGRADE = [
+    """
+    ALTER TABLE chat_message ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN json_typeof(message->'content') = 'string'
+                AND (message->'content')::text NOT LIKE '%\\u0000%'
+            THEN to_tsvector('simple', message->>'content')
+        END
+    ) STORED
+    """,
+    """
+    CREATE INDEX chat_message_search_vector_idx
+    ON chat_message USING GIN (search_vector)
+    """,
+    """
+    ALTER TABLE chat ADD COLUMN title_search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, ''))) STORED
+    """,
+    """
+    CREATE INDEX chat_title_search_vector_idx
+    ON chat USING GIN (title_search_vector)
+    """,
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS chat_title_search_vector_idx",
+    "ALTER TABLE chat DROP COLUMN IF EXISTS title_search_vector",
+    "DROP INDEX IF EXISTS chat_message_search_vector_idx",
+    "ALTER TABLE chat_message DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        try:
+            conn.execute(
+                sa.text(
+                    "CREATE VIRTUAL TABLE chat_fts USING fts5("
+                    "title, content, content='chat_fts_doc', content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                )
+            )
+        except sa.exc.OperationalError as e:
+            # Chat search falls back to scanning the chat JSON
+            log.warning(f"FTS5 is not available, skipping chat search index: {e}")
+            return
+
+        for statement in SQLITE_UPGRADE:
+            conn.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_UPGRADE:
+            conn.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            conn.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DOWNGRADE:
+            conn.execute(sa.text(statement))
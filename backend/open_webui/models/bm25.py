@@ -0,0 +1,373 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Integer, Text, JSON, Index, insert
+
+log = logging.getLogger(__name__)
+
+# Rows are written in batches to keep statement sizes bounded on large collections
+BATCH_SIZE = 1000
+
+####################
+# BM25 Index DB Schema
+####################
+
+
+class BM25Collection(Base):
+    __tablename__ = "bm25_collection"
+
+    name = Column(Text, primary_key=True)
+
+    doc_count = Column(BigInteger, nullable=False, default=0)
+    total_length = Column(BigInteger, nullable=False, default=0)
+    total_meta_length = Column(BigInteger, nullable=False, default=0)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
+class BM25Document(Base):
+    __tablename__ = "bm25_document"
+
+    collection_name = Column(Text, primary_key=True)
+    id = Column(Text, primary_key=True)
+
+    text = Column(Text)
+    meta = Column(JSON, nullable=True)
+
+    # Denormalized from meta, these are the filters deletes are issued with
+    file_id = Column(Text, nullable=True)
+    hash = Column(Text, nullable=True)
+
+    length = Column(Integer, nullable=False, default=0)
+    meta_length = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "bm25_document_collection_name_file_id_idx", "collection_name", "file_id"
+        ),
+        Index("bm25_document_collection_name_hash_idx", "collection_name", "hash"),
+    )
+
+
+class BM25Posting(Base):
+    __tablename__ = "bm25_posting"
+
+    collection_name = Column(Text, primary_key=True)
+    term = Column(Text, primary_key=True)
+    document_id = Column(Text, primary_key=True)
+
+    # Occurrences in the document text and in the enriched metadata text
+    tf = Column(Integer, nullable=False, default=0)
+    meta_tf = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "bm25_posting_collection_name_document_id_idx",
+            "collection_name",
+            "document_id",
+        ),
+    )
+
+
+class BM25CollectionModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+
+    doc_count: int = 0
+    total_length: int = 0
+    total_meta_length: int = 0
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class BM25DocumentModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    collection_name: str
+    id: str
+
+    text: str
+    meta: Optional[dict] = None
+
+    file_id: Optional[str] = None
+    hash: Optional[str] = None
+
+    length: int = 0
+    meta_length: int = 0
+
+
+class BM25PostingModel(BaseModel):
+    document_id: str
+    term: str
+    tf: int
+    meta_tf: int
+    length: int
+    meta_length: int
+
+
+####################
+# Forms
+####################
+
+
+class BM25DocumentForm(BaseModel):
+    id: str
+    text: str
+    meta: Optional[dict] = None
+
+    # term -> (tf, meta_tf)
+    terms: dict[str, tuple[int, int]]
+    length: int
+    meta_length: int
+
+
+class BM25IndexTable:
+    def get_collection_by_name(self, name: str) -> Optional[BM25CollectionModel]:
+        with get_db() as db:
+            try:
+                collection = db.get(BM25Collection, name)
+                return (
+                    BM25CollectionModel.model_validate(collection)
+                    if collection
+                    else None
+                )
+            except Exception:
+                return None
+
+    def insert_new_collection(
+        self, name: str, documents: list[BM25DocumentForm] = []
+    ) -> Optional[BM25CollectionModel]:
+        """
+        Create the index of a collection together with its initial documents,
+        in a single transaction so that a partially built index is never visible.
+        """
+        with get_db() as db:
+            try:
+                now = int(time.time())
+                collection = BM25Collection(
+                    name=name,
+                    doc_count=0,
+                    total_length=0,
+                    total_meta_length=0,
+                    created_at=now,
+                    updated_at=now,
+                )
+                db.add(collection)
+                db.flush()
+
+                self._insert_documents(db, name, documents)
+                db.commit()
+                db.refresh(collection)
+                return BM25CollectionModel.model_validate(collection)
+            except Exception as e:
+                # Most likely created concurrently by another worker
+                log.debug(f"Failed to create BM25 collection {name}: {e}")
+                db.rollback()
+                return None
+
+    def insert_documents(self, name: str, documents: list[BM25DocumentForm]) -> bool:
+        with get_db() as db:
+            try:
+                self._insert_documents(db, name, documents)
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Failed to index documents in {name}: {e}")
+                db.rollback()
+                return False
+
+    def _insert_documents(self, db, name: str, documents: list[BM25DocumentForm]):
+        if not documents:
+            return
+
+        document_rows = []
+        posting_rows = []
+        for doc in documents:
+            meta = doc.meta or {}
+            document_rows.append(
+                {
+                    "collection_name": name,
+                    "id": doc.id,
+                    "text": doc.text,
+                    "meta": meta,
+                    "file_id": meta.get("file_id"),
+                    "hash": meta.get("hash"),
+                    "length": doc.length,
+                    "meta_length": doc.meta_length,
+                }
+            )
+            posting_rows.extend(
+                {
+                    "collection_name": name,
+                    "term": term,
+                    "document_id": doc.id,
+                    "tf": tf,
+                    "meta_tf": meta_tf,
+                }
+                for term, (tf, meta_tf) in doc.terms.items()
+            )
+
+        for i in range(0, len(document_rows), BATCH_SIZE):
+            db.execute(insert(BM25Document), document_rows[i : i + BATCH_SIZE])
+        for i in range(0, len(posting_rows), BATCH_SIZE):
+            db.execute(insert(BM25Posting), posting_rows[i : i + BATCH_SIZE])
+
+        db.query(BM25Collection).filter_by(name=name).update(
+            {
+                "doc_count": BM25Collection.doc_count + len(documents),
+                "total_length": BM25Collection.total_length
+                + sum(doc.length for doc in documents),
+                "total_meta_length": BM25Collection.total_meta_length
+                + sum(doc.meta_length for doc in documents),
+                "updated_at": int(time.time()),
+            },
+            synchronize_session=False,
+        )
+
+    def _delete_documents(self, db, name: str, condition) -> int:
+        documents = (
+            db.query(BM25Document.id, BM25Document.length, BM25Document.meta_length)
+            .filter(BM25Document.collection_name == name, condition)
+            .all()
+        )
+        if not documents:
+            return 0
+
+        ids = [doc.id for doc in documents]
+        for i in range(0, len(ids), BATCH_SIZE):
+            batch = ids[i : i + BATCH_SIZE]
+            db.query(BM25Posting).filter(
+                BM25Posting.collection_name == name,
+                BM25Posting.document_id.in_(batch),
+            ).delete(synchronize_session=False)
+            db.query(BM25Document).filter(
+                BM25Document.collection_name == name,
+                BM25Document.id.in_(batch),
+            ).delete(synchronize_session=False)
+
+        db.query(BM25Collection).filter_by(name=name).update(
+            {
+                "doc_count": BM25Collection.doc_count - len(documents),
+                "total_length": BM25Collection.total_length
+                - sum(doc.length for doc in documents),
+                "total_meta_length": BM25Collection.total_meta_length
+                - sum(doc.meta_length for doc in documents),
+                "updated_at": int(time.time()),
+            },
+            synchronize_session=False,
+        )
+        return len(documents)
+
+    def delete_documents_by_ids(self, name: str, ids: list[str]) -> bool:
+        with get_db() as db:
+            try:
+                self._delete_documents(db, name, BM25Document.id.in_(ids))
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Failed to delete documents from {name}: {e}")
+                db.rollback()
+                return False
+
+    def delete_documents_by_file_id(self, name: str, file_id: str) -> bool:
+        with get_db() as db:
+            try:
+                self._delete_documents(db, name, BM25Document.file_id == file_id)
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Failed to delete documents from {name}: {e}")
+                db.rollback()
+                return False
+
+    def delete_documents_by_hash(self, name: str, hash: str) -> bool:
+        with get_db() as db:
+            try:
+                self._delete_documents(db, name, BM25Document.hash == hash)
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Failed to delete documents from {name}: {e}")
+                db.rollback()
+                return False
+
+    def delete_collection_by_name(self, name: str) -> bool:
+        with get_db() as db:
+            try:
+                db.query(BM25Posting).filter_by(collection_name=name).delete()
+                db.query(BM25Document).filter_by(collection_name=name).delete()
+                db.query(BM25Collection).filter_by(name=name).delete()
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Failed to delete BM25 collection {name}: {e}")
+                db.rollback()
+                return False
+
+    def delete_all_collections(self) -> bool:
+        with get_db() as db:
+            try:
+                db.query(BM25Posting).delete()
+                db.query(BM25Document).delete()
+                db.query(BM25Collection).delete()
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Failed to delete BM25 collections: {e}")
+                db.rollback()
+                return False
+
+    def get_postings_by_terms(
+        self, name: str, terms: list[str]
+    ) -> list[BM25PostingModel]:
+        if not terms:
+            return []
+
+        with get_db() as db:
+            rows = (
+                db.query(
+                    BM25Posting.document_id,
+                    BM25Posting.term,
+                    BM25Posting.tf,
+                    BM25Posting.meta_tf,
+                    BM25Document.length,
+                    BM25Document.meta_length,
+                )
+                .join(
+                    BM25Document,
+                    (BM25Document.collection_name == BM25Posting.collection_name)
+                    & (BM25Document.id == BM25Posting.document_id),
+                )
+                .filter(
+                    BM25Posting.collection_name == name,
+                    BM25Posting.term.in_(terms),
+                )
+                .all()
+            )
+            return [BM25PostingModel(**row._mapping) for row in rows]
+
+    def get_documents_by_ids(
+        self, name: str, ids: list[str]
+    ) -> list[BM25DocumentModel]:
+        if not ids:
+            return []
+
+        with get_db() as db:
+            documents = (
+                db.query(BM25Document)
+                .filter(
+                    BM25Document.collection_name == name,
+                    BM25Document.id.in_(ids),
+                )
+                .all()
+            )
+            return [BM25DocumentModel.model_validate(doc) for doc in documents]
+
+
+BM25Indexes = BM25IndexTable()
@@ -612,6 +612,26 @@ class ChannelTable:
                 for membership in memberships
             ]
 
+    def get_members_by_channel_ids(
+        self, channel_ids: list[str]
+    ) -> dict[str, list[ChannelMemberModel]]:
+        if not channel_ids:
+            return {}
+
+        with get_db() as db:
+            memberships = (
+                db.query(ChannelMember)
+                .filter(ChannelMember.channel_id.in_(channel_ids))
+                .all()
+            )
+
+            members_by_channel_id = {}
+            for membership in memberships:
+                members_by_channel_id.setdefault(membership.channel_id, []).append(
+                    ChannelMemberModel.model_validate(membership)
+                )
+            return members_by_channel_id
+
     def pin_channel(self, channel_id: str, user_id: str, is_pinned: bool) -> bool:
         with get_db() as db:
             membership = (
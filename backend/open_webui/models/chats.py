@@ -7,13 +7,21 @@ from typing import Optional
 from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
-from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from open_webui.utils.misc import (
+    get_message_list,
+    sanitize_data_for_db,
+    sanitize_text_for_db,
+)
+from open_webui.utils.message_buffer import MessageBuffer
+from open_webui.utils.redis import get_redis_client
+from open_webui.env import REALTIME_CHAT_SAVE_INTERVAL, REALTIME_CHAT_SAVE_MAX_UPDATES
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
+    Float,
     ForeignKey,
     String,
     Text,
@@ -21,7 +29,8 @@ from sqlalchemy import (
     Index,
     UniqueConstraint,
 )
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, cast
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -84,6 +93,51 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+    id = Column(Text, primary_key=True)
+    parent_id = Column(Text, nullable=True)
+    role = Column(Text, nullable=True)
+
+    message = Column(JSON, nullable=False)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        # WHERE chat_id = ... AND parent_id = ...
+        Index("chat_message_chat_id_parent_id_idx", "chat_id", "parent_id"),
+    )
+
+
+class ChatMessageModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    chat_id: str
+    id: str
+    parent_id: Optional[str] = None
+    role: Optional[str] = None
+
+    message: dict
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class ChatStats(Base):
+    __tablename__ = "chat_stats"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+
+    # Aggregates from ChatTable._compute_chat_stats, None if the chat has no
+    # current message to compute them from
+    stats = Column(JSON, nullable=True)
+
+    updated_at = Column(BigInteger, nullable=False)
+
+
 class ChatFile(Base):
     __tablename__ = "chat_file"
 
@@ -211,6 +265,17 @@ class ChatUsageStatsListResponse(BaseModel):
 
 
 class ChatTable:
+    def __init__(self):
+        # Write-behind buffer for streamed (in-flight) assistant messages
+        self.message_buffer = MessageBuffer(
+            redis_client=get_redis_client(),
+            interval=REALTIME_CHAT_SAVE_INTERVAL,
+            max_updates=REALTIME_CHAT_SAVE_MAX_UPDATES,
+        )
+
+        # Whether the full-text search index exists, checked on first search
+        self._search_index_available: Optional[bool] = None
+
     def _clean_null_bytes(self, obj):
         """Recursively remove null bytes from strings in dict/list structures."""
         return sanitize_data_for_db(obj)
@@ -238,6 +303,300 @@ class ChatTable:
 
         return changed
 
+    def _message_to_row(
+        self, chat_id: str, message_id: str, message: dict, now: int
+    ) -> dict:
+        return {
+            "chat_id": chat_id,
+            "id": message_id,
+            "parent_id": message.get("parentId"),
+            "role": message.get("role"),
+            "message": message,
+            "created_at": message.get("timestamp") or now,
+            "updated_at": now,
+        }
+
+    def _sync_chat_messages(self, db, id: str, chat: dict):
+        """
+        Mirror the messages of a full chat JSON into the chat_message table,
+        only touching the rows that actually changed.
+        """
+        messages = chat.get("history", {}).get("messages", {}) or {}
+        rows = {
+            row.id: row for row in db.query(ChatMessage).filter_by(chat_id=id).all()
+        }
+        now = int(time.time())
+
+        for message_id, message in messages.items():
+            row = rows.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatMessage(**self._message_to_row(id, message_id, message, now))
+                )
+            elif row.message != message:
+                row.message = message
+                row.parent_id = message.get("parentId")
+                row.role = message.get("role")
+                row.updated_at = now
+
+        if rows:
+            db.query(ChatMessage).filter(
+                ChatMessage.chat_id == id, ChatMessage.id.in_(list(rows.keys()))
+            ).delete(synchronize_session=False)
+
+    def _get_message_row(self, db, id: str, message_id: str) -> Optional[ChatMessage]:
+        """
+        Get a single message row, backfilling the chat's messages from its JSON
+        first if they have not been normalized yet.
+        """
+        row = db.get(ChatMessage, (id, message_id))
+        if row is not None:
+            return row
+
+        if db.query(ChatMessage.id).filter_by(chat_id=id).first() is None:
+            chat_item = db.get(Chat, id)
+            if chat_item is None or not chat_item.chat:
+                return None
+
+            self._sync_chat_messages(db, id, self._clean_null_bytes(chat_item.chat))
+            db.flush()
+            return db.get(ChatMessage, (id, message_id))
+
+        return None
+
+    def _get_messages_by_chat_ids(
+        self, db, chat_ids: list[str]
+    ) -> dict[str, dict[str, dict]]:
+        messages_by_chat_id = {}
+        if not chat_ids:
+            return messages_by_chat_id
+
+        rows = (
+            db.query(ChatMessage.chat_id, ChatMessage.id, ChatMessage.message)
+            .filter(ChatMessage.chat_id.in_(chat_ids))
+            .all()
+        )
+        for chat_id, message_id, message in rows:
+            messages_by_chat_id.setdefault(chat_id, {})[message_id] = message
+
+        return messages_by_chat_id
+
+    def _hydrate_chat(self, chat: dict, messages: dict[str, dict]) -> dict:
+        """Rebuild the legacy chat JSON shape from the normalized message rows."""
+        if not messages:
+            return chat
+
+        history = chat.get("history", {}) or {}
+        return {
+            **chat,
+            "history": {
+                **history,
+                "messages": {**(history.get("messages", {}) or {}), **messages},
+            },
+        }
+
+    def _to_chat_model(self, db, chat_item) -> ChatModel:
+        chat = ChatModel.model_validate(chat_item)
+        messages = self._get_messages_by_chat_ids(db, [chat.id]).get(chat.id)
+        chat.chat = self._hydrate_chat(chat.chat, messages)
+        return chat
+
+    def _to_chat_models(self, db, chat_items) -> list[ChatModel]:
+        chats = [ChatModel.model_validate(chat_item) for chat_item in chat_items]
+        messages_by_chat_id = self._get_messages_by_chat_ids(
+            db, [chat.id for chat in chats]
+        )
+        for chat in chats:
+            chat.chat = self._hydrate_chat(chat.chat, messages_by_chat_id.get(chat.id))
+        return chats
+
+    def _compute_chat_stats(
+        self, messages_map: dict, message_id: Optional[str]
+    ) -> Optional[dict]:
+        """
+        Aggregate the usage statistics of a chat from its message map.
+        Only sums and counts are stored so that they can be updated as single
+        messages change, averages are derived when the stats are read.
+        """
+        if not messages_map or not message_id:
+            return None
+
+        message_list = get_message_list(messages_map, message_id)
+        if not message_list:
+            return None
+
+        stats = {
+            "models": {},
+            "message_count": len(message_list),
+            "last_message_at": message_list[-1].get("timestamp", None),
+            "history_models": {},
+            "history_message_count": len(messages_map),
+            "history_user_message_count": 0,
+            "history_assistant_message_count": 0,
+            "user_content_length": 0,
+            "assistant_content_length": 0,
+            "response_time_total": 0,
+            "response_time_count": 0,
+        }
+
+        for message in messages_map.values():
+            role = message.get("role", "")
+            if role == "user":
+                stats["history_user_message_count"] += 1
+                stats["user_content_length"] += len(message.get("content") or "")
+            elif role == "assistant":
+                stats["history_assistant_message_count"] += 1
+                stats["assistant_content_length"] += len(message.get("content") or "")
+
+                model = message.get("model", None)
+                if model:
+                    stats["history_models"][model] = (
+                        stats["history_models"].get(model, 0) + 1
+                    )
+
+                user_message_id = message.get("parentId", None)
+                if user_message_id and user_message_id in messages_map:
+                    stats["response_time_total"] += message.get(
+                        "timestamp", 0
+                    ) - messages_map[user_message_id].get("timestamp", 0)
+                    stats["response_time_count"] += 1
+
+        for message in message_list:
+            if message.get("role") == "assistant":
+                model = message.get("model", None)
+                if model:
+                    stats["models"][model] = stats["models"].get(model, 0) + 1
+
+        return stats
+
+    def _save_chat_stats(self, db, id: str, chat: dict):
+        history = (chat or {}).get("history", {}) or {}
+        try:
+            stats = self._compute_chat_stats(
+                history.get("messages", {}) or {}, history.get("currentId")
+            )
+        except Exception as e:
+            log.debug(f"Failed to compute stats of chat {id}: {e}")
+            stats = None
+
+        row = db.get(ChatStats, id)
+        if row is None:
+            db.add(ChatStats(chat_id=id, stats=stats, updated_at=int(time.time())))
+        else:
+            row.stats = stats
+            row.updated_at = int(time.time())
+
+    def _refresh_chat_stats(self, db, id: str):
+        """Recompute the stats of a chat from its normalized message rows."""
+        current_id = (
+            db.query(Chat.chat["history"]["currentId"].as_string())
+            .filter_by(id=id)
+            .scalar()
+        )
+        messages = self._get_messages_by_chat_ids(db, [id]).get(id)
+        if messages is None:
+            chat_item = db.get(Chat, id)
+            chat = chat_item.chat if chat_item else {}
+        else:
+            chat = {"history": {"messages": messages, "currentId": current_id}}
+
+        self._save_chat_stats(db, id, chat)
+
+    def _set_current_message_id(self, db, id: str, message_id: str) -> bool:
+        """
+        Move the current message pointer of the chat in place, without
+        rewriting its JSON. Returns whether it moved.
+        """
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            chat = func.json_set(Chat.chat, "$.history.currentId", message_id)
+        elif dialect_name == "postgresql":
+            chat = cast(
+                func.jsonb_set(
+                    cast(Chat.chat, JSONB),
+                    cast(["history", "currentId"], ARRAY(Text)),
+                    func.to_jsonb(cast(message_id, Text)),
+                ),
+                JSON,
+            )
+        else:
+            chat_item = db.get(Chat, id)
+            if chat_item is None or not chat_item.chat:
+                return False
+
+            history = chat_item.chat.get("history") or {}
+            if history.get("currentId") == message_id:
+                return False
+
+            chat_item.chat = {
+                **chat_item.chat,
+                "history": {**history, "currentId": message_id},
+            }
+            return True
+
+        query = db.query(Chat).filter(
+            Chat.id == id,
+            Chat.chat["history"]["currentId"].as_string().is_distinct_from(message_id),
+        )
+        return bool(query.update({"chat": chat}, synchronize_session=False))
+
+    def _update_chat_stats_for_message(
+        self, db, id: str, old_message: dict, new_message: dict
+    ):
+        """
+        Apply a single message update to the stored stats. Content changes
+        (e.g. streamed responses) are applied as a delta, anything that could
+        move a message within the stats triggers a full recompute.
+        """
+        row = db.get(ChatStats, id)
+        if row is None or row.stats is None:
+            self._refresh_chat_stats(db, id)
+            return
+
+        if any(
+            old_message.get(key) != new_message.get(key)
+            for key in ("role", "model", "parentId", "timestamp")
+        ):
+            self._refresh_chat_stats(db, id)
+            return
+
+        delta = len(new_message.get("content") or "") - len(
+            old_message.get("content") or ""
+        )
+        role = new_message.get("role", "")
+        if delta and role in ("user", "assistant"):
+            stats = dict(row.stats)
+            stats[f"{role}_content_length"] += delta
+            row.stats = stats
+            row.updated_at = int(time.time())
+
+    def backfill_chat_stats(self, batch_size: int = 100) -> int:
+        """
+        Compute the stats of every chat that does not have them yet.
+        Returns the number of chats that were processed.
+        """
+        count = 0
+        while True:
+            with get_db() as db:
+                chat_ids = [
+                    chat_id
+                    for (chat_id,) in db.query(Chat.id)
+                    .outerjoin(ChatStats, ChatStats.chat_id == Chat.id)
+                    .filter(
+                        ChatStats.chat_id.is_(None),
+                        ~Chat.user_id.like("shared-%"),
+                    )
+                    .limit(batch_size)
+                    .all()
+                ]
+                if not chat_ids:
+                    return count
+
+                for chat_id in chat_ids:
+                    self._refresh_chat_stats(db, chat_id)
+                db.commit()
+                count += len(chat_ids)
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -259,6 +618,9 @@ class ChatTable:
 
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
+            db.flush()
+            self._sync_chat_messages(db, id, chat.chat)
+            self._save_chat_stats(db, id, chat.chat)
             db.commit()
             db.refresh(chat_item)
             return ChatModel.model_validate(chat_item) if chat_item else None
@@ -299,6 +661,22 @@ class ChatTable:
                 chats.append(Chat(**chat.model_dump()))
 
             db.add_all(chats)
+            db.flush()
+
+            now = int(time.time())
+            db.add_all(
+                [
+                    ChatMessage(
+                        **self._message_to_row(chat.id, message_id, message, now)
+                    )
+                    for chat in chats
+                    for message_id, message in (
+                        (chat.chat or {}).get("history", {}).get("messages", {}) or {}
+                    ).items()
+                ]
+            )
+            for chat in chats:
+                self._save_chat_stats(db, chat.id, chat.chat)
             db.commit()
             return [ChatModel.model_validate(chat) for chat in chats]
 
@@ -314,6 +692,8 @@ class ChatTable:
                 )
 
                 chat_item.updated_at = int(time.time())
+                self._sync_chat_messages(db, id, chat_item.chat)
+                self._save_chat_stats(db, id, chat_item.chat)
 
                 db.commit()
                 db.refresh(chat_item)
@@ -360,6 +740,15 @@ class ChatTable:
         return chat.chat.get("title", "New Chat")
 
     def get_messages_map_by_chat_id(self, id: str) -> Optional[dict]:
+        with get_db() as db:
+            rows = (
+                db.query(ChatMessage.id, ChatMessage.message)
+                .filter_by(chat_id=id)
+                .all()
+            )
+            if rows:
+                return {message_id: message for message_id, message in rows}
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
@@ -369,77 +758,140 @@ class ChatTable:
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            row = db.get(ChatMessage, (id, message_id))
+            message = row.message if row is not None else None
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+        if message is None:
+            chat = self.get_chat_by_id(id)
+            if chat is None:
+                return None
 
-    def upsert_message_to_chat_by_id_and_message_id(
+            message = (
+                chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            )
+
+        # Overlay updates that have not been written through yet
+        pending = self.message_buffer.get(id, message_id)
+        if pending:
+            message = {**message, **pending}
+
+        return message
+
+    def stage_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
+    ) -> Optional[dict]:
+        """
+        Buffer a partial message update and only write it through once the
+        flush budget is exhausted. Use `flush_message_to_chat_by_id_and_message_id`
+        to persist whatever is still pending when the message is complete.
+        """
+        pending = self.message_buffer.stage(id, message_id, message)
+        if pending is None:
             return None
 
-        # Sanitize message content for null characters before upserting
-        if isinstance(message.get("content"), str):
-            message["content"] = sanitize_text_for_db(message["content"])
+        return self.upsert_message_to_chat_by_id_and_message_id(id, message_id, pending)
 
-        chat = chat.chat
-        history = chat.get("history", {})
+    def flush_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str
+    ) -> Optional[dict]:
+        pending = self.message_buffer.pop(id, message_id)
+        if pending is None:
+            return None
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+        return self.upsert_message_to_chat_by_id_and_message_id(id, message_id, pending)
 
-        history["currentId"] = message_id
+    def upsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[dict]:
+        """
+        Merge `message` into a single message row and return the updated message,
+        making it the current message of the chat. Only new messages fall back
+        to rewriting the chat JSON.
+        """
+        # Direct writes supersede buffered updates, merge them to keep ordering
+        pending = self.message_buffer.pop(id, message_id)
+        if pending:
+            message = {**pending, **message}
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        # Sanitize message content for null characters before upserting
+        message = self._clean_null_bytes(message)
+
+        try:
+            with get_db() as db:
+                row = self._get_message_row(db, id, message_id)
+                if row is not None:
+                    now = int(time.time())
+
+                    previous_message = row.message
+                    row.message = {**row.message, **message}
+                    row.parent_id = row.message.get("parentId")
+                    row.role = row.message.get("role")
+                    row.updated_at = now
+
+                    # The stats follow the current branch, recompute them if it moved
+                    if self._set_current_message_id(db, id, message_id):
+                        self._refresh_chat_stats(db, id)
+                    else:
+                        self._update_chat_stats_for_message(
+                            db, id, previous_message, row.message
+                        )
+
+                    db.query(Chat).filter_by(id=id).update({"updated_at": now})
+                    db.commit()
+                    return row.message
+        except Exception as e:
+            log.exception(f"Error upserting message {message_id} of chat {id}: {e}")
+            return None
 
-    def add_message_status_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
 
         chat = chat.chat
         history = chat.get("history", {})
-
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+        history.setdefault("messages", {})[message_id] = message
+        history["currentId"] = message_id
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        self.update_chat_by_id(id, chat)
+        return message
+
+    def add_message_status_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict
+    ) -> Optional[dict]:
+        with get_db() as db:
+            row = self._get_message_row(db, id, message_id)
+            if row is None:
+                return None
+
+            now = int(time.time())
+            row.message = {
+                **row.message,
+                "statusHistory": row.message.get("statusHistory", []) + [status],
+            }
+            row.updated_at = now
+
+            db.query(Chat).filter_by(id=id).update({"updated_at": now})
+            db.commit()
+            return row.message
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
     ) -> list[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        message_files = []
+        with get_db() as db:
+            row = self._get_message_row(db, id, message_id)
+            if row is None:
+                return []
 
-        if message_id in history.get("messages", {}):
-            message_files = history["messages"][message_id].get("files", [])
-            message_files = message_files + files
-            history["messages"][message_id]["files"] = message_files
+            now = int(time.time())
+            message_files = row.message.get("files", []) + files
+            row.message = {**row.message, "files": message_files}
+            row.updated_at = now
 
-        chat["history"] = history
-        self.update_chat_by_id(id, chat)
-        return message_files
+            db.query(Chat).filter_by(id=id).update({"updated_at": now})
+            db.commit()
+            return message_files
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         with get_db() as db:
@@ -454,7 +906,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._to_chat_model(db, chat).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -488,7 +940,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._to_chat_model(db, chat).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -528,7 +980,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -540,7 +992,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -553,7 +1005,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -604,7 +1056,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_list_by_user_id(
         self,
@@ -643,7 +1095,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -701,7 +1153,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
@@ -714,7 +1166,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(db, chat_item)
         except Exception:
             return None
 
@@ -736,7 +1188,7 @@ class ChatTable:
         try:
             with get_db() as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -747,7 +1199,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id(
         self, user_id: str, skip: Optional[int] = None, limit: Optional[int] = None
@@ -770,11 +1222,99 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    "items": [ChatModel.model_validate(chat) for chat in all_chats],
+                    "items": self._to_chat_models(db, all_chats),
                     "total": total,
                 }
             )
 
+    def get_chat_usage_stats_list_by_user_id(
+        self, user_id: str, skip: Optional[int] = None, limit: Optional[int] = None
+    ) -> ChatUsageStatsListResponse:
+        """
+        Page over the precomputed stats of the user's chats without loading
+        the chat bodies. Stats missing for chats on the page are computed on
+        the fly, chats without a current message are left out.
+        """
+        with get_db() as db:
+            query = (
+                db.query(
+                    Chat.id,
+                    Chat.meta,
+                    Chat.updated_at,
+                    Chat.created_at,
+                    ChatStats.chat_id,
+                    ChatStats.stats,
+                )
+                .outerjoin(ChatStats, ChatStats.chat_id == Chat.id)
+                .filter(Chat.user_id == user_id)
+                .order_by(Chat.updated_at.desc())
+            )
+
+            total = db.query(Chat).filter_by(user_id=user_id).count()
+
+            if skip is not None:
+                query = query.offset(skip)
+            if limit is not None:
+                query = query.limit(limit)
+
+            rows = query.all()
+
+            missing_ids = [row.id for row in rows if row.chat_id is None]
+            if missing_ids:
+                for chat_id in missing_ids:
+                    self._refresh_chat_stats(db, chat_id)
+                db.commit()
+
+                stats_by_id = {
+                    chat_id: stats
+                    for chat_id, stats in db.query(
+                        ChatStats.chat_id, ChatStats.stats
+                    ).filter(ChatStats.chat_id.in_(missing_ids))
+                }
+            else:
+                stats_by_id = {}
+
+            items = []
+            for row in rows:
+                stats = row.stats if row.chat_id else stats_by_id.get(row.id)
+                if not stats or stats.get("last_message_at") is None:
+                    continue
+
+                user_count = stats["history_user_message_count"]
+                assistant_count = stats["history_assistant_message_count"]
+                items.append(
+                    ChatUsageStatsResponse(
+                        id=row.id,
+                        models=stats["models"],
+                        message_count=stats["message_count"],
+                        history_models=stats["history_models"],
+                        history_message_count=stats["history_message_count"],
+                        history_user_message_count=user_count,
+                        history_assistant_message_count=assistant_count,
+                        average_response_time=(
+                            stats["response_time_total"] / stats["response_time_count"]
+                            if stats["response_time_count"] > 0
+                            else 0
+                        ),
+                        average_user_message_content_length=(
+                            stats["user_content_length"] / user_count
+                            if user_count > 0
+                            else 0
+                        ),
+                        average_assistant_message_content_length=(
+                            stats["assistant_content_length"] / assistant_count
+                            if assistant_count > 0
+                            else 0
+                        ),
+                        tags=(row.meta or {}).get("tags", []),
+                        last_message_at=stats["last_message_at"],
+                        updated_at=row.updated_at,
+                        created_at=row.created_at,
+                    )
+                )
+
+            return ChatUsageStatsListResponse(items=items, total=total)
+
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -782,7 +1322,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -791,7 +1331,88 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
+
+    def _has_search_index(self, db) -> bool:
+        if self._search_index_available is None:
+            dialect_name = db.bind.dialect.name
+            if dialect_name == "sqlite":
+                available = db.execute(
+                    text(
+                        "SELECT 1 FROM sqlite_master "
+                        "WHERE type = 'table' AND name = 'chat_fts'"
+                    )
+                ).first()
+            elif dialect_name == "postgresql":
+                available = db.execute(
+                    text(
+                        "SELECT 1 FROM information_schema.columns "
+                        "WHERE table_name = 'chat_message' "
+                        "AND column_name = 'search_vector'"
+                    )
+                ).first()
+            else:
+                available = None
+
+            self._search_index_available = available is not None
+        return self._search_index_available
+
+    def _get_search_index_subquery(
+        self, dialect_name: str, user_id: str, words: list[str]
+    ):
+        """
+        Build a (chat_id, rank) subquery of the user's chats whose title or
+        messages contain all the words, each word matching as a prefix.
+        Higher ranks are better matches, titles weigh twice as much as messages.
+        """
+        words = [word for word in words if any(c.isalnum() for c in word)]
+        if not words:
+            return None
+
+        if dialect_name == "sqlite":
+            # bm25() is lower for better matches
+            search_query = " ".join(
+                '"' + word.replace('"', '""') + '"*' for word in words
+            )
+            sql = """
+                SELECT d.chat_id AS chat_id, -MIN(chat_fts.rank) AS rank
+                FROM chat_fts
+                JOIN chat_fts_doc AS d ON d.id = chat_fts.rowid
+                JOIN chat AS c ON c.id = d.chat_id
+                WHERE chat_fts MATCH :search_query
+                AND chat_fts.rank MATCH 'bm25(2.0, 1.0)'
+                AND c.user_id = :search_user_id
+                GROUP BY d.chat_id
+            """
+        elif dialect_name == "postgresql":
+            search_query = " & ".join(
+                "'" + word.replace("\\", "").replace("'", "''") + "':*"
+                for word in words
+            )
+            sql = """
+                SELECT matches.chat_id AS chat_id, MAX(matches.rank) AS rank
+                FROM (
+                    SELECT m.chat_id AS chat_id, ts_rank(m.search_vector, q) AS rank
+                    FROM chat_message AS m
+                    JOIN chat AS c ON c.id = m.chat_id,
+                    to_tsquery('simple', :search_query) AS q
+                    WHERE m.search_vector @@ q AND c.user_id = :search_user_id
+                    UNION ALL
+                    SELECT c.id AS chat_id, 2 * ts_rank(c.title_search_vector, q) AS rank
+                    FROM chat AS c, to_tsquery('simple', :search_query) AS q
+                    WHERE c.title_search_vector @@ q AND c.user_id = :search_user_id
+                ) AS matches
+                GROUP BY matches.chat_id
+            """
+        else:
+            return None
+
+        return (
+            text(sql)
+            .bindparams(search_query=search_query, search_user_id=user_id)
+            .columns(chat_id=String, rank=Float)
+            .subquery("search_index")
+        )
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -883,10 +1504,23 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
-
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
+
+            search_index = None
+            if search_text and self._has_search_index(db):
+                search_index = self._get_search_index_subquery(
+                    dialect_name, user_id, search_text_words
+                )
+
+            if search_index is not None:
+                # Best matches first, most recent first among equal ranks
+                query = query.join(
+                    search_index, search_index.c.chat_id == Chat.id
+                ).order_by(search_index.c.rank.desc(), Chat.updated_at.desc())
+            else:
+                query = query.order_by(Chat.updated_at.desc())
+
             if dialect_name == "sqlite":
                 # SQLite case: using JSON1 extension for JSON searching
                 sqlite_content_sql = (
@@ -897,11 +1531,13 @@ class ChatTable:
                     ")"
                 )
                 sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                if search_index is None:
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            sqlite_content_clause,
+                        ).params(title_key=f"%{search_text}%", content_key=search_text)
+                    )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -934,15 +1570,6 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
                 postgres_content_sql = """
                 EXISTS (
                     SELECT 1
@@ -954,12 +1581,25 @@ class ChatTable:
 
                 postgres_content_clause = text(postgres_content_sql)
 
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
+                if search_index is None:
+                    # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
+                    # the JSON representation for \u0000 before attempting text extraction
+
+                    # Safety filter: JSON field must not contain \u0000
+                    query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
+
+                    # Safety filter: title must not contain actual null bytes
+                    query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
+
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            postgres_content_clause,
+                        )
+                    ).params(
+                        title_key=f"%{search_text}%",
+                        content_key=search_text.lower(),
                     )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -1001,7 +1641,7 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str, skip: int = 0, limit: int = 60
@@ -1019,7 +1659,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -1034,7 +1674,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
@@ -1047,7 +1687,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -1086,7 +1726,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -1107,7 +1747,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -1193,6 +1833,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                db.query(ChatStats).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1203,6 +1845,9 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
+                if db.query(Chat.id).filter_by(id=id, user_id=user_id).first():
+                    db.query(ChatMessage).filter_by(chat_id=id).delete()
+                    db.query(ChatStats).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1215,6 +1860,16 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatStats).filter(
+                    ChatStats.chat_id.in_(
+                        select(Chat.id).where(Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1227,6 +1882,20 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatStats).filter(
+                    ChatStats.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -1347,7 +2016,7 @@ class ChatTable:
                 .all()
             )
 
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
 
 Chats = ChatTable()
@@ -50,6 +50,42 @@ class FileModel(BaseModel):
     updated_at: Optional[int]  # timestamp in epoch
 
 
+class FileBlob(Base):
+    """
+    Stored contents shared by all files with identical bytes, keyed by their
+    SHA-256 and freed when the last file referencing it is deleted.
+    """
+
+    __tablename__ = "file_blob"
+    hash = Column(String, primary_key=True)
+    path = Column(Text)
+    size = Column(BigInteger)
+    ref_count = Column(BigInteger)
+
+    # Extraction results reused by every file of the blob, stored next to it
+    # in Storage, and the loader settings they were extracted with
+    extraction_key = Column(Text, nullable=True)
+    extraction_path = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
+class FileBlobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    hash: str
+    path: Optional[str] = None
+    size: Optional[int] = None
+    ref_count: int
+
+    extraction_key: Optional[str] = None
+    extraction_path: Optional[str] = None
+
+    created_at: Optional[int]  # timestamp in epoch
+    updated_at: Optional[int]  # timestamp in epoch
+
+
 ####################
 # Forms
 ####################
@@ -285,11 +321,95 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).delete()
+                db.query(FileBlob).delete()
                 db.commit()
 
                 return True
             except Exception:
                 return False
 
+    def acquire_blob(self, hash: str, path: str, size: int) -> Optional[FileBlobModel]:
+        """
+        Add a reference to the blob of hash, creating it with path if it
+        doesn't exist yet. Returns the blob, whose path may differ from path.
+        """
+        with get_db() as db:
+            try:
+                now = int(time.time())
+                updated = (
+                    db.query(FileBlob)
+                    .filter_by(hash=hash)
+                    .update(
+                        {
+                            FileBlob.ref_count: FileBlob.ref_count + 1,
+                            FileBlob.updated_at: now,
+                        }
+                    )
+                )
+                if not updated:
+                    db.add(
+                        FileBlob(
+                            hash=hash,
+                            path=path,
+                            size=size,
+                            ref_count=1,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                    )
+                db.commit()
+                return FileBlobModel.model_validate(db.get(FileBlob, hash))
+            except Exception as e:
+                # e.g. created concurrently, the file keeps its own copy
+                log.exception(f"Error acquiring file blob: {e}")
+                return None
+
+    def release_blob(self, hash: str, path: str) -> bool:
+        """
+        Remove a reference to the blob of hash.
+        Returns True if nothing references path anymore, so it can be deleted.
+        """
+        with get_db() as db:
+            try:
+                blob = db.query(FileBlob).filter_by(hash=hash).with_for_update().first()
+                if not blob or blob.path != path:
+                    # Stored before deduplication or not shared
+                    return True
+
+                if blob.ref_count > 1:
+                    blob.ref_count -= 1
+                    blob.updated_at = int(time.time())
+                    db.commit()
+                    return False
+
+                db.delete(blob)
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Error releasing file blob: {e}")
+                return False
+
+    def get_blob_by_hash(self, hash: str) -> Optional[FileBlobModel]:
+        with get_db() as db:
+            try:
+                blob = db.get(FileBlob, hash)
+                return FileBlobModel.model_validate(blob) if blob else None
+            except Exception:
+                return None
+
+    def update_blob_extraction_by_hash(
+        self, hash: str, extraction_key: str, extraction_path: str
+    ) -> Optional[FileBlobModel]:
+        with get_db() as db:
+            try:
+                blob = db.query(FileBlob).filter_by(hash=hash).first()
+                blob.extraction_key = extraction_key
+                blob.extraction_path = extraction_path
+                blob.updated_at = int(time.time())
+                db.commit()
+                return FileBlobModel.model_validate(blob)
+            except Exception:
+                return None
+
 
 Files = FilesTable()
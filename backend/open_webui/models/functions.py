@@ -4,6 +4,7 @@ from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserModel
+from open_webui.utils.function_version import FUNCTION_VERSION
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
 
@@ -121,6 +122,7 @@ class FunctionsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                FUNCTION_VERSION.bump()
                 if result:
                     return FunctionModel.model_validate(result)
                 else:
@@ -168,6 +170,7 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                FUNCTION_VERSION.bump()
 
                 return [
                     FunctionModel.model_validate(func)
@@ -280,6 +283,7 @@ class FunctionsTable:
                 function.valves = valves
                 function.updated_at = int(time.time())
                 db.commit()
+                FUNCTION_VERSION.bump()
                 db.refresh(function)
                 return self.get_function_by_id(id)
             except Exception:
@@ -361,6 +365,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                FUNCTION_VERSION.bump()
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -375,6 +380,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                FUNCTION_VERSION.bump()
                 return True
             except Exception:
                 return None
@@ -384,6 +390,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                FUNCTION_VERSION.bump()
 
                 return True
             except Exception:
@@ -7,6 +7,7 @@ import uuid
 from open_webui.internal.db import Base, get_db
 
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.principal_cache import PRINCIPAL_CACHE
 
 
 from pydantic import BaseModel, ConfigDict
@@ -228,6 +229,17 @@ class GroupTable:
             }
 
     def get_groups_by_member_id(self, user_id: str) -> list[GroupModel]:
+        groups = PRINCIPAL_CACHE.get(
+            "groups",
+            user_id,
+            lambda: [
+                group.model_dump(mode="json")
+                for group in self._get_groups_by_member_id(user_id)
+            ],
+        )
+        return [GroupModel.model_validate(group) for group in groups]
+
+    def _get_groups_by_member_id(self, user_id: str) -> list[GroupModel]:
         with get_db() as db:
             return [
                 GroupModel.model_validate(group)
@@ -275,6 +287,7 @@ class GroupTable:
             return group_user_ids
 
     def set_group_user_ids_by_id(self, group_id: str, user_ids: list[str]) -> None:
+        previous_user_ids = self.get_group_user_ids_by_id(group_id) or []
         with get_db() as db:
             # Delete existing members
             db.query(GroupMember).filter(GroupMember.group_id == group_id).delete()
@@ -295,6 +308,8 @@ class GroupTable:
             db.add_all(new_members)
             db.commit()
 
+        PRINCIPAL_CACHE.invalidate([*previous_user_ids, *user_ids])
+
     def get_group_member_count_by_id(self, id: str) -> int:
         with get_db() as db:
             count = (
@@ -316,6 +331,7 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(self.get_group_user_ids_by_id(id))
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -323,9 +339,11 @@ class GroupTable:
 
     def delete_group_by_id(self, id: str) -> bool:
         try:
+            user_ids = self.get_group_user_ids_by_id(id)
             with get_db() as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                PRINCIPAL_CACHE.invalidate(user_ids)
                 return True
         except Exception:
             return False
@@ -333,9 +351,14 @@ class GroupTable:
     def delete_all_groups(self) -> bool:
         with get_db() as db:
             try:
+                user_ids = [
+                    user_id
+                    for (user_id,) in db.query(GroupMember.user_id).distinct().all()
+                ]
                 db.query(Group).delete()
                 db.commit()
 
+                PRINCIPAL_CACHE.invalidate(user_ids)
                 return True
             except Exception:
                 return False
@@ -362,6 +385,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([user_id])
                 return True
 
             except Exception:
@@ -453,6 +477,8 @@ class GroupTable:
                     )
 
                 db.commit()
+                if groups_to_add or groups_to_remove:
+                    PRINCIPAL_CACHE.invalidate([user_id])
                 return True
 
             except Exception as e:
@@ -492,6 +518,7 @@ class GroupTable:
                 db.commit()
                 db.refresh(group)
 
+                PRINCIPAL_CACHE.invalidate(user_ids)
                 return GroupModel.model_validate(group)
 
         except Exception as e:
@@ -521,6 +548,8 @@ class GroupTable:
 
                 db.commit()
                 db.refresh(group)
+
+                PRINCIPAL_CACHE.invalidate(user_ids)
                 return GroupModel.model_validate(group)
 
         except Exception as e:
@@ -0,0 +1,345 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import INGESTION_JOB_MAX_ATTEMPTS, INGESTION_JOB_TIMEOUT
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Index, Integer, Text, JSON
+from sqlalchemy import and_, func, or_
+
+log = logging.getLogger(__name__)
+
+####################
+# Ingestion Job DB Schema
+####################
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_job"
+
+    id = Column(Text, primary_key=True)
+    type = Column(Text, nullable=False)
+
+    user_id = Column(Text, nullable=False)
+    file_id = Column(Text, nullable=True)
+    payload = Column(JSON, nullable=True)
+
+    # queued, running, completed or failed
+    status = Column(Text, nullable=False)
+    # Higher runs first
+    priority = Column(Integer, nullable=False, default=0)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    error = Column(Text, nullable=True)
+
+    # Lease of the worker running the job
+    worker_id = Column(Text, nullable=True)
+    locked_until = Column(BigInteger, nullable=True)
+
+    # Earliest time the job may run, used to back off retries
+    run_after = Column(BigInteger, nullable=False)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ingestion_job_status_run_after_idx", "status", "run_after"),
+        Index("ingestion_job_file_id_idx", "file_id"),
+    )
+
+
+class IngestionJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    type: str
+
+    user_id: str
+    file_id: Optional[str] = None
+    payload: Optional[dict] = None
+
+    status: str
+    priority: int = 0
+
+    attempts: int = 0
+    max_attempts: int
+    error: Optional[str] = None
+
+    worker_id: Optional[str] = None
+    locked_until: Optional[int] = None
+
+    run_after: int
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class IngestionJobTable:
+    # Users whose next job is tried per claim, in case other workers claim
+    # the first ones meanwhile
+    CLAIM_CANDIDATES = 50
+
+    def insert_new_job(
+        self,
+        type: str,
+        user_id: str,
+        payload: dict,
+        file_id: Optional[str] = None,
+        priority: int = 0,
+    ) -> Optional[IngestionJobModel]:
+        now = int(time.time())
+        job = IngestionJobModel(
+            id=str(uuid.uuid4()),
+            type=type,
+            user_id=user_id,
+            file_id=file_id,
+            payload=payload,
+            status="queued",
+            priority=priority,
+            max_attempts=INGESTION_JOB_MAX_ATTEMPTS,
+            run_after=now,
+            created_at=now,
+            updated_at=now,
+        )
+
+        try:
+            with get_db() as db:
+                result = IngestionJob(**job.model_dump())
+                db.add(result)
+                db.commit()
+                db.refresh(result)
+                return IngestionJobModel.model_validate(result)
+        except Exception as e:
+            log.exception(f"Error queueing ingestion job: {e}")
+            return None
+
+    def get_job_by_id(self, id: str) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            job = db.get(IngestionJob, id)
+            return IngestionJobModel.model_validate(job) if job else None
+
+    def get_latest_job_by_file_id(self, file_id: str) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            job = (
+                db.query(IngestionJob)
+                .filter_by(file_id=file_id)
+                .order_by(IngestionJob.created_at.desc())
+                .first()
+            )
+            return IngestionJobModel.model_validate(job) if job else None
+
+    def claim_next_job(self, worker_id: str) -> Optional[IngestionJobModel]:
+        """
+        Lease the next runnable job to the worker. Every user's highest
+        priority, oldest job is a candidate. Among the highest priority
+        candidates, those of users with the fewest running jobs go first, then
+        the oldest. Running jobs whose lease expired are claimable again.
+        """
+        now = int(time.time())
+
+        with get_db() as db:
+            runnable = or_(
+                and_(IngestionJob.status == "queued", IngestionJob.run_after <= now),
+                and_(
+                    IngestionJob.status == "running",
+                    IngestionJob.locked_until < now,
+                ),
+            )
+            # Next job of every user, so one user's backlog can't crowd out
+            # the others
+            ranked = (
+                db.query(
+                    IngestionJob.id.label("id"),
+                    func.row_number()
+                    .over(
+                        partition_by=IngestionJob.user_id,
+                        order_by=(
+                            IngestionJob.priority.desc(),
+                            IngestionJob.created_at.asc(),
+                            IngestionJob.id.asc(),
+                        ),
+                    )
+                    .label("rank"),
+                )
+                .filter(runnable)
+                .subquery()
+            )
+            running = (
+                db.query(
+                    IngestionJob.user_id.label("user_id"),
+                    func.count(IngestionJob.id).label("count"),
+                )
+                .filter(
+                    IngestionJob.status == "running",
+                    IngestionJob.locked_until >= now,
+                )
+                .group_by(IngestionJob.user_id)
+                .subquery()
+            )
+            candidates = (
+                db.query(IngestionJob)
+                .join(ranked, ranked.c.id == IngestionJob.id)
+                .outerjoin(running, running.c.user_id == IngestionJob.user_id)
+                .filter(ranked.c.rank == 1)
+                .order_by(
+                    IngestionJob.priority.desc(),
+                    func.coalesce(running.c.count, 0).asc(),
+                    IngestionJob.created_at.asc(),
+                )
+                .limit(self.CLAIM_CANDIDATES)
+                .all()
+            )
+
+            for job in candidates:
+                # Compare and set, another worker may have claimed it meanwhile
+                claimed = (
+                    db.query(IngestionJob)
+                    .filter(
+                        IngestionJob.id == job.id,
+                        IngestionJob.status == job.status,
+                        IngestionJob.attempts == job.attempts,
+                    )
+                    .update(
+                        {
+                            "status": "running",
+                            "attempts": job.attempts + 1,
+                            "worker_id": worker_id,
+                            "locked_until": now + INGESTION_JOB_TIMEOUT,
+                            "updated_at": now,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+
+                if claimed:
+                    db.refresh(job)
+                    return IngestionJobModel.model_validate(job)
+
+            return None
+
+    def renew_lease(self, id: str, worker_id: str, attempts: int) -> bool:
+        """
+        Extend the lease of a job the worker is running. Returns False if the
+        lease was lost, i.e. another worker claimed the job since.
+        """
+        now = int(time.time())
+
+        with get_db() as db:
+            renewed = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.id == id,
+                    IngestionJob.status == "running",
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.attempts == attempts,
+                )
+                .update(
+                    {"locked_until": now + INGESTION_JOB_TIMEOUT, "updated_at": now},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return bool(renewed)
+
+    def complete_job(self, id: str, worker_id: str, attempts: int) -> bool:
+        """
+        Mark the job the worker claimed as completed. A no-op returning False
+        if another worker claimed it since.
+        """
+        with get_db() as db:
+            completed = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.id == id,
+                    IngestionJob.status == "running",
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.attempts == attempts,
+                )
+                .update(
+                    {
+                        "status": "completed",
+                        "error": None,
+                        "locked_until": None,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return bool(completed)
+
+    def fail_job(
+        self, id: str, worker_id: str, attempts: int, error: str
+    ) -> Optional[IngestionJobModel]:
+        """
+        Record a failed attempt of the job the worker claimed. The job is
+        queued again with exponential backoff until it runs out of attempts,
+        then it is marked as failed. A no-op returning None if another worker
+        claimed it since.
+        """
+        now = int(time.time())
+
+        with get_db() as db:
+            owned = and_(
+                IngestionJob.id == id,
+                IngestionJob.status == "running",
+                IngestionJob.worker_id == worker_id,
+                IngestionJob.attempts == attempts,
+            )
+            job = db.query(IngestionJob).filter(owned).first()
+            if not job:
+                return None
+
+            if job.attempts < job.max_attempts:
+                update = {
+                    "status": "queued",
+                    "run_after": now + 10 * 2 ** (job.attempts - 1),
+                }
+            else:
+                update = {"status": "failed"}
+
+            failed = (
+                db.query(IngestionJob)
+                .filter(owned)
+                .update(
+                    {
+                        **update,
+                        "error": error,
+                        "locked_until": None,
+                        "updated_at": now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if not failed:
+                return None
+
+            db.refresh(job)
+            return IngestionJobModel.model_validate(job)
+
+    def delete_jobs_by_file_id(self, file_id: str) -> bool:
+        with get_db() as db:
+            db.query(IngestionJob).filter_by(file_id=file_id).delete()
+            db.commit()
+            return True
+
+    def delete_finished_jobs(self, older_than: int) -> int:
+        with get_db() as db:
+            count = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.status.in_(["completed", "failed"]),
+                    IngestionJob.updated_at < older_than,
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return count
+
+
+IngestionJobs = IngestionJobTable()
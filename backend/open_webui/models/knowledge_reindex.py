@@ -0,0 +1,204 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Integer, Text, JSON
+from sqlalchemy.exc import IntegrityError
+
+log = logging.getLogger(__name__)
+
+####################
+# Knowledge Reindex DB Schema
+####################
+
+
+class KnowledgeReindex(Base):
+    """
+    Progress of rebuilding one knowledge base into a shadow collection, kept
+    so an interrupted reindex resumes into the same collection.
+    """
+
+    __tablename__ = "knowledge_reindex"
+
+    knowledge_id = Column(Text, primary_key=True)
+    collection_name = Column(Text, nullable=False)
+
+    # running, completed, failed or skipped
+    status = Column(Text, nullable=False)
+
+    total = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    failed_files = Column(JSON, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+    # Heartbeat of the process running the reindex
+    updated_at = Column(BigInteger, nullable=False)
+
+
+class KnowledgeReindexModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    knowledge_id: str
+    collection_name: str
+
+    status: str
+
+    total: int = 0
+    done: int = 0
+    failed_files: Optional[list[dict]] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class KnowledgeReindexTable:
+    def start_reindex(
+        self, knowledge_id: str, collection_name: str, total: int
+    ) -> Optional[KnowledgeReindexModel]:
+        """
+        Start a reindex of the knowledge base into collection_name. Returns
+        None if it is already being reindexed (see claim_reindex to take over
+        an interrupted one) or another process started it first.
+        """
+        now = int(time.time())
+        values = {
+            "collection_name": collection_name,
+            "status": "running",
+            "total": total,
+            "done": 0,
+            "failed_files": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        with get_db() as db:
+            reindex = db.get(KnowledgeReindex, knowledge_id)
+            try:
+                if reindex is None:
+                    db.add(KnowledgeReindex(knowledge_id=knowledge_id, **values))
+                elif reindex.status == "running":
+                    return None
+                else:
+                    # Compare-and-set on the previous run
+                    updated = (
+                        db.query(KnowledgeReindex)
+                        .filter_by(
+                            knowledge_id=knowledge_id,
+                            status=reindex.status,
+                            updated_at=reindex.updated_at,
+                        )
+                        .update(values)
+                    )
+                    if not updated:
+                        db.rollback()
+                        return None
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return None
+
+            db.expire_all()
+            return KnowledgeReindexModel.model_validate(
+                db.get(KnowledgeReindex, knowledge_id)
+            )
+
+    def claim_reindex(
+        self, knowledge_id: str, stale_before: int, total: int
+    ) -> Optional[KnowledgeReindexModel]:
+        """
+        Take over a running reindex whose heartbeat stopped before
+        stale_before, to resume it into its collection. Returns None if it
+        isn't running, is still alive, or another process claimed it first.
+        """
+        with get_db() as db:
+            reindex = db.get(KnowledgeReindex, knowledge_id)
+            if (
+                reindex is None
+                or reindex.status != "running"
+                or reindex.updated_at >= stale_before
+            ):
+                return None
+
+            # Compare-and-set on the heartbeat, only one process wins
+            updated = (
+                db.query(KnowledgeReindex)
+                .filter_by(
+                    knowledge_id=knowledge_id,
+                    status="running",
+                    updated_at=reindex.updated_at,
+                )
+                .update({"total": total, "updated_at": int(time.time())})
+            )
+            db.commit()
+            if not updated:
+                return None
+
+            db.expire_all()
+            return KnowledgeReindexModel.model_validate(
+                db.get(KnowledgeReindex, knowledge_id)
+            )
+
+    def heartbeat(self, knowledge_id: str) -> bool:
+        with get_db() as db:
+            updated = (
+                db.query(KnowledgeReindex)
+                .filter_by(knowledge_id=knowledge_id, status="running")
+                .update({"updated_at": int(time.time())})
+            )
+            db.commit()
+            return bool(updated)
+
+    def get_reindex_by_knowledge_id(
+        self, knowledge_id: str
+    ) -> Optional[KnowledgeReindexModel]:
+        with get_db() as db:
+            reindex = db.get(KnowledgeReindex, knowledge_id)
+            return KnowledgeReindexModel.model_validate(reindex) if reindex else None
+
+    def get_reindexes(self) -> list[KnowledgeReindexModel]:
+        with get_db() as db:
+            return [
+                KnowledgeReindexModel.model_validate(reindex)
+                for reindex in db.query(KnowledgeReindex).all()
+            ]
+
+    def get_stale_running_reindexes(
+        self, older_than: int
+    ) -> list[KnowledgeReindexModel]:
+        with get_db() as db:
+            return [
+                KnowledgeReindexModel.model_validate(reindex)
+                for reindex in db.query(KnowledgeReindex)
+                .filter(
+                    KnowledgeReindex.status == "running",
+                    KnowledgeReindex.updated_at < older_than,
+                )
+                .all()
+            ]
+
+    def update_progress(
+        self, knowledge_id: str, done: int, failed_files: list[dict]
+    ) -> bool:
+        with get_db() as db:
+            db.query(KnowledgeReindex).filter_by(knowledge_id=knowledge_id).update(
+                {
+                    "done": done,
+                    "failed_files": failed_files,
+                    "updated_at": int(time.time()),
+                }
+            )
+            db.commit()
+            return True
+
+    def finish_reindex(self, knowledge_id: str, status: str) -> bool:
+        with get_db() as db:
+            db.query(KnowledgeReindex).filter_by(knowledge_id=knowledge_id).update(
+                {"status": status, "updated_at": int(time.time())}
+            )
+            db.commit()
+            return True
+
+
+KnowledgeReindexes = KnowledgeReindexTable()
@@ -200,6 +200,82 @@ class MessageTable:
                 }
             )
 
+    def _get_reply_to_responses(
+        self, db, messages: list[Message]
+    ) -> list[MessageReplyToResponse]:
+        """
+        Attach the replied-to message (and its author) to each message using one
+        query for the referenced messages and one for their authors.
+        """
+        reply_to_ids = {m.reply_to_id for m in messages if m.reply_to_id}
+
+        reply_to_messages = {}
+        if reply_to_ids:
+            reply_to_messages = {
+                message.id: message
+                for message in db.query(Message)
+                .filter(Message.id.in_(reply_to_ids))
+                .all()
+            }
+
+        users = {}
+        author_ids = {m.user_id for m in reply_to_messages.values()}
+        if author_ids:
+            users = {
+                user.id: user
+                for user in db.query(User).filter(User.id.in_(author_ids)).all()
+            }
+
+        responses = []
+        for message in messages:
+            reply_to_message = reply_to_messages.get(message.reply_to_id)
+            reply_to_user = (
+                users.get(reply_to_message.user_id) if reply_to_message else None
+            )
+            responses.append(
+                MessageReplyToResponse.model_validate(
+                    {
+                        **MessageModel.model_validate(message).model_dump(),
+                        "reply_to_message": (
+                            {
+                                **MessageModel.model_validate(
+                                    reply_to_message
+                                ).model_dump(),
+                                "user": (
+                                    {
+                                        "id": reply_to_user.id,
+                                        "name": reply_to_user.name,
+                                        "role": reply_to_user.role,
+                                    }
+                                    if reply_to_user
+                                    else None
+                                ),
+                            }
+                            if reply_to_message
+                            else None
+                        ),
+                    }
+                )
+            )
+        return responses
+
+    def _apply_cursor(self, query, cursor: Optional[str]):
+        """
+        Restrict a created_at/id descending query to rows strictly older than
+        the cursor, formatted as "<created_at>:<id>" of the last row seen.
+        """
+        if not cursor:
+            return query
+
+        created_at, _, id = cursor.partition(":")
+        created_at = int(created_at)
+        return query.filter(
+            or_(
+                Message.created_at < created_at,
+                and_(Message.created_at == created_at, Message.id < id),
+            )
+        )
+
     def get_thread_replies_by_message_id(self, id: str) -> list[MessageReplyToResponse]:
         with get_db() as db:
             all_messages = (
@@ -209,26 +285,7 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._get_reply_to_responses(db, all_messages)
 
     def get_reply_user_ids_by_message_id(self, id: str) -> list[str]:
         with get_db() as db:
@@ -238,41 +295,31 @@ class MessageTable:
             ]
 
     def get_messages_by_channel_id(
-        self, channel_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> list[MessageReplyToResponse]:
         with get_db() as db:
+            query = db.query(Message).filter_by(channel_id=channel_id, parent_id=None)
             all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
+                self._apply_cursor(query, cursor)
+                .order_by(Message.created_at.desc(), Message.id.desc())
                 .offset(skip)
                 .limit(limit)
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._get_reply_to_responses(db, all_messages)
 
     def get_messages_by_parent_id(
-        self, channel_id: str, parent_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        parent_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> list[MessageReplyToResponse]:
         with get_db() as db:
             message = db.get(Message, parent_id)
@@ -280,10 +327,12 @@ class MessageTable:
             if not message:
                 return []
 
+            query = db.query(Message).filter_by(
+                channel_id=channel_id, parent_id=parent_id
+            )
             all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=parent_id)
-                .order_by(Message.created_at.desc())
+                self._apply_cursor(query, cursor)
+                .order_by(Message.created_at.desc(), Message.id.desc())
                 .offset(skip)
                 .limit(limit)
                 .all()
@@ -293,26 +342,7 @@ class MessageTable:
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._get_reply_to_responses(db, all_messages)
 
     def get_last_message_by_channel_id(self, channel_id: str) -> Optional[MessageModel]:
         with get_db() as db:
@@ -324,6 +354,21 @@ class MessageTable:
             )
             return MessageModel.model_validate(message) if message else None
 
+    def get_last_message_at_by_channel_ids(
+        self, channel_ids: list[str]
+    ) -> dict[str, int]:
+        if not channel_ids:
+            return {}
+
+        with get_db() as db:
+            rows = (
+                db.query(Message.channel_id, func.max(Message.created_at))
+                .filter(Message.channel_id.in_(channel_ids))
+                .group_by(Message.channel_id)
+                .all()
+            )
+            return {channel_id: created_at for channel_id, created_at in rows}
+
     def get_pinned_messages_by_channel_id(
         self, channel_id: str, skip: int = 0, limit: int = 50
     ) -> list[MessageModel]:
@@ -382,6 +427,64 @@ class MessageTable:
                 query = query.filter(Message.user_id != user_id)
             return query.count()
 
+    def get_unread_message_counts_by_channel_ids(
+        self, channel_ids: list[str], user_id: str
+    ) -> dict[str, int]:
+        """
+        Unread top-level message counts for every channel the user is a member
+        of, relative to each membership's last_read_at. Channels without a
+        membership are omitted.
+        """
+        if not channel_ids:
+            return {}
+
+        with get_db() as db:
+            rows = (
+                db.query(Message.channel_id, func.count(Message.id))
+                .join(
+                    ChannelMember,
+                    and_(
+                        ChannelMember.channel_id == Message.channel_id,
+                        ChannelMember.user_id == user_id,
+                    ),
+                )
+                .filter(
+                    Message.channel_id.in_(channel_ids),
+                    Message.parent_id == None,  # only count top-level messages
+                    Message.created_at > func.coalesce(ChannelMember.last_read_at, 0),
+                    Message.user_id != user_id,
+                )
+                .group_by(Message.channel_id)
+                .all()
+            )
+            return {channel_id: count for channel_id, count in rows}
+
+    def get_thread_reply_stats_by_message_ids(
+        self, ids: list[str]
+    ) -> dict[str, tuple[int, Optional[int]]]:
+        """
+        Map each message id to (reply_count, latest_reply_at) in one grouped
+        query. Messages without replies are omitted.
+        """
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            rows = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
+                )
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: (count, latest_reply_at)
+                for parent_id, count, latest_reply_at in rows
+            }
+
     def add_reaction_to_message(
         self, id: str, user_id: str, name: str
     ) -> Optional[MessageReactionModel]:
@@ -439,6 +542,44 @@ class MessageTable:
 
             return [Reactions(**reaction) for reaction in reactions.values()]
 
+    def get_reactions_by_message_ids(
+        self, ids: list[str]
+    ) -> dict[str, list[Reactions]]:
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            results = (
+                db.query(MessageReaction, User.id, User.name)
+                .join(User, MessageReaction.user_id == User.id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at.asc())
+                .all()
+            )
+
+            reactions_by_message_id = {}
+            for reaction, user_id, user_name in results:
+                reactions = reactions_by_message_id.setdefault(reaction.message_id, {})
+                if reaction.name not in reactions:
+                    reactions[reaction.name] = {
+                        "name": reaction.name,
+                        "users": [],
+                        "count": 0,
+                    }
+
+                reactions[reaction.name]["users"].append(
+                    {
+                        "id": user_id,
+                        "name": user_name,
+                    }
+                )
+                reactions[reaction.name]["count"] += 1
+
+            return {
+                message_id: [Reactions(**reaction) for reaction in reactions.values()]
+                for message_id, reactions in reactions_by_message_id.items()
+            }
+
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str
     ) -> bool:
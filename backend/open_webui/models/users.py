@@ -1,16 +1,18 @@
 import time
+import logging
+import threading
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import USER_LAST_ACTIVE_FLUSH_INTERVAL
 
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
-from open_webui.utils.misc import throttle
+from open_webui.utils.principal_cache import PRINCIPAL_CACHE
 
 
 from pydantic import BaseModel, ConfigDict
@@ -25,12 +27,15 @@ from sqlalchemy import (
     exists,
     select,
     cast,
+    update,
 )
 from sqlalchemy import or_, case
 from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
 
+log = logging.getLogger(__name__)
+
 ####################
 # User DB Schema
 ####################
@@ -235,6 +240,12 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    def __init__(self):
+        # Pending last active timestamps by user id, written in bulk by
+        # flush_last_active()
+        self._last_active: dict[str, int] = {}
+        self._last_active_lock = threading.Lock()
+
     def insert_new_user(
         self,
         id: str,
@@ -275,6 +286,22 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_cached_user_by_id(self, id: str) -> Optional[UserModel]:
+        """
+        Same as get_user_by_id but served from the principal cache, meant for
+        resolving the authenticated user on every request.
+        """
+        user = PRINCIPAL_CACHE.get(
+            "user",
+            id,
+            lambda: (
+                user.model_dump(mode="json")
+                if (user := self.get_user_by_id(id))
+                else None
+            ),
+        )
+        return UserModel.model_validate(user) if user else None
+
     def get_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -513,6 +540,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -527,6 +555,7 @@ class UsersTable:
                     {**form_data.model_dump(exclude_none=True)}
                 )
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -542,25 +571,50 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
             return None
 
-    @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
-    def update_last_active_by_id(self, id: str) -> Optional[UserModel]:
+    def update_last_active_by_id(self, id: str) -> None:
+        with self._last_active_lock:
+            self._last_active[id] = int(time.time())
+
+        if not USER_LAST_ACTIVE_FLUSH_INTERVAL:
+            self.flush_last_active()
+
+    def flush_last_active(self) -> int:
+        """
+        Write the buffered last active timestamps with a single bulk UPDATE.
+        Returns the number of users updated.
+        """
+        with self._last_active_lock:
+            pending, self._last_active = self._last_active, {}
+
+        if not pending:
+            return 0
+
         try:
             with get_db() as db:
-                db.query(User).filter_by(id=id).update(
-                    {"last_active_at": int(time.time())}
+                db.execute(
+                    update(User),
+                    [
+                        {"id": id, "last_active_at": last_active_at}
+                        for id, last_active_at in pending.items()
+                    ],
                 )
                 db.commit()
+            return len(pending)
+        except Exception as e:
+            log.exception(f"Failed to flush last active timestamps: {e}")
 
-                user = db.query(User).filter_by(id=id).first()
-                return UserModel.model_validate(user)
-        except Exception:
-            return None
+            # Keep the timestamps for the next flush unless newer ones arrived
+            with self._last_active_lock:
+                for id, last_active_at in pending.items():
+                    self._last_active.setdefault(id, last_active_at)
+            return 0
 
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str
@@ -588,6 +642,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
 
                 return UserModel.model_validate(user)
 
@@ -599,6 +654,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -619,6 +675,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -637,6 +694,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                PRINCIPAL_CACHE.invalidate([id])
 
                 return True
             else:
@@ -714,5 +772,21 @@ class UsersTable:
                 return user.last_active_at >= three_minutes_ago
             return False
 
+    def get_active_user_ids(self, user_ids: list[str]) -> set[str]:
+        if not user_ids:
+            return set()
+
+        with get_db() as db:
+            three_minutes_ago = int(time.time()) - 180
+            return {
+                id
+                for (id,) in db.query(User.id)
+                .filter(
+                    User.id.in_(user_ids),
+                    User.last_active_at >= three_minutes_ago,
+                )
+                .all()
+            }
+
 
 Users = UsersTable()
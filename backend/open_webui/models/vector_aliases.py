@@ -0,0 +1,69 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from sqlalchemy import BigInteger, Column, Text
+
+log = logging.getLogger(__name__)
+
+####################
+# Vector Collection Alias DB Schema
+####################
+
+
+class VectorCollectionAlias(Base):
+    """
+    Logical vector DB collection name (e.g. a knowledge base id) served by a
+    differently named physical collection, e.g. one rebuilt by a reindex.
+    """
+
+    __tablename__ = "vector_collection_alias"
+
+    name = Column(Text, primary_key=True)
+    collection_name = Column(Text, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+
+class VectorCollectionAliasTable:
+    def get_aliases(self) -> dict[str, str]:
+        with get_db() as db:
+            return {
+                alias.name: alias.collection_name
+                for alias in db.query(VectorCollectionAlias).all()
+            }
+
+    def set_alias(self, name: str, collection_name: str) -> Optional[str]:
+        """Point name at collection_name, returns the previous collection."""
+        with get_db() as db:
+            alias = db.get(VectorCollectionAlias, name)
+            previous = alias.collection_name if alias else None
+
+            if alias:
+                alias.collection_name = collection_name
+                alias.updated_at = int(time.time())
+            else:
+                db.add(
+                    VectorCollectionAlias(
+                        name=name,
+                        collection_name=collection_name,
+                        updated_at=int(time.time()),
+                    )
+                )
+            db.commit()
+            return previous
+
+    def delete_alias(self, name: str) -> bool:
+        with get_db() as db:
+            db.query(VectorCollectionAlias).filter_by(name=name).delete()
+            db.commit()
+            return True
+
+    def delete_all_aliases(self) -> bool:
+        with get_db() as db:
+            db.query(VectorCollectionAlias).delete()
+            db.commit()
+            return True
+
+
+VectorCollectionAliases = VectorCollectionAliasTable()
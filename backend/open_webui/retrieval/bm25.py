@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import math
+from collections import Counter, defaultdict
+from typing import Any, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from open_webui.models.bm25 import (
+    BM25CollectionModel,
+    BM25DocumentForm,
+    BM25Indexes,
+)
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import GetResult
+
+log = logging.getLogger(__name__)
+
+# Okapi BM25 parameters, same defaults as rank_bm25 (used by BM25Retriever)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Longer tokens (base64 blobs, minified code...) are not indexed, they would
+# exceed btree key limits and are never matched by a query anyway
+MAX_TERM_LENGTH = 256
+
+
+def tokenize(text: str) -> list[str]:
+    # Same preprocessing as BM25Retriever's default
+    return [term for term in text.split() if len(term) <= MAX_TERM_LENGTH]
+
+
+def get_enriched_metadata_text(metadata: dict) -> str:
+    metadata_parts = []
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+def get_bm25_document(id: str, text: str, metadata: Optional[dict]) -> BM25DocumentForm:
+    text = text or ""
+    metadata = metadata or {}
+
+    text_terms = Counter(tokenize(text))
+    meta_terms = Counter(tokenize(get_enriched_metadata_text(metadata)))
+
+    return BM25DocumentForm(
+        id=id,
+        text=text,
+        meta=metadata,
+        terms={
+            term: (text_terms.get(term, 0), meta_terms.get(term, 0))
+            for term in text_terms.keys() | meta_terms.keys()
+        },
+        length=sum(text_terms.values()),
+        meta_length=sum(meta_terms.values()),
+    )
+
+
+####################################
+#
+# Index maintenance
+#
+####################################
+
+
+class BM25Index:
+    """
+    Keeps the BM25 index in step with the vector database, every method
+    mirrors the VECTOR_DB_CLIENT write operation of the same name.
+    Failures are logged and never raised, a stale index only degrades ranking.
+    """
+
+    def insert(self, collection_name: str, items: list[dict], new: bool = False):
+        """
+        Collections created before the index existed are not indexed
+        incrementally, they get built in full from the vector database the
+        first time they are searched instead (see get_bm25_index).
+
+        :param new: The vector collection was just created by this write
+        """
+        try:
+            documents = [
+                get_bm25_document(item["id"], item.get("text"), item.get("metadata"))
+                for item in items
+            ]
+
+            if BM25Indexes.get_collection_by_name(collection_name):
+                BM25Indexes.insert_documents(collection_name, documents)
+            elif new:
+                BM25Indexes.insert_new_collection(collection_name, documents)
+        except Exception as e:
+            log.exception(f"Failed to update BM25 index of {collection_name}: {e}")
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if ids:
+            BM25Indexes.delete_documents_by_ids(collection_name, ids)
+        elif filter and filter.keys() == {"file_id"}:
+            BM25Indexes.delete_documents_by_file_id(collection_name, filter["file_id"])
+        elif filter and filter.keys() == {"hash"}:
+            BM25Indexes.delete_documents_by_hash(collection_name, filter["hash"])
+        else:
+            # Anything the index can't evaluate drops it, it is rebuilt on next search
+            BM25Indexes.delete_collection_by_name(collection_name)
+
+    def delete_collection(self, collection_name: str):
+        BM25Indexes.delete_collection_by_name(collection_name)
+
+    def reset(self):
+        BM25Indexes.delete_all_collections()
+
+
+BM25_INDEX = BM25Index()
+
+
+####################################
+#
+# Search
+#
+####################################
+
+
+def build_bm25_index(
+    collection_name: str, result: Optional[GetResult]
+) -> Optional[BM25CollectionModel]:
+    if result is None or not result.ids:
+        return None
+
+    documents = [
+        get_bm25_document(id, result.documents[0][idx], result.metadatas[0][idx])
+        for idx, id in enumerate(result.ids[0])
+    ]
+
+    collection = BM25Indexes.insert_new_collection(collection_name, documents)
+    if collection is None:
+        # Built concurrently by another request
+        collection = BM25Indexes.get_collection_by_name(collection_name)
+    return collection
+
+
+def get_bm25_index(collection_name: str) -> Optional[BM25CollectionModel]:
+    """
+    Return the index of a collection, building it from the vector database on
+    first use. Returns None if the collection does not exist.
+    """
+    collection = BM25Indexes.get_collection_by_name(collection_name)
+    if collection:
+        return collection
+
+    log.info(f"Building BM25 index for collection {collection_name}")
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    return build_bm25_index(collection_name, result)
+
+
+async def aget_bm25_index(collection_name: str) -> Optional[BM25CollectionModel]:
+    """
+    Async counterpart of get_bm25_index for callers on the event loop, the
+    database work runs in a worker thread.
+    """
+    collection = await asyncio.to_thread(
+        BM25Indexes.get_collection_by_name, collection_name
+    )
+    if collection:
+        return collection
+
+    log.info(f"Building BM25 index for collection {collection_name}")
+    result = await VECTOR_DB_CLIENT.aget(collection_name=collection_name)
+    return await asyncio.to_thread(build_bm25_index, collection_name, result)
+
+
+def search_bm25_index(
+    collection: BM25CollectionModel,
+    query: str,
+    k: int,
+    enriched: bool = False,
+) -> list[Document]:
+    """
+    Score the documents of an index against a query with Okapi BM25.
+    Only the postings of the query terms are read from the database.
+    """
+    if collection.doc_count <= 0:
+        return []
+
+    query_terms = tokenize(query)
+    postings = BM25Indexes.get_postings_by_terms(
+        collection.name, list(set(query_terms))
+    )
+
+    total_length = collection.total_length + (
+        collection.total_meta_length if enriched else 0
+    )
+    avgdl = total_length / collection.doc_count or 1
+
+    term_frequencies = defaultdict(dict)
+    for posting in postings:
+        tf = posting.tf + (posting.meta_tf if enriched else 0)
+        if tf > 0:
+            length = posting.length + (posting.meta_length if enriched else 0)
+            term_frequencies[posting.term][posting.document_id] = (tf, length)
+
+    scores = defaultdict(float)
+    for term in query_terms:
+        frequencies = term_frequencies.get(term)
+        if not frequencies:
+            continue
+
+        df = len(frequencies)
+        idf = math.log(1 + (collection.doc_count - df + 0.5) / (df + 0.5))
+        for document_id, (tf, length) in frequencies.items():
+            scores[document_id] += (
+                idf
+                * (tf * (BM25_K1 + 1))
+                / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl))
+            )
+
+    top_ids = sorted(scores, key=scores.get, reverse=True)[:k]
+    documents = {
+        doc.id: doc
+        for doc in BM25Indexes.get_documents_by_ids(collection.name, top_ids)
+    }
+
+    return [
+        Document(page_content=documents[id].text, metadata=documents[id].meta or {})
+        for id in top_ids
+        if id in documents
+    ]
+
+
+class BM25IndexRetriever(BaseRetriever):
+    collection: Any
+    k: int
+    enriched: bool = False
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return search_bm25_index(
+            self.collection, query, k=self.k, enriched=self.enriched
+        )
@@ -0,0 +1,135 @@
+"""
+CPU-bound document processing, run in CPU_PROCESS_POOL worker processes.
+
+Workers import this module on their own, so it must stay cheap to import (no
+app config or database). Documents are passed as (page_content, metadata)
+tuples rather than Document objects.
+"""
+
+from typing import Optional
+
+# Header levels the markdown_header splitter splits on, and their metadata keys
+MARKDOWN_HEADERS = [
+    ("#", "Header 1"),
+    ("##", "Header 2"),
+    ("###", "Header 3"),
+    ("####", "Header 4"),
+    ("#####", "Header 5"),
+    ("######", "Header 6"),
+]
+
+
+def split_texts(docs: list[tuple[str, dict]], splitter: dict) -> list[tuple[str, dict]]:
+    """
+    Split docs into chunks.
+
+    :param splitter: {"type": "character" | "token" | "markdown_header",
+        "chunk_size", "chunk_overlap", "encoding_name"}
+    """
+    from langchain_core.documents import Document
+    from langchain_text_splitters import (
+        MarkdownHeaderTextSplitter,
+        RecursiveCharacterTextSplitter,
+        TokenTextSplitter,
+    )
+
+    documents = [
+        Document(page_content=page_content, metadata=metadata)
+        for page_content, metadata in docs
+    ]
+
+    if splitter["type"] == "token":
+        text_splitter = TokenTextSplitter(
+            encoding_name=splitter["encoding_name"],
+            chunk_size=splitter["chunk_size"],
+            chunk_overlap=splitter["chunk_overlap"],
+            add_start_index=True,
+        )
+    else:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=splitter["chunk_size"],
+            chunk_overlap=splitter["chunk_overlap"],
+            add_start_index=True,
+        )
+
+    if splitter["type"] != "markdown_header":
+        return [
+            (chunk.page_content, chunk.metadata)
+            for chunk in text_splitter.split_documents(documents)
+        ]
+
+    markdown_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=MARKDOWN_HEADERS,
+        strip_headers=False,  # Keep headers in content for context
+    )
+
+    chunks = []
+    for doc in documents:
+        md_header_splits = markdown_splitter.split_text(doc.page_content)
+        md_header_splits = text_splitter.split_documents(md_header_splits)
+
+        # Preserve the original metadata, plus the headings of the chunk in order
+        for split_chunk in md_header_splits:
+            headings_list = [
+                split_chunk.metadata[header_meta_key_name]
+                for _, header_meta_key_name in MARKDOWN_HEADERS
+                if header_meta_key_name in split_chunk.metadata
+            ]
+            chunks.append(
+                (split_chunk.page_content, {**doc.metadata, "headings": headings_list})
+            )
+
+    return chunks
+
+
+def parse_html_pages(
+    pages: list[tuple[str, str]],
+    parser: Optional[str],
+    default_parser: str,
+    bs_kwargs: dict,
+    get_text_kwargs: dict,
+) -> list[tuple[str, dict]]:
+    """
+    Extract the text, title, description and language of fetched pages.
+
+    :param pages: (url, html) of each page
+    :param parser: BeautifulSoup parser, by default "xml" for .xml urls and
+        default_parser otherwise
+    """
+    from bs4 import BeautifulSoup
+
+    docs = []
+    for url, html in pages:
+        soup = BeautifulSoup(
+            html,
+            parser or ("xml" if url.endswith(".xml") else default_parser),
+            **bs_kwargs,
+        )
+
+        metadata = {"source": url}
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text()
+        if description := soup.find("meta", attrs={"name": "description"}):
+            metadata["description"] = description.get(
+                "content", "No description found."
+            )
+        if html_tag := soup.find("html"):
+            metadata["language"] = html_tag.get("lang", "No language found.")
+
+        docs.append((soup.get_text(**get_text_kwargs), metadata))
+
+    return docs
+
+
+def extract_file(
+    loader_kwargs: dict, filename: str, file_content_type: str, file_path: str
+) -> list[tuple[str, dict]]:
+    """Extract a local file with Loader, see Loader.load."""
+    from open_webui.retrieval.loaders.main import Loader
+
+    return [
+        (doc.page_content, doc.metadata)
+        for doc in Loader(**loader_kwargs).lazy_load(
+            filename, file_content_type, file_path
+        )
+    ]
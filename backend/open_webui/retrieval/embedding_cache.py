@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    ENABLE_RAG_EMBEDDING_CACHE_REDIS,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_DTYPE,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_EMBEDDING_CACHE_REDIS_TTL,
+)
+from open_webui.retrieval.tiered_cache import TieredCache, create_cache
+
+log = logging.getLogger(__name__)
+
+
+class EmbeddingCache(TieredCache):
+    """
+    Content-addressed cache of embedding vectors, stored as raw float32/float16
+    bytes prefixed with their dtype. The disk tier holds up to max_entries
+    vectors.
+    """
+
+    name = "embedding"
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100000,
+        dtype: str = "float32",
+        redis_client=None,
+        redis_ttl: int = 60 * 60 * 24 * 7,
+    ):
+        """
+        :param path: SQLite database file
+        :param max_entries: Number of vectors kept on disk before evicting
+        :param dtype: Storage precision of new entries, "float32" or "float16"
+        :param redis_client: Redis client instance (decode_responses=False) or None
+        :param redis_ttl: Expiry of entries in the Redis tier
+        """
+        self.dtype = dtype
+        super().__init__(
+            path, max_entries, redis_client=redis_client, redis_ttl=redis_ttl
+        )
+
+    @staticmethod
+    def get_key(
+        engine: str, model: str, url: Optional[str], prefix: Optional[str], text: str
+    ) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        return hashlib.sha256(
+            "\x00".join(
+                [engine or "", model or "", url or "", prefix or "", text_hash]
+            ).encode()
+        ).hexdigest()
+
+    def encode(self, vector: list[float]) -> bytes:
+        return (
+            f"{self.dtype}:".encode() + np.asarray(vector, dtype=self.dtype).tobytes()
+        )
+
+    def decode(self, value: bytes) -> list[float]:
+        # Entries keep the dtype they were written with
+        dtype, _, vector = value.partition(b":")
+        return np.frombuffer(vector, dtype=dtype.decode()).astype(np.float32).tolist()
+
+    def get_size(self, value: bytes) -> int:
+        return 1
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        return {
+            "entries": stats.pop("size"),
+            "max_entries": stats.pop("max_size"),
+            "dtype": self.dtype,
+            **stats,
+        }
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    if not ENABLE_RAG_EMBEDDING_CACHE:
+        return None
+
+    return create_cache(
+        EmbeddingCache,
+        ENABLE_RAG_EMBEDDING_CACHE_REDIS,
+        path=os.path.join(RAG_EMBEDDING_CACHE_DIR, "embeddings.db"),
+        max_entries=RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+        dtype=RAG_EMBEDDING_CACHE_DTYPE,
+        redis_ttl=RAG_EMBEDDING_CACHE_REDIS_TTL,
+    )
+
+
+EMBEDDING_CACHE = get_embedding_cache()
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable
+
+from open_webui.config import RAG_EMBEDDING_CONCURRENT_REQUESTS
+
+log = logging.getLogger(__name__)
+
+
+class EmbeddingScheduler:
+    """
+    Process-wide limiter for requests to remote embedding engines.
+
+    At most `limit` requests run at once, waiting requests are granted slots
+    round-robin across owners (users) so that one large upload doesn't starve
+    everyone else. The limit is halved whenever the engine rate limits us and
+    grows back by one slot per `limit` successful requests (AIMD).
+
+    Embeddings are generated from several event loops (sync endpoints run
+    their own through asyncio.run), so state is guarded by a thread lock and
+    waiters are woken on their own loop.
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.active = 0
+
+        self.requests = 0
+        self.throttled = 0
+
+        self._successes = 0
+        self._lock = threading.Lock()
+        self._waiters: OrderedDict[str, deque] = OrderedDict()
+
+    async def run(self, owner: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once a slot is available, a None result counts as a failure.
+        """
+        await self._acquire(owner)
+        result = None
+        try:
+            result = await fn()
+            return result
+        finally:
+            self._release(success=result is not None)
+
+    def throttle(self):
+        """
+        Report a rate limit response, halves the concurrency limit.
+        """
+        with self._lock:
+            self.throttled += 1
+            self._successes = 0
+            if self.limit > 1:
+                self.limit = max(1, self.limit // 2)
+                log.info(f"Embedding concurrency reduced to {self.limit}")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "max_concurrency": self.max_concurrency,
+                "active": self.active,
+                "waiting": sum(len(queue) for queue in self._waiters.values()),
+                "requests": self.requests,
+                "throttled": self.throttled,
+            }
+
+    async def _acquire(self, owner: str):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.requests += 1
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                return
+
+            waiter = (loop, loop.create_future())
+            self._waiters.setdefault(owner, deque()).append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                queue = self._waiters.get(owner)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._waiters[owner]
+                    raise
+
+            # Granted concurrently: a cancelled future is released by _grant
+            if not waiter[1].cancelled():
+                self._release(success=False)
+            raise
+
+    def _release(self, success: bool):
+        with self._lock:
+            self.active -= 1
+            if success:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._dispatch()
+
+    def _dispatch(self):
+        # Called with the lock held
+        while self.active < self.limit and self._waiters:
+            owner, queue = self._waiters.popitem(last=False)
+            loop, future = queue.popleft()
+            if queue:
+                # Move the owner to the back of the line
+                self._waiters[owner] = queue
+
+            self.active += 1
+            try:
+                loop.call_soon_threadsafe(self._grant, future)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                self.active -= 1
+
+    def _grant(self, future: asyncio.Future):
+        if future.done():
+            # Cancelled while the grant was in flight
+            self._release(success=False)
+        else:
+            future.set_result(None)
+
+
+EMBEDDING_SCHEDULER = EmbeddingScheduler(RAG_EMBEDDING_CONCURRENT_REQUESTS)
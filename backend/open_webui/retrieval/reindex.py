@@ -0,0 +1,369 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.documents import Document
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import KNOWLEDGE_REINDEX_CONCURRENCY
+from open_webui.models.files import FileModel
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.knowledge_reindex import KnowledgeReindexes
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.utils import get_embedding_config_hash
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.routers.retrieval import save_docs_to_vector_db
+
+log = logging.getLogger(__name__)
+
+
+# Seconds between heartbeats of a running reindex, one that missed a few was
+# interrupted and is resumed by another process
+REINDEX_HEARTBEAT_INTERVAL = 30
+REINDEX_STALE_AFTER = 3 * REINDEX_HEARTBEAT_INTERVAL
+
+# Files embedded at once, shared by all knowledge bases being reindexed
+_semaphore: Optional[asyncio.Semaphore] = None
+
+# Knowledge bases being reindexed by this process
+_running: set[str] = set()
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(KNOWLEDGE_REINDEX_CONCURRENCY)
+    return _semaphore
+
+
+def get_embedding_config(request) -> dict:
+    return {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+
+def get_collection_chunks(collection_name: str) -> dict[str, list[Document]]:
+    """Chunks of the collection by file id."""
+    if not VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        return {}
+
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if not result or not result.metadatas:
+        return {}
+
+    chunks = {}
+    for text, metadata in zip(result.documents[0], result.metadatas[0]):
+        metadata = metadata or {}
+        chunks.setdefault(metadata.get("file_id"), []).append(
+            Document(page_content=text, metadata=metadata)
+        )
+    return chunks
+
+
+def get_current_file_ids(
+    request, chunks: dict[str, list[Document]], files: list[FileModel]
+) -> set[str]:
+    """
+    Files whose chunks all match the file's current hash and the current
+    embedding model.
+    """
+    config_hash = get_embedding_config_hash(get_embedding_config(request))
+    hashes = {file.id: file.hash for file in files}
+
+    return {
+        file_id
+        for file_id, file_chunks in chunks.items()
+        if file_id in hashes
+        and all(
+            chunk.metadata.get("hash") == hashes[file_id]
+            and chunk.metadata.get("embedding_config_hash") == config_hash
+            for chunk in file_chunks
+        )
+    }
+
+
+def is_collection_current(request, collection_name: str, files: list[FileModel]):
+    """
+    Whether the collection holds every file at its current hash, embedded with
+    the current embedding model, and nothing else.
+    """
+    chunks = get_collection_chunks(collection_name)
+    return chunks.keys() == {file.id for file in files} and len(
+        get_current_file_ids(request, chunks, files)
+    ) == len(files)
+
+
+def prepare_collection(
+    request, knowledge_id: str, collection_name: str, files: list[FileModel]
+) -> tuple[set[str], dict[str, list[Document]]]:
+    """
+    Drop the chunks of files that were removed or changed from the collection
+    being built. Returns the ids of the files it holds, and the chunks of the
+    unchanged files in the collection currently serving the knowledge base.
+    """
+    chunks = get_collection_chunks(collection_name)
+    indexed_file_ids = get_current_file_ids(request, chunks, files)
+    for file_id in chunks.keys() - indexed_file_ids:
+        if file_id is not None:
+            VECTOR_DB_CLIENT.delete(
+                collection_name=collection_name, filter={"file_id": file_id}
+            )
+
+    current_chunks = get_collection_chunks(knowledge_id)
+    return indexed_file_ids, {
+        file_id: current_chunks[file_id]
+        for file_id in get_current_file_ids(request, current_chunks, files)
+    }
+
+
+def get_file_docs(file: FileModel) -> list[Document]:
+    # Same sources as adding a file to a knowledge base, see process_file
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=f"file-{file.id}", filter={"file_id": file.id}
+    )
+
+    if result is not None and len(result.ids[0]) > 0:
+        return [
+            Document(
+                page_content=result.documents[0][idx],
+                metadata=result.metadatas[0][idx],
+            )
+            for idx, id in enumerate(result.ids[0])
+        ]
+
+    return [
+        Document(
+            page_content=file.data.get("content", "") if file.data else "",
+            metadata={
+                **(file.meta or {}),
+                "name": file.filename,
+                "created_by": file.user_id,
+                "file_id": file.id,
+                "source": file.filename,
+            },
+        )
+    ]
+
+
+def index_file(
+    request,
+    file: FileModel,
+    collection_name: str,
+    user,
+    chunks: Optional[list[Document]] = None,
+):
+    """
+    Add the file to the collection. Chunks of an unchanged file are copied as
+    they are, the vector DB doesn't return vectors so they are embedded again,
+    but served by the embedding cache.
+    """
+    try:
+        save_docs_to_vector_db(
+            request,
+            docs=chunks or get_file_docs(file),
+            collection_name=collection_name,
+            metadata={
+                "file_id": file.id,
+                "name": file.filename,
+                "hash": file.hash,
+            },
+            split=chunks is None,
+            add=True,
+            user=user,
+        )
+    except ValueError as e:
+        # Already in the collection, e.g. the same content under another file
+        if str(e) != ERROR_MESSAGES.DUPLICATE_CONTENT:
+            raise
+
+
+async def keep_reindex_alive(knowledge_id: str):
+    while True:
+        await asyncio.sleep(REINDEX_HEARTBEAT_INTERVAL)
+        try:
+            await run_in_threadpool(KnowledgeReindexes.heartbeat, knowledge_id)
+        except Exception as e:
+            log.warning(f"Failed to update reindex heartbeat of {knowledge_id}: {e}")
+
+
+def drop_collection(collection_name: str):
+    try:
+        # Not (or no longer) an alias target, delete it on the underlying client
+        if VECTOR_DB_CLIENT.client.has_collection(collection_name=collection_name):
+            VECTOR_DB_CLIENT.client.delete_collection(collection_name=collection_name)
+        BM25_INDEX.delete_collection(collection_name=collection_name)
+    except Exception as e:
+        log.error(f"Error deleting collection {collection_name}: {str(e)}")
+
+
+async def reindex_knowledge_base(request, knowledge_id: str, user):
+    """
+    Rebuild a knowledge base into a new collection while the current one keeps
+    serving searches, then swap it in. An interrupted reindex (its heartbeat
+    stopped) resumes into the same collection and skips the files already in
+    it. If any file fails, the current collection is kept.
+    """
+    if Knowledges.get_knowledge_by_id(knowledge_id) is None:
+        KnowledgeReindexes.finish_reindex(knowledge_id, "skipped")
+        return
+
+    files = await run_in_threadpool(Knowledges.get_files_by_id, knowledge_id)
+
+    reindex = KnowledgeReindexes.get_reindex_by_knowledge_id(knowledge_id)
+    resuming = reindex is not None and reindex.status == "running"
+
+    if resuming:
+        reindex = KnowledgeReindexes.claim_reindex(
+            knowledge_id, int(time.time()) - REINDEX_STALE_AFTER, len(files)
+        )
+    elif await run_in_threadpool(is_collection_current, request, knowledge_id, files):
+        log.info(f"Knowledge base {knowledge_id} is up to date, skipping reindex")
+        if KnowledgeReindexes.start_reindex(knowledge_id, knowledge_id, len(files)):
+            KnowledgeReindexes.update_progress(knowledge_id, len(files), [])
+            KnowledgeReindexes.finish_reindex(knowledge_id, "skipped")
+        return
+    else:
+        reindex = KnowledgeReindexes.start_reindex(
+            knowledge_id, f"{knowledge_id}-{uuid.uuid4().hex[:8]}", len(files)
+        )
+
+    if reindex is None:
+        log.info(f"Knowledge base {knowledge_id} is being reindexed by another process")
+        return
+
+    heartbeat = asyncio.create_task(keep_reindex_alive(knowledge_id))
+    try:
+        await run_reindex(request, knowledge_id, reindex.collection_name, files, user)
+    finally:
+        heartbeat.cancel()
+
+
+async def run_reindex(
+    request, knowledge_id: str, collection_name: str, files: list[FileModel], user
+):
+    done = 0
+    failed_files = []
+    # Progress writes run in worker threads, keep them in order
+    progress_lock = asyncio.Lock()
+
+    async def update_progress():
+        async with progress_lock:
+            await run_in_threadpool(
+                KnowledgeReindexes.update_progress,
+                knowledge_id,
+                done,
+                list(failed_files),
+            )
+
+    async def index(file: FileModel, chunks: Optional[list[Document]]):
+        async with get_semaphore():
+            try:
+                await run_in_threadpool(
+                    index_file, request, file, collection_name, user, chunks
+                )
+            except Exception as e:
+                log.error(
+                    f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
+                )
+                failed_files.append({"file_id": file.id, "error": str(e)})
+
+    indexed_file_ids, unchanged_chunks = await run_in_threadpool(
+        prepare_collection, request, knowledge_id, collection_name, files
+    )
+
+    async def run(file: FileModel):
+        nonlocal done
+        if file.id not in indexed_file_ids:
+            await index(file, unchanged_chunks.get(file.id))
+
+        done += 1
+        await update_progress()
+
+    await asyncio.gather(*[run(file) for file in files])
+
+    if not failed_files:
+        # Catch up with files added to, removed from or updated in the knowledge
+        # base meanwhile, those changes went to the collection being replaced
+        files = await run_in_threadpool(Knowledges.get_files_by_id, knowledge_id)
+        indexed_file_ids, unchanged_chunks = await run_in_threadpool(
+            prepare_collection, request, knowledge_id, collection_name, files
+        )
+        for file in files:
+            if file.id not in indexed_file_ids:
+                await index(file, unchanged_chunks.get(file.id))
+
+        done = len(files)
+        await update_progress()
+
+    if failed_files:
+        # A partial collection must not replace the current one
+        log.warning(
+            f"Failed to process {len(failed_files)} files in knowledge base {knowledge_id}, keeping its current collection"
+        )
+        for failed in failed_files:
+            log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
+
+        KnowledgeReindexes.finish_reindex(knowledge_id, "failed")
+        await run_in_threadpool(drop_collection, collection_name)
+        return
+
+    previous_collection_name = VECTOR_DB_CLIENT.swap_collection(
+        knowledge_id, collection_name
+    )
+    KnowledgeReindexes.finish_reindex(knowledge_id, "completed")
+
+    # Rebuilt from the new collection on next search
+    BM25_INDEX.delete_collection(collection_name=knowledge_id)
+    BM25_INDEX.delete_collection(collection_name=collection_name)
+
+    # Other processes may still read the previous collection until they reload
+    # the aliases
+    await asyncio.sleep(2 * VECTOR_DB_CLIENT.refresh_interval)
+    await run_in_threadpool(drop_collection, previous_collection_name)
+
+
+async def reindex_knowledge_bases(request, knowledge_ids: list[str], user):
+    """Reindex the knowledge bases concurrently, see reindex_knowledge_base."""
+
+    async def run(knowledge_id: str):
+        if knowledge_id in _running:
+            log.info(f"Knowledge base {knowledge_id} is already being reindexed")
+            return
+
+        _running.add(knowledge_id)
+        try:
+            await reindex_knowledge_base(request, knowledge_id, user)
+        except Exception as e:
+            log.exception(f"Error reindexing knowledge base {knowledge_id}: {e}")
+        finally:
+            _running.discard(knowledge_id)
+
+    log.info(f"Starting reindexing for {len(knowledge_ids)} knowledge bases")
+    await asyncio.gather(*[run(knowledge_id) for knowledge_id in knowledge_ids])
+    log.info("Reindexing completed.")
+
+
+async def resume_interrupted_reindexes(request, user):
+    """
+    Resume reindexes left running by a process that stopped, called every
+    REINDEX_HEARTBEAT_INTERVAL. claim_reindex makes sure only one process
+    resumes each.
+    """
+    try:
+        reindexes = await run_in_threadpool(
+            KnowledgeReindexes.get_stale_running_reindexes,
+            int(time.time()) - REINDEX_STALE_AFTER,
+        )
+        knowledge_ids = [
+            reindex.knowledge_id
+            for reindex in reindexes
+            if reindex.knowledge_id not in _running
+        ]
+        if knowledge_ids:
+            await reindex_knowledge_bases(request, knowledge_ids, user)
+    except Exception as e:
+        log.exception(f"Error resuming knowledge base reindexes: {e}")
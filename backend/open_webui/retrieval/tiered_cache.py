@@ -0,0 +1,280 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from open_webui.env import (
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+# Bound of SQLite host parameters per statement
+BATCH_SIZE = 500
+
+
+class TieredCache:
+    """
+    Key-value cache of encoded entries in a local SQLite database evicted in
+    LRU order once over max_size, optionally fronted by a Redis tier shared by
+    all nodes. Redis hits are promoted to disk so that they survive the Redis
+    TTL. All methods are blocking and never raise, a failing cache behaves as
+    a miss.
+
+    Subclasses define how entries are encoded to bytes and what they count
+    for against max_size.
+    """
+
+    # Name of the cache in logs and prefix of its Redis keys
+    name = "cache"
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int,
+        redis_client=None,
+        redis_ttl: int = 60 * 60 * 24,
+    ):
+        """
+        :param path: SQLite database file
+        :param max_size: Total size of the entries kept on disk before evicting
+        :param redis_client: Redis client instance (decode_responses=False) or None
+        :param redis_ttl: Max expiry of entries in the Redis tier
+        """
+        self.max_size = max_size
+        self.r = redis_client
+        self.redis_ttl = redis_ttl
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at_idx ON cache (accessed_at)"
+        )
+        self._conn.commit()
+        self._size = self._get_disk_size()
+
+    def encode(self, entry: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, value: bytes) -> Any:
+        raise NotImplementedError
+
+    def get_size(self, value: bytes) -> int:
+        """What an encoded entry counts for against max_size."""
+        return len(value)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{self.name}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key])[0]
+
+    def set(self, key: str, entry: Any, ttl: Optional[float] = None):
+        self.set_many({key: entry}, ttl=ttl)
+
+    def get_many(self, keys: list[str]) -> list[Optional[Any]]:
+        results = [None] * len(keys)
+        if not keys:
+            return results
+
+        values = {}
+        try:
+            with self._lock:
+                for i in range(0, len(keys), BATCH_SIZE):
+                    batch = keys[i : i + BATCH_SIZE]
+                    rows = self._conn.execute(
+                        f"SELECT key, value FROM cache WHERE key IN "
+                        f"({','.join('?' * len(batch))})",
+                        batch,
+                    ).fetchall()
+                    values.update(rows)
+
+                if values:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key in values],
+                    )
+                    self._conn.commit()
+        except Exception as e:
+            log.warning(f"Failed to read {self.name} cache: {e}")
+
+        missing = list({key for key in keys if key not in values})
+        if missing and self.r is not None:
+            try:
+                mget = getattr(self.r, "mget_nonatomic", None) or self.r.mget
+                promoted = {
+                    key: value
+                    for key, value in zip(
+                        missing, mget([self._redis_key(key) for key in missing])
+                    )
+                    if value is not None
+                }
+                self.redis_hits += len(promoted)
+                values.update(promoted)
+
+                # Keep Redis hits on disk too so that they survive the Redis TTL
+                self._set_disk(promoted)
+            except Exception as e:
+                log.warning(f"Failed to read {self.name} cache from Redis: {e}")
+
+        for idx, key in enumerate(keys):
+            if key in values:
+                try:
+                    results[idx] = self.decode(values[key])
+                except Exception as e:
+                    log.warning(f"Failed to decode {self.name} cache entry: {e}")
+
+        hits = sum(1 for result in results if result is not None)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return results
+
+    def set_many(self, entries: dict[str, Any], ttl: Optional[float] = None):
+        """
+        :param ttl: Seconds the entries are useful for, bounds their Redis expiry
+        """
+        values = {}
+        for key, entry in entries.items():
+            try:
+                values[key] = self.encode(entry)
+            except Exception as e:
+                log.warning(f"Failed to encode {self.name} cache entry: {e}")
+        if not values:
+            return
+
+        self._set_disk(values)
+
+        if self.r is not None:
+            try:
+                expiry = self.redis_ttl if ttl is None else min(ttl, self.redis_ttl)
+                if expiry > 0:
+                    pipe = self.r.pipeline()
+                    for key, value in values.items():
+                        pipe.set(self._redis_key(key), value, ex=int(expiry))
+                    pipe.execute()
+            except Exception as e:
+                log.warning(f"Failed to write {self.name} cache to Redis: {e}")
+
+    def _get_disk_size(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()[0]
+
+    def _set_disk(self, values: dict[str, bytes]):
+        if not values:
+            return
+
+        try:
+            now = time.time()
+            with self._lock:
+                keys = list(values)
+                replaced = 0
+                for i in range(0, len(keys), BATCH_SIZE):
+                    batch = keys[i : i + BATCH_SIZE]
+                    replaced += self._conn.execute(
+                        f"SELECT COALESCE(SUM(size), 0) FROM cache WHERE key IN "
+                        f"({','.join('?' * len(batch))})",
+                        batch,
+                    ).fetchone()[0]
+
+                rows = [
+                    (key, value, self.get_size(value), now)
+                    for key, value in values.items()
+                ]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, size, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._size += sum(row[2] for row in rows) - replaced
+
+                if self._size > self.max_size:
+                    # Other workers may share the same file, resum before evicting
+                    self._size = self._get_disk_size()
+                    if self._size > self.max_size:
+                        self._evict()
+
+                self._conn.commit()
+        except Exception as e:
+            log.warning(f"Failed to write {self.name} cache: {e}")
+
+    def _evict(self):
+        # Evict down to 90% so that eviction doesn't run on every write
+        target = int(self.max_size * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at")
+
+        keys = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            keys.append((key,))
+            self._size -= size
+        rows.close()
+
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", keys)
+        self.evictions += len(keys)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_size": self.max_size,
+            "redis": self.r is not None,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_cache(
+    cache_class: type[TieredCache], enable_redis: bool, **kwargs
+) -> Optional[TieredCache]:
+    """
+    Create a cache with the Redis tier if enabled and Redis is configured, or
+    None if the cache can't be opened.
+    """
+    redis_client = None
+    if enable_redis and REDIS_URL:
+        try:
+            redis_client = get_redis_connection(
+                redis_url=REDIS_URL,
+                redis_sentinels=get_sentinels_from_env(
+                    REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+                ),
+                redis_cluster=REDIS_CLUSTER,
+                async_mode=False,
+                decode_responses=False,
+            )
+        except Exception as e:
+            log.warning(
+                f"{cache_class.name.capitalize()} cache Redis tier disabled: {e}"
+            )
+
+    try:
+        return cache_class(redis_client=redis_client, **kwargs)
+    except Exception as e:
+        log.warning(f"{cache_class.name.capitalize()} cache disabled: {e}")
+        return None
@@ -6,7 +6,9 @@ import requests
 import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import json
+import random
+import uuid
 import time
 import re
 
@@ -16,11 +18,13 @@ from langchain_classic.retrievers import (
     ContextualCompressionRetriever,
     EnsembleRetriever,
 )
-from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25IndexRetriever, aget_bm25_index
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.embedding_scheduler import EMBEDDING_SCHEDULER
 
 
 from open_webui.models.users import UserModel
@@ -33,6 +37,7 @@ from open_webui.models.notes import Notes
 from open_webui.retrieval.vector.main import GetResult
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import SESSION_POOL
 from open_webui.utils.misc import get_message_list
 
 from open_webui.retrieval.web.utils import get_web_loader
@@ -47,6 +52,8 @@ from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    RAG_EMBEDDING_BATCH_MAX_TOKENS,
+    RAG_EMBEDDING_MAX_RETRIES,
 )
 
 log = logging.getLogger(__name__)
@@ -112,7 +119,7 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
+        result = await VECTOR_DB_CLIENT.asearch(
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
@@ -133,12 +140,12 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
-def query_doc(
+async def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
     try:
         log.debug(f"query_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.search(
+        result = await VECTOR_DB_CLIENT.asearch(
             collection_name=collection_name,
             vectors=[query_embedding],
             limit=k,
@@ -153,10 +160,10 @@ def query_doc(
         raise e
 
 
-def get_doc(collection_name: str, user: UserModel = None):
+async def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        result = await VECTOR_DB_CLIENT.aget(collection_name=collection_name)
 
         if result:
             log.info(f"query_doc:result {result.ids} {result.metadatas}")
@@ -167,47 +174,8 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
-def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
-
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
-
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
-
-        enriched_texts.append(" ".join(metadata_parts))
-
-    return enriched_texts
-
-
 async def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
     query: str,
     embedding_function,
     k: int,
@@ -218,37 +186,18 @@ async def query_doc_with_hybrid_search(
     enable_enriched_texts: bool = False,
 ) -> dict:
     try:
-        # First check if collection_result has the required attributes
-        if (
-            not collection_result
-            or not hasattr(collection_result, "documents")
-            or not hasattr(collection_result, "metadatas")
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
-
-        # Now safely check the documents content after confirming attributes exist
-        if (
-            not collection_result.documents
-            or len(collection_result.documents) == 0
-            or not collection_result.documents[0]
-        ):
+        collection = await aget_bm25_index(collection_name)
+        if not collection or collection.doc_count <= 0:
             log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
             return {"documents": [], "metadatas": [], "distances": []}
 
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
-
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
+        bm25_retriever = BM25IndexRetriever(
+            collection=collection,
+            k=k,
+            enriched=enable_enriched_texts,
         )
-        bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -383,13 +332,13 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     }
 
 
-def get_all_items_from_collections(collection_names: list[str]) -> dict:
+async def get_all_items_from_collections(collection_names: list[str]) -> dict:
     results = []
 
     for collection_name in collection_names:
         if collection_name:
             try:
-                result = get_doc(collection_name=collection_name)
+                result = await get_doc(collection_name=collection_name)
                 if result is not None:
                     results.append(result.model_dump())
             except Exception as e:
@@ -409,10 +358,10 @@ async def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
+    async def process_query_collection(collection_name, query_embedding):
         try:
             if collection_name:
-                result = query_doc(
+                result = await query_doc(
                     collection_name=collection_name,
                     k=k,
                     query_embedding=query_embedding,
@@ -432,15 +381,13 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    task_results = await asyncio.gather(
+        *[
+            process_query_collection(collection_name, query_embedding)
+            for query_embedding in query_embeddings
+            for collection_name in collection_names
+        ]
+    )
 
     for result, err in task_results:
         if err is not None:
@@ -467,20 +414,18 @@ async def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
-    # Fetch collection data once per collection sequentially
-    # Avoid fetching the same data multiple times later
-    collection_results = {}
+    # Make sure each collection has a BM25 index once, sequentially
+    # Collections indexed before are only looked up, never fetched in full
+    collection_indexes = {}
     for collection_name in collection_names:
         try:
             log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
-            )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+                f"query_collection_with_hybrid_search:get_bm25_index:collection {collection_name}"
             )
+            collection_indexes[collection_name] = await aget_bm25_index(collection_name)
         except Exception as e:
-            log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
+            log.exception(f"Failed to index collection {collection_name}: {e}")
+            collection_indexes[collection_name] = None
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
@@ -490,7 +435,6 @@ async def query_collection_with_hybrid_search(
         try:
             result = await query_doc_with_hybrid_search(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
@@ -506,11 +450,11 @@ async def query_collection_with_hybrid_search(
             return None, e
 
     # Prepare tasks for all collections and queries
-    # Avoid running any tasks for collections that failed to fetch data (have assigned None)
+    # Avoid running any tasks for collections that failed to be indexed (have assigned None)
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if collection_indexes[collection_name] is not None
         for query in queries
     ]
 
@@ -533,6 +477,42 @@ async def query_collection_with_hybrid_search(
     return merge_and_sort_query_results(results, k=k)
 
 
+async def apost_embeddings(url: str, headers: dict, form_data: dict) -> dict:
+    """
+    POST an embedding request, retrying rate limits (429), server errors (5xx)
+    and connection errors with exponential backoff.
+    """
+    for attempt in range(RAG_EMBEDDING_MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            async with SESSION_POOL.session(url) as session:
+                async with session.post(url, headers=headers, json=form_data) as r:
+                    if r.status == 429 or r.status >= 500:
+                        if r.status == 429:
+                            EMBEDDING_SCHEDULER.throttle()
+                        if attempt >= RAG_EMBEDDING_MAX_RETRIES:
+                            r.raise_for_status()
+                        retry_after = r.headers.get("Retry-After")
+                        log.warning(
+                            f"Embedding request failed with {r.status}, retrying ({attempt + 1}/{RAG_EMBEDDING_MAX_RETRIES})"
+                        )
+                    else:
+                        r.raise_for_status()
+                        return await r.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt >= RAG_EMBEDDING_MAX_RETRIES:
+                raise
+            log.warning(
+                f"Embedding request failed with {e!r}, retrying ({attempt + 1}/{RAG_EMBEDDING_MAX_RETRIES})"
+            )
+
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(2**attempt, 30) * (0.5 + random.random())
+        await asyncio.sleep(delay)
+
+
 def generate_openai_batch_embeddings(
     model: str,
     texts: list[str],
@@ -595,16 +575,11 @@ async def agenerate_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(
-                f"{url}/embeddings", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await apost_embeddings(f"{url}/embeddings", headers, form_data)
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
@@ -684,14 +659,11 @@ async def agenerate_azure_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(full_url, headers=headers, json=form_data) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await apost_embeddings(full_url, headers, form_data)
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
@@ -760,21 +732,58 @@ async def agenerate_ollama_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(
-                f"{url}/api/embed", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "embeddings" in data:
-                    return data["embeddings"]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await apost_embeddings(f"{url}/api/embed", headers, form_data)
+        if "embeddings" in data:
+            return data["embeddings"]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
 
 
+def get_embedding_batches(
+    texts: list[str], batch_size: int, max_tokens: int = 0
+) -> list[list[str]]:
+    """
+    Split texts into batches of at most batch_size texts and, if max_tokens is
+    set, of at most max_tokens estimated tokens (a single longer text is still
+    sent alone).
+    """
+    batch_size = max(1, batch_size)
+
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for text in texts:
+        # Rough estimate, the engine's tokenizer is unknown
+        tokens = len(text) // 4 + 1
+        if batch and (
+            len(batch) >= batch_size
+            or (max_tokens > 0 and batch_tokens + tokens > max_tokens)
+        ):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+
+        batch.append(text)
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def get_embedding_config_hash(embedding_config: dict) -> str:
+    """
+    Fingerprint of the embedding engine and model, stored with every chunk as
+    a plain string, which unlike dicts survives every vector DB's metadata.
+    """
+    return hashlib.sha256(
+        json.dumps(embedding_config, sort_keys=True).encode()
+    ).hexdigest()
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -787,8 +796,10 @@ def get_embedding_function(
 ) -> Awaitable:
     if embedding_engine == "":
         # Sentence transformers: CPU-bound sync operation
-        async def async_embedding_function(query, prefix=None, user=None):
-            return await asyncio.to_thread(
+        async def async_embedding_function(
+            query, prefix=None, user=None, on_progress=None
+        ):
+            embeddings = await asyncio.to_thread(
                 (
                     lambda query, prefix=None: embedding_function.encode(
                         query, **({"prompt": prefix} if prefix else {})
@@ -797,8 +808,13 @@ def get_embedding_function(
                 query,
                 prefix,
             )
+            if on_progress and isinstance(query, list):
+                on_progress(len(query))
+            return embeddings
 
-        return async_embedding_function
+        return get_cached_embedding_function(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -811,33 +827,40 @@ def get_embedding_function(
             azure_api_version=azure_api_version,
         )
 
-        async def async_embedding_function(query, prefix=None, user=None):
+        async def async_embedding_function(
+            query, prefix=None, user=None, on_progress=None
+        ):
+            # Requests of the same user share a place in the scheduler's queue
+            owner = user.id if user else str(uuid.uuid4())
+
+            async def schedule(texts):
+                embeddings = await EMBEDDING_SCHEDULER.run(
+                    owner, lambda: embedding_function(texts, prefix=prefix, user=user)
+                )
+                if on_progress and isinstance(texts, list):
+                    on_progress(len(texts))
+                return embeddings
+
             if isinstance(query, list):
-                # Create batches
-                batches = [
-                    query[i : i + embedding_batch_size]
-                    for i in range(0, len(query), embedding_batch_size)
-                ]
+                batches = get_embedding_batches(
+                    query, embedding_batch_size, RAG_EMBEDDING_BATCH_MAX_TOKENS
+                )
 
                 if enable_async:
                     log.debug(
                         f"generate_multiple_async: Processing {len(batches)} batches in parallel"
                     )
-                    # Execute all batches in parallel
-                    tasks = [
-                        embedding_function(batch, prefix=prefix, user=user)
-                        for batch in batches
-                    ]
-                    batch_results = await asyncio.gather(*tasks)
+                    # Execute batches in parallel, bounded by the scheduler
+                    batch_results = await asyncio.gather(
+                        *[schedule(batch) for batch in batches]
+                    )
                 else:
                     log.debug(
                         f"generate_multiple_async: Processing {len(batches)} batches sequentially"
                     )
                     batch_results = []
                     for batch in batches:
-                        batch_results.append(
-                            await embedding_function(batch, prefix=prefix, user=user)
-                        )
+                        batch_results.append(await schedule(batch))
 
                 # Flatten results
                 embeddings = []
@@ -850,13 +873,77 @@ def get_embedding_function(
                 )
                 return embeddings
             else:
-                return await embedding_function(query, prefix, user)
+                return await schedule(query)
 
-        return async_embedding_function
+        return get_cached_embedding_function(
+            async_embedding_function, embedding_engine, embedding_model, url
+        )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
 
+def get_cached_embedding_function(
+    embedding_function, embedding_engine, embedding_model, url=None
+) -> Awaitable:
+    """
+    Serve embeddings from EMBEDDING_CACHE, only texts never embedded before with
+    the same engine, model, url and prefix are passed to embedding_function.
+    """
+    if EMBEDDING_CACHE is None:
+        return embedding_function
+
+    async def cached_embedding_function(
+        query, prefix=None, user=None, on_progress=None
+    ):
+        texts = query if isinstance(query, list) else [query]
+        keys = [
+            EMBEDDING_CACHE.get_key(
+                embedding_engine, embedding_model, url, prefix, text
+            )
+            for text in texts
+        ]
+        embeddings = await asyncio.to_thread(EMBEDDING_CACHE.get_many, keys)
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        log.debug(
+            f"embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+        )
+        if on_progress and isinstance(query, list) and len(missing) < len(texts):
+            on_progress(len(texts) - len(missing))
+
+        if not missing:
+            return embeddings if isinstance(query, list) else embeddings[0]
+
+        if isinstance(query, list):
+            result = await embedding_function(
+                [texts[idx] for idx in missing],
+                prefix=prefix,
+                user=user,
+                on_progress=on_progress,
+            )
+            generated = result
+        else:
+            result = await embedding_function(query, prefix=prefix, user=user)
+            generated = [result] if result is not None else None
+
+        if not isinstance(generated, list) or len(generated) != len(missing):
+            # Failed or partial generation, return what an uncached call would
+            if len(missing) == len(texts):
+                return result
+            return await embedding_function(query, prefix=prefix, user=user)
+
+        await asyncio.to_thread(
+            EMBEDDING_CACHE.set_many,
+            {keys[idx]: embedding for idx, embedding in zip(missing, generated)},
+        )
+        for idx, embedding in zip(missing, generated):
+            embeddings[idx] = embedding
+
+        return embeddings if isinstance(query, list) else embeddings[0]
+
+    return cached_embedding_function
+
+
 async def generate_embeddings(
     engine: str,
     model: str,
@@ -1137,7 +1224,9 @@ async def get_sources_from_items(
 
             try:
                 if full_context:
-                    query_result = get_all_items_from_collections(collection_names)
+                    query_result = await get_all_items_from_collections(
+                        collection_names
+                    )
                 else:
                     query_result = None  # Initialize to None
                     if hybrid_search:
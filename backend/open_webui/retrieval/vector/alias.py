@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from open_webui.models.vector_aliases import VectorCollectionAliases
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+
+log = logging.getLogger(__name__)
+
+
+class AliasedVectorDBClient(VectorDBBase):
+    """
+    Resolves logical collection names through vector_collection_alias before
+    calling the backend, so a collection rebuilt under another name (e.g. by a
+    knowledge base reindex) replaces the old one for every reader at once.
+
+    Aliases are few and rarely change, they are cached per process and
+    reloaded at most once per refresh interval.
+    """
+
+    def __init__(self, client: VectorDBBase, refresh_interval: float = 5.0):
+        self.client = client
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._aliases: dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+
+    def __getattr__(self, name):
+        # Backend specific helpers
+        return getattr(self.client, name)
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if (
+            not force
+            and self._loaded_at is not None
+            and now - self._loaded_at < self.refresh_interval
+        ):
+            return
+
+        try:
+            aliases = VectorCollectionAliases.get_aliases()
+        except Exception as e:
+            # e.g. before the migration ran, serve the names as they are
+            log.debug(f"Failed to load vector collection aliases: {e}")
+            aliases = self._aliases
+
+        with self._lock:
+            self._aliases = aliases
+            self._loaded_at = now
+
+    def resolve(self, collection_name: str) -> str:
+        self._refresh()
+        return self._aliases.get(collection_name, collection_name)
+
+    def swap_collection(self, name: str, collection_name: str) -> str:
+        """
+        Serve name from collection_name from now on. Returns the collection
+        that served it before, which other processes may keep reading for up
+        to one refresh interval.
+        """
+        previous = VectorCollectionAliases.set_alias(name, collection_name)
+        self._refresh(force=True)
+        return previous or name
+
+    def _drop_alias(self, collection_name: str) -> str:
+        physical_name = self.resolve(collection_name)
+        if physical_name != collection_name:
+            VectorCollectionAliases.delete_alias(collection_name)
+            self._refresh(force=True)
+        return physical_name
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self.client.has_collection(self.resolve(collection_name))
+
+    def delete_collection(self, collection_name: str) -> None:
+        return self.client.delete_collection(self._drop_alias(collection_name))
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return self.client.insert(self.resolve(collection_name), items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return self.client.upsert(self.resolve(collection_name), items)
+
+    def search(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return self.client.search(self.resolve(collection_name), vectors, limit)
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return self.client.query(self.resolve(collection_name), filter, limit)
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        return self.client.get(self.resolve(collection_name))
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return self.client.delete(self.resolve(collection_name), ids=ids, filter=filter)
+
+    def reset(self) -> None:
+        VectorCollectionAliases.delete_all_aliases()
+        self._refresh(force=True)
+        return self.client.reset()
+
+    # Async counterparts go to the backend's, which may be native
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.client.ahas_collection(self.resolve(collection_name))
+
+    async def adelete_collection(self, collection_name: str) -> None:
+        return await self.client.adelete_collection(self._drop_alias(collection_name))
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self.client.ainsert(self.resolve(collection_name), items)
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self.client.aupsert(self.resolve(collection_name), items)
+
+    async def asearch(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await self.client.asearch(self.resolve(collection_name), vectors, limit)
+
+    async def aquery(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await self.client.aquery(self.resolve(collection_name), filter, limit)
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        return await self.client.aget(self.resolve(collection_name))
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await self.client.adelete(
+            self.resolve(collection_name), ids=ids, filter=filter
+        )
+
+    async def areset(self) -> None:
+        VectorCollectionAliases.delete_all_aliases()
+        self._refresh(force=True)
+        return await self.client.areset()
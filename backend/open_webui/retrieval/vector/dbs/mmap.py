@@ -0,0 +1,612 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from open_webui.retrieval.vector.main import (
+    VectorDBBase,
+    VectorItem,
+    SearchResult,
+    GetResult,
+)
+from open_webui.config import (
+    MMAP_VECTOR_DATA_PATH,
+    MMAP_VECTOR_DTYPE,
+    MMAP_VECTOR_HNSW_THRESHOLD,
+    MMAP_VECTOR_COMPACTION_RATIO,
+)
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+log = logging.getLogger(__name__)
+
+# Rows scored at once by brute force search, bounds the memory of a search
+SEARCH_CHUNK_SIZE = 65536
+
+# Collections with fewer deleted rows are never compacted
+COMPACTION_MIN_DELETED = 1000
+
+
+class MmapCollection:
+    """
+    One collection on disk: an append-only matrix of L2 normalized vectors,
+    memory-mapped for search, and a SQLite sidecar with the id, text,
+    metadata and tombstone of every row.
+
+    Writes are serialized across processes by SQLite's write lock. Vectors
+    are appended before the rows referencing them are committed, so a write
+    interrupted in between leaves only unreferenced bytes, the next write
+    truncates them. Compaction writes the live rows to a new file of the next
+    epoch and switches to it in the same transaction that renumbers the rows.
+    """
+
+    def __init__(self, path: str, dtype: str):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.lock = threading.RLock()
+
+        # (epoch, count, generation) the cached state below was loaded at
+        self._state = None
+        self._matrix = None
+        self._deleted = None
+
+        self._hnsw = None
+        self._hnsw_epoch = None
+        self._hnsw_count = 0
+        self._hnsw_building = False
+        self._compacting = False
+
+    @property
+    def db_path(self) -> str:
+        return os.path.join(self.path, "meta.sqlite")
+
+    def get_vectors_path(self, epoch: int) -> str:
+        return os.path.join(self.path, f"vectors.{epoch}.bin")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.db_path)
+
+    @contextmanager
+    def connect(self, write: bool = False):
+        if write:
+            os.makedirs(self.path, exist_ok=True)
+
+        db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            if write:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("BEGIN IMMEDIATE")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value INTEGER)"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS items ("
+                    "row INTEGER PRIMARY KEY, id TEXT NOT NULL, text TEXT, "
+                    "metadata TEXT, deleted INTEGER NOT NULL DEFAULT 0)"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS items_id_idx ON items (id)")
+            else:
+                # Consistent snapshot of info and rows
+                db.execute("BEGIN")
+            yield db
+            db.execute("COMMIT")
+        except Exception:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def _get_info(self, db) -> dict:
+        info = {"dim": 0, "count": 0, "epoch": 0, "generation": 0}
+        try:
+            info.update(dict(db.execute("SELECT key, value FROM info").fetchall()))
+        except sqlite3.OperationalError:
+            # Collection dropped concurrently
+            pass
+        return info
+
+    def _set_info(self, db, **values):
+        db.executemany(
+            "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+            list(values.items()),
+        )
+
+    def _load(self, db) -> dict:
+        """Refresh the memory map and tombstones if the collection changed."""
+        info = self._get_info(db)
+        state = (info["epoch"], info["count"], info["generation"])
+        if state == self._state:
+            return info
+
+        count, dim = info["count"], info["dim"]
+        if count:
+            matrix = np.memmap(
+                self.get_vectors_path(info["epoch"]),
+                dtype=self.dtype,
+                mode="r",
+                shape=(count, dim),
+            )
+        else:
+            matrix = np.zeros((0, max(dim, 1)), dtype=self.dtype)
+
+        deleted = np.zeros(count, dtype=bool)
+        rows = [row for (row,) in db.execute("SELECT row FROM items WHERE deleted = 1")]
+        if rows:
+            deleted[rows] = True
+
+        self._matrix = matrix
+        self._deleted = deleted
+        self._state = state
+        return info
+
+    ####################
+    # Writes
+    ####################
+
+    def write(self, items: list[VectorItem]):
+        """Append items, replacing live rows with the same ids."""
+        vectors = normalize(np.asarray([item["vector"] for item in items]))
+        vectors = vectors.astype(self.dtype)
+
+        with self.lock, self.connect(write=True) as db:
+            info = self._get_info(db)
+            dim, count = info["dim"], info["count"]
+
+            if not dim:
+                dim = vectors.shape[1]
+            elif dim != vectors.shape[1]:
+                raise ValueError(
+                    f"Vector dimension {vectors.shape[1]} does not match the collection ({dim})"
+                )
+
+            db.executemany(
+                "UPDATE items SET deleted = 1 WHERE id = ? AND deleted = 0",
+                [(item["id"],) for item in items],
+            )
+
+            vectors_path = self.get_vectors_path(info["epoch"])
+            with open(vectors_path, "ab") as f:
+                # Drop vectors of an interrupted write
+                f.truncate(count * dim * self.dtype.itemsize)
+                f.write(vectors.tobytes())
+
+            db.executemany(
+                "INSERT INTO items (row, id, text, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        count + idx,
+                        item["id"],
+                        item["text"],
+                        json.dumps(item["metadata"], default=str),
+                    )
+                    for idx, item in enumerate(items)
+                ],
+            )
+            self._set_info(
+                db,
+                dim=dim,
+                count=count + len(items),
+                epoch=info["epoch"],
+                generation=info["generation"] + 1,
+            )
+            # Upserts leave the replaced rows behind
+            compact = self._needs_compaction(db, info)
+
+        if compact:
+            self._start(self._compact, "_compacting")
+
+    def delete(self, ids: Optional[list[str]] = None, filter: Optional[dict] = None):
+        if not self.exists():
+            return
+
+        with self.lock, self.connect(write=True) as db:
+            if ids:
+                db.executemany(
+                    "UPDATE items SET deleted = 1 WHERE id = ? AND deleted = 0",
+                    [(id,) for id in ids],
+                )
+            elif filter:
+                where, params = get_filter_clause(filter)
+                db.execute(
+                    f"UPDATE items SET deleted = 1 WHERE deleted = 0 AND {where}",
+                    params,
+                )
+            else:
+                return
+
+            info = self._get_info(db)
+            self._set_info(db, generation=info["generation"] + 1)
+            compact = self._needs_compaction(db, info)
+
+        if compact:
+            self._start(self._compact, "_compacting")
+
+    def _needs_compaction(self, db, info: dict) -> bool:
+        (deleted,) = db.execute(
+            "SELECT COUNT(*) FROM items WHERE deleted = 1"
+        ).fetchone()
+        return deleted >= max(
+            COMPACTION_MIN_DELETED, MMAP_VECTOR_COMPACTION_RATIO * info["count"]
+        )
+
+    def _compact(self):
+        """
+        Rewrite the live rows into a new file, dropping the tombstones. Only
+        writers wait for it, searches keep reading the previous epoch.
+        """
+        with self.connect(write=True) as db:
+            info = self._get_info(db)
+            rows = [
+                row
+                for (row,) in db.execute(
+                    "SELECT row FROM items WHERE deleted = 0 ORDER BY row"
+                )
+            ]
+            epoch = info["epoch"] + 1
+
+            if info["count"]:
+                matrix = np.memmap(
+                    self.get_vectors_path(info["epoch"]),
+                    dtype=self.dtype,
+                    mode="r",
+                    shape=(info["count"], info["dim"]),
+                )
+                with open(self.get_vectors_path(epoch), "wb") as f:
+                    for start in range(0, len(rows), SEARCH_CHUNK_SIZE):
+                        f.write(
+                            np.ascontiguousarray(
+                                matrix[rows[start : start + SEARCH_CHUNK_SIZE]]
+                            ).tobytes()
+                        )
+                del matrix
+
+            db.execute("DELETE FROM items WHERE deleted = 1")
+            # Ascending, a row never moves onto one that is still to be moved
+            db.executemany(
+                "UPDATE items SET row = ? WHERE row = ?",
+                [(new_row, row) for new_row, row in enumerate(rows) if new_row != row],
+            )
+            self._set_info(
+                db,
+                count=len(rows),
+                epoch=epoch,
+                generation=info["generation"] + 1,
+            )
+
+        try:
+            os.remove(self.get_vectors_path(info["epoch"]))
+        except OSError:
+            pass
+        log.info(f"Compacted {self.path} from {info['count']} to {len(rows)} rows")
+
+    ####################
+    # Reads
+    ####################
+
+    def search(self, vectors: list[list[float]], limit: int) -> SearchResult:
+        """One row of results per query vector, all from the same snapshot."""
+        queries = normalize(np.asarray(vectors)).astype(np.float32)
+
+        # Compaction may renumber the rows between the search and reading them,
+        # search again then
+        for _ in range(3):
+            try:
+                with self.lock, self.connect() as db:
+                    info = self._load(db)
+                    matrix, deleted = self._matrix, self._deleted
+                    epoch = info["epoch"]
+            except FileNotFoundError:
+                # Vectors of the epoch were just compacted away
+                self._state = None
+                continue
+
+            live = int(len(deleted) - deleted.sum())
+            k = min(limit or live, live)
+            if k <= 0:
+                break
+
+            index = self._get_hnsw(matrix, deleted, epoch, live)
+            results = []
+            for query in queries:
+                result = None
+                if index is not None:
+                    result = search_hnsw(index, query, k, deleted)
+                if result is None:
+                    result = search_brute_force(matrix, query, k, deleted)
+                results.append(result)
+
+            with self.connect() as db:
+                if self._get_info(db)["epoch"] != epoch:
+                    continue
+                items = self._get_rows(
+                    db, sorted({row for rows, _ in results for row in rows.tolist()})
+                )
+
+            found = [
+                [
+                    (items[row], float(score))
+                    for row, score in zip(rows.tolist(), scores.tolist())
+                    if row in items
+                ]
+                for rows, scores in results
+            ]
+            return SearchResult(
+                ids=[[item[0] for item, _ in rows] for rows in found],
+                documents=[[item[1] for item, _ in rows] for rows in found],
+                metadatas=[[item[2] for item, _ in rows] for rows in found],
+                # Cosine similarity is [-1, 1], normalize to [0, 1]
+                distances=[
+                    [(score + 1.0) / 2.0 for _, score in rows] for rows in found
+                ],
+            )
+
+        return SearchResult(
+            ids=[[] for _ in vectors],
+            documents=[[] for _ in vectors],
+            metadatas=[[] for _ in vectors],
+            distances=[[] for _ in vectors],
+        )
+
+    def _get_rows(self, db, rows: list[int]) -> dict:
+        items = {}
+        for start in range(0, len(rows), 500):
+            batch = rows[start : start + 500]
+            for row, id, text, metadata in db.execute(
+                f"SELECT row, id, text, metadata FROM items "
+                f"WHERE deleted = 0 AND row IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                items[row] = (id, text, json.loads(metadata) if metadata else {})
+        return items
+
+    def get(self, filter: Optional[dict] = None, limit: Optional[int] = None):
+        where, params = get_filter_clause(filter) if filter else ("1 = 1", [])
+        sql = f"SELECT id, text, metadata FROM items WHERE deleted = 0 AND {where} ORDER BY row"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = [*params, limit]
+
+        with self.connect() as db:
+            items = db.execute(sql, params).fetchall()
+
+        return GetResult(
+            ids=[[id for id, _, _ in items]],
+            documents=[[text for _, text, _ in items]],
+            metadatas=[
+                [json.loads(metadata) if metadata else {} for _, _, metadata in items]
+            ],
+        )
+
+    ####################
+    # HNSW
+    ####################
+
+    def _get_hnsw(self, matrix, deleted, epoch: int, live: int):
+        if hnswlib is None or live < MMAP_VECTOR_HNSW_THRESHOLD:
+            return None
+
+        with self.lock:
+            if self._hnsw is None or self._hnsw_epoch != epoch:
+                # Searched by brute force until the graph is built
+                self._hnsw = None
+                self._start(self._build_hnsw, "_hnsw_building")
+                return None
+
+            index = self._hnsw
+            count = len(matrix)
+            if self._hnsw_count < count:
+                # Appended since the graph was built
+                if index.get_max_elements() < count:
+                    index.resize_index(max(count, 2 * index.get_max_elements()))
+                index.add_items(
+                    np.asarray(matrix[self._hnsw_count : count], dtype=np.float32),
+                    np.arange(self._hnsw_count, count),
+                )
+                self._hnsw_count = count
+            return index
+
+    def _build_hnsw(self):
+        with self.lock, self.connect() as db:
+            info = self._load(db)
+            matrix, deleted = self._matrix, self._deleted
+
+        rows = np.flatnonzero(~deleted)
+        index = hnswlib.Index(space="ip", dim=info["dim"])
+        index.init_index(
+            max_elements=max(2 * len(matrix), 1), ef_construction=200, M=16
+        )
+        for start in range(0, len(rows), SEARCH_CHUNK_SIZE):
+            batch = rows[start : start + SEARCH_CHUNK_SIZE]
+            index.add_items(np.asarray(matrix[batch], dtype=np.float32), batch)
+
+        with self.lock:
+            self._hnsw = index
+            self._hnsw_epoch = info["epoch"]
+            self._hnsw_count = len(matrix)
+        log.info(f"Built HNSW graph of {self.path} with {len(rows)} vectors")
+
+    def _start(self, target, flag: str):
+        """Run target in a background thread unless it is already running."""
+        with self.lock:
+            if getattr(self, flag):
+                return
+            setattr(self, flag, True)
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                log.exception(f"Error maintaining vector collection {self.path}: {e}")
+            finally:
+                setattr(self, flag, False)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = vectors.astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def search_brute_force(matrix, query: np.ndarray, k: int, deleted: np.ndarray):
+    best_rows = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+
+    for start in range(0, len(matrix), SEARCH_CHUNK_SIZE):
+        scores = np.asarray(matrix[start : start + SEARCH_CHUNK_SIZE]) @ query
+        scores = scores.astype(np.float32)
+        scores[deleted[start : start + SEARCH_CHUNK_SIZE]] = -np.inf
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+
+        best_rows = np.concatenate([best_rows, top + start])
+        best_scores = np.concatenate([best_scores, scores[top]])
+        if len(best_scores) > k:
+            top = np.argpartition(-best_scores, k - 1)[:k]
+            best_rows, best_scores = best_rows[top], best_scores[top]
+
+    order = np.argsort(-best_scores)
+    order = order[np.isfinite(best_scores[order])]
+    return best_rows[order], best_scores[order]
+
+
+def search_hnsw(index, query: np.ndarray, k: int, deleted: np.ndarray):
+    """Search the graph, None if tombstones left fewer than k results."""
+    count = index.get_current_count()
+    index.set_ef(max(2 * k, 64))
+    labels, distances = index.knn_query(query, k=min(2 * k + 10, count))
+
+    rows, scores = labels[0].astype(np.int64), 1.0 - distances[0]
+    live = ~deleted[rows]
+    if live.sum() < k:
+        return None
+    return rows[live][:k], scores[live][:k]
+
+
+def get_filter_clause(filter: dict) -> tuple[str, list]:
+    """Equality conditions on metadata keys, all of which must match."""
+    clauses, params = [], []
+    for key, value in filter.items():
+        if not re.fullmatch(r"[A-Za-z0-9_]+", key):
+            raise ValueError(f"Invalid metadata filter key: {key}")
+        if isinstance(value, bool):
+            value = int(value)
+        clauses.append(f"json_extract(metadata, '$.{key}') = ?")
+        params.append(value)
+    return " AND ".join(clauses) or "1 = 1", params
+
+
+class MmapVectorClient(VectorDBBase):
+    """
+    Embedded vector store, see MmapCollection. Collections live in
+    MMAP_VECTOR_DATA_PATH, one directory each.
+    """
+
+    def __init__(self):
+        self.path = MMAP_VECTOR_DATA_PATH
+        self.dtype = MMAP_VECTOR_DTYPE
+        if self.dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported MMAP_VECTOR_DTYPE: {self.dtype}")
+
+        os.makedirs(self.path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._collections: dict[str, MmapCollection] = {}
+
+        if hnswlib is None:
+            log.info("hnswlib is not installed, all collections use exact search")
+
+    def _get_collection(self, collection_name: str) -> MmapCollection:
+        # Keep directory names safe, any other name is hashed
+        if re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9._-]*", collection_name):
+            dirname = collection_name
+        else:
+            dirname = hashlib.sha256(collection_name.encode()).hexdigest()
+
+        with self._lock:
+            collection = self._collections.get(dirname)
+            if collection is None:
+                collection = MmapCollection(
+                    os.path.join(self.path, dirname), self.dtype
+                )
+                self._collections[dirname] = collection
+            return collection
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self._get_collection(collection_name).exists()
+
+    def delete_collection(self, collection_name: str):
+        collection = self._get_collection(collection_name)
+        with self._lock:
+            self._collections = {
+                name: pooled
+                for name, pooled in self._collections.items()
+                if pooled is not collection
+            }
+        with collection.lock:
+            shutil.rmtree(collection.path, ignore_errors=True)
+
+    def insert(self, collection_name: str, items: list[VectorItem]):
+        if items:
+            self._get_collection(collection_name).write(items)
+
+    def upsert(self, collection_name: str, items: list[VectorItem]):
+        if items:
+            self._get_collection(collection_name).write(items)
+
+    def search(
+        self, collection_name: str, vectors: list[list[float | int]], limit: int
+    ) -> Optional[SearchResult]:
+        collection = self._get_collection(collection_name)
+        if not collection.exists():
+            return None
+        return collection.search(vectors, limit)
+
+    def query(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        collection = self._get_collection(collection_name)
+        if not collection.exists():
+            return None
+        try:
+            return collection.get(filter=filter, limit=limit)
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        collection = self._get_collection(collection_name)
+        if not collection.exists():
+            return None
+        return collection.get()
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        self._get_collection(collection_name).delete(ids=ids, filter=filter)
+
+    def reset(self):
+        with self._lock:
+            self._collections = {}
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
@@ -86,7 +86,7 @@ class S3VectorClient(VectorDBBase):
             "title",  # Document title
             "page",  # Page number
             "total_pages",  # Total pages in document
-            "embedding_config",  # Embedding configuration
+            "embedding_config_hash",  # Embedding configuration fingerprint
             "created_by",  # User who created it
             "name",  # Document name
             "hash",  # Content hash
@@ -1,4 +1,5 @@
 from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.retrieval.vector.alias import AliasedVectorDBClient
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import (
     VECTOR_DB,
@@ -71,8 +72,13 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
 
                 return WeaviateClient()
+            case VectorType.MMAP:
+                from open_webui.retrieval.vector.dbs.mmap import MmapVectorClient
+
+                return MmapVectorClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+# Knowledge base reindexing swaps collections through aliases
+VECTOR_DB_CLIENT = AliasedVectorDBClient(Vector.get_vector(VECTOR_DB))
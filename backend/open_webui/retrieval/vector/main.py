@@ -1,6 +1,13 @@
+import asyncio
+import weakref
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import anyio
+
+from open_webui.env import VECTOR_DB_THREAD_POOL_SIZE
 
 
 class VectorItem(BaseModel):
@@ -20,6 +27,25 @@ class SearchResult(GetResult):
     distances: Optional[List[List[float | int]]]
 
 
+# Bound the threads running sync vector DB calls, one per event loop as a
+# limiter belongs to the loop it was first used on
+_thread_limiters = weakref.WeakKeyDictionary()
+
+
+async def run_in_vector_db_thread(func: Callable, *args, **kwargs):
+    """Run a blocking vector DB call in the bounded vector DB thread pool."""
+    loop = asyncio.get_running_loop()
+    limiter = _thread_limiters.get(loop)
+    if limiter is None:
+        limiter = _thread_limiters[loop] = anyio.CapacityLimiter(
+            VECTOR_DB_THREAD_POOL_SIZE
+        )
+
+    return await anyio.to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=limiter
+    )
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -29,6 +55,10 @@ class VectorDBBase(ABC):
 
     Any custom vector database integration must inherit from this class and
     implement all abstract methods.
+
+    Every method has an async counterpart prefixed with "a" for callers on the
+    event loop. By default they run the sync method in a bounded thread pool,
+    backends with an async client may override them.
     """
 
     @abstractmethod
@@ -84,3 +114,43 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await run_in_vector_db_thread(self.has_collection, collection_name)
+
+    async def adelete_collection(self, collection_name: str) -> None:
+        return await run_in_vector_db_thread(self.delete_collection, collection_name)
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await run_in_vector_db_thread(self.insert, collection_name, items)
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await run_in_vector_db_thread(self.upsert, collection_name, items)
+
+    async def asearch(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await run_in_vector_db_thread(
+            self.search, collection_name, vectors, limit
+        )
+
+    async def aquery(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await run_in_vector_db_thread(self.query, collection_name, filter, limit)
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        return await run_in_vector_db_thread(self.get, collection_name)
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await run_in_vector_db_thread(
+            self.delete, collection_name, ids=ids, filter=filter
+        )
+
+    async def areset(self) -> None:
+        return await run_in_vector_db_thread(self.reset)
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from open_webui.config import (
+    ENABLE_WEB_CACHE,
+    ENABLE_WEB_CACHE_REDIS,
+    WEB_CACHE_DIR,
+    WEB_CACHE_MAX_SIZE,
+    WEB_CACHE_REDIS_TTL,
+    WEB_LOADER_CACHE_HEURISTIC_TTL,
+)
+from open_webui.retrieval.tiered_cache import TieredCache, create_cache
+
+log = logging.getLogger(__name__)
+
+# Upper bound of the freshness guessed from Last-Modified
+MAX_HEURISTIC_FRESHNESS = 60 * 60 * 24
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.sha256(
+        "\x00".join(parts).encode("utf-8", "surrogatepass")
+    ).hexdigest()
+
+
+def _parse_http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def get_freshness(headers, heuristic_ttl: float) -> Optional[float]:
+    """
+    Seconds a response may be reused without revalidation, from its
+    Cache-Control, Expires and Last-Modified headers, or None if a shared
+    cache must not store it (RFC 9111).
+
+    :param headers: Case-insensitive mapping of response headers
+    :param heuristic_ttl: Freshness of responses without any of those headers
+    """
+    cache_control = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            cache_control[name.lower()] = value.strip('"')
+
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+
+    for directive in ("s-maxage", "max-age"):
+        if directive in cache_control:
+            try:
+                return max(float(cache_control[directive]), 0.0)
+            except ValueError:
+                return 0.0
+
+    now = _parse_http_date(headers.get("Date", "")) or time.time()
+
+    if "Expires" in headers:
+        # An invalid date means already expired
+        expires = _parse_http_date(headers["Expires"])
+        return max(expires - now, 0.0) if expires else 0.0
+
+    last_modified = _parse_http_date(headers.get("Last-Modified", ""))
+    if last_modified:
+        return min(max(now - last_modified, 0.0) * 0.1, MAX_HEURISTIC_FRESHNESS)
+
+    return heuristic_ttl
+
+
+class WebCache(TieredCache):
+    """
+    Cache of web search results, fetched pages and the text extracted from
+    them, shared by all users so that repeated questions don't repeat outbound
+    requests. Pages are reused while fresh per their HTTP caching headers, then
+    revalidated with If-None-Match/If-Modified-Since.
+
+    Entries are zlib-compressed JSON, the disk tier holds up to max_size bytes.
+    """
+
+    name = "web"
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 512 * 1024 * 1024,
+        redis_client=None,
+        redis_ttl: int = 60 * 60 * 24,
+        heuristic_ttl: float = 300,
+    ):
+        """
+        :param path: SQLite database file
+        :param max_size: Bytes kept on disk before evicting
+        :param redis_client: Redis client instance (decode_responses=False) or None
+        :param redis_ttl: Max expiry of entries in the Redis tier
+        :param heuristic_ttl: Freshness of pages without caching headers
+        """
+        self.heuristic_ttl = heuristic_ttl
+        super().__init__(path, max_size, redis_client=redis_client, redis_ttl=redis_ttl)
+
+    def encode(self, entry: dict) -> bytes:
+        return zlib.compress(json.dumps(entry).encode())
+
+    def decode(self, value: bytes) -> dict:
+        return json.loads(zlib.decompress(value))
+
+    ####################################
+    # Search results
+    ####################################
+
+    def get_search_results(self, engine: str, query: str, params: dict):
+        """Return the results of a search still within its TTL, if any."""
+        entry = self.get(f"search:{_hash(engine, query, json.dumps(params))}")
+        if entry is not None and entry["expires_at"] > time.time():
+            return entry["results"]
+        return None
+
+    def set_search_results(
+        self, engine: str, query: str, params: dict, results: list[dict], ttl: int
+    ):
+        self.set(
+            f"search:{_hash(engine, query, json.dumps(params))}",
+            {"results": results, "expires_at": time.time() + ttl},
+            ttl=ttl,
+        )
+
+    ####################################
+    # Pages
+    ####################################
+
+    def get_page(self, url: str) -> Optional[dict]:
+        """
+        Return the cached page of the url, fresh or not:
+        {"body", "etag", "last_modified", "expires_at"}
+        """
+        return self.get(f"page:{_hash(url)}")
+
+    def set_page(self, url: str, body: str, headers, page: Optional[dict] = None):
+        """
+        Store a page fetched (200) or revalidated (304, with page the cached
+        one) with the given response headers, unless they forbid it.
+        """
+        freshness = get_freshness(headers, self.heuristic_ttl)
+        if freshness is None:
+            return
+
+        etag = headers.get("ETag") or (page or {}).get("etag")
+        last_modified = headers.get("Last-Modified") or (page or {}).get(
+            "last_modified"
+        )
+
+        # Without validators, a stale page can't be revalidated, only refetched
+        if not freshness and not etag and not last_modified:
+            return
+
+        self.set(
+            f"page:{_hash(url)}",
+            {
+                "body": body,
+                "etag": etag,
+                "last_modified": last_modified,
+                "expires_at": time.time() + freshness,
+            },
+        )
+
+    def get_page_text(self, url: str, body: str) -> Optional[list]:
+        """Return the (text, metadata) extracted from this body of the url."""
+        entry = self.get(f"text:{_hash(url, _hash(body))}")
+        return entry["text"] if entry is not None else None
+
+    def set_page_text(self, url: str, body: str, text: list):
+        self.set(f"text:{_hash(url, _hash(body))}", {"text": text})
+
+
+def is_page_fresh(page: Optional[dict]) -> bool:
+    return page is not None and page["expires_at"] > time.time()
+
+
+def get_web_cache() -> Optional[WebCache]:
+    if not ENABLE_WEB_CACHE:
+        return None
+
+    return create_cache(
+        WebCache,
+        ENABLE_WEB_CACHE_REDIS,
+        path=os.path.join(WEB_CACHE_DIR, "web.db"),
+        max_size=WEB_CACHE_MAX_SIZE,
+        redis_ttl=WEB_CACHE_REDIS_TTL,
+        heuristic_ttl=WEB_LOADER_CACHE_HEURISTIC_TTL,
+    )
+
+
+WEB_CACHE = get_web_cache()
@@ -25,6 +25,8 @@ from langchain_community.document_loaders import PlaywrightURLLoader, WebBaseLoa
 from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 
+from open_webui.retrieval.cpu_tasks import parse_html_pages
+from open_webui.retrieval.web.cache import WEB_CACHE, is_page_fresh
 from open_webui.retrieval.loaders.tavily import TavilyLoader
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
 from open_webui.constants import ERROR_MESSAGES
@@ -43,6 +45,7 @@ from open_webui.config import (
     WEB_FETCH_FILTER_LIST,
 )
 from open_webui.utils.misc import is_string_allowed
+from open_webui.utils.process_pool import CPU_PROCESS_POOL
 
 log = logging.getLogger(__name__)
 
@@ -560,11 +563,25 @@ class SafeWebBaseLoader(WebBaseLoader):
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
     ) -> str:
+        page = None
+        if WEB_CACHE is not None:
+            page = await asyncio.to_thread(WEB_CACHE.get_page, url)
+            if is_page_fresh(page):
+                return page["body"]
+
         async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
             for i in range(retries):
                 try:
+                    headers = dict(self.session.headers)
+                    if page is not None:
+                        # Revalidate the cached page, 304 if it didn't change
+                        if page.get("etag"):
+                            headers["If-None-Match"] = page["etag"]
+                        if page.get("last_modified"):
+                            headers["If-Modified-Since"] = page["last_modified"]
+
                     kwargs: Dict = dict(
-                        headers=self.session.headers,
+                        headers=headers,
                         cookies=self.session.cookies.get_dict(),
                     )
                     if not self.session.verify:
@@ -575,9 +592,25 @@ class SafeWebBaseLoader(WebBaseLoader):
                         **(self.requests_kwargs | kwargs),
                         allow_redirects=False,
                     ) as response:
+                        if page is not None and response.status == 304:
+                            await asyncio.to_thread(
+                                WEB_CACHE.set_page,
+                                url,
+                                page["body"],
+                                response.headers,
+                                page,
+                            )
+                            return page["body"]
+
                         if self.raise_for_status:
                             response.raise_for_status()
-                        return await response.text()
+                        text = await response.text()
+
+                        if WEB_CACHE is not None and response.status == 200:
+                            await asyncio.to_thread(
+                                WEB_CACHE.set_page, url, text, response.headers
+                            )
+                        return text
                 except aiohttp.ClientConnectionError as e:
                     if i == retries - 1:
                         raise
@@ -631,19 +664,34 @@ class SafeWebBaseLoader(WebBaseLoader):
 
     async def alazy_load(self) -> AsyncIterator[Document]:
         """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
-                )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+        results = await self.fetch_all(self.web_paths)
+        pages = list(zip(self.web_paths, results))
+
+        # Pages fetched before with the same content were already parsed
+        docs = [None] * len(pages)
+        if WEB_CACHE is not None:
+            for idx, (url, body) in enumerate(pages):
+                docs[idx] = await asyncio.to_thread(WEB_CACHE.get_page_text, url, body)
+
+        missing = [idx for idx, doc in enumerate(docs) if doc is None]
+        if missing:
+            # Parsing is CPU-bound, keep it off the event loop
+            self._check_parser(self.default_parser)
+            parsed = await CPU_PROCESS_POOL.run(
+                parse_html_pages,
+                [pages[idx] for idx in missing],
+                None,
+                self.default_parser,
+                self.bs_kwargs,
+                self.bs_get_text_kwargs,
+            )
+            for idx, doc in zip(missing, parsed):
+                docs[idx] = doc
+                if WEB_CACHE is not None and pages[idx][1]:
+                    await asyncio.to_thread(WEB_CACHE.set_page_text, *pages[idx], doc)
+
+        for page_content, metadata in docs:
+            yield Document(page_content=page_content, metadata=metadata)
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
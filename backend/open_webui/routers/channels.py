@@ -109,32 +109,46 @@ async def get_channels(
         )
 
     channels = Channels.get_channels_by_user_id(user.id)
-    channel_list = []
-    for channel in channels:
-        last_message = Messages.get_last_message_by_channel_id(channel.id)
-        last_message_at = last_message.created_at if last_message else None
+    channel_ids = [channel.id for channel in channels]
 
-        channel_member = Channels.get_member_by_channel_and_user_id(channel.id, user.id)
-        unread_count = (
-            Messages.get_unread_message_count(
-                channel.id, user.id, channel_member.last_read_at
-            )
-            if channel_member
-            else 0
-        )
+    last_message_at_by_channel_id = Messages.get_last_message_at_by_channel_ids(
+        channel_ids
+    )
+    unread_count_by_channel_id = Messages.get_unread_message_counts_by_channel_ids(
+        channel_ids, user.id
+    )
+
+    dm_members_by_channel_id = Channels.get_members_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"]
+    )
+    dm_user_ids = list(
+        {
+            member.user_id
+            for members in dm_members_by_channel_id.values()
+            for member in members
+        }
+    )
+    dm_users = {u.id: u for u in Users.get_users_by_user_ids(dm_user_ids)}
+    active_user_ids = Users.get_active_user_ids(dm_user_ids)
 
+    channel_list = []
+    for channel in channels:
         user_ids = None
         users = None
         if channel.type == "dm":
             user_ids = [
                 member.user_id
-                for member in Channels.get_members_by_channel_id(channel.id)
+                for member in dm_members_by_channel_id.get(channel.id, [])
             ]
             users = [
                 UserIdNameStatusResponse(
-                    **{**user.model_dump(), "is_active": Users.is_user_active(user.id)}
+                    **{
+                        **dm_users[user_id].model_dump(),
+                        "is_active": user_id in active_user_ids,
+                    }
                 )
-                for user in Users.get_users_by_user_ids(user_ids)
+                for user_id in user_ids
+                if user_id in dm_users
             ]
 
         channel_list.append(
@@ -142,8 +156,8 @@ async def get_channels(
                 **channel.model_dump(),
                 user_ids=user_ids,
                 users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
+                last_message_at=last_message_at_by_channel_id.get(channel.id),
+                unread_count=unread_count_by_channel_id.get(channel.id, 0),
             )
         )
 
@@ -725,15 +739,52 @@ class MessageUserResponse(MessageResponse):
         return any(bool(val) for val in v.values())
 
 
+def validate_message_cursor(cursor: Optional[str]):
+    """Cursors are "<created_at>:<id>" of the oldest message already loaded."""
+    if cursor is None:
+        return
+
+    created_at, _, message_id = cursor.partition(":")
+    if not created_at.isdigit() or not message_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid cursor"),
+        )
+
+
+def get_message_page_context(message_list, with_replies: bool = True):
+    """
+    Fetch the authors, reactions and (optionally) thread reply stats for a
+    page of messages in a fixed number of queries.
+    """
+    message_ids = [message.id for message in message_list]
+
+    users = {
+        u.id: u
+        for u in Users.get_users_by_user_ids(
+            list({message.user_id for message in message_list})
+        )
+    }
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
+    reply_stats = (
+        Messages.get_thread_reply_stats_by_message_ids(message_ids)
+        if with_replies
+        else {}
+    )
+    return users, reactions, reply_stats
+
+
 @router.get("/{id}/messages", response_model=list[MessageUserResponse])
 async def get_channel_messages(
     request: Request,
     id: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
 ):
     check_channels_access(request)
+    validate_message_cursor(cursor)
     channel = Channels.get_channel_by_id(id)
     if not channel:
         raise HTTPException(
@@ -757,28 +808,26 @@ async def get_channel_messages(
             id, user.id
         )  # Ensure user is a member of the channel
 
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit)
-    users = {}
+    message_list = Messages.get_messages_by_channel_id(id, skip, limit, cursor)
+    users, reactions, reply_stats = get_message_page_context(message_list)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
+        reply_count, latest_reply_at = reply_stats.get(message.id, (0, None))
+        message_user = users.get(message.user_id)
 
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reply_count": reply_count,
+                    "latest_reply_at": latest_reply_at,
+                    "reactions": reactions.get(message.id, []),
+                    "user": (
+                        UserNameResponse(**message_user.model_dump())
+                        if message_user
+                        else None
+                    ),
                 }
             )
         )
@@ -825,20 +874,22 @@ async def get_pinned_channel_messages(
     limit = PAGE_ITEM_COUNT_PINNED
 
     message_list = Messages.get_pinned_messages_by_channel_id(id, skip, limit)
-    users = {}
+    users, reactions, _ = get_message_page_context(message_list, with_replies=False)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
+        message_user = users.get(message.user_id)
 
         messages.append(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reactions": reactions.get(message.id, []),
+                    "user": (
+                        UserNameResponse(**message_user.model_dump())
+                        if message_user
+                        else None
+                    ),
                 }
             )
         )
@@ -1363,9 +1414,11 @@ async def get_channel_thread_messages(
     message_id: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
 ):
     check_channels_access(request)
+    validate_message_cursor(cursor)
     channel = Channels.get_channel_by_id(id)
     if not channel:
         raise HTTPException(
@@ -1385,14 +1438,14 @@ async def get_channel_thread_messages(
                 status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
             )
 
-    message_list = Messages.get_messages_by_parent_id(id, message_id, skip, limit)
-    users = {}
+    message_list = Messages.get_messages_by_parent_id(
+        id, message_id, skip, limit, cursor
+    )
+    users, reactions, _ = get_message_page_context(message_list, with_replies=False)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
+        message_user = users.get(message.user_id)
 
         messages.append(
             MessageUserResponse(
@@ -1400,8 +1453,12 @@ async def get_channel_thread_messages(
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reactions": reactions.get(message.id, []),
+                    "user": (
+                        UserNameResponse(**message_user.model_dump())
+                        if message_user
+                        else None
+                    ),
                 }
             )
         )
@@ -3,7 +3,6 @@ import logging
 from typing import Optional
 
 
-from open_webui.utils.misc import get_message_list
 from open_webui.socket.main import get_event_emitter
 from open_webui.models.chats import (
     ChatForm,
@@ -82,108 +81,9 @@ def get_session_user_chat_usage_stats(
         limit = items_per_page
         skip = (page - 1) * limit
 
-        result = Chats.get_chats_by_user_id(user.id, skip=skip, limit=limit)
-
-        chats = result.items
-        total = result.total
-
-        chat_stats = []
-        for chat in chats:
-            messages_map = chat.chat.get("history", {}).get("messages", {})
-            message_id = chat.chat.get("history", {}).get("currentId")
-
-            if messages_map and message_id:
-                try:
-                    history_models = {}
-                    history_message_count = len(messages_map)
-                    history_user_messages = []
-                    history_assistant_messages = []
-
-                    for message in messages_map.values():
-                        if message.get("role", "") == "user":
-                            history_user_messages.append(message)
-                        elif message.get("role", "") == "assistant":
-                            history_assistant_messages.append(message)
-                            model = message.get("model", None)
-                            if model:
-                                if model not in history_models:
-                                    history_models[model] = 0
-                                history_models[model] += 1
-
-                    average_user_message_content_length = (
-                        sum(
-                            len(message.get("content", ""))
-                            for message in history_user_messages
-                        )
-                        / len(history_user_messages)
-                        if len(history_user_messages) > 0
-                        else 0
-                    )
-                    average_assistant_message_content_length = (
-                        sum(
-                            len(message.get("content", ""))
-                            for message in history_assistant_messages
-                        )
-                        / len(history_assistant_messages)
-                        if len(history_assistant_messages) > 0
-                        else 0
-                    )
-
-                    response_times = []
-                    for message in history_assistant_messages:
-                        user_message_id = message.get("parentId", None)
-                        if user_message_id and user_message_id in messages_map:
-                            user_message = messages_map[user_message_id]
-                            response_time = message.get(
-                                "timestamp", 0
-                            ) - user_message.get("timestamp", 0)
-
-                            response_times.append(response_time)
-
-                    average_response_time = (
-                        sum(response_times) / len(response_times)
-                        if len(response_times) > 0
-                        else 0
-                    )
-
-                    message_list = get_message_list(messages_map, message_id)
-                    message_count = len(message_list)
-
-                    models = {}
-                    for message in reversed(message_list):
-                        if message.get("role") == "assistant":
-                            model = message.get("model", None)
-                            if model:
-                                if model not in models:
-                                    models[model] = 0
-                                models[model] += 1
-
-                            annotation = message.get("annotation", {})
-
-                    chat_stats.append(
-                        {
-                            "id": chat.id,
-                            "models": models,
-                            "message_count": message_count,
-                            "history_models": history_models,
-                            "history_message_count": history_message_count,
-                            "history_user_message_count": len(history_user_messages),
-                            "history_assistant_message_count": len(
-                                history_assistant_messages
-                            ),
-                            "average_response_time": average_response_time,
-                            "average_user_message_content_length": average_user_message_content_length,
-                            "average_assistant_message_content_length": average_assistant_message_content_length,
-                            "tags": chat.meta.get("tags", []),
-                            "last_message_at": message_list[-1].get("timestamp", None),
-                            "updated_at": chat.updated_at,
-                            "created_at": chat.created_at,
-                        }
-                    )
-                except Exception as e:
-                    pass
-
-        return ChatUsageStatsListResponse(items=chat_stats, total=total)
+        return Chats.get_chat_usage_stats_list_by_user_id(
+            user.id, skip=skip, limit=limit
+        )
 
     except Exception as e:
         log.exception(e)
@@ -609,13 +509,14 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
             "content": form_data.content,
         },
     )
+    chat = Chats.get_chat_by_id(id)
 
     event_emitter = get_event_emitter(
         {
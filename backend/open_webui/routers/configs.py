@@ -16,6 +16,7 @@ from open_webui.utils.tools import (
     set_tool_servers,
 )
 from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.session_pool import SESSION_POOL
 from open_webui.models.oauth_sessions import OAuthSessions
 
 
@@ -58,6 +59,16 @@ async def export_config(user=Depends(get_admin_user)):
     return get_config()
 
 
+############################
+# Config Stats
+############################
+
+
+@router.get("/stats", response_model=dict)
+async def get_config_stats(request: Request, user=Depends(get_admin_user)):
+    return request.app.state.config.get_stats()
+
+
 ############################
 # Connections Config
 ############################
@@ -95,6 +106,11 @@ async def set_connections_config(
     }
 
 
+@router.get("/connections/stats", response_model=dict)
+async def get_connections_stats(user=Depends(get_admin_user)):
+    return SESSION_POOL.get_stats()
+
+
 class OAuthClientRegistrationForm(BaseModel):
     url: str
     client_id: str
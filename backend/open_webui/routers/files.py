@@ -1,5 +1,7 @@
 import logging
 import os
+import shutil
+import time
 import uuid
 import json
 from fnmatch import fnmatch
@@ -21,10 +23,16 @@ from fastapi import (
     Query,
 )
 
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, StreamingResponse
+from starlette.datastructures import Headers
+
+from open_webui.config import CACHE_DIR, UPLOAD_CHUNK_SIZE
+from open_webui.env import ENABLE_INGESTION_QUEUE
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
 
 from open_webui.models.channels import Channels
 from open_webui.models.users import Users
@@ -37,9 +45,14 @@ from open_webui.models.files import (
 from open_webui.models.chats import Chats
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.groups import Groups
+from open_webui.models.ingestion_jobs import IngestionJobs, IngestionJobModel
 
 
-from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.routers.retrieval import (
+    ProcessFileForm,
+    delete_blob_extraction,
+    process_file,
+)
 from open_webui.routers.audio import transcribe
 
 from open_webui.storage.provider import Storage
@@ -48,6 +61,11 @@ from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
 from open_webui.utils.misc import strict_match_mime_type
+from open_webui.utils.file_status import (
+    FILE_STATUS,
+    FILE_STATUS_FINAL,
+    update_file_status,
+)
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -109,46 +127,65 @@ def has_access_to_file(
 ############################
 
 
-def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
-    try:
-        if file.content_type:
-            stt_supported_content_types = getattr(
-                request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-            )
+def delete_file_storage(file: FileModel):
+    """
+    Delete the stored contents of a deleted file, unless they are shared
+    with other files.
+    """
+    sha256 = (file.meta or {}).get("sha256")
+    blob = Files.get_blob_by_hash(sha256) if sha256 else None
+    if sha256 is None or Files.release_blob(sha256, file.path):
+        Storage.delete_file(file.path)
 
-            if strict_match_mime_type(stt_supported_content_types, file.content_type):
-                file_path = Storage.get_file(file_path)
-                result = transcribe(request, file_path, file_metadata, user)
+        if blob and blob.path == file.path and blob.extraction_path:
+            delete_blob_extraction(blob.extraction_path)
 
-                process_file(
-                    request,
-                    ProcessFileForm(
-                        file_id=file_item.id, content=result.get("text", "")
-                    ),
-                    user=user,
-                )
-            elif (not file.content_type.startswith(("image/", "video/"))) or (
-                request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-            ):
-                process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
-            else:
-                raise Exception(
-                    f"File type {file.content_type} is not supported for processing"
-                )
-        else:
-            log.info(
-                f"File type {file.content_type} is not provided, but trying to process anyway"
+
+def run_uploaded_file_processing(
+    request, content_type, file_path, file_id, file_metadata, user
+):
+    """
+    Transcribe or extract and embed an uploaded file, raising on failure. Runs
+    in the API process or in an `open-webui worker` process.
+    """
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
+
+        if strict_match_mime_type(stt_supported_content_types, content_type):
+            file_path = Storage.get_file(file_path)
+            result = transcribe(request, file_path, file_metadata, user)
+
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_id, content=result.get("text", "")),
+                user=user,
             )
-            process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
+            process_file(request, ProcessFileForm(file_id=file_id), user=user)
+        else:
+            raise Exception(f"File type {content_type} is not supported for processing")
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        process_file(request, ProcessFileForm(file_id=file_id), user=user)
+
 
+def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
+    try:
+        run_uploaded_file_processing(
+            request, file.content_type, file_path, file_item.id, file_metadata, user
+        )
     except Exception as e:
         log.error(f"Error processing file: {file_item.id}")
-        Files.update_file_data_by_id(
+        update_file_status(
             file_item.id,
-            {
-                "status": "failed",
-                "error": str(e.detail) if hasattr(e, "detail") else str(e),
-            },
+            "failed",
+            error=str(e.detail) if hasattr(e, "detail") else str(e),
         )
 
 
@@ -160,8 +197,13 @@ def upload_file(
     metadata: Optional[dict | str] = Form(None),
     process: bool = Query(True),
     process_in_background: bool = Query(True),
+    priority: int = Query(0),
     user=Depends(get_verified_user),
 ):
+    # Only admins may jump the ingestion queue, users may only yield
+    if user.role != "admin":
+        priority = min(priority, 0)
+
     return upload_file_handler(
         request,
         file=file,
@@ -170,6 +212,7 @@ def upload_file(
         process_in_background=process_in_background,
         user=user,
         background_tasks=background_tasks,
+        priority=priority,
     )
 
 
@@ -181,6 +224,7 @@ def upload_file_handler(
     process_in_background: bool = Query(True),
     user=Depends(get_verified_user),
     background_tasks: Optional[BackgroundTasks] = None,
+    priority: int = 0,
 ):
     log.info(f"file.content_type: {file.content_type} {process}")
 
@@ -219,7 +263,7 @@ def upload_file_handler(
         id = str(uuid.uuid4())
         name = filename
         filename = f"{id}_{filename}"
-        contents, file_path = Storage.upload_file(
+        size, sha256, file_path = Storage.upload_file_stream(
             file.file,
             filename,
             {
@@ -230,6 +274,15 @@ def upload_file_handler(
             },
         )
 
+        # Identical bytes are stored once, shared by all their files
+        blob = Files.acquire_blob(sha256, file_path, size)
+        if blob and blob.path != file_path:
+            try:
+                Storage.delete_file(file_path)
+            except Exception as e:
+                log.warning(f"Failed to delete duplicate of {blob.path}: {e}")
+            file_path = blob.path
+
         file_item = Files.insert_new_file(
             user.id,
             FileForm(
@@ -243,7 +296,8 @@ def upload_file_handler(
                     "meta": {
                         "name": name,
                         "content_type": file.content_type,
-                        "size": len(contents),
+                        "size": size,
+                        "sha256": sha256,
                         "data": file_metadata,
                     },
                 }
@@ -258,7 +312,27 @@ def upload_file_handler(
                 Channels.add_file_to_channel_by_id(channel.id, file_item.id, user.id)
 
         if process:
-            if background_tasks and process_in_background:
+            if ENABLE_INGESTION_QUEUE and process_in_background:
+                # Processed by `open-webui worker`, not by the API process
+                job = IngestionJobs.insert_new_job(
+                    type="process_uploaded_file",
+                    user_id=user.id,
+                    file_id=file_item.id,
+                    payload={
+                        "content_type": file.content_type,
+                        "file_path": file_path,
+                        "file_metadata": file_metadata,
+                    },
+                    priority=priority,
+                )
+                if job is None:
+                    # Nothing would ever pick the file up, don't leave it pending
+                    update_file_status(
+                        file_item.id, "failed", error="Failed to queue file processing"
+                    )
+                    file_item = Files.get_file_by_id(file_item.id) or file_item
+                return {"status": True, **file_item.model_dump()}
+            elif background_tasks and process_in_background:
                 background_tasks.add_task(
                     process_uploaded_file,
                     request,
@@ -296,6 +370,200 @@ def upload_file_handler(
         )
 
 
+############################
+# Resumable Upload
+############################
+
+# Chunks of unfinished uploads, abandoned uploads are removed after a day
+UPLOAD_SESSIONS_DIR = CACHE_DIR / "uploads"
+UPLOAD_SESSION_TTL = 60 * 60 * 24
+
+
+class UploadSessionForm(BaseModel):
+    filename: str
+    size: int
+    content_type: Optional[str] = None
+    metadata: Optional[dict] = None
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    size: int
+    chunk_size: int
+    chunks: int
+    received: list[int] = []
+
+
+def get_upload_session(upload_id: str, user) -> tuple[Path, dict]:
+    try:
+        # Also rules out path traversal through the id
+        upload_id = str(uuid.UUID(upload_id))
+        session_dir = UPLOAD_SESSIONS_DIR / upload_id
+        session = json.loads((session_dir / "session.json").read_text())
+    except (ValueError, OSError):
+        session = None
+
+    if not session or session["user_id"] != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+    return session_dir, session
+
+
+def get_upload_session_response(session_dir: Path, session: dict):
+    return UploadSessionResponse(
+        **session,
+        received=sorted(int(name) for name in os.listdir(session_dir / "chunks")),
+    )
+
+
+def delete_expired_upload_sessions():
+    if not UPLOAD_SESSIONS_DIR.exists():
+        return
+
+    now = time.time()
+    for session_dir in UPLOAD_SESSIONS_DIR.iterdir():
+        try:
+            if now - session_dir.stat().st_mtime > UPLOAD_SESSION_TTL:
+                shutil.rmtree(session_dir, ignore_errors=True)
+        except OSError:
+            pass
+
+
+@router.post("/uploads", response_model=UploadSessionResponse)
+def create_upload_session(
+    request: Request, form_data: UploadSessionForm, user=Depends(get_verified_user)
+):
+    """
+    Start a resumable upload: the file is sent in chunks of `chunk_size` bytes
+    (PUT /uploads/{id}/chunks/{index}), which can be retried individually,
+    then stored with POST /uploads/{id}/complete.
+    """
+    max_size = request.app.state.config.FILE_MAX_SIZE
+    if form_data.size <= 0 or (max_size and form_data.size > max_size * 1024 * 1024):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid file size"),
+        )
+
+    delete_expired_upload_sessions()
+
+    id = str(uuid.uuid4())
+    session = {
+        "id": id,
+        "user_id": user.id,
+        "filename": os.path.basename(form_data.filename),
+        "size": form_data.size,
+        "content_type": form_data.content_type,
+        "metadata": form_data.metadata,
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "chunks": -(-form_data.size // UPLOAD_CHUNK_SIZE),
+    }
+
+    session_dir = UPLOAD_SESSIONS_DIR / id
+    (session_dir / "chunks").mkdir(parents=True)
+    (session_dir / "session.json").write_text(json.dumps(session))
+    # Chunks are written in place, so they can arrive in any order
+    with open(session_dir / "data", "wb") as f:
+        f.truncate(form_data.size)
+
+    return get_upload_session_response(session_dir, session)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+def get_upload_session_by_id(upload_id: str, user=Depends(get_verified_user)):
+    session_dir, session = get_upload_session(upload_id, user)
+    return get_upload_session_response(session_dir, session)
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    request: Request,
+    upload_id: str,
+    index: int,
+    user=Depends(get_verified_user),
+):
+    # The body is streamed on the event loop, file I/O runs in the threadpool
+    session_dir, session = await run_in_threadpool(get_upload_session, upload_id, user)
+    if index < 0 or index >= session["chunks"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid chunk index"),
+        )
+
+    offset = index * session["chunk_size"]
+    expected_size = min(session["chunk_size"], session["size"] - offset)
+
+    received = 0
+    f = await run_in_threadpool(open, session_dir / "data", "r+b")
+    try:
+        await run_in_threadpool(f.seek, offset)
+        async for data in request.stream():
+            received += len(data)
+            if received > expected_size:
+                break
+            await run_in_threadpool(f.write, data)
+    finally:
+        await run_in_threadpool(f.close)
+
+    if received != expected_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                f"Chunk {index} must be {expected_size} bytes"
+            ),
+        )
+
+    await run_in_threadpool((session_dir / "chunks" / str(index)).touch)
+    return await run_in_threadpool(get_upload_session_response, session_dir, session)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=FileModelResponse)
+def complete_upload_session(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    upload_id: str,
+    process: bool = Query(True),
+    process_in_background: bool = Query(True),
+    user=Depends(get_verified_user),
+):
+    session_dir, session = get_upload_session(upload_id, user)
+
+    received = get_upload_session_response(session_dir, session).received
+    missing = sorted(set(range(session["chunks"])) - set(received))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(f"Missing chunks: {missing}"),
+        )
+
+    with open(session_dir / "data", "rb") as f:
+        file_item = upload_file_handler(
+            request,
+            file=UploadFile(
+                file=f,
+                size=session["size"],
+                filename=session["filename"],
+                headers=Headers(
+                    {"content-type": session["content_type"]}
+                    if session["content_type"]
+                    else {}
+                ),
+            ),
+            metadata=session["metadata"],
+            process=process,
+            process_in_background=process_in_background,
+            user=user,
+            background_tasks=background_tasks,
+        )
+
+    # Failed uploads can be completed again until the session expires
+    shutil.rmtree(session_dir, ignore_errors=True)
+    return file_item
+
+
 ############################
 # List Files
 ############################
@@ -369,7 +637,8 @@ async def delete_all_files(user=Depends(get_admin_user)):
     if result:
         try:
             Storage.delete_all_files()
-            VECTOR_DB_CLIENT.reset()
+            await VECTOR_DB_CLIENT.areset()
+            BM25_INDEX.reset()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -413,6 +682,80 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
         )
 
 
+MAX_FILE_PROCESSING_DURATION = 3600 * 2
+
+# Seconds between database re-checks of files whose status has not changed,
+# covering events missed while a node or the pub/sub connection was down
+FILE_STATUS_RECHECK_INTERVAL = 30
+
+
+async def file_status_event_stream(file_ids: list[str], batch: bool = False):
+    """
+    Stream status events of the given files until all of them are completed
+    or failed. Events are pushed by the processing code through FILE_STATUS and
+    only emitted when something changed. Batch events carry the file_id.
+    """
+
+    def to_event(file_id, data):
+        event = {"status": data.get("status")}
+        if event["status"] == "failed":
+            event["error"] = data.get("error")
+        if data.get("progress"):
+            event["progress"] = data["progress"]
+        if batch:
+            event["file_id"] = file_id
+        return event
+
+    with FILE_STATUS.subscribe(file_ids) as queue:
+        last_events = {}
+        pending = set(file_ids)
+
+        def check_files():
+            events = []
+            files = {file.id: file for file in Files.get_files_by_ids(list(pending))}
+            for file_id in list(pending):
+                file = files.get(file_id)
+                status = (file.data or {}).get("status") if file else None
+                if not status:
+                    # Missing file or legacy file without status
+                    pending.discard(file_id)
+                    if batch and not file:
+                        events.append({"file_id": file_id, "status": "not_found"})
+                    continue
+                events.append(to_event(file_id, file.data))
+            return events
+
+        def changed(event):
+            file_id = event.get("file_id") if batch else file_ids[0]
+            if last_events.get(file_id) == event:
+                return False
+            last_events[file_id] = event
+            if event.get("status") in FILE_STATUS_FINAL:
+                pending.discard(file_id)
+            return True
+
+        # Read the current status after subscribing so no transition is missed
+        for event in check_files():
+            if changed(event):
+                yield f"data: {json.dumps(event)}\n\n"
+
+        deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+        while pending and time.monotonic() < deadline:
+            try:
+                data = await asyncio.wait_for(
+                    queue.get(), timeout=FILE_STATUS_RECHECK_INTERVAL
+                )
+                if data.get("file_id") not in pending:
+                    continue
+                events = [to_event(data["file_id"], data)]
+            except asyncio.TimeoutError:
+                events = check_files()
+
+            for event in events:
+                if changed(event):
+                    yield f"data: {json.dumps(event)}\n\n"
+
+
 @router.get("/{id}/process/status")
 async def get_file_process_status(
     id: str, stream: bool = Query(False), user=Depends(get_verified_user)
@@ -431,34 +774,8 @@ async def get_file_process_status(
         or has_access_to_file(id, "read", user)
     ):
         if stream:
-            MAX_FILE_PROCESSING_DURATION = 3600 * 2
-
-            async def event_stream(file_item):
-                if file_item:
-                    for _ in range(MAX_FILE_PROCESSING_DURATION):
-                        file_item = Files.get_file_by_id(file_item.id)
-                        if file_item:
-                            data = file_item.model_dump().get("data", {})
-                            status = data.get("status")
-
-                            if status:
-                                event = {"status": status}
-                                if status == "failed":
-                                    event["error"] = data.get("error")
-
-                                yield f"data: {json.dumps(event)}\n\n"
-                                if status in ("completed", "failed"):
-                                    break
-                            else:
-                                # Legacy
-                                break
-
-                        await asyncio.sleep(0.5)
-                else:
-                    yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
-
             return StreamingResponse(
-                event_stream(file),
+                file_status_event_stream([file.id]),
                 media_type="text/event-stream",
             )
         else:
@@ -470,6 +787,65 @@ async def get_file_process_status(
         )
 
 
+@router.get("/{id}/process/job", response_model=Optional[IngestionJobModel])
+async def get_file_process_job(id: str, user=Depends(get_verified_user)):
+    """
+    Latest ingestion job of the file when ENABLE_INGESTION_QUEUE is set, its
+    status, attempts and last error. Progress within a job is reported by the
+    file status stream.
+    """
+    file = Files.get_file_by_id(id)
+
+    if not file or not (
+        file.user_id == user.id
+        or user.role == "admin"
+        or has_access_to_file(id, "read", user)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    return IngestionJobs.get_latest_job_by_file_id(id)
+
+
+############################
+# Get Files Process Status
+############################
+
+
+@router.get("/process/status")
+async def get_files_process_status(
+    file_ids: list[str] = Query(...), user=Depends(get_verified_user)
+):
+    """
+    Single status stream for many files, e.g. a knowledge base upload, instead
+    of one stream per file. Files the user cannot read are reported as
+    not_found.
+    """
+    file_ids = list(dict.fromkeys(file_ids))
+    files = {file.id: file for file in Files.get_files_by_ids(file_ids)}
+
+    readable_file_ids = [
+        file_id
+        for file_id, file in files.items()
+        if file.user_id == user.id
+        or user.role == "admin"
+        or has_access_to_file(file_id, "read", user)
+    ]
+
+    async def event_stream():
+        for file_id in file_ids:
+            if file_id not in readable_file_ids:
+                yield f"data: {json.dumps({'file_id': file_id, 'status': 'not_found'})}\n\n"
+
+        if readable_file_ids:
+            async for event in file_status_event_stream(readable_file_ids, batch=True):
+                yield event
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 ############################
 # Get File Data Content By Id
 ############################
@@ -745,11 +1121,13 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
         or has_access_to_file(id, "write", user)
     ):
 
+        IngestionJobs.delete_jobs_by_file_id(id)
         result = Files.delete_file_by_id(id)
         if result:
             try:
-                Storage.delete_file(file.path)
-                VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                delete_file_storage(file)
+                await VECTOR_DB_CLIENT.adelete(collection_name=f"file-{id}")
+                BM25_INDEX.delete(collection_name=f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
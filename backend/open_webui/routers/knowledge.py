@@ -1,7 +1,7 @@
 from typing import List, Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from fastapi.concurrency import run_in_threadpool
+import asyncio
 import logging
 
 from open_webui.models.groups import Groups
@@ -13,13 +13,20 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.models.knowledge_reindex import (
+    KnowledgeReindexes,
+    KnowledgeReindexModel,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.reindex import reindex_knowledge_bases
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
     process_files_batch,
     BatchProcessFilesForm,
 )
+from open_webui.routers.files import delete_file_storage
 from open_webui.storage.provider import Storage
 
 from open_webui.constants import ERROR_MESSAGES
@@ -205,52 +212,26 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
 
     knowledge_bases = Knowledges.get_knowledge_bases()
 
-    log.info(f"Starting reindexing for {len(knowledge_bases)} knowledge bases")
-
-    for knowledge_base in knowledge_bases:
-        try:
-            files = Knowledges.get_files_by_id(knowledge_base.id)
-            try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=knowledge_base.id
-                    )
-            except Exception as e:
-                log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
-                continue  # Skip, don't raise
-
-            failed_files = []
-            for file in files:
-                try:
-                    await run_in_threadpool(
-                        process_file,
-                        request,
-                        ProcessFileForm(
-                            file_id=file.id, collection_name=knowledge_base.id
-                        ),
-                        user=user,
-                    )
-                except Exception as e:
-                    log.error(
-                        f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
-                    )
-                    failed_files.append({"file_id": file.id, "error": str(e)})
-                    continue
+    # Searches keep using the current collections until each one is swapped
+    request.app.state.knowledge_reindex_task = asyncio.create_task(
+        reindex_knowledge_bases(
+            request,
+            [knowledge_base.id for knowledge_base in knowledge_bases],
+            user,
+        )
+    )
+    return True
 
-        except Exception as e:
-            log.error(f"Error processing knowledge base {knowledge_base.id}: {str(e)}")
-            # Don't raise, just continue
-            continue
 
-        if failed_files:
-            log.warning(
-                f"Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}"
-            )
-            for failed in failed_files:
-                log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
+@router.get("/reindex/status", response_model=list[KnowledgeReindexModel])
+async def get_reindex_status(user=Depends(get_verified_user)):
+    if user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGES.UNAUTHORIZED,
+        )
 
-    log.info(f"Reindexing completed.")
-    return True
+    return KnowledgeReindexes.get_reindexes()
 
 
 ############################
@@ -507,6 +488,9 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    BM25_INDEX.delete(
+        collection_name=knowledge.id, filter={"file_id": form_data.file_id}
+    )
 
     # Add content to the vector database
     try:
@@ -578,10 +562,14 @@ def remove_file_from_knowledge_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={"file_id": form_data.file_id}
         )  # Remove by file_id first
+        BM25_INDEX.delete(
+            collection_name=knowledge.id, filter={"file_id": form_data.file_id}
+        )
 
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={"hash": file.hash}
         )  # Remove by hash as well in case of duplicates
+        BM25_INDEX.delete(collection_name=knowledge.id, filter={"hash": file.hash})
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -593,13 +581,18 @@ def remove_file_from_knowledge_by_id(
             file_collection = f"file-{form_data.file_id}"
             if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
                 VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+            BM25_INDEX.delete_collection(collection_name=file_collection)
         except Exception as e:
             log.debug("This was most likely caused by bypassing embedding processing")
             log.debug(e)
             pass
 
         # Delete file from database
-        Files.delete_file_by_id(form_data.file_id)
+        if Files.delete_file_by_id(form_data.file_id):
+            try:
+                delete_file_storage(file)
+            except Exception as e:
+                log.warning(f"Failed to delete stored file {file.id}: {e}")
 
     if knowledge:
         return KnowledgeFilesResponse(
@@ -668,7 +661,8 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user)):
 
     # Clean up vector DB
     try:
-        VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        await VECTOR_DB_CLIENT.adelete_collection(collection_name=id)
+        BM25_INDEX.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -701,7 +695,8 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user)):
         )
 
     try:
-        VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        await VECTOR_DB_CLIENT.adelete_collection(collection_name=id)
+        BM25_INDEX.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -52,7 +52,7 @@ async def add_memory(
 
     vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
 
-    VECTOR_DB_CLIENT.upsert(
+    await VECTOR_DB_CLIENT.aupsert(
         collection_name=f"user-memory-{user.id}",
         items=[
             {
@@ -87,7 +87,7 @@ async def query_memory(
 
     vector = await request.app.state.EMBEDDING_FUNCTION(form_data.content, user=user)
 
-    results = VECTOR_DB_CLIENT.search(
+    results = await VECTOR_DB_CLIENT.asearch(
         collection_name=f"user-memory-{user.id}",
         vectors=[vector],
         limit=form_data.k,
@@ -103,7 +103,7 @@ async def query_memory(
 async def reset_memory_from_vector_db(
     request: Request, user=Depends(get_verified_user)
 ):
-    VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+    await VECTOR_DB_CLIENT.adelete_collection(f"user-memory-{user.id}")
 
     memories = Memories.get_memories_by_user_id(user.id)
 
@@ -115,7 +115,7 @@ async def reset_memory_from_vector_db(
         ]
     )
 
-    VECTOR_DB_CLIENT.upsert(
+    await VECTOR_DB_CLIENT.aupsert(
         collection_name=f"user-memory-{user.id}",
         items=[
             {
@@ -145,7 +145,7 @@ async def delete_memory_by_user_id(user=Depends(get_verified_user)):
 
     if result:
         try:
-            VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+            await VECTOR_DB_CLIENT.adelete_collection(f"user-memory-{user.id}")
         except Exception as e:
             log.error(e)
         return True
@@ -174,7 +174,7 @@ async def update_memory_by_id(
     if form_data.content is not None:
         vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
 
-        VECTOR_DB_CLIENT.upsert(
+        await VECTOR_DB_CLIENT.aupsert(
             collection_name=f"user-memory-{user.id}",
             items=[
                 {
@@ -202,7 +202,7 @@ async def delete_memory_by_id(memory_id: str, user=Depends(get_verified_user)):
     result = Memories.delete_memory_by_id_and_user_id(memory_id, user.id)
 
     if result:
-        VECTOR_DB_CLIENT.delete(
+        await VECTOR_DB_CLIENT.adelete(
             collection_name=f"user-memory-{user.id}", ids=[memory_id]
         )
         return True
@@ -1,12 +1,7 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
-
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
@@ -18,6 +13,8 @@ from aiocache import cached
 import requests
 
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import SESSION_POOL
+from open_webui.utils.ollama_router import OLLAMA_ROUTER, OllamaRoute
 from open_webui.models.chats import Chats
 from open_webui.models.users import UserModel
 
@@ -79,7 +76,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with SESSION_POOL.session(url) as session:
             headers = {
                 "Content-Type": "application/json",
                 **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -92,6 +89,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                 url,
                 headers=headers,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
             ) as response:
                 return await response.json()
     except Exception as e:
@@ -103,11 +101,13 @@ async def send_get_request(url, key=None, user: UserModel = None):
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
+    route: Optional[OllamaRoute] = None,
 ):
     if response:
         response.close()
-    if session:
-        await session.close()
+    await SESSION_POOL.release(session)
+    if route:
+        await route.finish()
 
 
 async def send_post_request(
@@ -118,13 +118,12 @@ async def send_post_request(
     content_type: Optional[str] = None,
     user: UserModel = None,
     metadata: Optional[dict] = None,
+    route: Optional[OllamaRoute] = None,
 ):
 
     r = None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = SESSION_POOL.get_session(url)
 
         headers = {
             "Content-Type": "application/json",
@@ -141,9 +140,15 @@ async def send_post_request(
             data=payload,
             headers=headers,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
+        if route:
+            route.first_byte()
 
         if r.ok is False:
+            if route:
+                # Client errors say nothing about the backend's health
+                await route.finish(success=r.status < 500)
             try:
                 res = await r.json()
                 await cleanup_response(r, session)
@@ -170,7 +175,7 @@ async def send_post_request(
                 status_code=r.status,
                 headers=response_headers,
                 background=BackgroundTask(
-                    cleanup_response, response=r, session=session
+                    cleanup_response, response=r, session=session, route=route
                 ),
             )
         else:
@@ -180,6 +185,8 @@ async def send_post_request(
     except HTTPException as e:
         raise e  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
+        if route:
+            await route.finish(success=r is not None and r.status < 500)
         detail = f"Ollama: {e}"
 
         raise HTTPException(
@@ -188,7 +195,7 @@ async def send_post_request(
         )
     finally:
         if not stream:
-            await cleanup_response(r, session)
+            await cleanup_response(r, session, route)
 
 
 def get_api_key(idx, url, configs):
@@ -199,6 +206,18 @@ def get_api_key(idx, url, configs):
     )  # Legacy support
 
 
+async def get_ollama_url_idx(
+    request: Request, url_idxs: list[int], chat_id: Optional[str] = None
+) -> int:
+    """
+    Pick the backend of a model served by several OLLAMA_BASE_URLS,
+    requests of the same chat are kept on the same backend when possible.
+    """
+    urls = [request.app.state.config.OLLAMA_BASE_URLS[idx] for idx in url_idxs]
+    url = await OLLAMA_ROUTER.select(urls, key=chat_id)
+    return url_idxs[urls.index(url)]
+
+
 ##########################################
 #
 # API routes
@@ -273,6 +292,11 @@ async def get_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/routing")
+async def get_routing_stats(request: Request, user=Depends(get_admin_user)):
+    return await OLLAMA_ROUTER.get_stats(request.app.state.config.OLLAMA_BASE_URLS)
+
+
 class OllamaConfigForm(BaseModel):
     ENABLE_OLLAMA_API: Optional[bool] = None
     OLLAMA_BASE_URLS: list[str]
@@ -933,7 +957,7 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
         )
 
-    url_idx = random.choice(models[model]["urls"])
+    url_idx = await get_ollama_url_idx(request, models[model]["urls"])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
@@ -1003,7 +1027,7 @@ async def embed(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = await get_ollama_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1030,12 +1054,18 @@ async def embed(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        r = requests.request(
-            method="POST",
-            url=f"{url}/api/embed",
-            headers=headers,
-            data=form_data.model_dump_json(exclude_none=True).encode(),
-        )
+        r = None
+        route = await OLLAMA_ROUTER.start(url)
+        try:
+            r = requests.request(
+                method="POST",
+                url=f"{url}/api/embed",
+                headers=headers,
+                data=form_data.model_dump_json(exclude_none=True).encode(),
+            )
+            route.first_byte()
+        finally:
+            await route.finish(success=r is not None and r.status_code < 500)
         r.raise_for_status()
 
         data = r.json()
@@ -1085,7 +1115,7 @@ async def embeddings(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = await get_ollama_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1112,12 +1142,18 @@ async def embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        r = requests.request(
-            method="POST",
-            url=f"{url}/api/embeddings",
-            headers=headers,
-            data=form_data.model_dump_json(exclude_none=True).encode(),
-        )
+        r = None
+        route = await OLLAMA_ROUTER.start(url)
+        try:
+            r = requests.request(
+                method="POST",
+                url=f"{url}/api/embeddings",
+                headers=headers,
+                data=form_data.model_dump_json(exclude_none=True).encode(),
+            )
+            route.first_byte()
+        finally:
+            await route.finish(success=r is not None and r.status_code < 500)
         r.raise_for_status()
 
         data = r.json()
@@ -1173,7 +1209,7 @@ async def generate_completion(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = await get_ollama_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1195,6 +1231,7 @@ async def generate_completion(
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        route=await OLLAMA_ROUTER.start(url),
     )
 
 
@@ -1232,7 +1269,12 @@ class GenerateChatCompletionForm(BaseModel):
     )
 
 
-async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] = None):
+async def get_ollama_url(
+    request: Request,
+    model: str,
+    url_idx: Optional[int] = None,
+    chat_id: Optional[str] = None,
+):
     if url_idx is None:
         models = request.app.state.OLLAMA_MODELS
         if model not in models:
@@ -1240,7 +1282,9 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = await get_ollama_url_idx(
+            request, models[model].get("urls", []), chat_id=chat_id
+        )
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1315,7 +1359,12 @@ async def generate_chat_completion(
     if ":" not in payload["model"]:
         payload["model"] = f"{payload['model']}:latest"
 
-    url, url_idx = await get_ollama_url(request, payload["model"], url_idx)
+    url, url_idx = await get_ollama_url(
+        request,
+        payload["model"],
+        url_idx,
+        chat_id=metadata.get("chat_id") if metadata else None,
+    )
     api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
         str(url_idx),
         request.app.state.config.OLLAMA_API_CONFIGS.get(url, {}),  # Legacy support
@@ -1333,6 +1382,7 @@ async def generate_chat_completion(
         content_type="application/x-ndjson",
         user=user,
         metadata=metadata,
+        route=await OLLAMA_ROUTER.start(url),
     )
 
 
@@ -1421,7 +1471,12 @@ async def generate_openai_completion(
     if ":" not in payload["model"]:
         payload["model"] = f"{payload['model']}:latest"
 
-    url, url_idx = await get_ollama_url(request, payload["model"], url_idx)
+    url, url_idx = await get_ollama_url(
+        request,
+        payload["model"],
+        url_idx,
+        chat_id=metadata.get("chat_id") if metadata else None,
+    )
     api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
         str(url_idx),
         request.app.state.config.OLLAMA_API_CONFIGS.get(url, {}),  # Legacy support
@@ -1439,6 +1494,7 @@ async def generate_openai_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        route=await OLLAMA_ROUTER.start(url),
     )
 
 
@@ -1504,7 +1560,12 @@ async def generate_openai_chat_completion(
     if ":" not in payload["model"]:
         payload["model"] = f"{payload['model']}:latest"
 
-    url, url_idx = await get_ollama_url(request, payload["model"], url_idx)
+    url, url_idx = await get_ollama_url(
+        request,
+        payload["model"],
+        url_idx,
+        chat_id=metadata.get("chat_id") if metadata else None,
+    )
     api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
         str(url_idx),
         request.app.state.config.OLLAMA_API_CONFIGS.get(url, {}),  # Legacy support
@@ -1521,6 +1582,7 @@ async def generate_openai_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        route=await OLLAMA_ROUTER.start(url),
     )
 
 
@@ -49,6 +49,7 @@ from open_webui.utils.misc import (
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import SESSION_POOL
 
 
 log = logging.getLogger(__name__)
@@ -64,7 +65,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with SESSION_POOL.session(url) as session:
             headers = {
                 **({"Authorization": f"Bearer {key}"} if key else {}),
             }
@@ -76,6 +77,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                 url,
                 headers=headers,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
             ) as response:
                 return await response.json()
     except Exception as e:
@@ -90,8 +92,7 @@ async def cleanup_response(
 ):
     if response:
         response.close()
-    if session:
-        await session.close()
+    await SESSION_POOL.release(session)
 
 
 def openai_reasoning_model_handler(payload):
@@ -926,9 +927,7 @@ async def generate_chat_completion(
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = SESSION_POOL.get_session(request_url)
 
         r = await session.request(
             method="POST",
@@ -937,6 +936,7 @@ async def generate_chat_completion(
             headers=headers,
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         # Check if response is SSE
@@ -1013,7 +1013,7 @@ async def embeddings(request: Request, form_data: dict, user):
         request, url, key, api_config, user=user
     )
     try:
-        session = aiohttp.ClientSession(trust_env=True)
+        session = SESSION_POOL.get_session(url)
         r = await session.request(
             method="POST",
             url=f"{url}/embeddings",
@@ -1103,7 +1103,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(trust_env=True)
+        session = SESSION_POOL.get_session(request_url)
         r = await session.request(
             method=request.method,
             url=request_url,
@@ -1,3 +1,5 @@
+import gzip
+import io
 import json
 import logging
 import mimetypes
@@ -9,7 +11,7 @@ import re
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Callable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -29,11 +31,6 @@ from pydantic import BaseModel
 import tiktoken
 
 
-from langchain_text_splitters import (
-    RecursiveCharacterTextSplitter,
-    TokenTextSplitter,
-    MarkdownHeaderTextSplitter,
-)
 from langchain_core.documents import Document
 
 from open_webui.models.files import FileModel, FileUpdateForm, Files
@@ -42,13 +39,18 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.embedding_scheduler import EMBEDDING_SCHEDULER
 
 # Document loaders
+from open_webui.retrieval.cpu_tasks import extract_file, split_texts
 from open_webui.retrieval.loaders.main import Loader
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
 from open_webui.retrieval.web.main import SearchResult
+from open_webui.retrieval.web.cache import WEB_CACHE
 from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.retrieval.web.ollama import search_ollama_cloud
 from open_webui.retrieval.web.perplexity_search import search_perplexity_search
@@ -77,6 +79,7 @@ from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
     get_content_from_url,
+    get_embedding_config_hash,
     get_embedding_function,
     get_reranking_function,
     get_model_path,
@@ -91,6 +94,8 @@ from open_webui.utils.misc import (
     sanitize_text_for_db,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.process_pool import CPU_PROCESS_POOL
+from open_webui.utils.file_status import update_file_status, publish_file_progress
 
 from open_webui.config import (
     ENV,
@@ -102,6 +107,10 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    RAG_EMBEDDING_PIPELINE_BATCH_SIZE,
+    RAG_EMBEDDING_PIPELINE_QUEUE_SIZE,
+    WEB_SEARCH_CACHE_TTL,
+    WEB_SEARCH_CACHE_TTL_BY_ENGINE,
 )
 from open_webui.env import (
     DEVICE_TYPE,
@@ -285,6 +294,19 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(request: Request, user=Depends(get_admin_user)):
+    if EMBEDDING_CACHE is None:
+        return {"status": False}
+
+    return {"status": True, **EMBEDDING_CACHE.get_stats()}
+
+
+@router.get("/embedding/scheduler")
+async def get_embedding_scheduler_stats(request: Request, user=Depends(get_admin_user)):
+    return {"status": True, **EMBEDDING_SCHEDULER.get_stats()}
+
+
 class OpenAIConfigForm(BaseModel):
     url: str
     key: str
@@ -1266,6 +1288,51 @@ async def update_rag_config(
 ####################################
 
 
+# Docs split per call to the CPU process pool
+SPLIT_BATCH_SIZE = 16
+
+
+def split_docs(request: Request, docs) -> Iterator[Document]:
+    """
+    Split docs with the configured text splitter, a few at a time, in the CPU
+    process pool.
+    """
+    splitter = {
+        "type": request.app.state.config.TEXT_SPLITTER or "character",
+        "chunk_size": request.app.state.config.CHUNK_SIZE,
+        "chunk_overlap": request.app.state.config.CHUNK_OVERLAP,
+        "encoding_name": str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+    }
+
+    if splitter["type"] == "token":
+        log.info(f"Using token text splitter: {splitter['encoding_name']}")
+        tiktoken.get_encoding(splitter["encoding_name"])
+    elif splitter["type"] == "markdown_header":
+        log.info("Using markdown header text splitter")
+    elif splitter["type"] != "character":
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+    for batch in batch_docs(docs, SPLIT_BATCH_SIZE):
+        chunks = CPU_PROCESS_POOL.run_sync(
+            split_texts,
+            [(doc.page_content, doc.metadata) for doc in batch],
+            splitter,
+        )
+        for page_content, metadata in chunks:
+            yield Document(page_content=page_content, metadata=metadata)
+
+
+def batch_docs(docs, batch_size: int) -> Iterator[list[Document]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1275,7 +1342,22 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
 ) -> bool:
+    """
+    Split, embed and store docs in the collection.
+
+    docs may be any iterable, e.g. pages yielded by Loader.lazy_load. Chunks go
+    through splitting, embedding and storing in batches of
+    RAG_EMBEDDING_PIPELINE_BATCH_SIZE, with the stages running concurrently
+    and at most RAG_EMBEDDING_PIPELINE_QUEUE_SIZE batches waiting between them,
+    so a large document never has all its chunks and embeddings in memory.
+    If a batch fails, the chunks already stored by this call are removed.
+
+    on_progress, if given, is called with (embedded chunks, total chunks) as
+    embedding batches finish, the total grows while docs are still being split.
+    """
+
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
 
@@ -1292,10 +1374,6 @@ def save_docs_to_vector_db(
 
         return ", ".join(docs_info)
 
-    log.debug(
-        f"save_docs_to_vector_db: document {_get_docs_info(docs)} {collection_name}"
-    )
-
     # Check if entries with the same hash (metadata.hash) already exist
     if metadata and "hash" in metadata:
         result = VECTOR_DB_CLIENT.query(
@@ -1309,91 +1387,28 @@ def save_docs_to_vector_db(
                 log.info(f"Document with hash {metadata['hash']} already exists")
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
-    if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
+    batches = batch_docs(
+        split_docs(request, docs) if split else docs,
+        RAG_EMBEDDING_PIPELINE_BATCH_SIZE,
+    )
 
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
+    # Split up front, an empty document must not touch the collection
+    first_batch = next(batches, None)
+    if first_batch is None:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
 
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+    log.debug(
+        f"save_docs_to_vector_db: document {_get_docs_info(first_batch)} {collection_name}"
+    )
 
-    if len(docs) == 0:
-        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    embedding_config_hash = get_embedding_config_hash(embedding_config)
 
-    texts = [sanitize_text_for_db(doc.page_content) for doc in docs]
-    metadatas = [
-        {
-            **doc.metadata,
-            **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
-        }
-        for doc in docs
-    ]
+    new_collection = True
+    inserted_ids = []
 
     try:
         if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
@@ -1401,12 +1416,15 @@ def save_docs_to_vector_db(
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                BM25_INDEX.delete_collection(collection_name=collection_name)
                 log.info(f"deleting existing collection {collection_name}")
             elif add is False:
                 log.info(
                     f"collection {collection_name} already exists, overwrite is False and add is False"
                 )
                 return True
+            else:
+                new_collection = False
 
         log.info(f"generating embeddings for {collection_name}")
         embedding_function = get_embedding_function(
@@ -1440,39 +1458,215 @@ def save_docs_to_vector_db(
             enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
         )
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
-            )
-        )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
+        total = 0
+        embedded = 0
+
+        def embedding_progress(count):
+            nonlocal embedded
+            embedded += count
+            if on_progress:
+                on_progress(embedded, total)
+
+        async def split_stage(queue: asyncio.Queue):
+            nonlocal total
+            batch = first_batch
+            while batch is not None:
+                total += len(batch)
+                await queue.put(batch)
+                # Splitting is CPU-bound, keep the loop free for the other stages
+                batch = await asyncio.to_thread(next, batches, None)
+            await queue.put(None)
+
+        async def embed_stage(queue: asyncio.Queue, insert_queue: asyncio.Queue):
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+
+                texts = [sanitize_text_for_db(doc.page_content) for doc in batch]
+                embeddings = await embedding_function(
+                    list(map(lambda x: x.replace("\n", " "), texts)),
+                    prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                    user=user,
+                    on_progress=embedding_progress,
+                )
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+                await insert_queue.put(
+                    [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "text": text,
+                            "vector": embeddings[idx],
+                            "metadata": {
+                                **batch[idx].metadata,
+                                **(metadata if metadata else {}),
+                                "embedding_config": embedding_config,
+                                "embedding_config_hash": embedding_config_hash,
+                            },
+                        }
+                        for idx, text in enumerate(texts)
+                    ]
+                )
+            await insert_queue.put(None)
 
-        log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+        async def insert_stage(queue: asyncio.Queue):
+            while True:
+                items = await queue.get()
+                if items is None:
+                    break
 
-        log.info(f"added {len(items)} items to collection {collection_name}")
+                await VECTOR_DB_CLIENT.ainsert(
+                    collection_name=collection_name,
+                    items=items,
+                )
+                inserted_ids.extend(item["id"] for item in items)
+                await asyncio.to_thread(
+                    BM25_INDEX.insert,
+                    collection_name=collection_name,
+                    items=items,
+                    new=new_collection,
+                )
+                log.debug(f"added {len(items)} items to collection {collection_name}")
+
+        async def run_pipeline():
+            embed_queue = asyncio.Queue(maxsize=RAG_EMBEDDING_PIPELINE_QUEUE_SIZE)
+            insert_queue = asyncio.Queue(maxsize=RAG_EMBEDDING_PIPELINE_QUEUE_SIZE)
+
+            tasks = [
+                asyncio.create_task(split_stage(embed_queue)),
+                asyncio.create_task(embed_stage(embed_queue, insert_queue)),
+                asyncio.create_task(insert_stage(insert_queue)),
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # A failed stage would leave the others waiting on their queue
+                for task in tasks:
+                    task.cancel()
+
+        if on_progress:
+            on_progress(0, len(first_batch))
+
+        # Run async embedding in sync context
+        asyncio.run(run_pipeline())
+
+        log.info(f"added {len(inserted_ids)} items to collection {collection_name}")
         return True
     except Exception as e:
         log.exception(e)
+        if inserted_ids:
+            # Don't leave a partially stored document behind
+            try:
+                if new_collection:
+                    VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                    BM25_INDEX.delete_collection(collection_name=collection_name)
+                else:
+                    VECTOR_DB_CLIENT.delete(
+                        collection_name=collection_name, ids=inserted_ids
+                    )
+                    BM25_INDEX.delete(collection_name=collection_name, ids=inserted_ids)
+            except Exception as cleanup_error:
+                log.error(
+                    f"Error removing partially stored items from {collection_name}: {cleanup_error}"
+                )
         raise e
 
 
+def get_extraction_key(file: FileModel, loader_config: dict) -> str:
+    return calculate_sha256_string(
+        json.dumps(
+            {
+                **loader_config,
+                "extension": os.path.splitext(file.filename)[1].lower(),
+                "content_type": file.meta.get("content_type"),
+            },
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
+def get_extracted_docs_from_blob(
+    file: FileModel, loader_config: dict
+) -> Optional[list[Document]]:
+    """
+    Return the documents extracted from another file with the same bytes
+    and the same loader settings, if any.
+    """
+    sha256 = file.meta.get("sha256")
+    blob = Files.get_blob_by_hash(sha256) if sha256 else None
+    if (
+        not blob
+        or blob.path != file.path
+        or not blob.extraction_path
+        or blob.extraction_key != get_extraction_key(file, loader_config)
+    ):
+        return None
+
+    try:
+        with gzip.open(Storage.get_file(blob.extraction_path), "rt") as f:
+            docs = json.load(f)
+    except Exception as e:
+        log.warning(f"Failed to read extracted content of blob {sha256}: {e}")
+        return None
+
+    log.info(f"Reusing extracted content of blob {sha256} for file {file.id}")
+    return [
+        Document(page_content=doc["page_content"], metadata=doc["metadata"])
+        for doc in docs
+    ]
+
+
+def save_extracted_docs_to_blob(
+    file: FileModel, loader_config: dict, docs: list[Document]
+):
+    """
+    Store the documents extracted from the file in Storage, next to its blob,
+    for the other files with the same bytes.
+    """
+    sha256 = file.meta.get("sha256")
+    blob = Files.get_blob_by_hash(sha256) if sha256 else None
+    if not blob or blob.path != file.path:
+        return
+
+    key = get_extraction_key(file, loader_config)
+    try:
+        contents = gzip.compress(
+            json.dumps(
+                [
+                    {
+                        "page_content": doc.page_content,
+                        "metadata": filter_metadata(doc.metadata),
+                    }
+                    for doc in docs
+                ],
+                default=str,
+            ).encode()
+        )
+        _, extraction_path = Storage.upload_file(
+            io.BytesIO(contents),
+            f"{sha256}_{key}.extraction.json.gz",
+            {"OpenWebUI-File-Hash": sha256},
+        )
+    except Exception as e:
+        log.warning(f"Failed to save extracted content of file {file.id}: {e}")
+        return
+
+    if not Files.update_blob_extraction_by_hash(sha256, key, extraction_path):
+        # The blob was deleted meanwhile
+        delete_blob_extraction(extraction_path)
+    elif blob.extraction_path and blob.extraction_path != extraction_path:
+        # Extracted with other loader settings
+        delete_blob_extraction(blob.extraction_path)
+
+
+def delete_blob_extraction(extraction_path: str):
+    try:
+        Storage.delete_file(extraction_path)
+    except Exception as e:
+        log.warning(f"Failed to delete extracted content {extraction_path}: {e}")
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
@@ -1510,6 +1704,7 @@ def process_file(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=f"file-{file.id}"
                     )
+                    BM25_INDEX.delete_collection(collection_name=f"file-{file.id}")
                 except:
                     # Audio file upload pipeline
                     pass
@@ -1564,10 +1759,9 @@ def process_file(
                 # Usage: /files/
                 file_path = file.path
                 if file_path:
-                    file_path = Storage.get_file(file_path)
-                    loader = Loader(
+                    update_file_status(file.id, "extracting")
+                    loader_config = dict(
                         engine=request.app.state.config.CONTENT_EXTRACTION_ENGINE,
-                        user=user,
                         DATALAB_MARKER_API_KEY=request.app.state.config.DATALAB_MARKER_API_KEY,
                         DATALAB_MARKER_API_BASE_URL=request.app.state.config.DATALAB_MARKER_API_BASE_URL,
                         DATALAB_MARKER_ADDITIONAL_CONFIG=request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG,
@@ -1597,9 +1791,30 @@ def process_file(
                         MINERU_API_TIMEOUT=request.app.state.config.MINERU_API_TIMEOUT,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
-                    docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
-                    )
+
+                    # Files with identical bytes are only extracted once
+                    docs = get_extracted_docs_from_blob(file, loader_config)
+                    if docs is None:
+                        file_path = Storage.get_file(file_path)
+                        if not loader_config["engine"]:
+                            # Local extraction is CPU-bound, other engines mostly
+                            # wait on their server
+                            docs = [
+                                Document(page_content=page_content, metadata=metadata)
+                                for page_content, metadata in CPU_PROCESS_POOL.run_sync(
+                                    extract_file,
+                                    {"user": user, **loader_config},
+                                    file.filename,
+                                    file.meta.get("content_type"),
+                                    file_path,
+                                )
+                            ]
+                        else:
+                            loader = Loader(user=user, **loader_config)
+                            docs = loader.load(
+                                file.filename, file.meta.get("content_type"), file_path
+                            )
+                        save_extracted_docs_to_blob(file, loader_config, docs)
 
                     docs = [
                         Document(
@@ -1638,7 +1853,7 @@ def process_file(
             Files.update_file_hash_by_id(file.id, hash)
 
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
-                Files.update_file_data_by_id(file.id, {"status": "completed"})
+                update_file_status(file.id, "completed")
                 return {
                     "status": True,
                     "collection_name": None,
@@ -1647,6 +1862,7 @@ def process_file(
                 }
             else:
                 try:
+                    update_file_status(file.id, "embedding")
                     result = save_docs_to_vector_db(
                         request,
                         docs=docs,
@@ -1658,6 +1874,9 @@ def process_file(
                         },
                         add=(True if form_data.collection_name else False),
                         user=user,
+                        on_progress=lambda done, total: publish_file_progress(
+                            file.id, "embedding", done, total
+                        ),
                     )
                     log.info(f"added {len(docs)} items to collection {collection_name}")
 
@@ -1669,10 +1888,7 @@ def process_file(
                             },
                         )
 
-                        Files.update_file_data_by_id(
-                            file.id,
-                            {"status": "completed"},
-                        )
+                        update_file_status(file.id, "completed")
 
                         return {
                             "status": True,
@@ -1687,9 +1903,10 @@ def process_file(
 
         except Exception as e:
             log.exception(e)
-            Files.update_file_data_by_id(
+            update_file_status(
                 file.id,
-                {"status": "failed"},
+                "failed",
+                error=str(e.detail) if hasattr(e, "detail") else str(e),
             )
 
             if "No pandoc was found" in str(e):
@@ -2102,6 +2319,67 @@ def search_web(
         raise Exception("No search engine API key found in environment variables")
 
 
+def search_web_with_cache(
+    request: Request, engine: str, query: str, user=None
+) -> list[SearchResult]:
+    """
+    search_web, with the results of the same query shared across users for
+    WEB_SEARCH_CACHE_TTL (or the engine's WEB_SEARCH_CACHE_TTL_BY_ENGINE) seconds.
+    """
+    try:
+        ttl = int(WEB_SEARCH_CACHE_TTL_BY_ENGINE.get(engine, WEB_SEARCH_CACHE_TTL))
+    except (TypeError, ValueError):
+        ttl = WEB_SEARCH_CACHE_TTL
+
+    if WEB_CACHE is None or ttl <= 0:
+        return search_web(request, engine, query, user)
+
+    params = {
+        "count": request.app.state.config.WEB_SEARCH_RESULT_COUNT,
+        "domain_filter_list": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
+    }
+
+    results = WEB_CACHE.get_search_results(engine, query, params)
+    if results is not None:
+        log.debug(f"Using cached {engine} results for query: {query}")
+        return [SearchResult(**result) for result in results]
+
+    results = search_web(request, engine, query, user)
+    if results:
+        WEB_CACHE.set_search_results(
+            engine, query, params, [dict(result) for result in results if result], ttl
+        )
+    return results
+
+
+def get_web_search_docs_hash(request: Request, docs: list[Document]) -> str:
+    """Fingerprint of the pages and the settings their chunks were embedded with."""
+    return calculate_sha256_string(
+        json.dumps(
+            {
+                "embedding": [
+                    request.app.state.config.RAG_EMBEDDING_ENGINE,
+                    request.app.state.config.RAG_EMBEDDING_MODEL,
+                ],
+                "splitter": [
+                    request.app.state.config.TEXT_SPLITTER,
+                    request.app.state.config.CHUNK_SIZE,
+                    request.app.state.config.CHUNK_OVERLAP,
+                ],
+                "docs": [
+                    [
+                        doc.metadata.get("source"),
+                        calculate_sha256_string(doc.page_content),
+                    ]
+                    for doc in docs
+                ],
+            },
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
@@ -2127,7 +2405,7 @@ async def process_web_search(
             async def search_with_limit(query):
                 async with semaphore:
                     return await run_in_threadpool(
-                        search_web,
+                        search_web_with_cache,
                         request,
                         request.app.state.config.WEB_SEARCH_ENGINE,
                         query,
@@ -2139,7 +2417,7 @@ async def process_web_search(
             # Unlimited parallel execution (previous behavior)
             search_tasks = [
                 run_in_threadpool(
-                    search_web,
+                    search_web_with_cache,
                     request,
                     request.app.state.config.WEB_SEARCH_ENGINE,
                     query,
@@ -2232,17 +2510,41 @@ async def process_web_search(
                 ]
             )
 
-            try:
-                await run_in_threadpool(
-                    save_docs_to_vector_db,
-                    request,
-                    docs,
-                    collection_name,
-                    overwrite=True,
-                    user=user,
+            # The collection is up to date if the same queries last loaded the
+            # same pages, no need to split and embed them again
+            docs_hash = get_web_search_docs_hash(request, docs)
+            cached_collection = (
+                await run_in_threadpool(WEB_CACHE.get, f"collection:{collection_name}")
+                if WEB_CACHE is not None
+                else None
+            )
+
+            if (
+                cached_collection is not None
+                and cached_collection.get("hash") == docs_hash
+                and await VECTOR_DB_CLIENT.ahas_collection(
+                    collection_name=collection_name
                 )
-            except Exception as e:
-                log.debug(f"error saving docs: {e}")
+            ):
+                log.debug(f"Reusing web search collection {collection_name}")
+            else:
+                try:
+                    await run_in_threadpool(
+                        save_docs_to_vector_db,
+                        request,
+                        docs,
+                        collection_name,
+                        overwrite=True,
+                        user=user,
+                    )
+                    if WEB_CACHE is not None:
+                        await run_in_threadpool(
+                            WEB_CACHE.set,
+                            f"collection:{collection_name}",
+                            {"hash": docs_hash},
+                        )
+                except Exception as e:
+                    log.debug(f"error saving docs: {e}")
 
             return {
                 "status": True,
@@ -2278,13 +2580,8 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
-            collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2317,7 +2614,7 @@ async def query_doc_handler(
             query_embedding = await request.app.state.EMBEDDING_FUNCTION(
                 form_data.query, prefix=RAG_EMBEDDING_QUERY_PREFIX, user=user
             )
-            return query_doc(
+            return await query_doc(
                 collection_name=form_data.collection_name,
                 query_embedding=query_embedding,
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
@@ -2427,6 +2724,10 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            BM25_INDEX.delete(
+                collection_name=form_data.collection_name,
+                filter={"hash": hash},
+            )
             return {"status": True}
         else:
             return {"status": False}
@@ -2438,6 +2739,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEX.reset()
     Knowledges.delete_all_knowledge()
 
 
@@ -1,12 +1,14 @@
 import os
 import shutil
 import json
+import hashlib
 import logging
 import re
 from abc import ABC, abstractmethod
 from typing import BinaryIO, Tuple, Dict
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from open_webui.config import (
@@ -25,6 +27,7 @@ from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_KEY,
     STORAGE_PROVIDER,
+    UPLOAD_CHUNK_SIZE,
     UPLOAD_DIR,
 )
 from google.cloud import storage
@@ -37,6 +40,12 @@ from azure.core.exceptions import ResourceNotFoundError
 
 log = logging.getLogger(__name__)
 
+# Smallest part size S3 accepts in a multipart upload (except for the last part)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+# GCS resumable upload chunks must be a multiple of 256 KiB
+GCS_CHUNK_SIZE_MULTIPLE = 256 * 1024
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -49,6 +58,16 @@ class StorageProvider(ABC):
     ) -> Tuple[bytes, str]:
         pass
 
+    def upload_file_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> Tuple[int, str, str]:
+        """
+        Uploads a file without holding its contents in memory.
+        Returns the size, the SHA-256 hex digest and the path of the file.
+        """
+        contents, file_path = self.upload_file(file, filename, tags)
+        return len(contents), hashlib.sha256(contents).hexdigest(), file_path
+
     @abstractmethod
     def delete_all_files(self) -> None:
         pass
@@ -71,6 +90,30 @@ class LocalStorageProvider(StorageProvider):
             f.write(contents)
         return contents, file_path
 
+    @staticmethod
+    def upload_file_stream(
+        file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> Tuple[int, str, str]:
+        """Handles chunked writing of the file to local storage."""
+        file_path = f"{UPLOAD_DIR}/{filename}"
+        size = 0
+        sha256 = hashlib.sha256()
+        try:
+            with open(file_path, "wb") as f:
+                while chunk := file.read(UPLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+        except Exception:
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            raise
+
+        if size == 0:
+            os.remove(file_path)
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        return size, sha256.hexdigest(), file_path
+
     @staticmethod
     def get_file(file_path: str) -> str:
         """Handles downloading of the file from local storage."""
@@ -138,6 +181,13 @@ class S3StorageProvider(StorageProvider):
         self.bucket_name = S3_BUCKET_NAME
         self.key_prefix = S3_KEY_PREFIX if S3_KEY_PREFIX else ""
 
+        # Files above one chunk are sent as a multipart upload read from disk
+        # part by part
+        part_size = max(UPLOAD_CHUNK_SIZE, S3_MIN_PART_SIZE)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size, multipart_chunksize=part_size
+        )
+
     @staticmethod
     def sanitize_tag_value(s: str) -> str:
         """Only include S3 allowed characters."""
@@ -151,21 +201,7 @@ class S3StorageProvider(StorageProvider):
         s3_key = os.path.join(self.key_prefix, filename)
         try:
             self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
-            if S3_ENABLE_TAGGING and tags:
-                sanitized_tags = {
-                    self.sanitize_tag_value(k): self.sanitize_tag_value(v)
-                    for k, v in tags.items()
-                }
-                tagging = {
-                    "TagSet": [
-                        {"Key": k, "Value": v} for k, v in sanitized_tags.items()
-                    ]
-                }
-                self.s3_client.put_object_tagging(
-                    Bucket=self.bucket_name,
-                    Key=s3_key,
-                    Tagging=tagging,
-                )
+            self._put_object_tagging(s3_key, tags)
             return (
                 open(file_path, "rb").read(),
                 f"s3://{self.bucket_name}/{s3_key}",
@@ -173,6 +209,38 @@ class S3StorageProvider(StorageProvider):
         except ClientError as e:
             raise RuntimeError(f"Error uploading file to S3: {e}")
 
+    def upload_file_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> Tuple[int, str, str]:
+        """Handles multipart uploading of the file to S3 storage."""
+        size, sha256, file_path = LocalStorageProvider.upload_file_stream(
+            file, filename, tags
+        )
+        s3_key = os.path.join(self.key_prefix, filename)
+        try:
+            self.s3_client.upload_file(
+                file_path, self.bucket_name, s3_key, Config=self.transfer_config
+            )
+            self._put_object_tagging(s3_key, tags)
+            return size, sha256, f"s3://{self.bucket_name}/{s3_key}"
+        except ClientError as e:
+            raise RuntimeError(f"Error uploading file to S3: {e}")
+
+    def _put_object_tagging(self, s3_key: str, tags: Dict[str, str]) -> None:
+        if S3_ENABLE_TAGGING and tags:
+            sanitized_tags = {
+                self.sanitize_tag_value(k): self.sanitize_tag_value(v)
+                for k, v in tags.items()
+            }
+            tagging = {
+                "TagSet": [{"Key": k, "Value": v} for k, v in sanitized_tags.items()]
+            }
+            self.s3_client.put_object_tagging(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Tagging=tagging,
+            )
+
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from S3 storage."""
         try:
@@ -236,6 +304,12 @@ class GCSStorageProvider(StorageProvider):
             self.gcs_client = storage.Client()
         self.bucket = self.gcs_client.bucket(GCS_BUCKET_NAME)
 
+        # Files above one chunk are sent as a resumable upload
+        self.chunk_size = max(
+            GCS_CHUNK_SIZE_MULTIPLE,
+            UPLOAD_CHUNK_SIZE // GCS_CHUNK_SIZE_MULTIPLE * GCS_CHUNK_SIZE_MULTIPLE,
+        )
+
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
     ) -> Tuple[bytes, str]:
@@ -248,6 +322,20 @@ class GCSStorageProvider(StorageProvider):
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
+    def upload_file_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> Tuple[int, str, str]:
+        """Handles resumable uploading of the file to GCS storage."""
+        size, sha256, file_path = LocalStorageProvider.upload_file_stream(
+            file, filename, tags
+        )
+        try:
+            blob = self.bucket.blob(filename, chunk_size=self.chunk_size)
+            blob.upload_from_filename(file_path)
+            return size, sha256, "gs://" + self.bucket_name + "/" + filename
+        except GoogleCloudError as e:
+            raise RuntimeError(f"Error uploading file to GCS: {e}")
+
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from GCS storage."""
         try:
@@ -296,13 +384,19 @@ class AzureStorageProvider(StorageProvider):
         if storage_key:
             # Configure using the Azure Storage Account Endpoint and Key
             self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=storage_key
+                account_url=self.endpoint,
+                credential=storage_key,
+                max_single_put_size=UPLOAD_CHUNK_SIZE,
+                max_block_size=UPLOAD_CHUNK_SIZE,
             )
         else:
             # Configure using the Azure Storage Account Endpoint and DefaultAzureCredential
             # If the key is not configured, then the DefaultAzureCredential will be used to support Managed Identity authentication
             self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=DefaultAzureCredential()
+                account_url=self.endpoint,
+                credential=DefaultAzureCredential(),
+                max_single_put_size=UPLOAD_CHUNK_SIZE,
+                max_block_size=UPLOAD_CHUNK_SIZE,
             )
         self.container_client = self.blob_service_client.get_container_client(
             self.container_name
@@ -320,6 +414,22 @@ class AzureStorageProvider(StorageProvider):
         except Exception as e:
             raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
 
+    def upload_file_stream(
+        self, file: BinaryIO, filename: str, tags: Dict[str, str]
+    ) -> Tuple[int, str, str]:
+        """Handles block uploading of the file to Azure Blob Storage."""
+        size, sha256, file_path = LocalStorageProvider.upload_file_stream(
+            file, filename, tags
+        )
+        try:
+            blob_client = self.container_client.get_blob_client(filename)
+            # Files above one chunk are staged as blocks read from disk
+            with open(file_path, "rb") as f:
+                blob_client.upload_blob(f, length=size, overwrite=True)
+            return size, sha256, f"{self.endpoint}/{self.container_name}/{filename}"
+        except Exception as e:
+            raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
+
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from Azure Blob Storage."""
         try:
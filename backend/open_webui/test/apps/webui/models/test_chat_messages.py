@@ -0,0 +1,161 @@
+from unittest.mock import patch
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+USER_ID = "chat-messages-test-user"
+
+
+def message(id, parent_id=None, role="user", content="", **data):
+    return {
+        "id": id,
+        "parentId": parent_id,
+        "childrenIds": [],
+        "role": role,
+        "content": content,
+        "timestamp": 1700000000,
+        **data,
+    }
+
+
+class TestChatMessages(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chats import ChatForm, Chats
+
+        self.chats = Chats
+        self.chat = Chats.insert_new_chat(
+            USER_ID,
+            ChatForm(
+                chat={
+                    "title": "chat",
+                    "history": {
+                        "currentId": "m2",
+                        "messages": {
+                            "m1": message("m1", content="Hello"),
+                            "m2": message("m2", "m1", "assistant", "Hi"),
+                        },
+                    },
+                }
+            ),
+        )
+
+    def teardown_method(self):
+        self.chats.delete_chats_by_user_id(USER_ID)
+        super().teardown_method()
+
+    def get_current_id(self):
+        return self.chats.get_chat_by_id(self.chat.id).chat["history"]["currentId"]
+
+    def test_insert_mirrors_messages_to_rows(self):
+        messages = self.chats.get_messages_map_by_chat_id(self.chat.id)
+
+        assert set(messages) == {"m1", "m2"}
+        assert messages["m2"]["content"] == "Hi"
+
+    def test_upsert_existing_message_merges_row(self):
+        result = self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m2", {"content": "Hi there"}
+        )
+
+        assert result["content"] == "Hi there"
+        assert result["role"] == "assistant"
+        chat = self.chats.get_chat_by_id(self.chat.id)
+        assert chat.chat["history"]["messages"]["m2"]["content"] == "Hi there"
+
+    def test_upsert_existing_message_moves_current_id(self):
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m1", {"content": "Hello again"}
+        )
+
+        assert self.get_current_id() == "m1"
+        chat = self.chats.get_chat_by_id(self.chat.id)
+        # Other keys of the chat JSON are left alone
+        assert chat.chat["title"] == "chat"
+
+    def test_upsert_new_message(self):
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m3", message("m3", "m2", content="Bye")
+        )
+
+        assert self.get_current_id() == "m3"
+        stored = self.chats.get_message_by_id_and_message_id(self.chat.id, "m3")
+        assert stored["content"] == "Bye"
+        assert set(self.chats.get_messages_map_by_chat_id(self.chat.id)) == {
+            "m1",
+            "m2",
+            "m3",
+        }
+
+    def test_upsert_missing_chat(self):
+        assert (
+            self.chats.upsert_message_to_chat_by_id_and_message_id(
+                "missing-chat", "m1", {"content": "Hello"}
+            )
+            is None
+        )
+
+    def test_staged_updates_are_overlaid_until_flushed(self):
+        buffer = self.chats.message_buffer
+        with (
+            patch.object(buffer, "interval", 60),
+            patch.object(buffer, "max_updates", 100),
+        ):
+            self.chats.stage_message_to_chat_by_id_and_message_id(
+                self.chat.id, "m2", {"content": "Hi, how"}
+            )
+
+        # Not written through yet, but visible to readers
+        assert (
+            self.chats.get_messages_map_by_chat_id(self.chat.id)["m2"]["content"]
+            == "Hi"
+        )
+        assert (
+            self.chats.get_message_by_id_and_message_id(self.chat.id, "m2")["content"]
+            == "Hi, how"
+        )
+
+        self.chats.flush_message_to_chat_by_id_and_message_id(self.chat.id, "m2")
+        assert (
+            self.chats.get_messages_map_by_chat_id(self.chat.id)["m2"]["content"]
+            == "Hi, how"
+        )
+
+    def test_update_chat_deletes_removed_message_rows(self):
+        chat = self.chats.get_chat_by_id(self.chat.id).chat
+        del chat["history"]["messages"]["m2"]
+        chat["history"]["currentId"] = "m1"
+        self.chats.update_chat_by_id(self.chat.id, chat)
+
+        assert set(self.chats.get_messages_map_by_chat_id(self.chat.id)) == {"m1"}
+
+    def test_add_message_status_and_files(self):
+        self.chats.add_message_status_to_chat_by_id_and_message_id(
+            self.chat.id, "m2", {"action": "web_search", "done": True}
+        )
+        files = self.chats.add_message_files_by_id_and_message_id(
+            self.chat.id, "m2", [{"type": "image", "url": "a.png"}]
+        )
+
+        assert files == [{"type": "image", "url": "a.png"}]
+        stored = self.chats.get_message_by_id_and_message_id(self.chat.id, "m2")
+        assert stored["statusHistory"] == [{"action": "web_search", "done": True}]
+        assert stored["files"] == files
+
+    def test_legacy_chat_is_backfilled_on_first_access(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.chats import ChatMessage
+
+        with get_db() as db:
+            db.query(ChatMessage).filter_by(chat_id=self.chat.id).delete()
+            db.commit()
+
+        result = self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m2", {"content": "Hi there"}
+        )
+
+        assert result["content"] == "Hi there"
+        assert result["parentId"] == "m1"
+        assert set(self.chats.get_messages_map_by_chat_id(self.chat.id)) == {
+            "m1",
+            "m2",
+        }
@@ -0,0 +1,174 @@
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+USER_ID = "chat-stats-test-user"
+
+
+def message(id, parent_id, role, content, timestamp, **data):
+    return {
+        "id": id,
+        "parentId": parent_id,
+        "childrenIds": [],
+        "role": role,
+        "content": content,
+        "timestamp": timestamp,
+        **data,
+    }
+
+
+def chat_body(current_id="m2"):
+    return {
+        "title": "chat",
+        "history": {
+            "currentId": current_id,
+            "messages": {
+                "m1": message("m1", None, "user", "Hello", 100),
+                "m2": message("m2", "m1", "assistant", "Hi", 103, model="llama"),
+                # Regenerated response on another branch
+                "m3": message("m3", "m1", "assistant", "Hey!", 110, model="qwen"),
+            },
+        },
+    }
+
+
+class TestChatStats(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chats import ChatForm, Chats
+
+        self.chats = Chats
+        self.chat = Chats.insert_new_chat(USER_ID, ChatForm(chat=chat_body()))
+
+    def teardown_method(self):
+        self.chats.delete_chats_by_user_id(USER_ID)
+        super().teardown_method()
+
+    def get_stats(self, id=None):
+        from open_webui.internal.db import get_db
+        from open_webui.models.chats import ChatStats
+
+        with get_db() as db:
+            row = db.get(ChatStats, id or self.chat.id)
+            return row.stats if row else None
+
+    def delete_stats(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.chats import ChatStats
+
+        with get_db() as db:
+            db.query(ChatStats).delete()
+            db.commit()
+
+    def test_insert_computes_stats(self):
+        assert self.get_stats() == {
+            "models": {"llama": 1},
+            "message_count": 2,
+            "last_message_at": 103,
+            "history_models": {"llama": 1, "qwen": 1},
+            "history_message_count": 3,
+            "history_user_message_count": 1,
+            "history_assistant_message_count": 2,
+            "user_content_length": 5,
+            "assistant_content_length": 6,
+            "response_time_total": 13,
+            "response_time_count": 2,
+        }
+
+    def test_chat_without_current_message(self):
+        from open_webui.models.chats import ChatForm
+
+        chat = self.chats.insert_new_chat(USER_ID, ChatForm(chat={"title": "empty"}))
+
+        assert self.get_stats(chat.id) is None
+
+    def test_content_change_is_applied_as_delta(self):
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m2", {"content": "Hi there"}
+        )
+
+        stats = self.get_stats()
+        assert stats["assistant_content_length"] == 12
+        assert stats["message_count"] == 2
+
+    def test_new_message_recomputes(self):
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m4", message("m4", "m2", "user", "Thanks", 120)
+        )
+
+        stats = self.get_stats()
+        assert stats["message_count"] == 3
+        assert stats["history_message_count"] == 4
+        assert stats["history_user_message_count"] == 2
+        assert stats["user_content_length"] == 11
+        assert stats["last_message_at"] == 120
+
+    def test_moving_current_message_recomputes(self):
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            self.chat.id, "m3", {"content": "Hey!"}
+        )
+
+        stats = self.get_stats()
+        assert stats["models"] == {"qwen": 1}
+        assert stats["last_message_at"] == 110
+
+    def test_update_chat_recomputes(self):
+        chat = chat_body(current_id="m3")
+        del chat["history"]["messages"]["m2"]
+        self.chats.update_chat_by_id(self.chat.id, chat)
+
+        stats = self.get_stats()
+        assert stats["history_models"] == {"qwen": 1}
+        assert stats["history_message_count"] == 2
+        assert stats["response_time_total"] == 10
+
+    def test_delete_chat_removes_stats(self):
+        self.chats.delete_chat_by_id(self.chat.id)
+
+        assert self.get_stats() is None
+
+    def test_backfill(self):
+        self.delete_stats()
+
+        assert self.chats.backfill_chat_stats(batch_size=1) >= 1
+        assert self.get_stats()["message_count"] == 2
+        # Nothing left to do
+        assert self.chats.backfill_chat_stats() == 0
+
+    def test_usage_stats_list(self):
+        from open_webui.models.chats import ChatForm
+
+        self.chats.insert_new_chat(USER_ID, ChatForm(chat={"title": "empty"}))
+
+        result = self.chats.get_chat_usage_stats_list_by_user_id(USER_ID)
+
+        # Chats without messages are counted but not listed
+        assert result.total == 2
+        assert len(result.items) == 1
+        item = result.items[0]
+        assert item.id == self.chat.id
+        assert item.models == {"llama": 1}
+        assert item.average_response_time == 6.5
+        assert item.average_user_message_content_length == 5
+        assert item.average_assistant_message_content_length == 3
+        assert item.last_message_at == 103
+
+    def test_usage_stats_list_computes_missing_stats(self):
+        self.delete_stats()
+
+        result = self.chats.get_chat_usage_stats_list_by_user_id(USER_ID)
+
+        assert [item.id for item in result.items] == [self.chat.id]
+        assert self.get_stats()["message_count"] == 2
+
+    def test_usage_stats_list_paging(self):
+        from open_webui.models.chats import ChatForm
+
+        self.chats.insert_new_chat(USER_ID, ChatForm(chat=chat_body()))
+
+        assert (
+            len(self.chats.get_chat_usage_stats_list_by_user_id(USER_ID, 0, 1).items)
+            == 1
+        )
+        assert (
+            len(self.chats.get_chat_usage_stats_list_by_user_id(USER_ID, 1, 10).items)
+            == 1
+        )
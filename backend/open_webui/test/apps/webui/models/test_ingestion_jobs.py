@@ -0,0 +1,170 @@
+import time
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class TestIngestionJobs(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.ingestion_jobs import IngestionJobs
+
+        self.jobs = IngestionJobs
+
+    def teardown_method(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.ingestion_jobs import IngestionJob
+
+        with get_db() as db:
+            db.query(IngestionJob).delete()
+            db.commit()
+        super().teardown_method()
+
+    def insert_job(self, user_id="user-1", created_at=None, **kwargs):
+        job = self.jobs.insert_new_job(
+            "process_file", user_id, {"file_id": "file"}, file_id="file", **kwargs
+        )
+        if created_at is not None:
+            self.set_job(job.id, created_at=created_at)
+        return job
+
+    def set_job(self, id, **values):
+        from open_webui.internal.db import get_db
+        from open_webui.models.ingestion_jobs import IngestionJob
+
+        with get_db() as db:
+            db.query(IngestionJob).filter_by(id=id).update(values)
+            db.commit()
+
+    def test_insert_new_job(self):
+        job = self.insert_job()
+
+        assert job.status == "queued"
+        assert job.attempts == 0
+        assert self.jobs.get_job_by_id(job.id) == job
+        assert self.jobs.get_latest_job_by_file_id("file").id == job.id
+
+    def test_claim(self):
+        job = self.insert_job()
+
+        claimed = self.jobs.claim_next_job("worker-1")
+
+        assert claimed.id == job.id
+        assert claimed.status == "running"
+        assert claimed.attempts == 1
+        assert claimed.worker_id == "worker-1"
+        assert claimed.locked_until > time.time()
+        # Leased jobs are not handed out twice
+        assert self.jobs.claim_next_job("worker-2") is None
+
+    def test_claim_empty_queue(self):
+        assert self.jobs.claim_next_job("worker-1") is None
+
+    def test_claim_oldest_first(self):
+        newer = self.insert_job(created_at=200)
+        older = self.insert_job(created_at=100)
+
+        assert self.jobs.claim_next_job("worker-1").id == older.id
+        assert self.jobs.claim_next_job("worker-1").id == newer.id
+
+    def test_claim_highest_priority_first(self):
+        self.insert_job(created_at=100)
+        urgent = self.insert_job(created_at=200, priority=1)
+
+        assert self.jobs.claim_next_job("worker-1").id == urgent.id
+
+    def test_claim_is_fair_across_users(self):
+        self.insert_job("user-1", created_at=100)
+        self.jobs.claim_next_job("worker-1")
+        self.insert_job("user-1", created_at=200)
+        other = self.insert_job("user-2", created_at=300)
+
+        # user-1 already has a job running, user-2 goes first despite being newer
+        assert self.jobs.claim_next_job("worker-2").id == other.id
+
+    def test_claim_is_fair_across_users_with_long_queues(self):
+        from open_webui.models.ingestion_jobs import IngestionJobTable
+
+        for idx in range(IngestionJobTable.CLAIM_CANDIDATES + 12):
+            self.insert_job("user-1", created_at=100 + idx)
+        self.jobs.claim_next_job("worker-1")
+        self.jobs.claim_next_job("worker-1")
+        other = self.insert_job("user-2", created_at=1000)
+
+        # user-2's job is newer than all of user-1's backlog
+        assert self.jobs.claim_next_job("worker-2").id == other.id
+        assert self.jobs.claim_next_job("worker-2").user_id == "user-1"
+
+    def test_claim_skips_backed_off_jobs(self):
+        job = self.insert_job()
+        self.set_job(job.id, run_after=int(time.time()) + 60)
+
+        assert self.jobs.claim_next_job("worker-1") is None
+
+    def test_expired_lease_is_reclaimed(self):
+        job = self.insert_job()
+        self.jobs.claim_next_job("worker-1")
+        self.set_job(job.id, locked_until=int(time.time()) - 1)
+
+        claimed = self.jobs.claim_next_job("worker-2")
+
+        assert claimed.id == job.id
+        assert claimed.worker_id == "worker-2"
+        assert claimed.attempts == 2
+        # The first worker lost its lease
+        assert self.jobs.renew_lease(job.id, "worker-1", 1) is False
+        assert self.jobs.complete_job(job.id, "worker-1", 1) is False
+        assert self.jobs.fail_job(job.id, "worker-1", 1, "error") is None
+        assert self.jobs.get_job_by_id(job.id).status == "running"
+
+    def test_renew_lease(self):
+        job = self.insert_job()
+        claimed = self.jobs.claim_next_job("worker-1")
+        self.set_job(job.id, locked_until=int(time.time()) + 1)
+
+        assert self.jobs.renew_lease(job.id, "worker-1", claimed.attempts) is True
+        assert self.jobs.get_job_by_id(job.id).locked_until > time.time() + 1
+
+    def test_complete_job(self):
+        job = self.insert_job()
+        claimed = self.jobs.claim_next_job("worker-1")
+
+        assert self.jobs.complete_job(job.id, "worker-1", claimed.attempts) is True
+
+        job = self.jobs.get_job_by_id(job.id)
+        assert job.status == "completed"
+        assert job.locked_until is None
+        assert self.jobs.claim_next_job("worker-1") is None
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = self.insert_job()
+        claimed = self.jobs.claim_next_job("worker-1")
+
+        failed = self.jobs.fail_job(job.id, "worker-1", claimed.attempts, "timeout")
+
+        assert failed.status == "queued"
+        assert failed.error == "timeout"
+        assert failed.run_after >= time.time() + 9
+        assert self.jobs.claim_next_job("worker-1") is None
+
+        self.set_job(job.id, run_after=int(time.time()))
+        assert self.jobs.claim_next_job("worker-1").attempts == 2
+
+    def test_job_fails_after_max_attempts(self):
+        job = self.insert_job()
+        self.set_job(job.id, max_attempts=1)
+        claimed = self.jobs.claim_next_job("worker-1")
+
+        failed = self.jobs.fail_job(job.id, "worker-1", claimed.attempts, "error")
+
+        assert failed.status == "failed"
+        assert self.jobs.claim_next_job("worker-1") is None
+
+    def test_delete_finished_jobs(self):
+        done = self.insert_job(created_at=100)
+        queued = self.insert_job(created_at=200)
+        claimed = self.jobs.claim_next_job("worker-1")
+        self.jobs.complete_job(done.id, "worker-1", claimed.attempts)
+
+        assert self.jobs.delete_finished_jobs(int(time.time()) + 1) == 1
+        assert self.jobs.get_job_by_id(done.id) is None
+        assert self.jobs.get_job_by_id(queued.id) is not None
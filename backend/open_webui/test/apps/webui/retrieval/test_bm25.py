@@ -0,0 +1,190 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+COLLECTION = "bm25-test-collection"
+
+
+def item(id, text, **metadata):
+    return {"id": id, "text": text, "metadata": metadata}
+
+
+class TestBM25Documents:
+    def test_tokenize_skips_long_terms(self):
+        from open_webui.retrieval.bm25 import MAX_TERM_LENGTH, tokenize
+
+        assert tokenize("a b  c\nd") == ["a", "b", "c", "d"]
+        assert tokenize("x" * (MAX_TERM_LENGTH + 1) + " y") == ["y"]
+
+    def test_document_terms(self):
+        from open_webui.retrieval.bm25 import get_bm25_document
+
+        document = get_bm25_document(
+            "doc", "apple apple pear", {"name": "apple.txt", "file_id": "f"}
+        )
+
+        assert document.length == 3
+        assert document.terms["apple"][0] == 2
+        assert document.terms["pear"] == (1, 0)
+        # The filename is only in the enriched metadata text
+        assert document.terms["apple.txt"][0] == 0
+        assert document.terms["apple.txt"][1] > 0
+        assert document.meta_length > 0
+
+    def test_document_without_text(self):
+        from open_webui.retrieval.bm25 import get_bm25_document
+
+        document = get_bm25_document("doc", None, None)
+
+        assert document.text == ""
+        assert document.terms == {}
+        assert document.length == 0
+
+
+class TestBM25Index(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.retrieval.bm25 import BM25_INDEX
+
+        self.index = BM25_INDEX
+        self.index.insert(
+            COLLECTION,
+            [
+                item("a", "the quick brown fox", file_id="f1", hash="h1"),
+                item("b", "the lazy dog sleeps", file_id="f1", hash="h1"),
+                item("c", "fox fox hunts the dog", file_id="f2", hash="h2"),
+            ],
+            new=True,
+        )
+
+    def teardown_method(self):
+        self.index.delete_collection(COLLECTION)
+        super().teardown_method()
+
+    def search(self, query, k=10, enriched=False):
+        from open_webui.models.bm25 import BM25Indexes
+        from open_webui.retrieval.bm25 import search_bm25_index
+
+        collection = BM25Indexes.get_collection_by_name(COLLECTION)
+        return [
+            doc.page_content
+            for doc in search_bm25_index(collection, query, k=k, enriched=enriched)
+        ]
+
+    def test_insert_new_collection(self):
+        from open_webui.models.bm25 import BM25Indexes
+
+        collection = BM25Indexes.get_collection_by_name(COLLECTION)
+        assert collection.doc_count == 3
+        assert collection.total_length == 4 + 4 + 5
+
+    def test_insert_into_unindexed_collection_is_skipped(self):
+        from open_webui.models.bm25 import BM25Indexes
+
+        self.index.insert("bm25-test-unindexed", [item("a", "fox")])
+
+        assert BM25Indexes.get_collection_by_name("bm25-test-unindexed") is None
+
+    def test_insert_updates_counts(self):
+        from open_webui.models.bm25 import BM25Indexes
+
+        self.index.insert(COLLECTION, [item("d", "a red fox")])
+
+        collection = BM25Indexes.get_collection_by_name(COLLECTION)
+        assert collection.doc_count == 4
+        assert collection.total_length == 4 + 4 + 5 + 3
+
+    def test_search_ranks_by_term_frequency(self):
+        assert self.search("fox") == [
+            "fox fox hunts the dog",
+            "the quick brown fox",
+        ]
+
+    def test_search_rare_terms_weigh_more(self):
+        # "the" is in every document, "lazy" in one
+        assert self.search("the lazy")[0] == "the lazy dog sleeps"
+
+    def test_search_limit(self):
+        assert len(self.search("the", k=2)) == 2
+
+    def test_search_unknown_term(self):
+        assert self.search("zebra") == []
+
+    def test_search_enriched_metadata(self):
+        self.index.insert(COLLECTION, [item("d", "nothing here", name="report.pdf")])
+
+        assert self.search("report") == []
+        assert self.search("report", enriched=True) == ["nothing here"]
+
+    def test_delete_by_ids(self):
+        self.index.delete(COLLECTION, ids=["c"])
+
+        assert self.search("fox") == ["the quick brown fox"]
+
+    def test_delete_by_file_id(self):
+        self.index.delete(COLLECTION, filter={"file_id": "f1"})
+
+        assert self.search("the") == ["fox fox hunts the dog"]
+
+    def test_delete_by_hash(self):
+        from open_webui.models.bm25 import BM25Indexes
+
+        self.index.delete(COLLECTION, filter={"hash": "h2"})
+
+        assert BM25Indexes.get_collection_by_name(COLLECTION).doc_count == 2
+        assert self.search("hunts") == []
+
+    def test_delete_by_other_filter_drops_index(self):
+        from open_webui.models.bm25 import BM25Indexes
+
+        self.index.delete(COLLECTION, filter={"source": "x"})
+
+        assert BM25Indexes.get_collection_by_name(COLLECTION) is None
+
+    def test_index_is_built_from_vector_db_on_first_use(self):
+        from open_webui.retrieval.bm25 import get_bm25_index
+        from open_webui.retrieval.vector.main import GetResult
+
+        self.index.delete_collection(COLLECTION)
+        result = GetResult(
+            ids=[["x", "y"]],
+            documents=[["red fox", "blue whale"]],
+            metadatas=[[{}, {}]],
+        )
+        with patch("open_webui.retrieval.bm25.VECTOR_DB_CLIENT") as client:
+            client.get.return_value = result
+            collection = get_bm25_index(COLLECTION)
+
+        client.get.assert_called_once_with(collection_name=COLLECTION)
+        assert collection.doc_count == 2
+        assert self.search("whale") == ["blue whale"]
+
+    @pytest.mark.asyncio
+    async def test_index_is_built_from_vector_db_on_first_use_async(self):
+        from open_webui.retrieval.bm25 import aget_bm25_index
+        from open_webui.retrieval.vector.main import GetResult
+
+        self.index.delete_collection(COLLECTION)
+        result = GetResult(
+            ids=[["x", "y"]],
+            documents=[["red fox", "blue whale"]],
+            metadatas=[[{}, {}]],
+        )
+        with patch("open_webui.retrieval.bm25.VECTOR_DB_CLIENT") as client:
+            client.aget = AsyncMock(return_value=result)
+            collection = await aget_bm25_index(COLLECTION)
+            # Built once, then looked up
+            assert (await aget_bm25_index(COLLECTION)).doc_count == 2
+
+        client.aget.assert_awaited_once_with(collection_name=COLLECTION)
+        assert collection.doc_count == 2
+        assert self.search("whale") == ["blue whale"]
+
+    def test_missing_collection_is_not_built(self):
+        from open_webui.retrieval.bm25 import get_bm25_index
+
+        with patch("open_webui.retrieval.bm25.VECTOR_DB_CLIENT") as client:
+            client.get.return_value = None
+            assert get_bm25_index("bm25-test-missing") is None
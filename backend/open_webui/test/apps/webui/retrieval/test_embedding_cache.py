@@ -0,0 +1,104 @@
+from unittest.mock import Mock
+
+import pytest
+
+from open_webui.retrieval.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(path=str(tmp_path / "embeddings.db"), max_entries=10)
+
+
+class TestEmbeddingCache:
+    def test_get_key(self):
+        key = EmbeddingCache.get_key("openai", "model", None, None, "text")
+
+        assert key == EmbeddingCache.get_key("openai", "model", None, None, "text")
+        assert key != EmbeddingCache.get_key("openai", "other", None, None, "text")
+        assert key != EmbeddingCache.get_key("openai", "model", None, "query: ", "text")
+        assert key != EmbeddingCache.get_key("openai", "model", None, None, "other")
+
+    def test_miss_then_hit(self, cache):
+        assert cache.get_many(["a", "b"]) == [None, None]
+
+        cache.set_many({"a": [0.5, 1.0]})
+
+        assert cache.get_many(["a", "b"]) == [[0.5, 1.0], None]
+        stats = cache.get_stats()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+
+    def test_float16_entries(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        cache = EmbeddingCache(path=path, dtype="float16")
+        cache.set_many({"a": [0.1, 0.2]})
+
+        vector = cache.get_many(["a"])[0]
+        assert vector == pytest.approx([0.1, 0.2], abs=1e-3)
+        # Entries keep their dtype when the setting changes
+        vector = EmbeddingCache(path=path, dtype="float32").get_many(["a"])[0]
+        assert vector == pytest.approx([0.1, 0.2], abs=1e-3)
+
+    def test_count_ignores_existing_keys(self, cache):
+        cache.set_many({"a": [1.0], "b": [2.0]})
+        cache.set_many({"a": [1.0], "c": [3.0]})
+
+        assert cache.get_stats()["entries"] == 3
+
+    def test_count_is_loaded_from_disk(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        EmbeddingCache(path=path).set_many({"a": [1.0], "b": [2.0]})
+
+        assert EmbeddingCache(path=path).get_stats()["entries"] == 2
+
+    def test_evicts_least_recently_used(self, cache):
+        cache.set_many({f"old-{i}": [float(i)] for i in range(5)})
+        # Reading the first entry makes it recently used
+        cache.get_many(["old-0"])
+        cache.set_many({f"new-{i}": [float(i)] for i in range(6)})
+
+        stats = cache.get_stats()
+        assert stats["entries"] <= 10
+        assert stats["evictions"] > 0
+        assert cache.get_many(["old-0"]) != [None]
+        assert cache.get_many(["old-1"]) == [None]
+        assert None not in cache.get_many([f"new-{i}" for i in range(6)])
+
+    def test_redis_hits_are_kept_on_disk(self, cache):
+        redis_client = Mock(spec=["mget", "pipeline"])
+        redis_client.mget.return_value = [cache.encode([1.5])]
+        cache.r = redis_client
+
+        assert cache.get_many(["a"]) == [[1.5]]
+        assert cache.get_stats()["redis_hits"] == 1
+
+        cache.r = None
+        assert cache.get_many(["a"]) == [[1.5]]
+
+    def test_writes_go_to_redis(self, cache):
+        redis_client = Mock(spec=["mget", "pipeline"])
+        cache.r = redis_client
+
+        cache.set_many({"a": [1.0]})
+
+        pipe = redis_client.pipeline.return_value
+        pipe.set.assert_called_once()
+        pipe.execute.assert_called_once()
+
+    def test_redis_failures_are_misses(self, cache):
+        redis_client = Mock(spec=["mget", "pipeline"])
+        redis_client.mget.side_effect = Exception("connection refused")
+        redis_client.pipeline.side_effect = Exception("connection refused")
+        cache.r = redis_client
+
+        assert cache.get_many(["a"]) == [None]
+        cache.set_many({"a": [1.0]})
+        assert cache.get_many(["a"]) == [[1.0]]
+
+    def test_disk_failures_are_misses(self, cache):
+        cache._conn.close()
+
+        cache.set_many({"a": [1.0]})
+        assert cache.get_many(["a"]) == [None]
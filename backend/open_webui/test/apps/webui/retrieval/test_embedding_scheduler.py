@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from open_webui.retrieval.embedding_scheduler import EmbeddingScheduler
+
+
+class TestEmbeddingScheduler:
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        scheduler = EmbeddingScheduler(max_concurrency=2)
+        running = 0
+        max_running = 0
+
+        async def fn():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return True
+
+        results = await asyncio.gather(*[scheduler.run("user", fn) for _ in range(6)])
+
+        assert results == [True] * 6
+        assert max_running == 2
+        stats = scheduler.get_stats()
+        assert stats["active"] == 0
+        assert stats["waiting"] == 0
+        assert stats["requests"] == 6
+
+    @pytest.mark.asyncio
+    async def test_throttle_halves_limit_and_successes_grow_it(self):
+        scheduler = EmbeddingScheduler(max_concurrency=8)
+
+        scheduler.throttle()
+        assert scheduler.limit == 4
+        scheduler.throttle()
+        assert scheduler.limit == 2
+
+        async def fn():
+            return True
+
+        # One more slot per `limit` successful requests
+        for _ in range(2):
+            await scheduler.run("user", fn)
+        assert scheduler.limit == 3
+
+        for _ in range(100):
+            await scheduler.run("user", fn)
+        assert scheduler.limit == 8
+        assert scheduler.get_stats()["throttled"] == 2
+
+    def test_throttle_keeps_one_slot(self):
+        scheduler = EmbeddingScheduler(max_concurrency=1)
+
+        scheduler.throttle()
+
+        assert scheduler.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_dont_grow_limit(self):
+        scheduler = EmbeddingScheduler(max_concurrency=4)
+        scheduler.throttle()
+
+        async def fn():
+            return None
+
+        for _ in range(10):
+            await scheduler.run("user", fn)
+
+        assert scheduler.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_exceptions_release_the_slot(self):
+        scheduler = EmbeddingScheduler(max_concurrency=1)
+
+        async def fn():
+            raise ValueError("engine error")
+
+        with pytest.raises(ValueError):
+            await scheduler.run("user", fn)
+
+        assert scheduler.get_stats()["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_round_robin_across_owners(self):
+        scheduler = EmbeddingScheduler(max_concurrency=1)
+        order = []
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+            return True
+
+        def record(name):
+            async def fn():
+                order.append(name)
+                return True
+
+            return fn
+
+        first = asyncio.create_task(scheduler.run("a", blocker))
+        await asyncio.sleep(0)
+
+        tasks = [
+            asyncio.create_task(scheduler.run("a", record(f"a{i}"))) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(scheduler.run("b", record("b0"))))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(first, *tasks)
+
+        assert order == ["a0", "b0", "a1", "a2"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        scheduler = EmbeddingScheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+            return True
+
+        first = asyncio.create_task(scheduler.run("a", blocker))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.run("b", blocker))
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()["waiting"] == 1
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert scheduler.get_stats()["waiting"] == 0
+
+        release.set()
+        await first
+        assert scheduler.get_stats()["active"] == 0
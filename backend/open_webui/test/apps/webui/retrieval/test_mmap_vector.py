@@ -0,0 +1,230 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.vector.dbs import mmap
+from open_webui.retrieval.vector.dbs.mmap import MmapVectorClient, search_brute_force
+
+COLLECTION = "mmap-test-collection"
+
+
+def item(id, vector, text=None, **metadata):
+    return {"id": id, "vector": vector, "text": text or id, "metadata": metadata}
+
+
+ITEMS = [
+    item("x", [1.0, 0.0, 0.0], file_id="f1"),
+    item("y", [0.0, 1.0, 0.0], file_id="f1"),
+    item("z", [0.0, 0.0, 1.0], file_id="f2"),
+    item("xy", [1.0, 1.0, 0.0], file_id="f2"),
+]
+
+
+@pytest.fixture
+def client(tmp_path):
+    with patch.object(mmap, "MMAP_VECTOR_DATA_PATH", str(tmp_path)):
+        yield MmapVectorClient()
+
+
+class TestMmapVectorClient:
+    def test_missing_collection(self, client):
+        assert client.has_collection(COLLECTION) is False
+        assert client.search(COLLECTION, [[1.0, 0.0, 0.0]], 5) is None
+        assert client.query(COLLECTION, {"file_id": "f1"}) is None
+        assert client.get(COLLECTION) is None
+        # Deleting from a missing collection doesn't create it
+        client.delete(COLLECTION, ids=["x"])
+        assert client.has_collection(COLLECTION) is False
+
+    def test_search(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        result = client.search(COLLECTION, [[1.0, 0.1, 0.0]], 2)
+
+        assert result.ids == [["x", "xy"]]
+        assert result.documents == [["x", "xy"]]
+        assert result.metadatas[0][0] == {"file_id": "f1"}
+        # Cosine similarity mapped to [0, 1], best first
+        assert 1.0 >= result.distances[0][0] > result.distances[0][1] > 0.5
+
+    def test_search_many_vectors(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        result = client.search(COLLECTION, [[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], 1)
+
+        assert result.ids == [["x"], ["z"]]
+        assert result.documents == [["x"], ["z"]]
+        assert len(result.distances) == 2
+
+    def test_search_limit_larger_than_collection(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        assert len(client.search(COLLECTION, [[1.0, 0.0, 0.0]], 10).ids[0]) == 4
+
+    def test_dimension_mismatch(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        with pytest.raises(ValueError):
+            client.insert(COLLECTION, [item("w", [1.0, 0.0])])
+
+    def test_get_and_query(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        assert client.get(COLLECTION).ids == [["x", "y", "z", "xy"]]
+        assert client.query(COLLECTION, {"file_id": "f2"}).ids == [["z", "xy"]]
+        assert client.query(COLLECTION, {"file_id": "f1"}, limit=1).ids == [["x"]]
+
+    def test_query_invalid_filter_key(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        assert client.query(COLLECTION, {"file_id') OR (1": "f1"}) is None
+
+    def test_upsert_replaces_rows(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        client.upsert(COLLECTION, [item("x", [0.0, 0.0, 1.0], "moved")])
+
+        assert client.get(COLLECTION).ids == [["y", "z", "xy", "x"]]
+        result = client.search(COLLECTION, [[0.0, 0.0, 1.0]], 2)
+        assert sorted(result.ids[0]) == ["x", "z"]
+        assert "moved" in result.documents[0]
+
+    def test_delete_by_ids(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        client.delete(COLLECTION, ids=["x", "xy"])
+
+        assert client.search(COLLECTION, [[1.0, 0.0, 0.0]], 4).ids[0] == ["y", "z"]
+
+    def test_delete_by_filter(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        client.delete(COLLECTION, filter={"file_id": "f1"})
+
+        assert client.get(COLLECTION).ids == [["z", "xy"]]
+
+    def test_delete_everything(self, client):
+        client.insert(COLLECTION, ITEMS)
+        client.delete(COLLECTION, filter={"file_id": "f1"})
+        client.delete(COLLECTION, filter={"file_id": "f2"})
+
+        assert client.search(COLLECTION, [[1.0, 0.0, 0.0]], 4).ids == [[]]
+        assert client.search(COLLECTION, [[1.0, 0.0, 0.0]] * 2, 4).ids == [[], []]
+
+    def test_delete_collection(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        client.delete_collection(COLLECTION)
+
+        assert client.has_collection(COLLECTION) is False
+        client.insert(COLLECTION, [item("w", [1.0, 0.0])])
+        assert client.get(COLLECTION).ids == [["w"]]
+
+    def test_unsafe_collection_names_are_hashed(self, client):
+        client.insert("../escape", ITEMS)
+
+        assert client.has_collection("../escape") is True
+        assert not os.path.exists(os.path.join(client.path, "..", "escape"))
+
+    def test_reset(self, client):
+        client.insert(COLLECTION, ITEMS)
+
+        client.reset()
+
+        assert client.has_collection(COLLECTION) is False
+
+    def test_float16(self, tmp_path):
+        with (
+            patch.object(mmap, "MMAP_VECTOR_DATA_PATH", str(tmp_path)),
+            patch.object(mmap, "MMAP_VECTOR_DTYPE", "float16"),
+        ):
+            client = MmapVectorClient()
+        client.insert(COLLECTION, ITEMS)
+
+        assert client.search(COLLECTION, [[0.0, 1.0, 0.0]], 1).ids == [["y"]]
+
+    def test_unsupported_dtype(self, tmp_path):
+        with (
+            patch.object(mmap, "MMAP_VECTOR_DATA_PATH", str(tmp_path)),
+            patch.object(mmap, "MMAP_VECTOR_DTYPE", "int8"),
+        ):
+            with pytest.raises(ValueError):
+                MmapVectorClient()
+
+
+class TestMmapCollection:
+    def test_interrupted_write_is_truncated(self, client):
+        client.insert(COLLECTION, ITEMS)
+        collection = client._get_collection(COLLECTION)
+        # Vectors appended by a write that never committed its rows
+        with open(collection.get_vectors_path(0), "ab") as f:
+            f.write(b"\xff" * 100)
+
+        client.insert(COLLECTION, [item("w", [-1.0, 0.0, 0.0])])
+
+        assert os.path.getsize(collection.get_vectors_path(0)) == 5 * 3 * 4
+        assert client.search(COLLECTION, [[-1.0, 0.0, 0.0]], 1).ids == [["w"]]
+
+    def test_compaction(self, client):
+        client.insert(COLLECTION, ITEMS)
+        client.delete(COLLECTION, ids=["x", "y"])
+        collection = client._get_collection(COLLECTION)
+
+        collection._compact()
+
+        assert not os.path.exists(collection.get_vectors_path(0))
+        assert os.path.getsize(collection.get_vectors_path(1)) == 2 * 3 * 4
+        assert client.get(COLLECTION).ids == [["z", "xy"]]
+        assert client.search(COLLECTION, [[1.0, 0.0, 0.0]], 1).ids == [["xy"]]
+
+        # Appends go to the new epoch
+        client.insert(COLLECTION, [item("x", [1.0, 0.0, 0.0])])
+        assert client.search(COLLECTION, [[1.0, 0.0, 0.0]], 1).ids == [["x"]]
+
+    def test_compaction_is_triggered_by_deletes(self, client):
+        client.insert(COLLECTION, ITEMS)
+        collection = client._get_collection(COLLECTION)
+
+        with (
+            patch.object(mmap, "COMPACTION_MIN_DELETED", 2),
+            patch.object(collection, "_start") as start,
+        ):
+            client.delete(COLLECTION, ids=["x"])
+            start.assert_not_called()
+
+            client.delete(COLLECTION, ids=["y"])
+            start.assert_called_once_with(collection._compact, "_compacting")
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+    def test_brute_force_search_in_chunks(self, chunk_size):
+        matrix = mmap.normalize(np.random.default_rng(0).normal(size=(10, 4)))
+        deleted = np.zeros(10, dtype=bool)
+        deleted[[2, 5]] = True
+        query = matrix[2]
+
+        with patch.object(mmap, "SEARCH_CHUNK_SIZE", chunk_size):
+            rows, scores = search_brute_force(matrix, query, 3, deleted)
+
+        expected = [row for row in np.argsort(-(matrix @ query)) if not deleted[row]]
+        assert rows.tolist() == expected[:3]
+        assert list(scores) == sorted(scores, reverse=True)
+
+    def test_hnsw_search(self, client):
+        pytest.importorskip("hnswlib")
+        vectors = np.random.default_rng(0).normal(size=(200, 8))
+        client.insert(
+            COLLECTION,
+            [item(str(idx), vector.tolist()) for idx, vector in enumerate(vectors)],
+        )
+        client.delete(COLLECTION, ids=["0"])
+        collection = client._get_collection(COLLECTION)
+
+        with patch.object(mmap, "MMAP_VECTOR_HNSW_THRESHOLD", 100):
+            collection._build_hnsw()
+            result = client.search(COLLECTION, [vectors[1].tolist()], 5)
+
+        assert collection._hnsw is not None
+        assert result.ids[0][0] == "1"
+        assert "0" not in result.ids[0]
@@ -0,0 +1,401 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+KNOWLEDGE_ID = "reindex-test-knowledge"
+
+
+def file(id, hash=None):
+    return SimpleNamespace(id=id, filename=f"{id}.txt", hash=hash or f"hash-{id}")
+
+
+class TestReindexBase(AbstractPostgresTest):
+    def teardown_method(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.knowledge_reindex import KnowledgeReindex
+        from open_webui.models.vector_aliases import VectorCollectionAlias
+
+        with get_db() as db:
+            db.query(KnowledgeReindex).delete()
+            db.query(VectorCollectionAlias).delete()
+            db.commit()
+        super().teardown_method()
+
+    def set_reindex(self, **values):
+        from open_webui.internal.db import get_db
+        from open_webui.models.knowledge_reindex import KnowledgeReindex
+
+        with get_db() as db:
+            db.query(KnowledgeReindex).filter_by(knowledge_id=KNOWLEDGE_ID).update(
+                values
+            )
+            db.commit()
+
+
+class TestKnowledgeReindexes(TestReindexBase):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.knowledge_reindex import KnowledgeReindexes
+
+        self.reindexes = KnowledgeReindexes
+
+    def test_start(self):
+        reindex = self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+
+        assert reindex.status == "running"
+        assert reindex.collection_name == "collection-1"
+        assert reindex.total == 3
+        assert reindex.failed_files == []
+
+    def test_start_while_running(self):
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+
+        assert self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-2", 3) is None
+
+    def test_restart_finished(self):
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+        self.reindexes.update_progress(KNOWLEDGE_ID, 3, [{"file_id": "a"}])
+        self.reindexes.finish_reindex(KNOWLEDGE_ID, "failed")
+
+        reindex = self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-2", 4)
+
+        assert reindex.status == "running"
+        assert reindex.collection_name == "collection-2"
+        assert reindex.done == 0
+        assert reindex.failed_files == []
+
+    def test_claim_interrupted(self):
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+        self.set_reindex(updated_at=100)
+
+        reindex = self.reindexes.claim_reindex(KNOWLEDGE_ID, 200, 5)
+
+        assert reindex.collection_name == "collection-1"
+        assert reindex.total == 5
+        assert reindex.updated_at > 200
+        # The heartbeat moved, nobody else can claim it
+        assert self.reindexes.claim_reindex(KNOWLEDGE_ID, 200, 5) is None
+
+    def test_claim_alive(self):
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+
+        assert (
+            self.reindexes.claim_reindex(KNOWLEDGE_ID, int(time.time()) - 90, 3) is None
+        )
+
+    def test_claim_finished(self):
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+        self.reindexes.finish_reindex(KNOWLEDGE_ID, "completed")
+        self.set_reindex(updated_at=100)
+
+        assert self.reindexes.claim_reindex(KNOWLEDGE_ID, 200, 3) is None
+
+    def test_heartbeat(self):
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 3)
+        self.set_reindex(updated_at=100)
+        assert [
+            reindex.knowledge_id
+            for reindex in self.reindexes.get_stale_running_reindexes(200)
+        ] == [KNOWLEDGE_ID]
+
+        assert self.reindexes.heartbeat(KNOWLEDGE_ID) is True
+        assert self.reindexes.get_stale_running_reindexes(200) == []
+
+        self.reindexes.finish_reindex(KNOWLEDGE_ID, "completed")
+        assert self.reindexes.heartbeat(KNOWLEDGE_ID) is False
+
+
+class TestAliasedVectorDBClient(TestReindexBase):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.retrieval.vector.alias import AliasedVectorDBClient
+
+        self.backend = MagicMock()
+        self.client = AliasedVectorDBClient(self.backend)
+
+    def test_unaliased_names(self):
+        self.client.search(KNOWLEDGE_ID, [[0.1]], 5)
+
+        self.backend.search.assert_called_once_with(KNOWLEDGE_ID, [[0.1]], 5)
+
+    def test_swap_collection(self):
+        assert self.client.swap_collection(KNOWLEDGE_ID, "collection-1") == (
+            KNOWLEDGE_ID
+        )
+        self.client.get(KNOWLEDGE_ID)
+        self.backend.get.assert_called_once_with("collection-1")
+
+        assert (
+            self.client.swap_collection(KNOWLEDGE_ID, "collection-2") == "collection-1"
+        )
+        assert self.client.resolve(KNOWLEDGE_ID) == "collection-2"
+
+    def test_swap_is_seen_by_other_processes_after_refresh(self):
+        from open_webui.retrieval.vector.alias import AliasedVectorDBClient
+
+        other = AliasedVectorDBClient(self.backend, refresh_interval=60)
+        assert other.resolve(KNOWLEDGE_ID) == KNOWLEDGE_ID
+
+        self.client.swap_collection(KNOWLEDGE_ID, "collection-1")
+
+        assert other.resolve(KNOWLEDGE_ID) == KNOWLEDGE_ID
+        other._refresh(force=True)
+        assert other.resolve(KNOWLEDGE_ID) == "collection-1"
+
+    def test_delete_collection_drops_alias(self):
+        self.client.swap_collection(KNOWLEDGE_ID, "collection-1")
+
+        self.client.delete_collection(KNOWLEDGE_ID)
+
+        self.backend.delete_collection.assert_called_once_with("collection-1")
+        assert self.client.resolve(KNOWLEDGE_ID) == KNOWLEDGE_ID
+
+    def test_reset_drops_aliases(self):
+        self.client.swap_collection(KNOWLEDGE_ID, "collection-1")
+
+        self.client.reset()
+
+        self.backend.reset.assert_called_once()
+        assert self.client.resolve(KNOWLEDGE_ID) == KNOWLEDGE_ID
+
+
+class TestRunReindex(TestReindexBase):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.knowledge_reindex import KnowledgeReindexes
+        from open_webui.retrieval.reindex import get_embedding_config
+        from open_webui.retrieval.utils import get_embedding_config_hash
+
+        self.reindexes = KnowledgeReindexes
+        self.reindexes.start_reindex(KNOWLEDGE_ID, "collection-1", 2)
+
+        self.request = SimpleNamespace(
+            app=SimpleNamespace(
+                state=SimpleNamespace(
+                    config=SimpleNamespace(
+                        RAG_EMBEDDING_ENGINE="openai",
+                        RAG_EMBEDDING_MODEL="text-embedding-3-small",
+                    )
+                )
+            )
+        )
+        self.config_hash = get_embedding_config_hash(get_embedding_config(self.request))
+
+        # Chunk metadata by collection, KNOWLEDGE_ID is the live collection
+        self.collections = {}
+        self.vector_db_client = MagicMock(refresh_interval=0)
+        self.vector_db_client.has_collection.side_effect = (
+            lambda collection_name: collection_name in self.collections
+        )
+        self.vector_db_client.get.side_effect = lambda collection_name: (
+            SimpleNamespace(
+                documents=[["text"] * len(self.collections[collection_name])],
+                metadatas=[self.collections[collection_name]],
+            )
+        )
+        self.vector_db_client.delete.side_effect = self.delete_chunks
+        self.vector_db_client.client.has_collection.return_value = True
+        self.vector_db_client.swap_collection.return_value = KNOWLEDGE_ID
+        self.files = [file("a"), file("b")]
+
+        self.patches = [
+            patch(
+                "open_webui.retrieval.reindex.VECTOR_DB_CLIENT", self.vector_db_client
+            ),
+            patch("open_webui.retrieval.reindex.BM25_INDEX"),
+            patch(
+                "open_webui.retrieval.reindex.Knowledges.get_files_by_id",
+                side_effect=lambda knowledge_id: self.files,
+            ),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        for p in self.patches:
+            p.stop()
+        super().teardown_method()
+
+    def add_chunk(self, collection_name, file, config_hash=None):
+        self.collections.setdefault(collection_name, []).append(
+            {
+                "file_id": file.id,
+                "hash": file.hash,
+                "embedding_config_hash": config_hash or self.config_hash,
+            }
+        )
+
+    def delete_chunks(self, collection_name, filter):
+        self.collections[collection_name] = [
+            metadata
+            for metadata in self.collections[collection_name]
+            if metadata["file_id"] != filter["file_id"]
+        ]
+
+    async def run_reindex(self, error_file_ids=(), during=None):
+        from open_webui.retrieval.reindex import run_reindex
+
+        def index_file(request, file, collection_name, user, chunks=None):
+            if file.id in error_file_ids:
+                raise Exception("embedding engine unavailable")
+            self.add_chunk(collection_name, file)
+            if during:
+                during(file)
+
+        index_file = MagicMock(side_effect=index_file)
+        with patch("open_webui.retrieval.reindex.index_file", index_file):
+            await run_reindex(
+                self.request, KNOWLEDGE_ID, "collection-1", self.files, None
+            )
+        return index_file
+
+    def get_indexed(self, index_file):
+        return [
+            (call.args[1].id, call.args[4] is not None)
+            for call in index_file.call_args_list
+        ]
+
+    @pytest.mark.asyncio
+    async def test_swaps_in_new_collection(self):
+        index_file = await self.run_reindex()
+
+        assert self.get_indexed(index_file) == [("a", False), ("b", False)]
+        self.vector_db_client.swap_collection.assert_called_once_with(
+            KNOWLEDGE_ID, "collection-1"
+        )
+        # The previous collection is dropped after the grace period
+        self.vector_db_client.client.delete_collection.assert_called_once_with(
+            collection_name=KNOWLEDGE_ID
+        )
+        reindex = self.reindexes.get_reindex_by_knowledge_id(KNOWLEDGE_ID)
+        assert reindex.status == "completed"
+        assert reindex.done == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_file_keeps_live_collection(self):
+        await self.run_reindex(error_file_ids=["b"])
+
+        self.vector_db_client.swap_collection.assert_not_called()
+        # The partial collection is dropped instead
+        self.vector_db_client.client.delete_collection.assert_called_once_with(
+            collection_name="collection-1"
+        )
+        reindex = self.reindexes.get_reindex_by_knowledge_id(KNOWLEDGE_ID)
+        assert reindex.status == "failed"
+        assert reindex.failed_files == [
+            {"file_id": "b", "error": "embedding engine unavailable"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_indexed_files(self):
+        self.add_chunk("collection-1", self.files[0])
+
+        index_file = await self.run_reindex()
+
+        assert self.get_indexed(index_file) == [("b", False)]
+
+    @pytest.mark.asyncio
+    async def test_resume_reindexes_changed_files(self):
+        self.add_chunk("collection-1", self.files[0])
+        self.files[0].hash = "changed"
+
+        index_file = await self.run_reindex()
+
+        assert self.get_indexed(index_file) == [("a", False), ("b", False)]
+        assert [m["hash"] for m in self.collections["collection-1"]] == [
+            "changed",
+            "hash-b",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_are_copied(self):
+        self.add_chunk(KNOWLEDGE_ID, self.files[0])
+        self.add_chunk(KNOWLEDGE_ID, file("b", hash="old"))
+
+        index_file = await self.run_reindex()
+
+        # Only b changed since it was indexed
+        assert self.get_indexed(index_file) == [("a", True), ("b", False)]
+
+    @pytest.mark.asyncio
+    async def test_files_of_another_embedding_model_are_not_copied(self):
+        self.add_chunk(KNOWLEDGE_ID, self.files[0], config_hash="other-model")
+
+        index_file = await self.run_reindex()
+
+        assert self.get_indexed(index_file) == [("a", False), ("b", False)]
+
+    @pytest.mark.asyncio
+    async def test_files_updated_during_reindex_are_caught_up(self):
+        def during(indexed_file):
+            if indexed_file.id == "b" and self.files[0].hash == "hash-a":
+                # The update goes to the live collection
+                self.files[0] = file("a", hash="updated")
+                self.add_chunk(KNOWLEDGE_ID, self.files[0])
+
+        index_file = await self.run_reindex(during=during)
+
+        assert self.get_indexed(index_file) == [
+            ("a", False),
+            ("b", False),
+            ("a", True),
+        ]
+        assert {m["hash"] for m in self.collections["collection-1"]} == {
+            "updated",
+            "hash-b",
+        }
+        self.vector_db_client.swap_collection.assert_called_once()
+
+
+class TestIsCollectionCurrent:
+    def get_request(self, model="text-embedding-3-small"):
+        return SimpleNamespace(
+            app=SimpleNamespace(
+                state=SimpleNamespace(
+                    config=SimpleNamespace(
+                        RAG_EMBEDDING_ENGINE="openai", RAG_EMBEDDING_MODEL=model
+                    )
+                )
+            )
+        )
+
+    def is_current(self, request, metadatas, files):
+        from open_webui.retrieval.reindex import is_collection_current
+
+        with patch("open_webui.retrieval.reindex.VECTOR_DB_CLIENT") as client:
+            client.has_collection.return_value = bool(metadatas)
+            client.get.return_value = SimpleNamespace(
+                documents=[["text"] * len(metadatas)], metadatas=[metadatas]
+            )
+            return is_collection_current(request, KNOWLEDGE_ID, files)
+
+    def test_current(self):
+        from open_webui.retrieval.reindex import get_embedding_config
+        from open_webui.retrieval.utils import get_embedding_config_hash
+
+        request = self.get_request()
+        config_hash = get_embedding_config_hash(get_embedding_config(request))
+        metadatas = [
+            {
+                "file_id": "a",
+                "hash": "hash-a",
+                # Stringified by most vector DBs
+                "embedding_config": str(get_embedding_config(request)),
+                "embedding_config_hash": config_hash,
+            }
+        ]
+
+        assert self.is_current(request, metadatas, [file("a")]) is True
+        assert self.is_current(request, metadatas, [file("a", "new")]) is False
+        assert self.is_current(request, metadatas, [file("a"), file("b")]) is False
+        assert self.is_current(self.get_request("other"), metadatas, [file("a")]) is (
+            False
+        )
+
+    def test_empty(self):
+        assert self.is_current(self.get_request(), [], []) is True
+        assert self.is_current(self.get_request(), [], [file("a")]) is False
@@ -0,0 +1,93 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from open_webui.retrieval.web.cache import WebCache, get_freshness
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return WebCache(path=str(tmp_path / "web.db"), max_size=1000)
+
+
+class TestWebCache:
+    def test_miss_then_hit(self, cache):
+        assert cache.get("a") is None
+
+        cache.set("a", {"body": "text"})
+
+        assert cache.get("a") == {"body": "text"}
+        stats = cache.get_stats()
+        assert 0 < stats["size"] < 1000
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_replacing_entry_updates_size(self, cache):
+        cache.set("a", {"body": "x" * 10})
+        size = cache.get_stats()["size"]
+
+        cache.set("a", {"body": "x" * 10})
+
+        assert cache.get_stats()["size"] == size
+
+    def test_evicts_least_recently_used_by_size(self, cache):
+        entries = {f"entry-{i}": {"body": os.urandom(100).hex()} for i in range(6)}
+        # Room for 5 entries
+        cache.max_size = 5 * len(cache.encode(entries["entry-0"])) + 10
+
+        for i in range(4):
+            cache.set(f"entry-{i}", entries[f"entry-{i}"])
+        # Reading the first entry makes it recently used
+        cache.get("entry-0")
+        for i in range(4, 6):
+            cache.set(f"entry-{i}", entries[f"entry-{i}"])
+
+        stats = cache.get_stats()
+        assert stats["size"] <= cache.max_size
+        assert stats["evictions"] > 0
+        assert cache.get("entry-0") is not None
+        assert cache.get("entry-1") is None
+        assert cache.get("entry-5") is not None
+
+    def test_ttl_bounds_redis_expiry(self, cache):
+        redis_client = Mock(spec=["mget", "pipeline"])
+        cache.r = redis_client
+        pipe = redis_client.pipeline.return_value
+
+        cache.set("a", {"results": []}, ttl=60)
+        assert pipe.set.call_args.kwargs["ex"] == 60
+
+        # Entries that are already stale only go to disk
+        pipe.set.reset_mock()
+        cache.set("b", {"results": []}, ttl=0)
+        pipe.set.assert_not_called()
+        assert cache.get("b") == {"results": []}
+
+    def test_redis_hits_are_kept_on_disk(self, cache):
+        redis_client = Mock(spec=["mget", "pipeline"])
+        redis_client.mget.return_value = [cache.encode({"body": "text"})]
+        cache.r = redis_client
+
+        assert cache.get("a") == {"body": "text"}
+        assert cache.get_stats()["redis_hits"] == 1
+
+        cache.r = None
+        assert cache.get("a") == {"body": "text"}
+
+    def test_invalid_entries_are_misses(self, cache):
+        cache._set_disk({"a": b"not zlib"})
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["misses"] == 1
+
+
+class TestGetFreshness:
+    def test_max_age(self):
+        assert get_freshness({"Cache-Control": "public, max-age=60"}, 300) == 60
+
+    def test_no_store(self):
+        assert get_freshness({"Cache-Control": "no-store"}, 300) is None
+
+    def test_heuristic(self):
+        assert get_freshness({}, 300) == 300
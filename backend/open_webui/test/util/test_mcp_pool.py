@@ -0,0 +1,112 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.pool import MCPSessionPool, PooledMCPClient
+
+
+async def connect(self, url, headers=None):
+    self._url = url
+    self._headers = headers
+    self.session = object()
+
+
+async def disconnect(self):
+    self.session = None
+    self.closed = True
+
+
+class TestMCPSessionPool:
+    def setup_method(self):
+        self.pool = MCPSessionPool(idle_timeout=0, health_check_interval=60)
+        self.sleep = AsyncMock()
+        self.patches = [
+            patch.object(PooledMCPClient, "connect", connect),
+            patch.object(PooledMCPClient, "disconnect", disconnect),
+            patch("open_webui.utils.mcp.pool.asyncio.sleep", self.sleep),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def teardown_method(self):
+        for p in self.patches:
+            p.stop()
+
+    async def acquire(self, headers=None):
+        # Bound to the test's event loop
+        self.pool._loop = asyncio.get_running_loop()
+        return await self.pool.acquire("server", "http://mcp", headers)
+
+    async def reap_once(self):
+        # Stop the reaper after its first pass
+        self.sleep.side_effect = [None, asyncio.CancelledError()]
+        with pytest.raises(asyncio.CancelledError):
+            await self.pool._reap()
+
+    @pytest.mark.asyncio
+    async def test_acquire_reuses_client(self):
+        client = await self.acquire({"a": "b"})
+
+        assert await self.acquire({"a": "b"}) is client
+        assert client.refs == 2
+        # Other credentials get a session of their own
+        assert await self.acquire({"a": "c"}) is not client
+
+    @pytest.mark.asyncio
+    async def test_reaper_skips_held_clients(self):
+        client = await self.acquire()
+        client.last_used = time.monotonic() - 10
+
+        await self.reap_once()
+        assert client.closed is False
+
+        self.pool.release(client)
+        client.last_used = time.monotonic() - 10
+        await self.reap_once()
+        assert client.closed is True
+
+    @pytest.mark.asyncio
+    async def test_reaper_skips_clients_with_calls_in_flight(self):
+        client = await self.acquire()
+        self.pool.release(client)
+        called = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def call_tool(self, function_name, function_args):
+            called.set()
+            await finish.wait()
+            return {"ok": True}
+
+        with patch.object(MCPClient, "call_tool", call_tool):
+            call = asyncio.create_task(client.call_tool("tool", {}))
+            await called.wait()
+            client.last_used = time.monotonic() - 10
+
+            await self.reap_once()
+            assert client.closed is False
+
+            finish.set()
+            assert await call == {"ok": True}
+        assert client.refs == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_client_calls_through_pool(self):
+        client = await self.acquire({"a": "b"})
+        await client.disconnect()
+        clients = []
+
+        async def call_tool(self, function_name, function_args):
+            clients.append(self)
+            return {"ok": True}
+
+        with patch.object(MCPClient, "call_tool", call_tool):
+            assert await client.call_tool("tool", {}) == {"ok": True}
+
+        reconnected = clients[0]
+        assert reconnected is not client
+        assert reconnected.closed is False
+        assert reconnected.refs == 0
+        assert await self.acquire({"a": "b"}) is reconnected
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import Mock
+
+from open_webui.utils.message_buffer import MessageBuffer
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_store():
+    MessageBuffer._memory_store.clear()
+    yield
+    MessageBuffer._memory_store.clear()
+
+
+class TestMessageBuffer:
+    def test_stage_coalesces_updates(self):
+        buffer = MessageBuffer(redis_client=None, interval=60, max_updates=10)
+
+        assert buffer.stage("chat", "msg", {"content": "Hel"}) is None
+        assert buffer.stage("chat", "msg", {"content": "Hello"}) is None
+        assert buffer.stage("chat", "msg", {"done": False}) is None
+
+        assert buffer.get("chat", "msg") == {"content": "Hello", "done": False}
+
+    def test_stage_flushes_on_max_updates(self):
+        buffer = MessageBuffer(redis_client=None, interval=60, max_updates=3)
+
+        assert buffer.stage("chat", "msg", {"content": "a"}) is None
+        assert buffer.stage("chat", "msg", {"content": "ab"}) is None
+        assert buffer.stage("chat", "msg", {"content": "abc"}) == {"content": "abc"}
+
+        # Flushed entries are cleared
+        assert buffer.get("chat", "msg") is None
+
+    def test_stage_flushes_on_interval(self):
+        buffer = MessageBuffer(redis_client=None, interval=0, max_updates=100)
+
+        assert buffer.stage("chat", "msg", {"content": "a"}) == {"content": "a"}
+        assert buffer.get("chat", "msg") is None
+
+    def test_pop(self):
+        buffer = MessageBuffer(redis_client=None, interval=60, max_updates=100)
+
+        buffer.stage("chat", "msg", {"content": "a"})
+        assert buffer.pop("chat", "msg") == {"content": "a"}
+        assert buffer.pop("chat", "msg") is None
+
+    def test_redis_backend(self):
+        store = {}
+        redis_client = Mock()
+        redis_client.get.side_effect = lambda key: store.get(key)
+        redis_client.set.side_effect = lambda key, value, ex=None: store.update(
+            {key: value}
+        )
+        redis_client.delete.side_effect = lambda key: store.pop(key, None)
+
+        buffer = MessageBuffer(redis_client=redis_client, interval=60, max_updates=10)
+        buffer.stage("chat", "msg", {"content": "a"})
+
+        assert len(store) == 1
+        assert MessageBuffer._memory_store == {}
+        assert buffer.get("chat", "msg") == {"content": "a"}
+        assert buffer.pop("chat", "msg") == {"content": "a"}
+        assert store == {}
+
+    def test_redis_failure_falls_back_to_memory(self):
+        redis_client = Mock()
+        redis_client.get.side_effect = Exception("connection refused")
+        redis_client.set.side_effect = Exception("connection refused")
+        redis_client.delete.side_effect = Exception("connection refused")
+
+        buffer = MessageBuffer(redis_client=redis_client, interval=60, max_updates=10)
+        buffer.stage("chat", "msg", {"content": "a"})
+
+        assert buffer.get("chat", "msg") == {"content": "a"}
@@ -0,0 +1,215 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from open_webui.utils.ollama_router import STICKY_MAX_SKEW, OllamaRouter
+
+URLS = ["http://ollama-a:11434", "http://ollama-b:11434"]
+A, B = URLS
+
+
+def get_router(**kwargs):
+    return OllamaRouter(redis_client=None, **kwargs)
+
+
+class TestOllamaRouterSelection:
+    @pytest.mark.asyncio
+    async def test_single_backend(self):
+        router = get_router()
+
+        assert await router.select([A]) == A
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding(self):
+        router = get_router()
+        await router.start(A)
+
+        assert await router.select(URLS) == B
+
+    @pytest.mark.asyncio
+    async def test_finished_requests_are_not_outstanding(self):
+        router = get_router()
+        route = await router.start(A)
+        await router.start(B)
+        await route.finish()
+        # Only the first call counts
+        await route.finish()
+
+        assert await router.get_in_flight(URLS) == {A: 0, B: 1}
+        assert await router.select(URLS) == A
+
+    @pytest.mark.asyncio
+    async def test_latency_prefers_lower_expected_wait(self):
+        router = get_router(strategy="latency")
+        router._record_latency(A, 2.0)
+        router._record_latency(B, 0.5)
+        await router.start(B)
+
+        # 0.5s * 2 requests is still faster than 2s * 1 request
+        assert await router.select(URLS) == B
+
+        await router.start(B)
+        await router.start(B)
+        await router.start(B)
+        assert await router.select(URLS) == A
+
+    def test_latency_moving_average(self):
+        router = get_router()
+        router._record_latency(A, 1.0)
+        router._record_latency(A, 2.0)
+
+        assert router._get_stats(A)["latency"] == pytest.approx(1.3)
+
+
+class TestOllamaRouterSticky:
+    @pytest.mark.asyncio
+    async def test_same_key_same_backend(self):
+        router = get_router()
+        url = await router.select(URLS, key="chat")
+        await router.start(url)
+
+        # The other backend is less loaded, but the chat stays
+        assert await router.select(URLS, key="chat") == url
+
+    @pytest.mark.asyncio
+    async def test_overloaded_sticky_backend_is_abandoned(self):
+        router = get_router()
+        url = await router.select(URLS, key="chat")
+        for _ in range(STICKY_MAX_SKEW + 1):
+            await router.start(url)
+
+        other = await router.select(URLS, key="chat")
+        assert other != url
+        # The chat moves to the new backend
+        await router.start(other)
+        assert await router.select(URLS, key="chat") == other
+
+    @pytest.mark.asyncio
+    async def test_expired_assignment(self):
+        router = get_router()
+        router._sticky["chat"] = (A, time.time() - 1)
+        await router.start(A)
+
+        assert await router.select(URLS, key="chat") == B
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        router = get_router(sticky_ttl=0)
+        await router.select(URLS, key="chat")
+
+        assert router._sticky == {}
+
+
+class TestOllamaRouterEjection:
+    @pytest.mark.asyncio
+    async def test_backend_is_ejected_after_consecutive_errors(self):
+        router = get_router(eject_errors=2, eject_duration=60)
+        for _ in range(2):
+            await (await router.start(A)).finish(success=False)
+        await router.start(B)
+        await router.start(B)
+
+        assert await router.select(URLS) == B
+        stats = await router.get_stats(URLS)
+        assert stats["backends"][A]["ejected"] is True
+        assert stats["backends"][A]["errors"] == 2
+        assert stats["backends"][B]["ejected"] is False
+
+    @pytest.mark.asyncio
+    async def test_success_resets_consecutive_errors(self):
+        router = get_router(eject_errors=2)
+        await (await router.start(A)).finish(success=False)
+        await (await router.start(A)).finish(success=True)
+        await (await router.start(A)).finish(success=False)
+
+        stats = await router.get_stats(URLS)
+        assert stats["backends"][A]["ejected"] is False
+        assert 0 < stats["backends"][A]["error_rate"] < 1
+
+    @pytest.mark.asyncio
+    async def test_ejection_ends(self):
+        router = get_router(eject_errors=1)
+        await (await router.start(A)).finish(success=False)
+        router._get_stats(A)["ejected_until"] = time.time() - 1
+        await router.start(B)
+
+        assert await router.select(URLS) == A
+
+    @pytest.mark.asyncio
+    async def test_all_backends_ejected(self):
+        router = get_router(eject_errors=1, eject_duration=60)
+        for url in URLS:
+            await (await router.start(url)).finish(success=False)
+
+        assert await router.select(URLS) in URLS
+
+    @pytest.mark.asyncio
+    async def test_eject_disabled(self):
+        router = get_router(eject_errors=0)
+        for _ in range(5):
+            await (await router.start(A)).finish(success=False)
+
+        assert (await router.get_stats(URLS))["backends"][A]["ejected"] is False
+
+
+class TestOllamaRouterRedis:
+    def get_redis(self):
+        redis_client = MagicMock()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[0, 3, 0, 1])
+        redis_client.pipeline.return_value = pipe
+        redis_client.get = AsyncMock(return_value=None)
+        redis_client.set = AsyncMock()
+        redis_client.zrem = AsyncMock()
+        return redis_client
+
+    @pytest.mark.asyncio
+    async def test_outstanding_requests_are_shared(self):
+        redis_client = self.get_redis()
+        router = OllamaRouter(redis_client=redis_client)
+
+        assert await router.get_in_flight(URLS) == {A: 3, B: 1}
+        assert await router.select(URLS) == B
+
+    @pytest.mark.asyncio
+    async def test_requests_are_tracked_in_redis(self):
+        redis_client = self.get_redis()
+        router = OllamaRouter(redis_client=redis_client)
+
+        route = await router.start(A)
+        assert route.redis is True
+        assert router._in_flight == {}
+
+        await route.finish()
+        redis_client.zrem.assert_awaited_once_with(router._in_flight_key(A), route.id)
+
+    @pytest.mark.asyncio
+    async def test_sticky_assignment_is_shared(self):
+        redis_client = self.get_redis()
+        redis_client.get.return_value = A
+        router = OllamaRouter(redis_client=redis_client)
+
+        # A is busier, but within the allowed skew
+        assert await router.select(URLS, key="chat") == A
+        redis_client.set.assert_awaited_once_with(
+            router._sticky_key("chat"), A, ex=router.sticky_ttl
+        )
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_memory_when_redis_fails(self):
+        redis_client = MagicMock()
+        redis_client.pipeline.side_effect = Exception("connection refused")
+        redis_client.get = AsyncMock(side_effect=Exception("connection refused"))
+        redis_client.set = AsyncMock(side_effect=Exception("connection refused"))
+        router = OllamaRouter(redis_client=redis_client)
+
+        route = await router.start(A)
+        assert route.redis is False
+        assert await router.get_in_flight(URLS) == {A: 1, B: 0}
+
+        assert await router.select(URLS, key="chat") == B
+        assert router._sticky["chat"][0] == B
+
+        await route.finish()
+        assert await router.get_in_flight(URLS) == {A: 0, B: 0}
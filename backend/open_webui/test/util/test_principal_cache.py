@@ -0,0 +1,211 @@
+from unittest.mock import Mock
+
+from open_webui.utils.principal_cache import PrincipalCache
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class FakeRedis:
+    """Just enough of a Redis client for the principal cache, shared by nodes"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1)
+        return int(self.data[key])
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def __getattr__(self, name):
+                return lambda *args: self.commands.append((name, args))
+
+            def execute(self):
+                return [getattr(redis, name)(*args) for name, args in self.commands]
+
+        return Pipeline()
+
+
+class TestPrincipalCache:
+    def test_hit_after_load(self):
+        cache = PrincipalCache(redis_client=None)
+        load = Mock(return_value={"id": "1"})
+
+        assert cache.get("user", "1", load) == {"id": "1"}
+        assert cache.get("user", "1", load) == {"id": "1"}
+
+        load.assert_called_once()
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_none_is_not_cached(self):
+        cache = PrincipalCache(redis_client=None)
+        load = Mock(return_value=None)
+
+        assert cache.get("user", "1", load) is None
+        assert cache.get("user", "1", load) is None
+
+        assert load.call_count == 2
+
+    def test_disabled(self):
+        cache = PrincipalCache(redis_client=None, ttl=0)
+        load = Mock(return_value={"id": "1"})
+
+        cache.get("user", "1", load)
+        cache.get("user", "1", load)
+
+        assert load.call_count == 2
+        assert cache.get_stats()["size"] == 0
+
+    def test_invalidate_drops_only_given_users(self):
+        cache = PrincipalCache(redis_client=None)
+        cache.get("user", "1", lambda: "a")
+        cache.get("groups", "1", lambda: ["g"])
+        cache.get("user", "2", lambda: "b")
+
+        cache.invalidate(["1"])
+
+        assert cache.get("user", "1", lambda: "c") == "c"
+        assert cache.get("groups", "1", lambda: []) == []
+        assert cache.get("user", "2", lambda: "d") == "b"
+
+    def test_value_loaded_during_invalidation_is_not_stored(self):
+        cache = PrincipalCache(redis_client=None)
+
+        def load():
+            cache.invalidate(["1"])
+            return "stale"
+
+        assert cache.get("user", "1", load) == "stale"
+        assert cache.get("user", "1", lambda: "fresh") == "fresh"
+
+    def test_entries_are_shared_through_redis(self):
+        redis = FakeRedis()
+        node_a = PrincipalCache(redis_client=redis, sync_interval=0)
+        node_b = PrincipalCache(redis_client=redis, sync_interval=0)
+
+        node_a.get("user", "1", lambda: {"role": "user"})
+        load = Mock()
+
+        assert node_b.get("user", "1", load) == {"role": "user"}
+        load.assert_not_called()
+        assert node_b.get_stats()["redis_hits"] == 1
+
+    def test_invalidation_reaches_other_nodes(self):
+        redis = FakeRedis()
+        node_a = PrincipalCache(redis_client=redis, sync_interval=0)
+        node_b = PrincipalCache(redis_client=redis, sync_interval=0)
+        node_a.get("user", "1", lambda: "user")
+        node_b.get("user", "1", lambda: "user")
+
+        node_a.invalidate(["1"])
+
+        assert node_a.get("user", "1", lambda: "admin") == "admin"
+        assert node_b.get("user", "1", lambda: "admin") == "admin"
+
+    def test_concurrent_invalidations_resync(self):
+        redis = FakeRedis()
+        node_a = PrincipalCache(redis_client=redis, sync_interval=60)
+        node_b = PrincipalCache(redis_client=redis, sync_interval=60)
+        node_a.get("user", "2", lambda: "user")
+
+        node_b.invalidate(["2"])
+        node_a.invalidate(["1"])
+
+        # Node A missed B's invalidation, so it drops everything on its next read
+        assert node_a.get("user", "2", lambda: "admin") == "admin"
+
+    def test_redis_failures_fall_back_to_local_cache(self):
+        redis = Mock()
+        redis.get.side_effect = Exception("connection refused")
+        redis.set.side_effect = Exception("connection refused")
+        redis.pipeline.side_effect = Exception("connection refused")
+        cache = PrincipalCache(redis_client=redis, sync_interval=0)
+        load = Mock(return_value="user")
+
+        assert cache.get("user", "1", load) == "user"
+        assert cache.get("user", "1", load) == "user"
+        load.assert_called_once()
+
+        cache.invalidate(["1"])
+        assert cache.get("user", "1", lambda: "admin") == "admin"
+
+
+class TestPrincipalCacheInvalidation(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.groups import Groups
+        from open_webui.models.users import Users
+
+        self.users = Users
+        self.groups = Groups
+        self.users.insert_new_user(
+            id="principal-cache-user",
+            name="user",
+            email="principal-cache-user@openwebui.com",
+            role="user",
+        )
+        self.group_ids = []
+
+    def teardown_method(self):
+        for group_id in self.group_ids:
+            self.groups.delete_group_by_id(group_id)
+        self.users.delete_user_by_id("principal-cache-user")
+        super().teardown_method()
+
+    def test_user_update_invalidates(self):
+        assert self.users.get_cached_user_by_id("principal-cache-user").role == "user"
+
+        self.users.update_user_role_by_id("principal-cache-user", "admin")
+
+        assert self.users.get_cached_user_by_id("principal-cache-user").role == "admin"
+
+    def test_deleted_user_is_not_served(self):
+        assert self.users.get_cached_user_by_id("principal-cache-user") is not None
+
+        self.users.delete_user_by_id("principal-cache-user")
+
+        assert self.users.get_cached_user_by_id("principal-cache-user") is None
+
+    def test_group_membership_invalidates(self):
+        from open_webui.models.groups import GroupForm
+
+        group = self.groups.insert_new_group(
+            "principal-cache-user", GroupForm(name="group", description="")
+        )
+        self.group_ids.append(group.id)
+        assert self.groups.get_groups_by_member_id("principal-cache-user") == []
+
+        self.groups.add_users_to_group(group.id, ["principal-cache-user"])
+        assert [
+            g.id for g in self.groups.get_groups_by_member_id("principal-cache-user")
+        ] == [group.id]
+
+        self.groups.remove_users_from_group(group.id, ["principal-cache-user"])
+        assert self.groups.get_groups_by_member_id("principal-cache-user") == []
+
+    def test_group_deletion_invalidates(self):
+        from open_webui.models.groups import GroupForm
+
+        group = self.groups.insert_new_group(
+            "principal-cache-user", GroupForm(name="group", description="")
+        )
+        self.groups.add_users_to_group(group.id, ["principal-cache-user"])
+        assert len(self.groups.get_groups_by_member_id("principal-cache-user")) == 1
+
+        self.groups.delete_group_by_id(group.id)
+
+        assert self.groups.get_groups_by_member_id("principal-cache-user") == []
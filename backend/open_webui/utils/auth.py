@@ -37,6 +37,7 @@ from open_webui.env import (
     WEBUI_SECRET_KEY,
     TRUSTED_SIGNATURE_KEY,
     STATIC_DIR,
+    USER_LAST_ACTIVE_FLUSH_INTERVAL,
     WEBUI_AUTH_TRUSTED_EMAIL_HEADER,
 )
 
@@ -266,6 +267,15 @@ def get_http_authorization_cred(auth_header: Optional[str]):
         return None
 
 
+def update_last_active(user_id: str, background_tasks: Optional[BackgroundTasks]):
+    if USER_LAST_ACTIVE_FLUSH_INTERVAL:
+        # Buffered, written to the database in bulk by the periodic flush
+        Users.update_last_active_by_id(user_id)
+    elif background_tasks:
+        # Written right away, after the response so that it doesn't block it
+        background_tasks.add_task(Users.update_last_active_by_id, user_id)
+
+
 async def get_current_user(
     request: Request,
     response: Response,
@@ -295,6 +305,7 @@ async def get_current_user(
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
+        update_last_active(user.id, background_tasks)
         return user
 
     # auth by jwt token
@@ -314,7 +325,7 @@ async def get_current_user(
                     detail="Invalid token",
                 )
 
-            user = Users.get_user_by_id(data["id"])
+            user = Users.get_cached_user_by_id(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -339,10 +350,7 @@ async def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                update_last_active(user.id, background_tasks)
             return user
         else:
             raise HTTPException(
@@ -393,7 +401,6 @@ def get_current_user_by_api_key(request, api_key: str):
         current_span.set_attribute("client.user.role", user.role)
         current_span.set_attribute("client.auth.type", "api_key")
 
-    Users.update_last_active_by_id(user.id)
     return user
 
 
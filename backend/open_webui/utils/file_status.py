@@ -0,0 +1,166 @@
+import json
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.models.files import Files
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+
+# Statuses after which a file no longer changes
+FILE_STATUS_FINAL = ("completed", "failed")
+
+# Bounds of the backoff (seconds) between reconnects of the pub/sub listener
+LISTEN_RETRY_MIN_DELAY = 1
+LISTEN_RETRY_MAX_DELAY = 30
+
+
+class FileStatusBroker:
+    """
+    Fans out file processing status transitions (pending, extracting,
+    embedding, completed, failed) to the status streams waiting on them.
+
+    publish() may be called from any thread, file processing runs in worker
+    threads. With Redis, events go through a shared pub/sub channel so a stream
+    served by one node sees transitions made on another, listen() delivers them
+    to the local subscribers. Without Redis, events are delivered in process.
+    """
+
+    def __init__(self, redis_client):
+        """
+        :param redis_client: Sync Redis client used to publish, or None
+        """
+        self.r = redis_client
+
+        self._lock = threading.Lock()
+        # file id -> {(event loop, queue)}
+        self._subscribers: dict[str, set] = {}
+
+    def _channel(self) -> str:
+        return f"{REDIS_KEY_PREFIX}:files:status"
+
+    def publish(self, file_id: str, status: str, **data):
+        event = {"file_id": file_id, "status": status, **data}
+
+        if self.r is not None:
+            try:
+                self.r.publish(self._channel(), json.dumps(event))
+                return
+            except Exception as e:
+                log.debug(f"Failed to publish file status to Redis: {e}")
+
+        self._dispatch(event)
+
+    def _dispatch(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.get("file_id"), ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Event loop of the subscriber is already closed
+                pass
+
+    @contextmanager
+    def subscribe(self, file_ids: list[str]):
+        """Yield a queue receiving the status events of the given files."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+
+        with self._lock:
+            for file_id in file_ids:
+                self._subscribers.setdefault(file_id, set()).add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                for file_id in file_ids:
+                    subscribers = self._subscribers.get(file_id)
+                    if subscribers is not None:
+                        subscribers.discard(subscriber)
+                        if not subscribers:
+                            del self._subscribers[file_id]
+
+    async def listen(self, redis):
+        """
+        Deliver events published on any node to the local subscribers,
+        resubscribing with backoff whenever the pub/sub connection drops.
+        """
+        delay = LISTEN_RETRY_MIN_DELAY
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self._channel())
+                delay = LISTEN_RETRY_MIN_DELAY
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        self._dispatch(json.loads(message["data"]))
+                    except Exception as e:
+                        log.exception(f"Error handling file status event: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(
+                    f"File status listener disconnected, retrying in {delay}s: {e}"
+                )
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX_DELAY)
+
+
+FILE_STATUS = FileStatusBroker(redis_client=get_redis_client())
+
+
+# Failures held back by defer_file_failures(), by file id
+_deferred_failures: ContextVar[Optional[dict]] = ContextVar(
+    "deferred_file_failures", default=None
+)
+
+
+@contextmanager
+def defer_file_failures():
+    """
+    Hold back "failed" transitions made in this context, for callers that may
+    retry the processing. Yields the held back errors by file id, the caller
+    reports them once it gives up.
+    """
+    failures = {}
+    token = _deferred_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _deferred_failures.reset(token)
+
+
+def update_file_status(file_id: str, status: str, error: Optional[str] = None):
+    """Persist a status transition of a file and notify its status streams."""
+    deferred = _deferred_failures.get()
+    if status == "failed" and deferred is not None:
+        deferred[file_id] = error
+        return
+
+    data = {"status": status}
+    if error is not None:
+        data["error"] = error
+
+    Files.update_file_data_by_id(file_id, data)
+    FILE_STATUS.publish(file_id, **data)
+
+
+def publish_file_progress(file_id: str, status: str, done: int, total: int):
+    """Notify status streams of progress within a status, without a DB write."""
+    FILE_STATUS.publish(file_id, status, progress={"done": done, "total": total})
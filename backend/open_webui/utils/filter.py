@@ -6,6 +6,8 @@ from open_webui.utils.plugin import (
     get_function_module_from_cache,
 )
 from open_webui.models.functions import Functions
+from open_webui.models.users import Users
+from open_webui.utils.function_version import FUNCTION_VERSION
 
 log = logging.getLogger(__name__)
 
@@ -55,80 +57,144 @@ def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None)
     return filter_ids
 
 
-async def process_filter_functions(
-    request, filter_functions, filter_type, form_data, extra_params
-):
-    skip_files = None
+class CompiledFilter:
+    """
+    A filter function with its valves applied and its handler signatures
+    resolved, so running it does not touch the database.
+    """
 
-    for function in filter_functions:
-        filter = function
-        filter_id = function.id
-        if not filter:
-            continue
+    FILTER_TYPES = ("inlet", "outlet", "stream")
 
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
-        # Prepare handler function
-        handler = getattr(function_module, filter_type, None)
-        if not handler:
-            continue
+    def __init__(self, request, function_id: str):
+        self.id = function_id
+        self.module = get_function_module(request, function_id)
 
-        # Check if the function has a file_handler variable
-        if filter_type == "inlet" and hasattr(function_module, "file_handler"):
-            skip_files = function_module.file_handler
+        self.file_handler = getattr(self.module, "file_handler", None)
+        self.has_file_handler = hasattr(self.module, "file_handler")
+        self.has_user_valves = hasattr(self.module, "UserValves")
 
         # Apply valves to the function
-        if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
-
-        try:
-            # Prepare parameters
-            sig = inspect.signature(handler)
-
-            params = {"body": form_data}
-            if filter_type == "stream":
-                params = {"event": form_data}
-
-            params = params | {
-                k: v
-                for k, v in {
-                    **extra_params,
-                    "__id__": filter_id,
-                }.items()
-                if k in sig.parameters
-            }
-
-            # Handle user parameters
-            if "__user__" in sig.parameters:
-                if hasattr(function_module, "UserValves"):
+        if hasattr(self.module, "valves") and hasattr(self.module, "Valves"):
+            valves = Functions.get_function_valves_by_id(function_id)
+            self.module.valves = self.module.Valves(**(valves if valves else {}))
+
+        # filter_type -> (handler, parameter names, is coroutine)
+        self.handlers = {}
+        for filter_type in self.FILTER_TYPES:
+            handler = getattr(self.module, filter_type, None)
+            if handler:
+                self.handlers[filter_type] = (
+                    handler,
+                    frozenset(inspect.signature(handler).parameters),
+                    inspect.iscoroutinefunction(handler),
+                )
+
+
+def get_user_valves(function_id: str, user_id: str) -> dict:
+    # Served from the principal cache, which is invalidated on settings updates
+    user = Users.get_cached_user_by_id(user_id)
+    settings = user.settings.model_dump() if user and user.settings else {}
+    return settings.get("functions", {}).get("valves", {}).get(function_id, {})
+
+
+class FilterPipeline:
+    def __init__(self, filters: list[CompiledFilter]):
+        self.filters = filters
+
+    async def run(self, filter_type, form_data, extra_params):
+        skip_files = None
+
+        for filter in self.filters:
+            if filter_type not in filter.handlers:
+                continue
+            handler, parameters, is_coroutine = filter.handlers[filter_type]
+
+            # Check if the function has a file_handler variable
+            if filter_type == "inlet" and filter.has_file_handler:
+                skip_files = filter.file_handler
+
+            try:
+                # Prepare parameters
+                params = {"body": form_data}
+                if filter_type == "stream":
+                    params = {"event": form_data}
+
+                params = params | {
+                    k: v
+                    for k, v in {
+                        **extra_params,
+                        "__id__": filter.id,
+                    }.items()
+                    if k in parameters
+                }
+
+                # Handle user parameters
+                if "__user__" in parameters and filter.has_user_valves:
                     try:
-                        params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
+                        params["__user__"]["valves"] = filter.module.UserValves(
+                            **get_user_valves(filter.id, params["__user__"]["id"])
                         )
                     except Exception as e:
                         log.exception(f"Failed to get user values: {e}")
 
-            # Execute handler
-            if inspect.iscoroutinefunction(handler):
-                form_data = await handler(**params)
-            else:
-                form_data = handler(**params)
+                # Execute handler
+                if is_coroutine:
+                    form_data = await handler(**params)
+                else:
+                    form_data = handler(**params)
+
+            except Exception as e:
+                log.debug(f"Error in {filter_type} handler {filter.id}: {e}")
+                raise e
+
+        # Handle file cleanup for inlet
+        if skip_files:
+            if "files" in form_data.get("metadata", {}):
+                del form_data["metadata"]["files"]
+            if "files" in form_data:
+                del form_data["files"]
+
+        return form_data, {}
+
 
-        except Exception as e:
-            log.debug(f"Error in {filter_type} handler {filter_id}: {e}")
-            raise e
+# Upper bound on compiled pipelines kept per process
+MAX_FILTER_PIPELINES = 256
 
-    # Handle file cleanup for inlet
-    if skip_files:
-        if "files" in form_data.get("metadata", {}):
-            del form_data["metadata"]["files"]
-        if "files" in form_data:
-            del form_data["files"]
 
-    return form_data, {}
+def get_filter_pipeline(request, filter_ids: list[str], model_id=None):
+    """
+    Return the compiled pipeline for a (model, filter set), compiling it on
+    first use. All pipelines are dropped when FUNCTION_VERSION changes, i.e.
+    when any function or its valves were updated on any node.
+    """
+    version = FUNCTION_VERSION.get()
+    state = request.app.state
+
+    if getattr(state, "FILTER_PIPELINES_VERSION", None) != version:
+        state.FILTER_PIPELINES = {}
+        state.FILTER_PIPELINES_VERSION = version
+
+    key = (model_id, tuple(filter_ids))
+    pipeline = state.FILTER_PIPELINES.get(key)
+    if pipeline is None:
+        pipeline = FilterPipeline(
+            [CompiledFilter(request, filter_id) for filter_id in filter_ids]
+        )
+
+        if len(state.FILTER_PIPELINES) >= MAX_FILTER_PIPELINES:
+            state.FILTER_PIPELINES.pop(next(iter(state.FILTER_PIPELINES)))
+        state.FILTER_PIPELINES[key] = pipeline
+
+    return pipeline
+
+
+async def process_filter_functions(
+    request, filter_functions, filter_type, form_data, extra_params
+):
+    model = extra_params.get("__model__") or {}
+    pipeline = get_filter_pipeline(
+        request,
+        [function.id for function in filter_functions if function],
+        model_id=model.get("id") if isinstance(model, dict) else None,
+    )
+    return await pipeline.run(filter_type, form_data, extra_params)
@@ -0,0 +1,69 @@
+import time
+import logging
+import threading
+from typing import Optional
+
+from open_webui.env import FUNCTION_VERSION_SYNC_INTERVAL, REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+
+class FunctionVersion:
+    """
+    Version counter for function content and valves, used to invalidate
+    anything compiled from them (e.g. filter pipelines).
+
+    Every function or valve update bumps the version. The counter lives in a
+    shared Redis key, each node checks that key at most once per sync interval
+    so updates made on other nodes are picked up without a Redis call per
+    read. Falls back to a per-process counter if Redis is not available.
+    """
+
+    def __init__(self, redis_client, sync_interval: float = 1.0):
+        """
+        :param redis_client: Redis client instance or None
+        :param sync_interval: Seconds between checks of the shared version key
+        """
+        self.r = redis_client
+        self.sync_interval = sync_interval
+
+        self._lock = threading.Lock()
+        # Local part of the version, bumped on every update made by this node
+        self._local = 0
+        # Last seen value of the shared version key
+        self._shared: Optional[str] = None
+        self._checked_at = 0.0
+
+    def _key(self) -> str:
+        return f"{REDIS_KEY_PREFIX}:functions:__version__"
+
+    def get(self) -> str:
+        if self.r is not None:
+            now = time.monotonic()
+            if now - self._checked_at >= self.sync_interval:
+                self._checked_at = now
+                try:
+                    self._shared = self.r.get(self._key())
+                except Exception as e:
+                    log.debug(f"Failed to read function version from Redis: {e}")
+
+        return f"{self._shared}:{self._local}"
+
+    def bump(self):
+        """Invalidate everything compiled from the current functions on all nodes."""
+        with self._lock:
+            self._local += 1
+
+        if self.r is not None:
+            try:
+                self._shared = str(self.r.incr(self._key()))
+            except Exception as e:
+                log.debug(f"Failed to bump function version in Redis: {e}")
+
+
+FUNCTION_VERSION = FunctionVersion(
+    redis_client=get_redis_client(),
+    # Interval is configured in milliseconds
+    sync_interval=FUNCTION_VERSION_SYNC_INTERVAL / 1000,
+)
@@ -0,0 +1,268 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+import anyio
+
+from mcp import ClientSession, types
+from mcp.client.streamable_http import streamablehttp_client
+
+from open_webui.env import (
+    ENABLE_MCP_SESSION_POOL,
+    MCP_SESSION_HEALTH_CHECK_INTERVAL,
+    MCP_SESSION_IDLE_TIMEOUT,
+)
+from open_webui.utils.mcp.client import MCPClient
+
+log = logging.getLogger(__name__)
+
+
+class PooledMCPClient(MCPClient):
+    """
+    MCP client whose session lives in a task of its own, so it can outlive the
+    request that opened it (the transport's task group must be exited by the
+    task that entered it). Tool specs are cached until the server announces a
+    tools/list_changed notification.
+
+    refs counts the chats holding the client and its in-flight calls, the pool
+    only closes idle clients no one holds.
+    """
+
+    def __init__(
+        self, pool: Optional["MCPSessionPool"] = None, server_id: Optional[str] = None
+    ):
+        super().__init__()
+        self.closed = False
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+
+        self._pool = pool
+        self._server_id = server_id
+        self._url: Optional[str] = None
+        self._headers: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._tool_specs: Optional[list] = None
+
+    async def connect(self, url: str, headers: Optional[dict] = None):
+        self._url = url
+        self._headers = headers
+        ready = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(url, headers, ready))
+        await ready
+
+    async def _run(self, url: str, headers: Optional[dict], ready: asyncio.Future):
+        try:
+            async with streamablehttp_client(url, headers=headers) as transport:
+                read_stream, write_stream, _ = transport
+                async with ClientSession(
+                    read_stream, write_stream, message_handler=self._handle_message
+                ) as session:
+                    with anyio.fail_after(10):
+                        await session.initialize()
+
+                    self.session = session
+                    ready.set_result(True)
+                    await self._closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                log.debug(f"MCP session to {url} closed: {e}")
+        finally:
+            self.session = None
+            self.closed = True
+            if not ready.done():
+                ready.set_exception(RuntimeError("MCP client is not connected."))
+
+    async def _handle_message(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self._tool_specs = None
+
+    async def list_tool_specs(self) -> Optional[dict]:
+        if self._tool_specs is None:
+            self._tool_specs = await super().list_tool_specs()
+        return self._tool_specs
+
+    async def call_tool(
+        self, function_name: str, function_args: dict
+    ) -> Optional[dict]:
+        if self.closed and self._pool is not None:
+            # The session died since the chat acquired the client, call through
+            # the session the pool reconnects
+            client = await self._pool.acquire(self._server_id, self._url, self._headers)
+            if client is not None:
+                try:
+                    return await client._call_tool(function_name, function_args)
+                finally:
+                    self._pool.release(client)
+
+        return await self._call_tool(function_name, function_args)
+
+    async def _call_tool(
+        self, function_name: str, function_args: dict
+    ) -> Optional[dict]:
+        self.refs += 1
+        self.last_used = time.monotonic()
+        try:
+            return await super().call_tool(function_name, function_args)
+        except Exception:
+            # Check the session is still alive before it is reused
+            self.last_checked = 0
+            raise
+        finally:
+            self.refs -= 1
+            self.last_used = time.monotonic()
+
+    async def ping(self) -> bool:
+        try:
+            with anyio.fail_after(5):
+                await self.session.send_ping()
+            self.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            log.debug(f"MCP session failed health check: {e}")
+            return False
+
+    async def disconnect(self):
+        if self._closing is not None:
+            self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """
+    Long-lived MCP sessions keyed by server, URL and request headers (i.e.
+    the credentials), so chats reuse an initialized session and its tool
+    specs instead of paying a handshake each time. Sessions idle for longer
+    than idle_timeout are closed, sessions unused for longer than
+    health_check_interval are pinged before reuse and replaced if dead.
+
+    Like SESSION_POOL, sessions are bound to the application's event loop,
+    callers elsewhere get None from acquire and connect on their own. Clients
+    acquired are handed back through release.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        idle_timeout: float = 300,
+        health_check_interval: float = 60,
+    ):
+        self.enabled = enabled
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: dict[str, PooledMCPClient] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    def start(self):
+        """
+        Bind the pool to the running event loop, called from the app lifespan.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._reaper = asyncio.create_task(self._reap())
+
+    async def close(self):
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._locks = {}
+        self._loop = None
+
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+        await asyncio.gather(
+            *[client.disconnect() for client in clients], return_exceptions=True
+        )
+
+    def _get_key(self, server_id: str, url: str, headers: Optional[dict]) -> str:
+        identity = hashlib.sha256(
+            json.dumps(headers or {}, sort_keys=True).encode()
+        ).hexdigest()
+        return f"{server_id}:{url}:{identity}"
+
+    async def acquire(
+        self, server_id: str, url: str, headers: Optional[dict] = None
+    ) -> Optional[PooledMCPClient]:
+        """
+        Return a connected pooled client, or None when pooling is not
+        available on this event loop. The client is held until released.
+        """
+        if not self.enabled or self._loop is None:
+            return None
+        try:
+            if asyncio.get_running_loop() is not self._loop:
+                return None
+        except RuntimeError:
+            return None
+
+        key = self._get_key(server_id, url, headers)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            client = self._clients.get(key)
+
+            if (
+                client is not None
+                and not client.closed
+                and time.monotonic() - client.last_checked > self.health_check_interval
+                and not await client.ping()
+            ):
+                await client.disconnect()
+
+            if client is None or client.closed:
+                log.debug(f"Opening pooled MCP session to {server_id}")
+                client = PooledMCPClient(self, server_id)
+                await client.connect(url=url, headers=headers)
+                self._clients[key] = client
+
+            client.refs += 1
+            client.last_used = time.monotonic()
+            return client
+
+    def release(self, client: PooledMCPClient):
+        """Hand back a client once the chat holding it is done."""
+        client.refs = max(client.refs - 1, 0)
+        client.last_used = time.monotonic()
+
+    def discard(self, client: PooledMCPClient):
+        """Drop a client that failed, the next acquire reconnects."""
+        for key, pooled in list(self._clients.items()):
+            if pooled is client:
+                del self._clients[key]
+        asyncio.create_task(client.disconnect())
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30))
+            try:
+                now = time.monotonic()
+                for key, client in list(self._clients.items()):
+                    # Clients held by a chat or running a call are busy, not idle
+                    if client.closed or (
+                        client.refs <= 0 and now - client.last_used > self.idle_timeout
+                    ):
+                        self._clients.pop(key, None)
+                        self._locks.pop(key, None)
+                        await client.disconnect()
+            except Exception as e:
+                log.debug(f"Error closing idle MCP sessions: {e}")
+
+
+MCP_SESSION_POOL = MCPSessionPool(
+    enabled=ENABLE_MCP_SESSION_POOL,
+    idle_timeout=MCP_SESSION_IDLE_TIMEOUT,
+    health_check_interval=MCP_SESSION_HEALTH_CHECK_INTERVAL,
+)
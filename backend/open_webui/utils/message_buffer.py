@@ -0,0 +1,106 @@
+import json
+import time
+import logging
+from typing import Optional, Dict
+
+from open_webui.env import REDIS_KEY_PREFIX
+
+log = logging.getLogger(__name__)
+
+
+class MessageBuffer:
+    """
+    Write-behind buffer for in-flight chat messages.
+
+    Partial message updates are merged into a pending entry per
+    (chat_id, message_id) and handed back to the caller for persistence once
+    the flush budget (elapsed time or number of updates) is exhausted.
+    Uses Redis so that every worker sees the same pending state and falls back
+    to in-memory storage if Redis is not available.
+    """
+
+    # In-memory fallback storage
+    _memory_store: Dict[str, dict] = {}
+
+    def __init__(
+        self,
+        redis_client,
+        interval: float = 1.0,
+        max_updates: int = 100,
+        ttl: int = 60 * 60,
+    ):
+        """
+        :param redis_client: Redis client instance or None
+        :param interval: Max seconds an update may stay buffered before a flush
+        :param max_updates: Max number of coalesced updates before a flush
+        :param ttl: Expiry of a pending entry in Redis, guards against leaks
+        """
+        self.r = redis_client
+        self.interval = interval
+        self.max_updates = max_updates
+        self.ttl = ttl
+
+    def _key(self, chat_id: str, message_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:message_buffer:{chat_id}:{message_id}"
+
+    def _redis_available(self) -> bool:
+        return self.r is not None
+
+    def _load(self, key: str) -> Optional[dict]:
+        if self._redis_available():
+            try:
+                value = self.r.get(key)
+                return json.loads(value) if value else None
+            except Exception as e:
+                log.debug(f"Failed to read message buffer from Redis: {e}")
+        return self._memory_store.get(key)
+
+    def _store(self, key: str, entry: dict):
+        if self._redis_available():
+            try:
+                self.r.set(key, json.dumps(entry), ex=self.ttl)
+                return
+            except Exception as e:
+                log.debug(f"Failed to write message buffer to Redis: {e}")
+        self._memory_store[key] = entry
+
+    def _delete(self, key: str):
+        if self._redis_available():
+            try:
+                self.r.delete(key)
+            except Exception as e:
+                log.debug(f"Failed to delete message buffer from Redis: {e}")
+        self._memory_store.pop(key, None)
+
+    def stage(self, chat_id: str, message_id: str, message: dict) -> Optional[dict]:
+        """
+        Merge a partial update into the pending message.
+        Returns the coalesced message (and clears it) when it is due for a
+        flush, otherwise None.
+        """
+        key = self._key(chat_id, message_id)
+        now = time.time()
+
+        entry = self._load(key) or {"message": {}, "since": now, "count": 0}
+        entry["message"] = {**entry["message"], **message}
+        entry["count"] += 1
+
+        if now - entry["since"] >= self.interval or entry["count"] >= self.max_updates:
+            self._delete(key)
+            return entry["message"]
+
+        self._store(key, entry)
+        return None
+
+    def get(self, chat_id: str, message_id: str) -> Optional[dict]:
+        entry = self._load(self._key(chat_id, message_id))
+        return entry["message"] if entry else None
+
+    def pop(self, chat_id: str, message_id: str) -> Optional[dict]:
+        key = self._key(chat_id, message_id)
+        entry = self._load(key)
+        if entry is None:
+            return None
+
+        self._delete(key)
+        return entry["message"]
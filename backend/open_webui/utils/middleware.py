@@ -101,6 +101,7 @@ from open_webui.utils.filter import (
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.pool import MCP_SESSION_POOL
 
 
 from open_webui.config import (
@@ -1453,11 +1454,31 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                         for key, value in connection_headers.items():
                             headers[key] = value
 
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
+                    mcp_url = mcp_server_connection.get("url", "")
+                    mcp_headers = headers if headers else None
+
+                    mcp_client = await MCP_SESSION_POOL.acquire(
+                        server_id, mcp_url, mcp_headers
                     )
+                    if mcp_client is not None:
+                        try:
+                            tool_specs = await mcp_client.list_tool_specs()
+                        except Exception as e:
+                            # Pooled session went stale, reconnect once
+                            log.debug(f"Reconnecting MCP server {server_id}: {e}")
+                            MCP_SESSION_POOL.discard(mcp_client)
+                            mcp_client = await MCP_SESSION_POOL.acquire(
+                                server_id, mcp_url, mcp_headers
+                            )
+                            tool_specs = await mcp_client.list_tool_specs()
+                        # Released to the pool once the chat completes
+                        mcp_clients[server_id] = mcp_client
+                    else:
+                        # Not pooled, disconnected once the chat completes
+                        mcp_client = MCPClient()
+                        mcp_clients[server_id] = mcp_client
+                        await mcp_client.connect(url=mcp_url, headers=mcp_headers)
+                        tool_specs = await mcp_client.list_tool_specs()
 
                     function_name_filter_list = mcp_server_connection.get(
                         "config", {}
@@ -1466,7 +1487,6 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                     if isinstance(function_name_filter_list, str):
                         function_name_filter_list = function_name_filter_list.split(",")
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
                     for tool_spec in tool_specs:
 
                         def make_tool_function(client, function_name):
@@ -1486,7 +1506,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                                 continue
 
                         tool_function = make_tool_function(
-                            mcp_clients[server_id], tool_spec["name"]
+                            mcp_client, tool_spec["name"]
                         )
 
                         mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
@@ -1496,7 +1516,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                             },
                             "callable": tool_function,
                             "type": "mcp",
-                            "client": mcp_clients[server_id],
+                            "client": mcp_client,
                             "direct": False,
                         }
                 except Exception as e:
@@ -2804,8 +2824,8 @@ async def process_chat_response(
                                                 break
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
-                                            # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            # Buffer message, written through to the database periodically
+                                            Chats.stage_message_to_chat_by_id_and_message_id(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -3268,6 +3288,11 @@ async def process_chat_response(
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                else:
+                    # Persist any buffered updates
+                    Chats.flush_message_to_chat_by_id_and_message_id(
+                        metadata["chat_id"], metadata["message_id"]
+                    )
 
                 # Send a webhook notification if the user is not active
                 if not Users.is_user_active(user.id):
@@ -3306,6 +3331,12 @@ async def process_chat_response(
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+            finally:
+                if ENABLE_REALTIME_CHAT_SAVE:
+                    # Persist any buffered updates, however the response ended
+                    Chats.flush_message_to_chat_by_id_and_message_id(
+                        metadata["chat_id"], metadata["message_id"]
+                    )
 
             if response.background is not None:
                 await response.background()
@@ -0,0 +1,303 @@
+import logging
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_TIMEOUT,
+    OLLAMA_ROUTING_EJECT_DURATION,
+    OLLAMA_ROUTING_EJECT_ERRORS,
+    OLLAMA_ROUTING_STICKY_TTL,
+    OLLAMA_ROUTING_STRATEGY,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.3
+
+# A sticky backend is abandoned once it has this many more requests
+# outstanding than the least loaded one
+STICKY_MAX_SKEW = 4
+
+MAX_STICKY_ENTRIES = 10000
+
+
+class OllamaRoute:
+    """
+    A request in flight to one backend, returned by OllamaRouter.start.
+    """
+
+    def __init__(self, router: "OllamaRouter", url: str):
+        self.router = router
+        self.url = url
+        self.id = str(uuid.uuid4())
+        self.started_at = time.time()
+        self.first_byte_at: Optional[float] = None
+        self.redis = False
+        self.finished = False
+
+    def first_byte(self):
+        if self.first_byte_at is None:
+            self.first_byte_at = time.time()
+            self.router._record_latency(self.url, self.first_byte_at - self.started_at)
+
+    async def finish(self, success: bool = True):
+        # Called from several cleanup paths, only the first call counts
+        if self.finished:
+            return
+        self.finished = True
+        await self.router._finish(self, success)
+
+
+class OllamaRouter:
+    """
+    Picks one of the backends serving a model.
+
+    Tracks outstanding requests, a moving average of the time to first byte
+    and the error rate of every backend, and picks the least loaded
+    ("least_outstanding") or the one with the lowest expected wait
+    ("latency"). Requests of the same chat stick to the same backend, so that
+    Ollama can reuse the prompt's KV cache, unless that backend is overloaded.
+    Backends failing several times in a row are ejected for a while.
+
+    Outstanding requests and sticky assignments are shared through Redis when
+    available, so that several Open WebUI replicas see the same load.
+    Falls back to in-memory state if Redis is not available.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        strategy: str = "least_outstanding",
+        sticky_ttl: int = 900,
+        eject_errors: int = 3,
+        eject_duration: int = 30,
+        max_request_age: int = 3600,
+    ):
+        """
+        :param redis_client: Async Redis client instance or None
+        :param strategy: "least_outstanding", "latency" or "random"
+        :param sticky_ttl: Seconds a chat stays assigned to its backend, 0 to disable
+        :param eject_errors: Consecutive failures after which a backend is ejected
+        :param eject_duration: Seconds an ejected backend is skipped
+        :param max_request_age: Outstanding requests older than this are
+            ignored, so that crashed replicas don't leave backends marked busy
+        """
+        self.r = redis_client
+        self.strategy = strategy
+        self.sticky_ttl = sticky_ttl
+        self.eject_errors = eject_errors
+        self.eject_duration = eject_duration
+        self.max_request_age = max_request_age
+
+        self._in_flight: dict[str, int] = {}
+        self._sticky: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._stats: dict[str, dict] = {}
+
+    def _in_flight_key(self, url: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:ollama:in_flight:{url}"
+
+    def _sticky_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:ollama:sticky:{key}"
+
+    def _get_stats(self, url: str) -> dict:
+        if url not in self._stats:
+            self._stats[url] = {
+                "requests": 0,
+                "errors": 0,
+                "latency": None,
+                "error_rate": 0.0,
+                "consecutive_errors": 0,
+                "ejected_until": 0.0,
+            }
+        return self._stats[url]
+
+    ####################################
+    # Selection
+    ####################################
+
+    async def select(self, urls: list[str], key: Optional[str] = None) -> str:
+        """
+        Pick one of urls for a new request.
+
+        :param key: Routing key of the conversation (chat id), or None
+        """
+        if len(urls) == 1 or self.strategy == "random":
+            return random.choice(urls)
+
+        now = time.time()
+        candidates = [
+            url for url in urls if self._get_stats(url)["ejected_until"] <= now
+        ]
+        if not candidates:
+            # Everything is down, let the requests find out which came back
+            candidates = urls
+
+        in_flight = await self.get_in_flight(candidates)
+
+        if key and self.sticky_ttl > 0:
+            url = await self._get_sticky(key)
+            if url in candidates and in_flight[url] <= (
+                min(in_flight.values()) + STICKY_MAX_SKEW
+            ):
+                await self._set_sticky(key, url)
+                return url
+
+        if self.strategy == "latency":
+
+            def score(url):
+                # Expected wait, backends without samples yet are tried first
+                latency = self._get_stats(url)["latency"] or 0.0
+                return (latency * (in_flight[url] + 1), in_flight[url])
+
+        else:
+
+            def score(url):
+                return (in_flight[url], self._get_stats(url)["latency"] or 0.0)
+
+        best = min(score(url) for url in candidates)
+        url = random.choice([url for url in candidates if score(url) == best])
+
+        if key and self.sticky_ttl > 0:
+            await self._set_sticky(key, url)
+        return url
+
+    async def _get_sticky(self, key: str) -> Optional[str]:
+        if self.r is not None:
+            try:
+                return await self.r.get(self._sticky_key(key))
+            except Exception as e:
+                log.debug(f"Failed to read sticky backend from Redis: {e}")
+
+        entry = self._sticky.get(key)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        return None
+
+    async def _set_sticky(self, key: str, url: str):
+        if self.r is not None:
+            try:
+                await self.r.set(self._sticky_key(key), url, ex=self.sticky_ttl)
+                return
+            except Exception as e:
+                log.debug(f"Failed to write sticky backend to Redis: {e}")
+
+        self._sticky[key] = (url, time.time() + self.sticky_ttl)
+        self._sticky.move_to_end(key)
+        while len(self._sticky) > MAX_STICKY_ENTRIES:
+            self._sticky.popitem(last=False)
+
+    ####################################
+    # Outstanding requests
+    ####################################
+
+    async def start(self, url: str) -> OllamaRoute:
+        route = OllamaRoute(self, url)
+        self._get_stats(url)["requests"] += 1
+
+        if self.r is not None:
+            try:
+                key = self._in_flight_key(url)
+                pipe = self.r.pipeline()
+                pipe.zadd(key, {route.id: route.started_at})
+                pipe.expire(key, self.max_request_age)
+                await pipe.execute()
+                route.redis = True
+                return route
+            except Exception as e:
+                log.debug(f"Failed to track request in Redis: {e}")
+
+        self._in_flight[url] = self._in_flight.get(url, 0) + 1
+        return route
+
+    async def get_in_flight(self, urls: list[str]) -> dict[str, int]:
+        if self.r is not None:
+            try:
+                pipe = self.r.pipeline()
+                for url in urls:
+                    key = self._in_flight_key(url)
+                    pipe.zremrangebyscore(
+                        key, "-inf", time.time() - self.max_request_age
+                    )
+                    pipe.zcard(key)
+                results = await pipe.execute()
+                return {
+                    url: results[idx * 2 + 1] + self._in_flight.get(url, 0)
+                    for idx, url in enumerate(urls)
+                }
+            except Exception as e:
+                log.debug(f"Failed to read outstanding requests from Redis: {e}")
+
+        return {url: self._in_flight.get(url, 0) for url in urls}
+
+    async def _finish(self, route: OllamaRoute, success: bool):
+        if route.redis:
+            try:
+                await self.r.zrem(self._in_flight_key(route.url), route.id)
+            except Exception as e:
+                # Expires after max_request_age
+                log.debug(f"Failed to untrack request in Redis: {e}")
+        else:
+            self._in_flight[route.url] = max(0, self._in_flight.get(route.url, 0) - 1)
+
+        stats = self._get_stats(route.url)
+        stats["error_rate"] += EWMA_ALPHA * (
+            (0.0 if success else 1.0) - stats["error_rate"]
+        )
+        if success:
+            stats["consecutive_errors"] = 0
+            return
+
+        stats["errors"] += 1
+        stats["consecutive_errors"] += 1
+        # Once the ejection ends a single failure ejects the backend again
+        if stats["consecutive_errors"] >= self.eject_errors > 0:
+            stats["ejected_until"] = time.time() + self.eject_duration
+            log.warning(
+                f"Ejecting Ollama backend {route.url} for {self.eject_duration}s "
+                f"after {stats['consecutive_errors']} consecutive errors"
+            )
+
+    def _record_latency(self, url: str, latency: float):
+        stats = self._get_stats(url)
+        if stats["latency"] is None:
+            stats["latency"] = latency
+        else:
+            stats["latency"] += EWMA_ALPHA * (latency - stats["latency"])
+
+    async def get_stats(self, urls: list[str]) -> dict:
+        now = time.time()
+        in_flight = await self.get_in_flight(urls)
+
+        backends = {}
+        for url in urls:
+            stats = self._get_stats(url)
+            backends[url] = {
+                "in_flight": in_flight[url],
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "latency": stats["latency"],
+                "error_rate": stats["error_rate"],
+                "ejected": stats["ejected_until"] > now,
+            }
+
+        return {
+            "strategy": self.strategy,
+            "redis": self.r is not None,
+            "backends": backends,
+        }
+
+
+OLLAMA_ROUTER = OllamaRouter(
+    redis_client=get_redis_client(async_mode=True),
+    strategy=OLLAMA_ROUTING_STRATEGY,
+    sticky_ttl=OLLAMA_ROUTING_STICKY_TTL,
+    eject_errors=OLLAMA_ROUTING_EJECT_ERRORS,
+    eject_duration=OLLAMA_ROUTING_EJECT_DURATION,
+    max_request_age=max(AIOHTTP_CLIENT_TIMEOUT or 0, 3600),
+)
@@ -0,0 +1,183 @@
+import json
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from open_webui.env import (
+    PRINCIPAL_CACHE_SYNC_INTERVAL,
+    PRINCIPAL_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """
+    Short-lived cache for the authenticated principal (user row and group
+    memberships) keyed by user id.
+
+    Entries are kept in a local dict and shared across nodes through Redis.
+    Invalidations bump a shared version key, each node checks that key at most
+    once per sync interval and drops its local entries when it changed.
+    Entries are stored together with the version they were loaded under, so a
+    value loaded concurrently with an invalidation is never served afterwards.
+    Falls back to a per-process cache if Redis is not available.
+    """
+
+    # Kinds of entries cached per user
+    KINDS = ("user", "groups")
+
+    def __init__(self, redis_client, ttl: int = 30, sync_interval: float = 1.0):
+        """
+        :param redis_client: Redis client instance or None
+        :param ttl: Seconds an entry may be served before it is reloaded, 0 disables the cache
+        :param sync_interval: Seconds between checks of the shared version key
+        """
+        self.r = redis_client
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+
+        self._lock = threading.Lock()
+        self._local: Dict[Tuple[str, str], Tuple[float, Optional[str], Any]] = {}
+
+        # Last seen value of the shared version key
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+        # Bumped on every local invalidation, guards against storing a value
+        # that was loaded while it was being invalidated
+        self._generation = 0
+
+        self._stats = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    def _key(self, kind: str, id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:principal:{kind}:{id}"
+
+    def _version_key(self) -> str:
+        return f"{REDIS_KEY_PREFIX}:principal:__version__"
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._version_checked_at < self.sync_interval:
+            return
+        self._version_checked_at = now
+
+        try:
+            version = self.r.get(self._version_key())
+        except Exception as e:
+            log.debug(f"Failed to read principal cache version from Redis: {e}")
+            return
+
+        if version != self._version:
+            with self._lock:
+                self._local.clear()
+                self._version = version
+
+    def get(self, kind: str, id: str, load: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for (kind, id), calling load() on a miss.
+        Values must be JSON serializable, None results are not cached.
+        """
+        if self.ttl <= 0:
+            return load()
+
+        if self.r is not None:
+            self._sync()
+
+        now = time.monotonic()
+        entry = self._local.get((kind, id))
+        if entry is not None and entry[0] > now:
+            self._stats["hits"] += 1
+            return entry[2]
+
+        version = self._version
+        generation = self._generation
+
+        if self.r is not None:
+            try:
+                cached = self.r.get(self._key(kind, id))
+                if cached:
+                    cached = json.loads(cached)
+                    if cached["v"] == version:
+                        self._stats["redis_hits"] += 1
+                        with self._lock:
+                            if generation == self._generation:
+                                self._local[(kind, id)] = (
+                                    now + self.ttl,
+                                    version,
+                                    cached["data"],
+                                )
+                        return cached["data"]
+            except Exception as e:
+                log.debug(f"Failed to read principal cache from Redis: {e}")
+
+        self._stats["misses"] += 1
+        value = load()
+        if value is None:
+            return None
+
+        with self._lock:
+            if generation != self._generation or version != self._version:
+                return value
+            self._local[(kind, id)] = (now + self.ttl, version, value)
+
+        if self.r is not None:
+            try:
+                self.r.set(
+                    self._key(kind, id),
+                    json.dumps({"v": version, "data": value}),
+                    ex=self.ttl,
+                )
+            except Exception as e:
+                log.debug(f"Failed to write principal cache to Redis: {e}")
+
+        return value
+
+    def invalidate(self, user_ids: Iterable[str]):
+        """Drop every cached entry of the given users on all nodes."""
+        user_ids = set(user_ids or [])
+        if not user_ids or self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._local if key[1] in user_ids]:
+                del self._local[key]
+        self._stats["invalidations"] += 1
+
+        if self.r is not None:
+            try:
+                pipe = self.r.pipeline()
+                pipe.incr(self._version_key())
+                # One key per command, keys may live on different cluster slots
+                for user_id in user_ids:
+                    for kind in self.KINDS:
+                        pipe.delete(self._key(kind, user_id))
+                version = pipe.execute()[0]
+
+                with self._lock:
+                    # Only skip the next refresh if no other node invalidated
+                    # in between, otherwise drop everything on the next sync
+                    if (
+                        self._version is not None
+                        and int(version) == int(self._version) + 1
+                    ) or (self._version is None and int(version) == 1):
+                        self._version = str(version)
+                    else:
+                        self._version_checked_at = 0.0
+            except Exception as e:
+                log.debug(f"Failed to invalidate principal cache in Redis: {e}")
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "size": len(self._local)}
+
+
+PRINCIPAL_CACHE = PrincipalCache(
+    redis_client=get_redis_client(),
+    ttl=PRINCIPAL_CACHE_TTL,
+    # Interval is configured in milliseconds
+    sync_interval=PRINCIPAL_CACHE_SYNC_INTERVAL / 1000,
+)
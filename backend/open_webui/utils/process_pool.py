@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from open_webui.env import CPU_PROCESS_POOL_SIZE
+
+log = logging.getLogger(__name__)
+
+
+class CPUProcessPool:
+    """
+    Worker processes for CPU-bound document processing (HTML parsing, text
+    splitting, local extraction), so that it neither blocks the event loop nor
+    holds the GIL against request handling.
+
+    Functions must be top-level functions of modules that are cheap to import,
+    taking and returning picklable values (see retrieval/cpu_tasks.py). Without
+    a pool (size 0, before start, or in processes that don't run the app
+    lifespan such as ingestion workers), calls run in the calling thread, or a
+    worker thread for run. A pool broken by a crashed worker is replaced.
+    """
+
+    def __init__(self, size: int = 2):
+        """
+        :param size: Max number of worker processes, spawned on first use
+        """
+        self.size = size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Create the pool, called from the app lifespan."""
+        if self.size > 0 and self._executor is None:
+            # Forking a process running threads and an event loop is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def close(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _replace(self, executor: ProcessPoolExecutor, e: Exception):
+        if self._executor is executor:
+            log.warning(f"CPU process pool is broken, replacing it: {e}")
+            self.close()
+            self.start()
+
+    def run_sync(self, func: Callable, *args, **kwargs):
+        """Run func in the pool and wait for its result, off the event loop."""
+        executor = self._executor
+        if executor is not None:
+            try:
+                return executor.submit(func, *args, **kwargs).result()
+            except BrokenProcessPool as e:
+                self._replace(executor, e)
+        return func(*args, **kwargs)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        executor = self._executor
+        if executor is not None:
+            try:
+                return await asyncio.wrap_future(executor.submit(func, *args, **kwargs))
+            except BrokenProcessPool as e:
+                self._replace(executor, e)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+CPU_PROCESS_POOL = CPUProcessPool(size=CPU_PROCESS_POOL_SIZE)
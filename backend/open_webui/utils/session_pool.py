@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    ENABLE_AIOHTTP_CLIENT_POOL,
+)
+
+log = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """
+    Application-scoped aiohttp sessions, one per upstream (scheme://host:port),
+    so that upstream requests reuse kept-alive connections and cached DNS
+    lookups instead of paying a new TCP+TLS handshake each time.
+
+    Sessions are bound to the application's event loop (see start). Callers
+    running on another loop, or before start, get a new session of their
+    own, release closes those and leaves pooled ones open.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        limit: int = 100,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+    ):
+        """
+        :param limit: Max number of simultaneous connections per upstream
+        :param keepalive_timeout: Seconds an idle connection is kept open
+        :param dns_cache_ttl: Seconds a DNS lookup is reused
+        """
+        self.enabled = enabled
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._stats: dict[str, dict] = {}
+
+    def start(self):
+        """
+        Bind the pool to the running event loop, called from the app lifespan.
+        """
+        self._loop = asyncio.get_running_loop()
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions = {}
+        self._loop = None
+
+        await asyncio.gather(
+            *[session.close() for session in sessions], return_exceptions=True
+        )
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """
+        Return the pooled session of the upstream of url, or a new session
+        when pooling is not available. Hand it back through release.
+        """
+        if self.enabled and self._loop is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+            if loop is self._loop:
+                origin = self._get_origin(url)
+                session = self._sessions.get(origin)
+                if session is None or session.closed:
+                    session = self._create_session(origin)
+                    self._sessions[origin] = session
+                return session
+
+        return aiohttp.ClientSession(trust_env=True)
+
+    async def release(self, session: Optional[aiohttp.ClientSession]):
+        if session is None:
+            return
+
+        if not any(session is pooled for pooled in self._sessions.values()):
+            await session.close()
+
+    @asynccontextmanager
+    async def session(self, url: str):
+        session = self.get_session(url)
+        try:
+            yield session
+        finally:
+            await self.release(session)
+
+    def get_stats(self) -> dict:
+        upstreams = {
+            origin: {**stats, "open": origin in self._sessions}
+            for origin, stats in self._stats.items()
+        }
+        created = sum(stats["connections_created"] for stats in upstreams.values())
+        reused = sum(stats["connections_reused"] for stats in upstreams.values())
+
+        return {
+            "enabled": self.enabled and self._loop is not None,
+            "requests": sum(stats["requests"] for stats in upstreams.values()),
+            "connections_created": created,
+            "connections_reused": reused,
+            "reuse_rate": reused / (created + reused) if created + reused else 0.0,
+            "upstreams": upstreams,
+        }
+
+    def _get_origin(self, url: str) -> str:
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    def _create_session(self, origin: str) -> aiohttp.ClientSession:
+        log.debug(f"Creating pooled session for {origin}")
+        stats = self._stats.setdefault(
+            origin,
+            {"requests": 0, "connections_created": 0, "connections_reused": 0},
+        )
+
+        async def on_request_start(session, context, params):
+            stats["requests"] += 1
+
+        async def on_connection_create_end(session, context, params):
+            stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats["connections_reused"] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.limit,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            ),
+            trust_env=True,
+            # Sessions are shared between users, never keep response cookies
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[trace_config],
+        )
+
+
+SESSION_POOL = SessionPool(
+    enabled=ENABLE_AIOHTTP_CLIENT_POOL,
+    limit=AIOHTTP_CLIENT_POOL_LIMIT,
+    keepalive_timeout=AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    dns_cache_ttl=AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+)
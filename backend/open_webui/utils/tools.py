@@ -4,6 +4,9 @@ import re
 import inspect
 import aiohttp
 import asyncio
+import hashlib
+import uuid
+import time
 import yaml
 import json
 
@@ -42,6 +45,7 @@ from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    REDIS_KEY_PREFIX,
 )
 
 import copy
@@ -108,6 +112,7 @@ async def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
     tools_dict = {}
+    tool_servers = None
 
     for tool_id in tool_ids:
         tool = Tools.get_tool_by_id(tool_id)
@@ -130,8 +135,11 @@ async def get_tools(
 
                 if type == "openapi":
 
+                    if tool_servers is None:
+                        tool_servers = await get_tool_servers(request)
+
                     tool_server_data = None
-                    for server in await get_tool_servers(request):
+                    for server in tool_servers:
                         if server["id"] == server_id:
                             tool_server_data = server
                             break
@@ -557,35 +565,95 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
-async def set_tool_servers(request: Request):
-    request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
-    )
+# Seconds between checks of the shared tool server specs for updates
+TOOL_SERVERS_SYNC_INTERVAL = 1.0
+
 
-    if request.app.state.redis is not None:
-        await request.app.state.redis.set(
-            "tool_servers", json.dumps(request.app.state.TOOL_SERVERS)
+def _tool_servers_key() -> str:
+    return f"{REDIS_KEY_PREFIX}:tool_servers"
+
+
+async def refresh_tool_servers(app, lock_ttl: Optional[float] = None) -> list:
+    """
+    Refresh the specs of all tool servers, revalidating unchanged servers
+    with conditional requests, and share the result with the other nodes.
+
+    :param lock_ttl: Skip the refresh if another node refreshed within this
+        many seconds, for periodic refreshes
+    """
+    redis = app.state.redis
+
+    if redis is not None and lock_ttl:
+        acquired = await redis.set(
+            f"{_tool_servers_key()}:refresh_lock",
+            "1",
+            nx=True,
+            ex=max(int(lock_ttl) - 1, 1),
         )
+        if not acquired:
+            return app.state.TOOL_SERVERS
+
+    tool_servers = await get_tool_servers_data(
+        app.state.config.TOOL_SERVER_CONNECTIONS, app.state.TOOL_SERVERS
+    )
+    version = uuid.uuid4().hex
+
+    app.state.TOOL_SERVERS = tool_servers
+    app.state.TOOL_SERVERS_VERSION = version
+
+    if redis is not None:
+        await redis.set(_tool_servers_key(), json.dumps(tool_servers))
+        await redis.set(f"{_tool_servers_key()}:version", version)
 
-    return request.app.state.TOOL_SERVERS
+    return tool_servers
+
+
+async def set_tool_servers(request: Request):
+    return await refresh_tool_servers(request.app)
 
 
 async def get_tool_servers(request: Request):
-    tool_servers = []
-    if request.app.state.redis is not None:
+    """
+    Return the cached tool server specs. Specs refreshed by another node are
+    picked up within TOOL_SERVERS_SYNC_INTERVAL, servers are only fetched
+    here if no node has fetched them yet.
+    """
+    state = request.app.state
+    redis = state.redis
+
+    now = time.monotonic()
+    if redis is not None and now - state.TOOL_SERVERS_CHECKED_AT >= (
+        TOOL_SERVERS_SYNC_INTERVAL
+    ):
+        state.TOOL_SERVERS_CHECKED_AT = now
         try:
-            tool_servers = json.loads(await request.app.state.redis.get("tool_servers"))
-            request.app.state.TOOL_SERVERS = tool_servers
+            version = await redis.get(f"{_tool_servers_key()}:version")
+            if version is not None and version != state.TOOL_SERVERS_VERSION:
+                tool_servers = await redis.get(_tool_servers_key())
+                if tool_servers is not None:
+                    state.TOOL_SERVERS = json.loads(tool_servers)
+                    state.TOOL_SERVERS_VERSION = version
         except Exception as e:
             log.error(f"Error fetching tool_servers from Redis: {e}")
 
-    if not tool_servers:
-        tool_servers = await set_tool_servers(request)
+    if state.TOOL_SERVERS_VERSION is None:
+        return await set_tool_servers(request)
 
-    return tool_servers
+    return state.TOOL_SERVERS
 
 
-async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+async def fetch_tool_server_data(
+    url: str,
+    headers: Optional[dict],
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Fetch an OpenAPI spec. With the validators of a previous fetch, the
+    request is conditional and the spec is None if it did not change.
+
+    Returns (spec, etag, last_modified).
+    """
     _headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -593,6 +661,10 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
 
     if headers:
         _headers.update(headers)
+    if etag:
+        _headers["If-None-Match"] = etag
+    if last_modified:
+        _headers["If-Modified-Since"] = last_modified
 
     error = None
     try:
@@ -601,6 +673,10 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
             async with session.get(
                 url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
             ) as response:
+                if response.status == 304 and (etag or last_modified):
+                    log.debug(f"Tool server spec not modified: {url}")
+                    return None, etag, last_modified
+
                 if response.status != 200:
                     error_body = await response.json()
                     raise Exception(error_body)
@@ -622,6 +698,9 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
                     except Exception as e:
                         raise e
 
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
         if isinstance(err, dict) and "detail" in err:
@@ -631,10 +710,50 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
         raise Exception(error)
 
     log.debug(f"Fetched data: {res}")
+    return res, etag, last_modified
+
+
+async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+    res, _, _ = await fetch_tool_server_data(url, headers)
     return res
 
 
-async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def get_tool_server_fingerprint(server: Dict[str, Any]) -> str:
+    """Hash of the connection settings a cached spec was fetched with."""
+    return hashlib.sha256(
+        json.dumps(
+            {
+                key: server.get(key)
+                for key in (
+                    "url",
+                    "path",
+                    "spec_type",
+                    "spec",
+                    "auth_type",
+                    "key",
+                    "info",
+                )
+            },
+            sort_keys=True,
+        ).encode()
+    ).hexdigest()
+
+
+async def get_tool_servers_data(
+    servers: List[Dict[str, Any]], cached: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch and convert the specs of the enabled OpenAPI tool servers. Servers
+    found in cached with the same connection settings are revalidated with a
+    conditional request and keep their converted specs if unchanged, or if
+    the server can't be reached.
+    """
+    cached_by_fingerprint = {
+        server.get("fingerprint"): server
+        for server in (cached or [])
+        if server.get("fingerprint")
+    }
+
     # Prepare list of enabled servers along with their original index
 
     tasks = []
@@ -662,6 +781,9 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
             server_url = server.get("url")
             spec_type = server.get("spec_type", "url")
 
+            fingerprint = get_tool_server_fingerprint(server)
+            cached_server = cached_by_fingerprint.get(fingerprint)
+
             # Create async tasks to fetch data
             task = None
             if spec_type == "url":
@@ -669,36 +791,60 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
                 openapi_path = server.get("path", "openapi.json")
                 spec_url = get_tool_server_url(server_url, openapi_path)
                 # Fetch from URL
-                task = get_tool_server_data(
+                task = fetch_tool_server_data(
                     spec_url,
                     {"Authorization": f"Bearer {token}"} if token else None,
+                    etag=cached_server.get("etag") if cached_server else None,
+                    last_modified=(
+                        cached_server.get("last_modified") if cached_server else None
+                    ),
                 )
             elif spec_type == "json" and server.get("spec", ""):
-                # Use provided JSON spec
-                spec_json = None
-                try:
-                    spec_json = json.loads(server.get("spec", ""))
-                except Exception as e:
-                    log.error(f"Error parsing JSON spec for tool server {id}: {e}")
-
-                if spec_json:
-                    task = asyncio.sleep(
-                        0,
-                        result=spec_json,
-                    )
+                if cached_server:
+                    # Unchanged inline spec
+                    task = asyncio.sleep(0, result=(None, None, None))
+                else:
+                    # Use provided JSON spec
+                    spec_json = None
+                    try:
+                        spec_json = json.loads(server.get("spec", ""))
+                    except Exception as e:
+                        log.error(f"Error parsing JSON spec for tool server {id}: {e}")
+
+                    if spec_json:
+                        task = asyncio.sleep(
+                            0,
+                            result=(spec_json, None, None),
+                        )
 
             if task:
                 tasks.append(task)
-                server_entries.append((id, idx, server, server_url, info, token))
+                server_entries.append(
+                    (id, idx, server, server_url, info, fingerprint, cached_server)
+                )
 
     # Execute tasks concurrently
     responses = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Build final results with index and server metadata
     results = []
-    for (id, idx, server, url, info, _), response in zip(server_entries, responses):
+    for (id, idx, server, url, info, fingerprint, cached_server), response in zip(
+        server_entries, responses
+    ):
         if isinstance(response, Exception):
-            log.error(f"Failed to connect to {url} OpenAPI tool server")
+            if cached_server:
+                log.warning(
+                    f"Failed to connect to {url} OpenAPI tool server, keeping its cached spec"
+                )
+                results.append({**cached_server, "id": str(id), "idx": idx})
+            else:
+                log.error(f"Failed to connect to {url} OpenAPI tool server")
+            continue
+
+        response, etag, last_modified = response
+        if response is None:
+            # Not modified
+            results.append({**cached_server, "id": str(id), "idx": idx})
             continue
 
         response = {
@@ -725,6 +871,9 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
                 "openapi": openapi_data,
                 "info": response.get("info"),
                 "specs": response.get("specs"),
+                "fingerprint": fingerprint,
+                "etag": etag,
+                "last_modified": last_modified,
             }
         )
 
@@ -0,0 +1,201 @@
+# worker.py
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from open_webui.env import (
+    INGESTION_JOB_TIMEOUT,
+    INGESTION_WORKER_CONCURRENCY,
+    INGESTION_WORKER_POLL_INTERVAL,
+)
+
+log = logging.getLogger(__name__)
+
+# Finished jobs are kept this long (seconds) for inspection, then pruned
+FINISHED_JOB_RETENTION = 7 * 24 * 3600
+
+# The lease of a running job is renewed this often (seconds), so that only jobs
+# of dead workers are claimed again once INGESTION_JOB_TIMEOUT passes
+LEASE_RENEWAL_INTERVAL = max(INGESTION_JOB_TIMEOUT / 4, 1)
+
+
+def get_worker_request(app):
+    from fastapi import Request
+    from starlette.datastructures import Headers
+
+    # Processing code expects a request, only its app (config, embedding
+    # function) is used
+    return Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal/worker",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+
+def keep_lease(job, done: threading.Event):
+    """Renew the lease of the job until done is set or the lease is lost."""
+    from open_webui.models.ingestion_jobs import IngestionJobs
+
+    while not done.wait(LEASE_RENEWAL_INTERVAL):
+        try:
+            if not IngestionJobs.renew_lease(job.id, job.worker_id, job.attempts):
+                log.warning(f"Lost the lease of ingestion job {job.id}")
+                return
+        except Exception as e:
+            log.warning(f"Failed to renew the lease of ingestion job {job.id}: {e}")
+
+
+def run_job(request, job):
+    done = threading.Event()
+    heartbeat = threading.Thread(target=keep_lease, args=(job, done), daemon=True)
+    heartbeat.start()
+    try:
+        _run_job(request, job)
+    finally:
+        done.set()
+        heartbeat.join()
+
+
+def _run_job(request, job):
+    from open_webui.models.ingestion_jobs import IngestionJobs
+    from open_webui.models.users import Users
+    from open_webui.routers.files import run_uploaded_file_processing
+    from open_webui.utils.file_status import defer_file_failures, update_file_status
+
+    # Failures are reported below, once it is known whether the job is retried
+    with defer_file_failures():
+        try:
+            if job.attempts > job.max_attempts:
+                raise Exception("Job timed out")
+
+            user = Users.get_user_by_id(job.user_id)
+            if not user:
+                raise Exception(f"User not found: {job.user_id}")
+
+            if job.type == "process_uploaded_file":
+                run_uploaded_file_processing(
+                    request,
+                    job.payload.get("content_type"),
+                    job.payload.get("file_path"),
+                    job.file_id,
+                    job.payload.get("file_metadata") or {},
+                    user,
+                )
+            else:
+                raise Exception(f"Unknown ingestion job type: {job.type}")
+
+            if not IngestionJobs.complete_job(job.id, job.worker_id, job.attempts):
+                log.warning(f"Ingestion job {job.id} was claimed by another worker")
+            return
+        except Exception as e:
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
+
+    log.warning(f"Ingestion job {job.id} failed (attempt {job.attempts}): {error}")
+    job = IngestionJobs.fail_job(job.id, job.worker_id, job.attempts, error)
+    if job is None:
+        # Another worker claimed the job and reports its outcome
+        return
+    if job.file_id:
+        if job.status == "queued":
+            update_file_status(job.file_id, "pending")
+        else:
+            update_file_status(job.file_id, "failed", error=error)
+
+
+def worker_loop(worker_id: str):
+    """Claim and run ingestion jobs one at a time until SIGTERM/SIGINT."""
+    from open_webui.main import app
+    from open_webui.models.ingestion_jobs import IngestionJobs
+
+    stopping = False
+
+    def stop(*args):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    request = get_worker_request(app)
+    log.info(f"Ingestion worker {worker_id} started")
+
+    pruned_at = 0.0
+    while not stopping:
+        try:
+            if time.monotonic() - pruned_at > 3600:
+                pruned_at = time.monotonic()
+                IngestionJobs.delete_finished_jobs(
+                    int(time.time()) - FINISHED_JOB_RETENTION
+                )
+
+            job = IngestionJobs.claim_next_job(worker_id)
+            if job is None:
+                time.sleep(INGESTION_WORKER_POLL_INTERVAL)
+                continue
+
+            log.info(f"Ingestion worker {worker_id} running job {job.id}")
+            run_job(request, job)
+        except Exception as e:
+            log.exception(f"Error in ingestion worker {worker_id}: {e}")
+            time.sleep(INGESTION_WORKER_POLL_INTERVAL)
+
+    log.info(f"Ingestion worker {worker_id} stopped")
+
+
+def run_workers(concurrency: int = INGESTION_WORKER_CONCURRENCY):
+    """
+    Start `concurrency` worker processes and restart any that exit, until
+    SIGTERM/SIGINT, which is forwarded so workers finish their current job.
+    """
+    context = multiprocessing.get_context("spawn")
+    host = socket.gethostname()
+
+    stopping = False
+
+    def stop(*args):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    def start(index):
+        process = context.Process(
+            target=worker_loop,
+            args=(f"{host}:{os.getpid()}:{index}",),
+            daemon=False,
+        )
+        process.start()
+        return process
+
+    processes = [start(index) for index in range(concurrency)]
+    log.info(f"Started {concurrency} ingestion workers")
+
+    while not stopping:
+        time.sleep(1)
+        for index, process in enumerate(processes):
+            if not process.is_alive() and not stopping:
+                log.warning(
+                    f"Ingestion worker {index} exited with {process.exitcode}, restarting"
+                )
+                processes[index] = start(index)
+
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
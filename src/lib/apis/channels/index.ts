@@ -378,12 +378,13 @@ export const getChannelMessages = async (
 	token: string = '',
 	channel_id: string,
 	skip: number = 0,
-	limit: number = 50
+	limit: number = 50,
+	cursor: string | null = null
 ) => {
 	let error = null;
 
 	const res = await fetch(
-		`${WEBUI_API_BASE_URL}/channels/${channel_id}/messages?skip=${skip}&limit=${limit}`,
+		`${WEBUI_API_BASE_URL}/channels/${channel_id}/messages?skip=${skip}&limit=${limit}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`,
 		{
 			method: 'GET',
 			headers: {
@@ -456,12 +457,13 @@ export const getChannelThreadMessages = async (
 	channel_id: string,
 	message_id: string,
 	skip: number = 0,
-	limit: number = 50
+	limit: number = 50,
+	cursor: string | null = null
 ) => {
 	let error = null;
 
 	const res = await fetch(
-		`${WEBUI_API_BASE_URL}/channels/${channel_id}/messages/${message_id}/thread?skip=${skip}&limit=${limit}`,
+		`${WEBUI_API_BASE_URL}/channels/${channel_id}/messages/${message_id}/thread?skip=${skip}&limit=${limit}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`,
 		{
 			method: 'GET',
 			headers: {
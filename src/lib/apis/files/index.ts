@@ -118,6 +118,32 @@ export const getFileProcessStatus = async (token: string, id: string) => {
 	return res;
 };
 
+export const getFilesProcessStatus = async (token: string, ids: string[]) => {
+	const queryParams = new URLSearchParams();
+	for (const id of ids) {
+		queryParams.append('file_ids', id);
+	}
+
+	let error = null;
+	const res = await fetch(`${WEBUI_API_BASE_URL}/files/process/status?${queryParams}`, {
+		method: 'GET',
+		headers: {
+			Accept: 'application/json',
+			authorization: `Bearer ${token}`
+		}
+	}).catch((err) => {
+		error = err.detail;
+		console.error(err);
+		return null;
+	});
+
+	if (error) {
+		throw error;
+	}
+
+	return res;
+};
+
 export const uploadDir = async (token: string) => {
 	let error = null;
 